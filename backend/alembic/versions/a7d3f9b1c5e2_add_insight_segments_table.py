@@ -0,0 +1,42 @@
+"""Add insight_segments table for the target-insight warehouse
+
+Revision ID: a7d3f9b1c5e2
+Revises: f2c6a8e4d1b9
+Create Date: 2026-10-17 16:27:05.918364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9b1c5e2'
+down_revision: Union[str, Sequence[str], None] = 'f2c6a8e4d1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('insight_segments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('age_group', sa.String(length=50), nullable=False),
+    sa.Column('gender', sa.String(length=20), nullable=False),
+    sa.Column('interest', sa.String(length=100), nullable=False),
+    sa.Column('profile_count', sa.Integer(), nullable=False),
+    sa.Column('stats', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('category', 'age_group', 'gender', 'interest', name='uq_insight_segments_key')
+    )
+    op.create_index(op.f('ix_insight_segments_id'), 'insight_segments', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_insight_segments_id'), table_name='insight_segments')
+    op.drop_table('insight_segments')
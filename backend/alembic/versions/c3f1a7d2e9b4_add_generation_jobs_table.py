@@ -0,0 +1,51 @@
+"""Add generation_jobs table for asynchronous generation with stage checkpoints
+
+Revision ID: c3f1a7d2e9b4
+Revises: 82dad5c45e43
+Create Date: 2026-10-17 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a7d2e9b4'
+down_revision: Union[str, Sequence[str], None] = '82dad5c45e43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('generation_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'RETRYING', 'SUCCEEDED', 'FAILED', name='generationjobstatus'), nullable=False),
+    sa.Column('request', sa.JSON(), nullable=False),
+    sa.Column('checkpoints', sa.JSON(), nullable=False),
+    sa.Column('current_stage', sa.String(length=50), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['content_id'], ['contents.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_generation_jobs_status'), 'generation_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_generation_jobs_user_id'), 'generation_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generation_jobs_user_id'), table_name='generation_jobs')
+    op.drop_index(op.f('ix_generation_jobs_status'), table_name='generation_jobs')
+    op.drop_table('generation_jobs')
+    sa.Enum(name='generationjobstatus').drop(op.get_bind(), checkfirst=True)
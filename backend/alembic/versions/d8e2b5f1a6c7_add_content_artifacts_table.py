@@ -0,0 +1,37 @@
+"""Add content_artifacts table for reusing stage outputs on regeneration
+
+Revision ID: d8e2b5f1a6c7
+Revises: c3f1a7d2e9b4
+Create Date: 2026-10-17 11:03:27.541902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2b5f1a6c7'
+down_revision: Union[str, Sequence[str], None] = 'c3f1a7d2e9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('content_artifacts',
+    sa.Column('content_id', sa.Integer(), nullable=False),
+    sa.Column('parent_content_id', sa.Integer(), nullable=True),
+    sa.Column('artifacts', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['content_id'], ['contents.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['parent_content_id'], ['contents.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('content_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('content_artifacts')
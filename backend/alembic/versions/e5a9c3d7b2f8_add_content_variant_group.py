@@ -0,0 +1,32 @@
+"""Add variant group columns to contents
+
+Revision ID: e5a9c3d7b2f8
+Revises: d8e2b5f1a6c7
+Create Date: 2026-10-17 13:41:09.662315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3d7b2f8'
+down_revision: Union[str, Sequence[str], None] = 'd8e2b5f1a6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contents', sa.Column('variant_group_id', sa.String(length=32), nullable=True))
+    op.add_column('contents', sa.Column('variant_label', sa.String(length=50), nullable=True))
+    op.create_index(op.f('ix_contents_variant_group_id'), 'contents', ['variant_group_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contents_variant_group_id'), table_name='contents')
+    op.drop_column('contents', 'variant_label')
+    op.drop_column('contents', 'variant_group_id')
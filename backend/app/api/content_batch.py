@@ -0,0 +1,96 @@
+"""
+일괄 콘텐츠 생성 API
+여러 제품을 한 번에 생성하고 항목별 결과를 NDJSON으로 스트리밍
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+import json
+import logging
+from typing import List, Optional
+
+from app.schemas.content import BatchGenerationRequest
+from app.services.content_batch import batch_generation_service, BatchItem
+from app.models.user import User
+from app.utils.auth import get_current_user
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/content", tags=["content-batch"])
+
+
+def _ndjson_response(items: List[BatchItem], user_id: int, concurrency: Optional[int]) -> StreamingResponse:
+    if not items:
+        raise HTTPException(status_code=400, detail="생성할 항목이 없습니다")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.BATCH_MAX_ITEMS}개까지 생성할 수 있습니다 (요청: {len(items)}개)"
+        )
+
+    async def lines():
+        async for event in batch_generation_service.stream(items, user_id=user_id, concurrency=concurrency):
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.post("/batch", summary="일괄 콘텐츠 생성 (JSON, NDJSON 스트리밍)")
+async def generate_batch(
+    request: BatchGenerationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    여러 제품의 콘텐츠를 한 번에 생성
+
+    **인증 필요**: 로그인한 사용자만 사용 가능
+
+    - items: /api/content/generate 요청과 같은 형식의 제품 목록 (최대 BATCH_MAX_ITEMS개)
+    - concurrency: 동시 생성 수 (최대 BATCH_MAX_CONCURRENCY)
+
+    카테고리와 타겟이 같은 항목은 타겟 인사이트와 RAG 검색 결과를 공유합니다.
+    응답은 한 줄에 하나씩 JSON 객체를 보내는 NDJSON입니다.
+    - 항목이 끝날 때마다: {"type": "item", "index", "status": "succeeded" | "failed", "content_id", "data" | "error"}
+    - 마지막 줄: {"type": "summary", "total", "succeeded", "failed", "elapsed_seconds"}
+
+    항목 하나가 실패해도 나머지 항목은 계속 생성합니다.
+    """
+    items = batch_generation_service.parse_items(request.items)
+    logger.info(f"일괄 생성 요청 (JSON, {len(items)}개, 사용자: {current_user.email})")
+    return _ndjson_response(items, current_user.id, request.concurrency)
+
+
+@router.post("/batch/csv", summary="일괄 콘텐츠 생성 (CSV 업로드, NDJSON 스트리밍)")
+async def generate_batch_csv(
+    file: UploadFile = File(...),
+    concurrency: Optional[int] = Form(None, ge=1),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    CSV 파일의 제품 목록으로 일괄 생성 (응답 형식은 POST /api/content/batch와 같음)
+
+    첫 줄은 열 이름이며 product_name, product_description, category는 필수입니다.
+    target_ages, target_genders, target_interests는 ; 또는 |로 여러 값을 구분합니다.
+
+    예:
+        product_name,product_description,category,target_ages,target_genders,target_interests,copy_tone
+        수분 크림,저자극 수분 크림,beauty,20대;30대,여성,뷰티|스킨케어,professional
+    """
+    try:
+        text = (await file.read()).decode("utf-8-sig")  # 엑셀에서 저장한 CSV의 BOM 제거
+        items = batch_generation_service.parse_csv(text)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV 파일은 UTF-8로 인코딩되어야 합니다")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"일괄 생성 요청 (CSV {file.filename}, {len(items)}개, 사용자: {current_user.email})")
+    return _ndjson_response(items, current_user.id, concurrency)
@@ -3,27 +3,39 @@
 전략 → 카피 → 이미지 프롬프트 → 이미지 생성을 한 번에 처리
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import logging
 import time
 import json
+import math
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, List, Optional
 
 from app.schemas.content import (
     FullContentGenerationRequest,
     FullContentGenerationResponse
 )
+from app.services.artifact_store import artifact_store
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.client_pool import client_pool
+from app.services.content_pipeline import content_pipeline
+from app.services.fair_scheduler import SchedulerTimeoutError
+from app.services.generation_jobs import generation_job_service
+from app.services.idempotency import idempotency_service, IdempotencyError
 from app.services.gemini_service import gemini_service
 from app.services.nanobanana_service import nanobanana_service
-from app.services.replicate_service import replicate_service
 from app.services.vector_service import vector_service
 from app.models.content import Content, ContentStatus
+from app.models.generation_job import GenerationJob, GenerationJobStatus
 from app.models.user import User
-from app.models.base import get_db
+from app.models.base import get_db, SessionLocal
 from app.utils.auth import get_current_user
+from app.utils.deadline import Deadline, current_deadline, request_deadline, should_skip
+from app.utils.metrics import metrics
+from app.utils.stage_graph import StageTimeoutError
+from app.utils.tenant import Tenant, request_tenant, set_tenant
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -31,6 +43,28 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/content", tags=["content-generation"])
 
 
+def _circuit_open_error(error: CircuitOpenError) -> HTTPException:
+    """프로바이더 서킷이 열려 있을 때의 응답 (503 + Retry-After)"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))}
+    )
+
+
+def _is_variant_request(request: FullContentGenerationRequest) -> bool:
+    return bool(request.variant_tones) or request.images_per_variant > 1
+
+
+def _check_variant_count(request: FullContentGenerationRequest):
+    count = len(content_pipeline.variant_specs(request))
+    if count > settings.GENERATION_MAX_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"변형은 최대 {settings.GENERATION_MAX_VARIANTS}개까지 생성할 수 있습니다 (요청: {count}개)"
+        )
+
+
 @router.post(
     "/generate",
     response_model=FullContentGenerationResponse,
@@ -39,8 +73,11 @@ router = APIRouter(prefix="/api/content", tags=["content-generation"])
 )
 async def generate_full_content(
     request: FullContentGenerationRequest,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    deadline: Optional[Deadline] = Depends(request_deadline),
+    tenant: Tenant = Depends(request_tenant),
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="중복 요청 방지 키 (재시도 시 같은 값)")
 ):
     """
     전체 콘텐츠 생성 파이프라인
@@ -53,418 +90,121 @@ async def generate_full_content(
     4. 이미지 생성 및 저장
     5. 데이터베이스에 저장 (사용자 ID 포함)
 
-    **예상 시간**: 30-40초
-    """
-    start_time = time.time()
+    fast_mode=True이면 인사이트/전략/카피(0-2단계)를 Gemini 1회 호출로 생성합니다.
+    speculative_image=True이면 카피 생성과 동시에 전략 기반 프롬프트로 이미지를 먼저 생성하고,
+    카피 기반 프롬프트와 충분히 비슷하면 그 이미지를 사용합니다 (응답의 speculative_image에 채택 여부/절약 시간).
 
-    try:
-        logger.info(f"통합 콘텐츠 생성 시작: {request.product_name}")
-
-        # === regenerate_type 처리 ===
-        if request.regenerate_type:
-            logger.info(f"재생성 요청: {request.regenerate_type}")
-
-            # auto인 경우 사용자 의도 분석
-            if request.regenerate_type == "auto" and request.custom_request:
-                logger.info(f"사용자 요청 분석 중: {request.custom_request}")
-                intent_analysis = await gemini_service.analyze_user_intent(request.custom_request)
-                logger.info(f"분석 결과: {intent_analysis}")
-
-                # 분석 결과에 따라 regenerate_type 변경
-                request.regenerate_type = intent_analysis.get("type", "all")
-                logger.info(f"재생성 타입 결정: {request.regenerate_type}")
-
-        # 다중 타겟을 문자열로 변환 (빈 배열이면 "AI 자동 분석"으로 표시)
-        if len(request.target_ages) > 1:
-            target_age_str = ", ".join(request.target_ages)
-        elif len(request.target_ages) == 1:
-            target_age_str = request.target_ages[0]
-        else:
-            target_age_str = "AI 자동 분석"
+    각 단계는 의존 관계 그래프(StageGraph)로 실행되어 서로 의존하지 않는 단계는 동시에 진행됩니다.
+    (연령대 입력 시 RAG 검색 ∥ 인사이트 분석, 제품 이미지 프롬프트 ∥ 카피 생성, Vector DB 저장 ∥ 성과 예측)
+    BACKGROUND_POST_PROCESSING=True이면 Vector DB 저장과 성과 예측은 작업 큐에서 실행되고
+    응답의 background_jobs 작업 ID로 진행 상태를 조회합니다 (GET /api/jobs/{job_id}).
+    단계별 소요 시간과 critical path는 응답의 stage_timings에 포함됩니다.
 
-        if len(request.target_genders) > 1:
-            target_gender_str = ", ".join(request.target_genders)
-        elif len(request.target_genders) == 1:
-            target_gender_str = request.target_genders[0]
-        else:
-            target_gender_str = "무관"
-
-        logger.info(f"카테고리: {request.category} / 타겟: {target_age_str} / {target_gender_str}")
-
-        # === 0단계: AI 타겟 인사이트 분석 ===
-        logger.info("0/5 AI 타겟 인사이트 분석 중...")
-        target_insights = await gemini_service.analyze_target_insights(
-            product_name=request.product_name,
-            product_description=request.product_description,
-            category=request.category,
-            target_ages=request.target_ages,
-            target_genders=request.target_genders,
-            target_interests=request.target_interests
-        )
-        logger.info(f"✓ 타겟 인사이트 분석 완료")
-        logger.info(f"  - Target Ages: {len(target_insights.get('target_ages', []))}개")
-        logger.info(f"  - Target Interests: {len(target_insights.get('target_interests', []))}개")
-        logger.info(f"  - Pain Points: {len(target_insights.get('pain_points', []))}개")
-        logger.info(f"  - Preferred Channels: {len(target_insights.get('preferred_channels', []))}개")
-
-        # AI가 생성한 연령대 사용 (비어있었다면)
-        final_target_ages = target_insights.get('target_ages', request.target_ages) if not request.target_ages or len(request.target_ages) == 0 else request.target_ages
-        # AI가 생성한 관심사를 사용 (비어있었다면)
-        final_target_interests = target_insights.get('target_interests', request.target_interests) if not request.target_interests or len(request.target_interests) == 0 else request.target_interests
-
-        # 연령대 문자열 생성 (AI가 생성한 연령대 사용)
-        target_age_str = ", ".join(final_target_ages) if len(final_target_ages) > 1 else final_target_ages[0] if final_target_ages else "20-29"
-
-        # === RAG: 과거 유사 콘텐츠 성과 검색 ===
-        past_performance = []
-        try:
-            logger.info("📊 RAG: 유사 콘텐츠 성과 검색 중...")
-            # 검색 쿼리 생성 (제품 설명 + 카테고리)
-            query_text = f"제품: {request.product_name}\n설명: {request.product_description}\n카테고리: {request.category}"
-
-            past_performance = vector_service.get_performance_reference(
-                query_text=query_text,
-                target_age=target_age_str if len(final_target_ages) == 1 else None,  # 단일 연령대만 필터링
-                target_gender=target_gender_str if target_gender_str != "무관" else None,
-                category=request.category,
-                limit=3  # 최대 3개 참조
-            )
-
-            if past_performance:
-                logger.info(f"✓ RAG: {len(past_performance)}개 유사 콘텐츠 발견")
-                for i, perf in enumerate(past_performance, 1):
-                    logger.info(f"  {i}. 유사도: {perf['similarity_score']:.2f}, 성과: 도달 {perf['performance']['impressions']:,}명")
-            else:
-                logger.info("  RAG: 유사 콘텐츠 없음 (첫 콘텐츠 또는 유사도 낮음)")
-        except Exception as e:
-            logger.warning(f"⚠️  RAG 검색 실패 (계속 진행): {str(e)}")
-            past_performance = []
-
-        # === 1단계: 마케팅 전략 생성 (RAG 활용) ===
-        logger.info("1/5 마케팅 전략 생성 중...")
-        strategies = await gemini_service.generate_marketing_strategies(
-            product_name=request.product_name,
-            product_description=request.product_description,
-            category=request.category,
-            target_age=target_age_str,
-            target_gender=target_gender_str,
-            target_interests=final_target_interests,
-            past_performance=past_performance  # RAG 데이터 전달
-        )
+    variant_tones 또는 images_per_variant(>1)를 지정하면 변형 모드로 실행됩니다.
+    인사이트/RAG/전략은 한 번만 생성하고 톤별 카피와 변형별 이미지를 동시에 생성하여
+    같은 variant_group_id의 콘텐츠로 저장합니다 (응답의 variants, 소요 시간은 변형 1개와 비슷).
 
-        # 전략 선택 (사용자 지정 또는 첫 번째 전략)
-        selected_strategy_id = request.strategy_id or 1
+    X-Request-Timeout 헤더(초, 없으면 REQUEST_DEADLINE_SECONDS)로 시간 예산을 지정하면 남은 시간에 따라
+    RAG/성과 예측 생략, Gemini 출력 토큰 축소, 빠른 이미지 모델 사용 등으로 단계를 줄이고
+    적용한 항목을 응답의 deadline.degradations에 담습니다. 필수 단계가 예산 안에 끝나지 않으면 504입니다.
 
-        # 디버그: strategies 타입 확인
-        logger.info(f"strategies 타입: {type(strategies)}, 길이: {len(strategies)}")
-
-        selected_strategy = next(
-            (s for s in strategies if s["id"] == selected_strategy_id),
-            strategies[0]
-        )
-
-        # 디버그: selected_strategy 타입 확인
-        logger.info(f"selected_strategy 타입: {type(selected_strategy)}")
-
-        logger.info(f"✓ 전략 생성 완료 (선택: {selected_strategy.get('name', 'Unknown')})")
-
-        # === 2단계: 카피 생성 (regenerate_type이 'image'가 아닐 때만) ===
-        if request.regenerate_type != "image":
-            logger.info(f"2/5 카피 생성 중... (톤: {request.copy_tone})")
-            copies = await gemini_service.generate_copies(
-                product_name=request.product_name,
-                product_description=request.product_description,
-                strategy=selected_strategy,
-                target_age=target_age_str,
-                target_gender=target_gender_str,
-                target_interests=final_target_interests,
-                copy_tone=request.copy_tone  # 요청된 톤 전달
-            )
-
-            # 첫 번째 카피 사용 (이제 하나만 생성됨)
-            selected_copy = copies[0]
-
-            logger.info(f"✓ 카피 생성 완료 ({selected_copy['tone']})")
-        else:
-            # 이미지만 재생성 - 기존 카피 유지 (임시로 빈 카피)
-            logger.info("2/5 카피 생성 스킵 (이미지만 재생성)")
-            selected_copy = {"text": "", "tone": request.copy_tone, "hashtags": [], "length": 0}
-
-        # === 3단계: 이미지 프롬프트 변환 (regenerate_type이 'copy'가 아닐 때만) ===
-        if request.regenerate_type != "copy":
-            logger.info("3/5 이미지 프롬프트 변환 중...")
-            image_prompt = await gemini_service.convert_to_image_prompt(
-                copy_text=selected_copy["text"] if selected_copy["text"] else request.product_description,
-                product_name=request.product_name,
-                target_age=target_age_str,
-                target_gender=target_gender_str,
-                strategy=selected_strategy
-            )
-
-            logger.info(f"✓ 이미지 프롬프트 생성 완료")
-        else:
-            # 카피만 재생성 - 이미지 생성 스킵
-            logger.info("3/5 이미지 프롬프트 변환 스킵 (카피만 재생성)")
-            image_prompt = None
-
-        # === 4단계: 이미지 생성 (regenerate_type이 'copy'가 아닐 때만) ===
-        if request.regenerate_type != "copy" and image_prompt:
-            logger.info("4/5 이미지 생성 중...")
-
-            # IMAGE_PROVIDER 환경변수에 따라 이미지 생성 서비스 선택
-            image_provider = settings.IMAGE_PROVIDER.lower()
-
-            # 제품 이미지가 있으면 제품 기반 마케팅 이미지 생성
-            if request.product_image_path:
-                import os
-                if os.path.exists(request.product_image_path):
-                    logger.info(f"제품 이미지 기반 마케팅 이미지 생성 모드")
-                    logger.info(f"제품 이미지 경로: {request.product_image_path}")
-
-                    # 제품 이미지 기반 마케팅 프롬프트 생성
-                    marketing_prompt = await gemini_service.generate_text(
-                        f"""You will see a product image. Create a new marketing image that includes this EXACT product.
-
-Product: {request.product_name}
-Description: {request.product_description}
-Target Audience: {target_age_str}, {target_gender_str}
-Marketing Strategy: {selected_strategy.get('name', '')} - {selected_strategy.get('core_message', '')}
-
-CRITICAL RULE: The product itself (design, color, shape, branding) MUST remain EXACTLY as shown in the provided image. Do not change the product at all.
-
-Generate a complete marketing scene that features this product:
-- A person holding, wearing, or using the product
-- The product placed in an attractive lifestyle setting
-- A professional product showcase with appropriate background
-
-Focus on:
-- Keeping the product identical to the reference image
-- Natural composition and lighting
-- Authentic human features (hands, face) if people are included
-- Professional photography style
-- Matching the target audience's preferences
-
-Generate a photorealistic marketing scene with the EXACT product from the image.""",
-                        temperature=0.5
-                    )
-
-                    logger.info(f"마케팅 프롬프트: {marketing_prompt[:100]}...")
-
-                    # Gemini로 제품 이미지 기반 마케팅 이미지 생성
-                    image_result = await nanobanana_service.generate_from_product_image(
-                        product_image_path=request.product_image_path,
-                        prompt=marketing_prompt,
-                        save_local=True
-                    )
-                    provider_name = "nanobanana (product-based)"
-                    logger.info(f"✓ 제품 이미지 기반 마케팅 이미지 생성 완료")
-                else:
-                    logger.warning(f"제품 이미지 파일을 찾을 수 없음: {request.product_image_path}")
-                    logger.info("일반 이미지 생성으로 대체")
-                    # 파일이 없으면 일반 이미지 생성으로 대체
-                    if image_provider == "nanobanana":
-                        image_result = await nanobanana_service.generate_image(
-                            prompt=image_prompt,
-                            width=1024,
-                            height=1024,
-                            save_local=True
-                        )
-                        provider_name = "nanobanana"
-                    else:
-                        image_result = await replicate_service.generate_image(
-                            prompt=image_prompt,
-                            width=1024,
-                            height=1024,
-                            save_local=True
-                        )
-                        provider_name = "replicate"
-            else:
-                # 제품 이미지가 없으면 일반 이미지 생성
-                if image_provider == "nanobanana":
-                    logger.info("이미지 생성 서비스: Nano Banana (Gemini 2.5 Flash Image)")
-                    image_result = await nanobanana_service.generate_image(
-                        prompt=image_prompt,
-                        width=1024,
-                        height=1024,
-                        save_local=True
-                    )
-                    provider_name = "nanobanana"
-                else:
-                    # 기본값: replicate
-                    logger.info("이미지 생성 서비스: Replicate (SDXL/Ideogram)")
-                    image_result = await replicate_service.generate_image(
-                        prompt=image_prompt,
-                        width=1024,
-                        height=1024,
-                        save_local=True
-                    )
-                    provider_name = "replicate"
+    중복 요청 방지:
+    - 같은 사용자의 동일한 요청이 처리 중이면 새로 생성하지 않고 그 결과를 함께 반환합니다 (X-Request-Coalesced: true).
+    - Idempotency-Key 헤더를 보내면 같은 키의 재요청은 IDEMPOTENCY_TTL_SECONDS 동안 저장된 응답을 반환합니다
+      (Idempotent-Replayed: true). 같은 키로 다른 본문을 보내면 422, 다른 서버에서 처리 중이면 409입니다.
 
-                logger.info(f"✓ 이미지 생성 완료 (provider: {provider_name})")
-        else:
-            # 카피만 재생성 - 이미지 없음 (임시 데이터)
-            logger.info("4/5 이미지 생성 스킵 (카피만 재생성)")
-            image_result = {"original_url": "", "local_url": None}
-            provider_name = "none"
+    동시 생성 수(SCHEDULER_GENERATION_SLOTS)가 가득 차 있으면 사용자/프로젝트별 공정 순서로 기다리며
+    (일괄/비동기 생성보다 먼저 실행), SCHEDULER_MAX_WAIT_SECONDS 안에 시작하지 못하면 503입니다.
 
-        # === 생성 시간 계산 ===
-        generation_time = int(time.time() - start_time)
+    **예상 시간**: 30-40초
+    """
+    _check_variant_count(request)
 
-        # === 5단계: 데이터베이스 저장 (항상 저장) ===
-        content_id = None
+    async def produce() -> Dict:
+        # 병합된 요청이 함께 기다리므로 요청 세션과 분리된 세션 사용
+        start_time = time.time()
+        db = SessionLocal()
         try:
-            content = Content(
-                user_id=current_user.id,  # 로그인한 사용자 ID
-                project_id=request.project_id,
-                product_name=request.product_name,
-                product_description=request.product_description,
-                category=request.category,
-                target_age_group=target_age_str,
-                target_gender=target_gender_str,
-                target_income_level=request.target_income_level,
-                target_interests=request.target_interests,
-                strategy=selected_strategy,
-                copy_text=selected_copy["text"],
-                copy_tone=selected_copy["tone"],
-                hashtags=selected_copy.get("hashtags", []),
-                image_prompt=image_prompt,
-                image_url=image_result.get("local_url") or image_result["original_url"],
-                image_provider=provider_name,
-                status=ContentStatus.COMPLETED,
-                generation_time=generation_time
-            )
-
-            db.add(content)
-            db.commit()
-            db.refresh(content)
-            content_id = content.id
-
-            logger.info(f"✓ 데이터베이스 저장 완료 (ID: {content_id})")
+            logger.info(f"통합 콘텐츠 생성 시작: {request.product_name}")
 
-            # === Vector DB 저장 (임베딩 생성 및 저장) ===
-            try:
-                logger.info(f"Vector DB 저장 중... (content_id: {content_id})")
-                vector_success = vector_service.save_content_embedding(
-                    content_id=content_id,
-                    copy_text=selected_copy["text"],
-                    image_prompt=image_prompt,
-                    metadata={
-                        "target_age": target_age_str,
-                        "target_gender": target_gender_str,
-                        "category": request.category,
-                        "product_name": request.product_name,
-                        "strategy_name": selected_strategy.get("name", ""),
-                        "copy_tone": selected_copy["tone"]
-                    }
+            if _is_variant_request(request):
+                response_data, generation_time = await content_pipeline.run_variants(
+                    request, user_id=current_user.id, start_time=start_time
+                )
+            else:
+                response_data, generation_time = await content_pipeline.run(
+                    request, user_id=current_user.id, db=db, start_time=start_time
                 )
-                if vector_success:
-                    logger.info(f"✓ Vector DB 저장 완료 (content_id: {content_id})")
-                else:
-                    logger.warning(f"⚠️  Vector DB 저장 실패 (content_id: {content_id})")
-            except Exception as ve:
-                logger.error(f"Vector DB 저장 에러: {str(ve)}")
-                # Vector DB 저장 실패해도 전체 프로세스는 계속 진행
-
-            # === 성과 예측 자동 실행 ===
-            # 성과 예측 실행 및 결과 가져오기
-            performance_data = None
-            try:
-                logger.info(f"성과 예측 시작... (content_id: {content_id})")
-                from app.services.performance_service import PerformanceService
-                performance_service = PerformanceService(db)
 
-                # 비동기로 성과 예측 실행
-                performance = await performance_service.predict_performance(content_id)
-
-                if performance:
-                    logger.info(f"✓ 성과 예측 완료 (content_id: {content_id})")
-                    # 성과 예측 결과를 딕셔너리로 변환
-                    performance_data = {
-                        "impressions": performance.impressions,
-                        "clicks": performance.clicks,
-                        "ctr": performance.ctr,
-                        "engagement_rate": performance.engagement_rate,
-                        "conversion_rate": performance.conversion_rate,
-                        "brand_recall_score": performance.brand_recall_score,
-                        "confidence_score": performance.confidence_score
-                    }
-                else:
-                    logger.warning(f"⚠️  성과 예측 실패 (content_id: {content_id})")
-            except Exception as pe:
-                logger.error(f"성과 예측 에러: {str(pe)}")
-                # 성과 예측 실패해도 전체 프로세스는 계속 진행
+            logger.info(f"✅ 통합 콘텐츠 생성 완료 (소요 시간: {generation_time}초)")
+            return {"data": response_data, "generation_time": generation_time}
 
         except Exception as e:
-            logger.error(f"데이터베이스 저장 실패: {str(e)}")
-            db.rollback()
-            # 저장 실패해도 생성된 콘텐츠는 반환
+            import traceback
+            logger.error(f"통합 콘텐츠 생성 실패: {str(e)}")
+            logger.error(traceback.format_exc())
 
-        # === 응답 구성 ===
-        response_data = {
-            "content_id": content_id,
-            "target_insights": target_insights,  # AI 분석 인사이트 추가
-            # 타겟 세그먼트 정보 추가
-            "target_age_group": target_age_str,
-            "target_gender": target_gender_str,
-            "target_ages": final_target_ages,  # AI가 생성한 연령대 또는 사용자 입력
-            "target_genders": request.target_genders,
-            "target_interests": final_target_interests,  # AI가 생성한 관심사 또는 사용자 입력
-            "strategies": strategies,
-            "selected_strategy_id": selected_strategy_id,
-            "selected_strategy": selected_strategy,
-            "copy": {
-                "text": selected_copy["text"],
-                "tone": selected_copy["tone"],
-                "hashtags": selected_copy.get("hashtags", []),
-                "length": selected_copy.get("length")
-            },
-            "image": {
-                "prompt": image_prompt,
-                "original_url": image_result["original_url"],
-                "local_url": image_result.get("local_url"),
-                "file_path": image_result.get("file_path")
-            },
-            "performance_prediction": performance_data  # 성과 예측 데이터 추가
-        }
+            # 실패 시 DB에 오류 기록 (save_to_db=True인 경우)
+            if request.save_to_db and request.project_id:
+                try:
+                    age_str, gender_str = content_pipeline.target_strings(request)
+
+                    failed_content = Content(
+                        project_id=request.project_id,
+                        target_age_group=age_str,
+                        target_gender=gender_str,
+                        status=ContentStatus.FAILED,
+                        error_message=str(e),
+                        generation_time=int(time.time() - start_time)
+                    )
+                    db.add(failed_content)
+                    db.commit()
+                except:
+                    db.rollback()
+            raise
+        finally:
+            db.close()
 
-        logger.info(f"✅ 통합 콘텐츠 생성 완료 (소요 시간: {generation_time}초)")
+    try:
+        result, outcome = await idempotency_service.execute(
+            current_user.id,
+            "content.generate",
+            request.model_dump(mode="json"),
+            idempotency_key,
+            produce
+        )
+        if outcome == "replayed":
+            response.headers["Idempotent-Replayed"] = "true"
+        elif outcome == "coalesced":
+            response.headers["X-Request-Coalesced"] = "true"
 
+        generation_time = result["generation_time"]
         return FullContentGenerationResponse(
             success=True,
-            data=response_data,
+            data=result["data"],
             message=f"콘텐츠 생성 완료 (소요 시간: {generation_time}초)",
             generation_time=generation_time
         )
 
+    except IdempotencyError as e:
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after else None
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=headers)
     except Exception as e:
-        import traceback
-        logger.error(f"통합 콘텐츠 생성 실패: {str(e)}")
-        logger.error(traceback.format_exc())
-
-        # 실패 시 DB에 오류 기록 (save_to_db=True인 경우)
-        if request.save_to_db and request.project_id:
-            try:
-                # target_age_str와 target_gender_str이 정의되지 않았을 수 있으므로 체크
-                try:
-                    age_str = target_age_str
-                    gender_str = target_gender_str
-                except NameError:
-                    age_str = ", ".join(request.target_ages) if len(request.target_ages) > 1 else request.target_ages[0]
-                    gender_str = ", ".join(request.target_genders) if len(request.target_genders) > 1 else request.target_genders[0]
-
-                failed_content = Content(
-                    project_id=request.project_id,
-                    target_age_group=age_str,
-                    target_gender=gender_str,
-                    status=ContentStatus.FAILED,
-                    error_message=str(e),
-                    generation_time=int(time.time() - start_time)
-                )
-                db.add(failed_content)
-                db.commit()
-            except:
-                db.rollback()
-
+        if isinstance(e, CircuitOpenError):
+            raise _circuit_open_error(e)
+        # 병합된 요청은 실행 중인 파이프라인의 데드라인을 따름 (idempotency_service.execute에서 지정)
+        deadline = current_deadline()
+        if isinstance(e, (StageTimeoutError, SchedulerTimeoutError)) and deadline is not None and deadline.expired:
+            raise HTTPException(
+                status_code=504,
+                detail=f"요청 시간 예산({deadline.budget}초) 안에 생성하지 못했습니다: {str(e)}"
+            )
+        if isinstance(e, SchedulerTimeoutError):
+            raise HTTPException(
+                status_code=503,
+                detail=f"생성 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도하세요 ({str(e)})",
+                headers={"Retry-After": str(math.ceil(e.retry_after or settings.SCHEDULER_MAX_WAIT_SECONDS))}
+            )
         raise HTTPException(
             status_code=500,
             detail=f"콘텐츠 생성 중 오류가 발생했습니다: {str(e)}"
@@ -480,18 +220,29 @@ Generate a photorealistic marketing scene with the EXACT product from the image.
 async def regenerate_image_only(
     request: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    deadline: Optional[Deadline] = Depends(request_deadline),
+    tenant: Tenant = Depends(request_tenant)
 ):
     """
     이미지만 재생성
     - 기존 카피, 전략, 타겟 정보 유지
     - 이미지만 새로 생성
+    - 원본 콘텐츠(content_id)의 단계 산출물이 있으면 이미지 프롬프트/성과 예측 재사용
+    - X-Request-Timeout 시간 예산이 부족하면 성과 예측 생략 (응답의 deadline.degradations)
     """
     start_time = time.time()
+    calls = client_pool.count_calls()
 
     try:
         logger.info(f"=== 이미지 재생성 시작 (사용자: {current_user.email}) ===")
 
+        # 원본 콘텐츠의 단계 산출물 (없으면 요청 본문만으로 처리)
+        parent_id = request.get('content_id')
+        artifacts = artifact_store.load_for_user(db, parent_id, current_user.id)
+        if artifacts:
+            logger.info(f"✓ 원본 단계 산출물 재사용 (content_id: {parent_id}, {', '.join(artifacts)})")
+
         # 사용자의 커스텀 요청 확인
         custom_request = request.get('customPrompt') or request.get('custom_request')
         logger.info(f"🔍 받은 customPrompt: {custom_request}")
@@ -502,7 +253,7 @@ async def regenerate_image_only(
         product_name = request.get('product_name', '')
 
         # 전략 정보
-        selected_strategy = request.get('selected_strategy', {})
+        selected_strategy = artifacts.get('selected_strategy') or request.get('selected_strategy', {})
 
         # 타겟 정보
         target_ages = request.get('target_ages', [])
@@ -515,7 +266,7 @@ async def regenerate_image_only(
             logger.info(f"✓ 사용자 커스텀 요청: {custom_request}")
 
             # 기존 이미지 프롬프트 가져오기
-            existing_image_prompt = request.get('image', {}).get('prompt', '')
+            existing_image_prompt = artifacts.get('image_prompt') or request.get('image', {}).get('prompt', '')
 
             if existing_image_prompt:
                 # 기존 프롬프트를 유지하면서 커스텀 요청만 반영
@@ -557,6 +308,10 @@ DO NOT add explanations - output ONLY the modified prompt.
                 )
 
             logger.info(f"✓ 커스텀 요청 반영한 프롬프트 생성 완료")
+        elif artifacts.get('image_prompt'):
+            # 커스텀 요청 없고 카피/전략이 그대로면 저장된 프롬프트로 이미지만 다시 생성
+            image_prompt = artifacts['image_prompt']
+            logger.info(f"✓ 저장된 이미지 프롬프트 재사용")
         else:
             # 커스텀 요청 없으면 기존 카피로 새 프롬프트 재생성 (품질 개선 적용)
             logger.info(f"✓ 기존 카피로 새 프롬프트 재생성 중...")
@@ -572,11 +327,9 @@ DO NOT add explanations - output ONLY the modified prompt.
 
         logger.info(f"✓ 이미지 생성 중...")
 
-        # IMAGE_PROVIDER 환경변수에 따라 이미지 생성 서비스 선택
-        image_provider = settings.IMAGE_PROVIDER.lower()
-
         # 제품 이미지 경로 확인
         product_image_path = request.get('product_image_path')
+        marketing_prompt = None
 
         # 제품 이미지가 있으면 제품 기반 마케팅 이미지 생성
         if product_image_path:
@@ -585,8 +338,9 @@ DO NOT add explanations - output ONLY the modified prompt.
                 logger.info(f"제품 이미지 기반 재생성 모드")
                 logger.info(f"제품 이미지 경로: {product_image_path}")
 
-                # 제품 이미지 기반 마케팅 프롬프트 생성
-                marketing_prompt = await gemini_service.generate_text(
+                # 제품 이미지 기반 마케팅 프롬프트 생성 (커스텀 요청이 없으면 저장된 프롬프트 재사용)
+                marketing_prompt = None if custom_request else artifacts.get('marketing_prompt')
+                marketing_prompt = marketing_prompt or await gemini_service.generate_text(
                     f"""You will see a product image. Create a new marketing image that includes this EXACT product.
 
 Product: {product_name}
@@ -626,37 +380,10 @@ Generate a photorealistic marketing image following these rules.""",
                 logger.warning(f"제품 이미지 파일을 찾을 수 없음: {product_image_path}")
                 logger.info("일반 이미지 생성으로 대체")
                 # 파일이 없으면 일반 이미지 생성으로 대체
-                if image_provider == "nanobanana":
-                    image_result = await nanobanana_service.generate_image(
-                        prompt=image_prompt,
-                        width=1024,
-                        height=1024,
-                        save_local=True
-                    )
-                else:
-                    image_result = await replicate_service.generate_image(
-                        prompt=image_prompt,
-                        width=1024,
-                        height=1024
-                    )
+                image_result, _ = await content_pipeline.generate_image(image_prompt)
         else:
-            # 제품 이미지가 없으면 일반 이미지 생성
-            if image_provider == "nanobanana":
-                logger.info("이미지 생성 서비스: Nano Banana (Gemini 2.5 Flash Image)")
-                image_result = await nanobanana_service.generate_image(
-                    prompt=image_prompt,
-                    width=1024,
-                    height=1024,
-                    save_local=True
-                )
-            else:
-                # 기본값: replicate
-                logger.info("이미지 생성 서비스: Replicate (SDXL/Ideogram)")
-                image_result = await replicate_service.generate_image(
-                    prompt=image_prompt,
-                    width=1024,
-                    height=1024
-                )
+            # 제품 이미지가 없으면 일반 이미지 생성 (IMAGE_PROVIDER, 장애 시 대체 프로바이더)
+            image_result, _ = await content_pipeline.generate_image(image_prompt)
 
         generation_time = int(time.time() - start_time)
 
@@ -697,6 +424,20 @@ Generate a photorealistic marketing image following these rules.""",
 
             logger.info(f"✓ 재생성 콘텐츠 DB 저장 완료 (ID: {content_id})")
 
+            # 원본 산출물 상속 (이미지 프롬프트만 갱신)
+            artifact_store.inherit(
+                db,
+                parent_content_id=int(parent_id) if artifacts else None,
+                content_id=content_id,
+                parent_artifacts=artifacts,
+                updates={
+                    "selected_strategy": selected_strategy,
+                    "copy": copy_data,
+                    "image_prompt": image_prompt,
+                    "marketing_prompt": marketing_prompt
+                }
+            )
+
             # === Vector DB 저장 ===
             try:
                 logger.info(f"Vector DB 저장 중... (content_id: {content_id})")
@@ -726,7 +467,13 @@ Generate a photorealistic marketing image following these rules.""",
                 from app.services.performance_service import PerformanceService
                 performance_service = PerformanceService(db)
 
-                performance = await performance_service.predict_performance(content_id)
+                # 시뮬레이션 입력(카피/전략/타겟)이 원본과 같으면 원본 예측을 복사
+                performance = None
+                parent_copy = artifacts.get('copy') or {}
+                if artifacts and parent_copy.get('text') == existing_copy:
+                    performance = performance_service.copy_performance(int(parent_id), content_id)
+                if not performance and not should_skip("performance"):
+                    performance = await performance_service.predict_performance(content_id)
 
                 if performance:
                     logger.info(f"✓ 성과 예측 완료 (content_id: {content_id})")
@@ -747,6 +494,9 @@ Generate a photorealistic marketing image following these rules.""",
             logger.error(f"DB 저장 실패: {str(e)}")
             db.rollback()
 
+        gemini_calls = calls.get("gemini", 0)
+        metrics.observe("regenerate.gemini_calls", gemini_calls, kind="image")
+
         # 기존 데이터 유지하면서 이미지만 업데이트
         response_data = {
             "content_id": content_id,  # 새로 생성된 content_id
@@ -768,8 +518,10 @@ Generate a photorealistic marketing image following these rules.""",
             },
             "performance_prediction": performance_data  # 성과 예측 데이터 추가
         }
+        if deadline is not None:
+            response_data["deadline"] = deadline.to_dict()
 
-        logger.info(f"✅ 이미지 재생성 완료 (소요 시간: {generation_time}초)")
+        logger.info(f"✅ 이미지 재생성 완료 (소요 시간: {generation_time}초, Gemini 호출: {gemini_calls}회)")
 
         return FullContentGenerationResponse(
             success=True,
@@ -783,6 +535,8 @@ Generate a photorealistic marketing image following these rules.""",
         logger.error(f"이미지 재생성 실패: {str(e)}")
         logger.error(traceback.format_exc())
 
+        if isinstance(e, CircuitOpenError):
+            raise _circuit_open_error(e)
         raise HTTPException(
             status_code=500,
             detail=f"이미지 재생성 중 오류가 발생했습니다: {str(e)}"
@@ -798,18 +552,29 @@ Generate a photorealistic marketing image following these rules.""",
 async def regenerate_copy_only(
     request: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    deadline: Optional[Deadline] = Depends(request_deadline),
+    tenant: Tenant = Depends(request_tenant)
 ):
     """
     카피만 재생성
     - 기존 이미지, 타겟 정보 유지
     - 카피만 새로운 톤으로 재생성
+    - 원본 콘텐츠(content_id)의 단계 산출물이 있으면 선택 전략/페르소나 재사용
+    - X-Request-Timeout 시간 예산이 부족하면 성과 예측 생략 (응답의 deadline.degradations)
     """
     start_time = time.time()
+    calls = client_pool.count_calls()
 
     try:
         logger.info(f"=== 카피 재생성 시작 (사용자: {current_user.email}) ===")
 
+        # 원본 콘텐츠의 단계 산출물 (없으면 요청 본문만으로 처리)
+        parent_id = request.get('content_id')
+        artifacts = artifact_store.load_for_user(db, parent_id, current_user.id)
+        if artifacts:
+            logger.info(f"✓ 원본 단계 산출물 재사용 (content_id: {parent_id}, {', '.join(artifacts)})")
+
         product_name = request.get('product_name', '')
         product_description = request.get('product_description', '')
         copy_tone = request.get('copy_tone', 'professional')
@@ -825,14 +590,19 @@ async def regenerate_copy_only(
 
         logger.info(f"✓ 새로운 톤({copy_tone})으로 카피 생성 중...")
 
-        # 기존 전략 정보로 strategy dict 구성
-        strategy_dict = {
-            "id": request.get('selected_strategy_id', 1),
-            "name": strategy_name,
-            "core_message": core_message,
-            "emotion": request.get('selected_strategy', {}).get('emotion', '감성적'),
-            "expected_effect": request.get('selected_strategy', {}).get('expected_effect', '')
-        }
+        # 기존 전략 정보로 strategy dict 구성 (같은 전략이면 저장된 전체 전략 사용)
+        stored_strategy = artifacts.get('selected_strategy') or {}
+        if stored_strategy and stored_strategy.get('name', '') in (strategy_name, ''):
+            strategy_dict = stored_strategy
+            strategy_name = stored_strategy.get('name', strategy_name)
+        else:
+            strategy_dict = {
+                "id": request.get('selected_strategy_id', 1),
+                "name": strategy_name,
+                "core_message": core_message,
+                "emotion": request.get('selected_strategy', {}).get('emotion', '감성적'),
+                "expected_effect": request.get('selected_strategy', {}).get('expected_effect', '')
+            }
 
         # 카피 재생성
         copies_data = await gemini_service.generate_copies(
@@ -891,6 +661,19 @@ async def regenerate_copy_only(
 
             logger.info(f"✓ 재생성 콘텐츠 DB 저장 완료 (ID: {content_id})")
 
+            # 원본 산출물 상속 (카피/전략 갱신, 페르소나는 타겟이 같으면 성과 예측에서 재사용)
+            artifact_store.inherit(
+                db,
+                parent_content_id=int(parent_id) if artifacts else None,
+                content_id=content_id,
+                parent_artifacts=artifacts,
+                updates={
+                    "selected_strategy": strategy_dict,
+                    "copy": selected_copy,
+                    "image_prompt": image_data.get('prompt') or None
+                }
+            )
+
             # === Vector DB 저장 ===
             try:
                 logger.info(f"Vector DB 저장 중... (content_id: {content_id})")
@@ -920,7 +703,9 @@ async def regenerate_copy_only(
                 from app.services.performance_service import PerformanceService
                 performance_service = PerformanceService(db)
 
-                performance = await performance_service.predict_performance(content_id)
+                performance = None
+                if not should_skip("performance"):
+                    performance = await performance_service.predict_performance(content_id)
 
                 if performance:
                     logger.info(f"✓ 성과 예측 완료 (content_id: {content_id})")
@@ -941,6 +726,9 @@ async def regenerate_copy_only(
             logger.error(f"DB 저장 실패: {str(e)}")
             db.rollback()
 
+        gemini_calls = calls.get("gemini", 0)
+        metrics.observe("regenerate.gemini_calls", gemini_calls, kind="copy")
+
         # 기존 데이터 유지하면서 카피만 업데이트
         response_data = {
             "content_id": content_id,  # 새로 생성된 content_id
@@ -962,8 +750,10 @@ async def regenerate_copy_only(
             "image": request.get('image', {}),  # 기존 이미지 유지
             "performance_prediction": performance_data  # 성과 예측 데이터 추가
         }
+        if deadline is not None:
+            response_data["deadline"] = deadline.to_dict()
 
-        logger.info(f"✅ 카피 재생성 완료 (소요 시간: {generation_time}초)")
+        logger.info(f"✅ 카피 재생성 완료 (소요 시간: {generation_time}초, Gemini 호출: {gemini_calls}회)")
 
         return FullContentGenerationResponse(
             success=True,
@@ -977,6 +767,8 @@ async def regenerate_copy_only(
         logger.error(f"카피 재생성 실패: {str(e)}")
         logger.error(traceback.format_exc())
 
+        if isinstance(e, CircuitOpenError):
+            raise _circuit_open_error(e)
         raise HTTPException(
             status_code=500,
             detail=f"카피 재생성 중 오류가 발생했습니다: {str(e)}"
@@ -988,11 +780,48 @@ async def regenerate_copy_only(
 # SSE 스트리밍 콘텐츠 생성
 # ============================================================
 
+async def _cancel_on_disconnect(http_request: Request, events: AsyncGenerator[str, None]) -> AsyncGenerator[str, None]:
+    """
+    클라이언트 연결이 끊기면 스트림 생성 중단
+
+    StreamingResponse는 다음 이벤트를 보낼 때에야 연결 종료를 알게 되어 그 사이 외부 API 호출이 계속되므로,
+    연결 종료 메시지를 기다리다가 생성 중인 태스크를 취소합니다 (진행 중인 Gemini/이미지 호출까지 취소).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def produce():
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(finished)
+
+    async def watch_disconnect():
+        while (await http_request.receive())["type"] != "http.disconnect":
+            pass
+        if not producer.done():
+            logger.info("스트리밍 클라이언트 연결 종료, 생성 취소")
+            metrics.incr("stream_generation.disconnects")
+            producer.cancel()
+
+    producer = asyncio.create_task(produce())
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        while (event := await queue.get()) is not finished:
+            yield event
+    finally:
+        watcher.cancel()
+        producer.cancel()
+
+
 @router.post("/generate-stream")
 async def generate_content_with_stream(
     request: FullContentGenerationRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    tenant: Tenant = Depends(request_tenant)
 ):
     """
     SSE를 사용한 실시간 진행 상태 스트리밍 콘텐츠 생성
@@ -1001,10 +830,19 @@ async def generate_content_with_stream(
     const eventSource = new EventSource('/api/content/generate-stream');
     eventSource.onmessage = (event) => {
         const data = JSON.parse(event.data);
-        // data.type: 'progress' | 'complete' | 'error'
+        // data.type: 'progress' | 'partial' | 'complete' | 'error'
     };
+
+    전략/카피 단계는 Gemini 출력을 토큰 단위로 스트리밍합니다.
+    'partial' 이벤트의 data에는 지금까지 파싱된 전략/카피 필드가 담깁니다:
+    {"type": "partial", "stage": "strategies" | "copies", "delta": "...", "data": [...]}
+
+    연결이 끊기면 생성을 중단합니다. 생성 중 취소/전략 선택/이미지 건너뛰기가 필요하면
+    WebSocket 채널(/api/content/ws/generate)을 사용하세요.
     """
-    
+    # 파이프라인을 거치지 않으므로 프로젝트까지 지정 (Gemini 쿼터 대기 순서)
+    set_tenant(Tenant(tenant.user_id, request.project_id))
+
     async def generate_with_progress():
         """진행 상태를 SSE로 전송하며 콘텐츠 생성"""
         try:
@@ -1019,6 +857,16 @@ async def generate_content_with_stream(
                     "message": message
                 }
                 return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+            # 부분 생성 결과 전송 헬퍼 함수 (토큰 스트리밍)
+            def send_partial(stage: str, event: dict):
+                data = {
+                    "type": "partial",
+                    "stage": stage,
+                    "delta": event["delta"],
+                    "data": event["data"]
+                }
+                return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
             
             # 시작
             yield send_progress(0, 8, "🎯 제품 정보를 분석하고 있습니다...")
@@ -1042,23 +890,14 @@ async def generate_content_with_stream(
             
             # 0단계: AI 타겟 인사이트 분석
             yield send_progress(1, 8, "🧠 AI가 타겟 고객을 분석하고 있습니다...")
-            await asyncio.sleep(0.1)  # 메시지 전송 시간 확보
 
-            target_insights = await gemini_service.analyze_target_insights(
-                product_name=request.product_name,
-                product_description=request.product_description,
-                category=request.category,
-                target_ages=request.target_ages,
-                target_genders=request.target_genders,
-                target_interests=request.target_interests
-            )
+            target_insights = await content_pipeline.analyze_target_insights(request)
 
             final_target_ages = target_insights.get('target_ages', request.target_ages) if not request.target_ages or len(request.target_ages) == 0 else request.target_ages
             final_target_interests = target_insights.get('target_interests', request.target_interests) if not request.target_interests or len(request.target_interests) == 0 else request.target_interests
 
             # 1단계: RAG 검색 + 마케팅 전략 생성
             yield send_progress(2, 8, "💡 마케팅 전략을 수립하고 있습니다...")
-            await asyncio.sleep(0.1)
             
             past_performance = []
             try:
@@ -1073,8 +912,9 @@ async def generate_content_with_stream(
             except Exception as e:
                 logger.warning(f"⚠️ RAG 검색 실패 (계속 진행): {str(e)}")
             
-            # 2단계: 마케팅 전략 생성
-            strategies = await gemini_service.generate_marketing_strategies(
+            # 2단계: 마케팅 전략 생성 (토큰 스트리밍)
+            strategies = []
+            async for event in gemini_service.stream_marketing_strategies(
                 product_name=request.product_name,
                 product_description=request.product_description,
                 category=request.category,
@@ -1082,15 +922,19 @@ async def generate_content_with_stream(
                 target_gender=target_gender_str,
                 target_interests=final_target_interests,
                 past_performance=past_performance
-            )
+            ):
+                if event["type"] == "partial":
+                    yield send_partial("strategies", event)
+                else:
+                    strategies = event["data"]
             
             selected_strategy = strategies[0] if strategies else None
             
             # 3단계: 카피 생성
             yield send_progress(3, 8, "✍️ 매력적인 카피를 작성하고 있습니다...")
-            await asyncio.sleep(0.1)
 
-            copies = await gemini_service.generate_copies(
+            copies = []
+            async for event in gemini_service.stream_copies(
                 product_name=request.product_name,
                 product_description=request.product_description,
                 strategy=selected_strategy,
@@ -1098,13 +942,16 @@ async def generate_content_with_stream(
                 target_gender=target_gender_str,
                 target_interests=final_target_interests,
                 copy_tone=request.copy_tone
-            )
+            ):
+                if event["type"] == "partial":
+                    yield send_partial("copies", event)
+                else:
+                    copies = event["data"]
 
             selected_copy = copies[0]
             
             # 4단계: 이미지 프롬프트 생성
             yield send_progress(4, 8, "🎨 이미지 프롬프트를 생성하고 있습니다...")
-            await asyncio.sleep(0.1)
 
             image_prompt = await gemini_service.convert_to_image_prompt(
                 copy_text=selected_copy["text"],
@@ -1116,10 +963,6 @@ async def generate_content_with_stream(
             
             # 5단계: 이미지 생성
             yield send_progress(5, 8, "🖼️ 고품질 이미지를 생성하고 있습니다...")
-            await asyncio.sleep(0.1)
-
-            # 이미지 생성 서비스 선택 (settings.IMAGE_PROVIDER)
-            image_provider = settings.IMAGE_PROVIDER.lower()
 
             # 제품 이미지가 있으면 제품 기반 생성 시도
             if request.product_image_path:
@@ -1139,42 +982,10 @@ async def generate_content_with_stream(
                     provider_name = "nanobanana (product-based)"
                 else:
                     logger.warning(f"제품 이미지 파일 없음, 일반 이미지 생성으로 대체")
-                    if image_provider == "nanobanana":
-                        image_result = await nanobanana_service.generate_image(
-                            prompt=image_prompt,
-                            width=1024,
-                            height=1024,
-                            save_local=True
-                        )
-                        provider_name = "nanobanana"
-                    else:
-                        image_result = await replicate_service.generate_image(
-                            prompt=image_prompt,
-                            width=1024,
-                            height=1024,
-                            save_local=True
-                        )
-                        provider_name = "replicate"
+                    image_result, provider_name = await content_pipeline.generate_image(image_prompt)
             else:
-                # 제품 이미지 없으면 일반 이미지 생성
-                if image_provider == "nanobanana":
-                    logger.info("이미지 생성 서비스: Nano Banana (Gemini 2.5 Flash Image)")
-                    image_result = await nanobanana_service.generate_image(
-                        prompt=image_prompt,
-                        width=1024,
-                        height=1024,
-                        save_local=True
-                    )
-                    provider_name = "nanobanana"
-                else:
-                    logger.info("이미지 생성 서비스: Replicate (SDXL/Ideogram)")
-                    image_result = await replicate_service.generate_image(
-                        prompt=image_prompt,
-                        width=1024,
-                        height=1024,
-                        save_local=True
-                    )
-                    provider_name = "replicate"
+                # 제품 이미지 없으면 일반 이미지 생성 (IMAGE_PROVIDER, 장애 시 대체 프로바이더)
+                image_result, provider_name = await content_pipeline.generate_image(image_prompt)
 
             logger.info(f"✓ 이미지 생성 완료 (provider: {provider_name})")
             
@@ -1201,7 +1012,6 @@ async def generate_content_with_stream(
             
             # 6단계: 성과 예측
             yield send_progress(6, 8, "📊 성과를 예측하고 있습니다...")
-            await asyncio.sleep(0.1)
 
             from app.services.performance_service import PerformanceService
             performance_service = PerformanceService(db)
@@ -1209,7 +1019,6 @@ async def generate_content_with_stream(
 
             # 7단계: Vector DB 저장
             yield send_progress(7, 8, "✨ 최종 콘텐츠를 완성하고 있습니다...")
-            await asyncio.sleep(0.1)
             
             try:
                 vector_service.save_content(
@@ -1275,7 +1084,119 @@ async def generate_content_with_stream(
             yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
     
     return StreamingResponse(
-        generate_with_progress(),
+        _cancel_on_disconnect(http_request, generate_with_progress()),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+# === 비동기 생성 작업 ===
+
+def _get_generation_job(db: Session, job_id: str, user_id: int) -> GenerationJob:
+    job = db.query(GenerationJob).filter(
+        GenerationJob.id == job_id,
+        GenerationJob.user_id == user_id
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="생성 작업을 찾을 수 없습니다")
+    return job
+
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    summary="비동기 콘텐츠 생성 작업 시작",
+    description="작업 ID를 바로 반환하고 백그라운드에서 콘텐츠를 생성합니다"
+)
+async def create_generation_job(
+    request: FullContentGenerationRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Dict:
+    """
+    비동기 콘텐츠 생성 작업 시작
+
+    /generate와 같은 요청을 받아 작업 ID를 바로 반환합니다.
+    진행 상태는 GET /api/content/jobs/{job_id} (폴링) 또는 GET /api/content/jobs/{job_id}/events (SSE)로 조회합니다.
+
+    단계별 결과는 체크포인트로 저장되므로, 실패한 작업을 재시도하면 완료된 단계(인사이트, 전략, 카피 등)의
+    LLM 호출을 다시 하지 않고 마지막으로 완료된 단계 다음부터 실행합니다.
+    """
+    if _is_variant_request(request):
+        raise HTTPException(status_code=400, detail="변형 모드는 /api/content/generate에서만 지원합니다")
+
+    job = generation_job_service.create(db, request, current_user.id)
+    await generation_job_service.enqueue(job)
+    logger.info(f"생성 작업 추가 (job_id: {job.id}, 제품: {request.product_name})")
+
+    return {
+        "success": True,
+        "job_id": job.id,
+        "status": job.status.value,
+        "status_url": f"/api/content/jobs/{job.id}",
+        "events_url": f"/api/content/jobs/{job.id}/events"
+    }
+
+
+@router.get("/jobs/{job_id}", summary="생성 작업 상태 조회")
+def get_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Dict:
+    """
+    생성 작업 상태 조회
+
+    - status: queued, running, retrying(자동 재시도 대기), succeeded, failed
+    - completed_stages: 체크포인트가 저장된 단계 (재시도 시 건너뜀)
+    - result: 완료 시 /generate 응답의 data와 같은 형식
+    """
+    job = _get_generation_job(db, job_id, current_user.id)
+    return {"success": True, "job": generation_job_service.to_dict(job)}
+
+
+@router.get("/jobs/{job_id}/events", summary="생성 작업 진행 상태 스트리밍 (SSE)")
+def stream_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    생성 작업 진행 상태 SSE
+
+    상태나 완료된 단계가 바뀔 때마다 {"type": "progress", "job": {...}} 이벤트를 보내고,
+    작업이 끝나면 {"type": "complete" | "error", "job": {...}}를 보낸 뒤 연결을 닫습니다.
+    """
+    _get_generation_job(db, job_id, current_user.id)
+
+    def load_job() -> Dict:
+        session = SessionLocal()
+        try:
+            job = session.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+            return generation_job_service.to_dict(job)
+        finally:
+            session.close()
+
+    async def job_events() -> AsyncGenerator[str, None]:
+        last = None
+        while True:
+            job = await asyncio.to_thread(load_job)
+            snapshot = (job["status"], job["current_stage"], len(job["completed_stages"]), job["attempts"])
+            if job["status"] in (GenerationJobStatus.SUCCEEDED.value, GenerationJobStatus.FAILED.value):
+                event_type = "complete" if job["status"] == GenerationJobStatus.SUCCEEDED.value else "error"
+                yield f"data: {json.dumps({'type': event_type, 'job': job}, ensure_ascii=False)}\n\n"
+                return
+            if snapshot != last:
+                last = snapshot
+                yield f"data: {json.dumps({'type': 'progress', 'job': job}, ensure_ascii=False)}\n\n"
+            await asyncio.sleep(settings.JOB_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(
+        job_events(),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1283,3 +1204,25 @@ async def generate_content_with_stream(
             "X-Accel-Buffering": "no"
         }
     )
+
+
+@router.post("/jobs/{job_id}/retry", status_code=202, summary="실패한 생성 작업 재개")
+async def retry_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Dict:
+    """
+    실패한 생성 작업 재개
+
+    저장된 체크포인트는 유지되므로 마지막으로 완료된 단계 다음부터 다시 실행합니다.
+    """
+    job = _get_generation_job(db, job_id, current_user.id)
+    if job.status != GenerationJobStatus.FAILED:
+        raise HTTPException(status_code=409, detail=f"실패한 작업만 재개할 수 있습니다 (현재 상태: {job.status.value})")
+
+    job = generation_job_service.retry(db, job)
+    await generation_job_service.enqueue(job)
+    logger.info(f"생성 작업 재개 요청 (job_id: {job.id}, 완료된 단계: {len(job.checkpoints or {})}개)")
+
+    return {"success": True, "job": generation_job_service.to_dict(job)}
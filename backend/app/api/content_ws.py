@@ -0,0 +1,243 @@
+"""
+WebSocket 콘텐츠 생성 API
+단계별 결과를 실시간으로 보내고, 생성 중에 취소/전략 선택/이미지 건너뛰기를 받음
+
+SSE(/generate-stream)는 서버 → 클라이언트 한 방향이라 생성 중에 방향을 바꿀 수 없으므로,
+같은 파이프라인(ContentPipeline.run)을 WebSocket으로 실행하여 클라이언트 메시지로 제어합니다.
+연결이 끊기거나 cancel을 받으면 파이프라인 태스크를 취소하며, 취소는 진행 중인 Gemini/이미지 호출
+(Replicate 예측은 업스트림까지)과 스레드에서 실행 중인 단계(Qdrant/Voyage AI)에도 전달됩니다.
+
+메시지 (JSON):
+    클라이언트 → 서버
+        {"type": "start", "request": {...}, "await_strategy_selection": false, "timeout": "60s"}
+        {"type": "select_strategy", "strategy_id": 2}
+        {"type": "skip_image"}
+        {"type": "cancel"}
+    서버 → 클라이언트
+        {"type": "started"}
+        {"type": "stage", "stage": "strategies", "result": ...}
+        {"type": "awaiting_strategy", "strategies": [...]}  (await_strategy_selection=true일 때)
+        {"type": "ack", "action": "select_strategy" | "skip_image" | "cancel"}
+        {"type": "complete", "data": {...}, "generation_time": 31}
+        {"type": "cancelled"} / {"type": "error", "detail": "..."}
+"""
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, status
+from pydantic import ValidationError
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.schemas.content import FullContentGenerationRequest
+from app.services.content_pipeline import content_pipeline, GenerationControls
+from app.models.base import SessionLocal
+from app.utils.auth import get_user_from_token
+from app.utils.deadline import Deadline, parse_timeout, set_deadline
+from app.utils.metrics import metrics
+from app.utils.tenant import Tenant, set_tenant
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/content", tags=["content-generation"])
+
+
+def _parse_start(message: Dict) -> Tuple[FullContentGenerationRequest, GenerationControls, Optional[Deadline]]:
+    """
+    start 메시지 검증
+
+    Raises:
+        ValueError: start 메시지가 아니거나 요청 형식이 잘못된 경우
+    """
+    if not isinstance(message, dict) or message.get("type") != "start":
+        raise ValueError("첫 메시지는 start여야 합니다")
+
+    payload = message.get("request") or {}
+    if not isinstance(payload, dict):
+        raise ValueError("request는 JSON 객체여야 합니다")
+    try:
+        request = FullContentGenerationRequest(**payload)
+    except ValidationError as e:
+        raise ValueError(f"요청 형식 오류: {e.errors(include_url=False)}")
+    if request.variant_tones or request.images_per_variant > 1:
+        raise ValueError("변형 생성은 /api/content/generate를 사용하세요")
+
+    seconds = settings.REQUEST_DEADLINE_SECONDS
+    if message.get("timeout"):
+        seconds = parse_timeout(str(message["timeout"]))
+    deadline = Deadline(seconds) if seconds else None
+
+    controls = GenerationControls(await_strategy=bool(message.get("await_strategy_selection")))
+    return request, controls, deadline
+
+
+class GenerationSession:
+    """WebSocket 연결 1개의 생성 실행"""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._send_lock = asyncio.Lock()
+        self.closed = False
+
+    async def send(self, message: Dict[str, Any]):
+        if self.closed:
+            return
+        async with self._send_lock:
+            try:
+                await self.websocket.send_text(json.dumps(message, ensure_ascii=False, default=str))
+            except (WebSocketDisconnect, RuntimeError):
+                # 연결이 끊김 - 수신 루프가 파이프라인을 취소함
+                self.closed = True
+
+    async def run(
+        self,
+        request: FullContentGenerationRequest,
+        controls: GenerationControls,
+        user_id: int,
+        db
+    ):
+        start_time = time.time()
+
+        async def on_checkpoint(stage: str, result: Any):
+            await self.send({"type": "stage", "stage": stage, "result": result})
+            if stage == "strategies" and controls.await_strategy:
+                await self.send({"type": "awaiting_strategy", "strategies": result})
+
+        pipeline = asyncio.create_task(content_pipeline.run(
+            request, user_id=user_id, db=db, start_time=start_time,
+            on_checkpoint=on_checkpoint, controls=controls
+        ))
+        await self.send({"type": "started"})
+        outcome = await self._control_loop(pipeline, controls)
+        metrics.incr("ws_generation.sessions", outcome=outcome)
+
+        if outcome == "completed":
+            response_data, generation_time = pipeline.result()
+            logger.info(f"✅ WebSocket 콘텐츠 생성 완료 (소요 시간: {generation_time}초)")
+            await self.send({"type": "complete", "data": response_data, "generation_time": generation_time})
+        elif outcome == "cancelled":
+            logger.info(f"WebSocket 콘텐츠 생성 취소 ({time.time() - start_time:.1f}초)")
+            await self.send({"type": "cancelled"})
+        elif outcome == "failed":
+            e = pipeline.exception()
+            logger.error(f"WebSocket 콘텐츠 생성 실패: {str(e)}")
+            await self.send({"type": "error", "detail": str(e)})
+        else:
+            logger.info(f"WebSocket 연결 종료, 콘텐츠 생성 취소 ({time.time() - start_time:.1f}초)")
+
+    async def _control_loop(self, pipeline: asyncio.Task, controls: GenerationControls) -> str:
+        """파이프라인이 끝날 때까지 제어 메시지 처리 (completed | failed | cancelled | disconnected)"""
+        receiver: Optional[asyncio.Task] = None
+        try:
+            while True:
+                if receiver is None:
+                    receiver = asyncio.ensure_future(self.websocket.receive_json())
+                await asyncio.wait({pipeline, receiver}, return_when=asyncio.FIRST_COMPLETED)
+
+                if pipeline.done():
+                    if pipeline.cancelled():
+                        return "cancelled"
+                    return "failed" if pipeline.exception() is not None else "completed"
+
+                try:
+                    message = receiver.result()
+                except WebSocketDisconnect:
+                    self.closed = True
+                    await self._cancel(pipeline)
+                    return "disconnected"
+                except (ValueError, KeyError):
+                    await self.send({"type": "error", "detail": "JSON 메시지만 받을 수 있습니다"})
+                    receiver = None
+                    continue
+                receiver = None
+
+                action = message.get("type") if isinstance(message, dict) else None
+                if action == "cancel":
+                    await self.send({"type": "ack", "action": action})
+                    await self._cancel(pipeline)
+                    return "cancelled"
+                elif action == "select_strategy":
+                    try:
+                        strategy_id = int(message["strategy_id"])
+                    except (KeyError, TypeError, ValueError):
+                        await self.send({"type": "error", "detail": "strategy_id가 필요합니다"})
+                        continue
+                    controls.select_strategy(strategy_id)
+                    await self.send({"type": "ack", "action": action, "strategy_id": strategy_id})
+                elif action == "skip_image":
+                    controls.skip_image()
+                    await self.send({"type": "ack", "action": action})
+                else:
+                    await self.send({"type": "error", "detail": f"알 수 없는 메시지: {action}"})
+        finally:
+            if receiver is not None and not receiver.done():
+                receiver.cancel()
+            # 핸들러 자체가 취소된 경우 (서버 종료 등)
+            if not pipeline.done():
+                await self._cancel(pipeline)
+
+    @staticmethod
+    async def _cancel(pipeline: asyncio.Task):
+        """파이프라인 취소 후 정리가 끝날 때까지 대기 (진행 중인 프로바이더 호출까지 취소)"""
+        pipeline.cancel()
+        try:
+            await pipeline
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+@router.websocket("/ws/generate")
+async def generate_content_ws(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None, description="JWT 액세스 토큰 (브라우저 WebSocket은 헤더를 보낼 수 없음)")
+):
+    """
+    WebSocket 실시간 콘텐츠 생성 (단계별 결과 + 생성 중 제어)
+
+    연결: ws://.../api/content/ws/generate?token=<JWT>
+
+    - start의 request는 /api/content/generate와 같은 형식입니다 (변형 모드 제외).
+    - await_strategy_selection=true이면 전략 단계 후 awaiting_strategy를 보내고, select_strategy를 받을 때까지
+      (최대 WS_STRATEGY_SELECTION_TIMEOUT_SECONDS) 카피/이미지 단계를 기다립니다.
+      fast 모드는 전략/카피를 한 번에 생성하므로 request.strategy_id만 사용합니다.
+    - skip_image: 이미지 프롬프트/이미지 단계를 건너뛰고(진행 중이면 취소) 이미지 없이 저장합니다.
+    - cancel 또는 연결 종료: 생성을 중단하고 진행 중인 외부 API 호출을 취소합니다 (콘텐츠는 저장되지 않음).
+    - timeout(초, 없으면 REQUEST_DEADLINE_SECONDS): /generate의 X-Request-Timeout과 같은 시간 예산
+    """
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(token, db)
+        if user is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="인증 정보를 확인할 수 없습니다")
+            return
+
+        await websocket.accept()
+        session = GenerationSession(websocket)
+
+        try:
+            message = await asyncio.wait_for(websocket.receive_json(), timeout=settings.WS_START_TIMEOUT_SECONDS)
+            request, controls, deadline = _parse_start(message)
+        except WebSocketDisconnect:
+            return
+        except asyncio.TimeoutError:
+            await session.send({"type": "error", "detail": "start 메시지 대기 시간 초과"})
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        except ValueError as e:
+            # JSON 파싱 실패(json.JSONDecodeError) 포함
+            await session.send({"type": "error", "detail": str(e)})
+            await websocket.close(code=status.WS_1007_INVALID_FRAME_PAYLOAD_DATA)
+            return
+
+        # 파이프라인 태스크가 물려받도록 시작 전에 지정
+        set_deadline(deadline)
+        set_tenant(Tenant(user.id, request.project_id))
+        logger.info(f"WebSocket 콘텐츠 생성 시작: {request.product_name}")
+
+        await session.run(request, controls, user_id=user.id, db=db)
+        if not session.closed:
+            await websocket.close()
+    finally:
+        db.close()
@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
 @router.get("")
 def get_contents(
     project_id: Optional[int] = Query(None, description="프로젝트 ID로 필터링"),
+    variant_group_id: Optional[str] = Query(None, description="변형 그룹 ID로 필터링 (함께 생성된 톤/이미지 변형)"),
     limit: int = Query(20, ge=1, le=100, description="조회할 콘텐츠 수"),
     offset: int = Query(0, ge=0, description="건너뛸 콘텐츠 수"),
     current_user: User = Depends(get_current_user),
@@ -33,6 +34,7 @@ def get_contents(
 
     Args:
         project_id: 특정 프로젝트의 콘텐츠만 조회 (선택)
+        variant_group_id: 같은 요청에서 생성된 변형만 조회 (선택)
         limit: 한 번에 조회할 콘텐츠 수 (기본 20, 최대 100)
         offset: 페이지네이션을 위한 offset (기본 0)
 
@@ -47,6 +49,10 @@ def get_contents(
         if project_id is not None:
             query = query.filter(Content.project_id == project_id)
 
+        # 변형 그룹 필터링
+        if variant_group_id is not None:
+            query = query.filter(Content.variant_group_id == variant_group_id)
+
         # 전체 개수 (필터 적용 후)
         total = query.count()
 
@@ -80,6 +86,8 @@ def get_contents(
                 "hashtags": content.hashtags,
                 "image_url": content.image_url,
                 "image_provider": content.image_provider,
+                "variant_group_id": content.variant_group_id,
+                "variant_label": content.variant_label,
                 "status": content.status.value,
                 "created_at": content.created_at.isoformat() if content.created_at else None,
                 "generation_time": content.generation_time,
@@ -177,6 +185,8 @@ def get_content(
             "image_prompt": content.image_prompt,
             "image_url": content.image_url,
             "image_provider": content.image_provider,
+            "variant_group_id": content.variant_group_id,
+            "variant_label": content.variant_label,
             "status": content.status.value,
             "generation_time": content.generation_time,
             "created_at": content.created_at.isoformat() if content.created_at else None,
@@ -0,0 +1,51 @@
+"""
+백그라운드 작업 상태 API
+콘텐츠 생성 후처리(임베딩 저장, 성과 예측) 등 작업 큐 작업의 진행 상태 조회
+"""
+
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Dict, Any, Optional
+
+from app.models.user import User
+from app.services.job_queue import job_queue
+from app.utils.auth import get_current_user
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+@router.get("/{job_id}", summary="작업 상태 조회")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    작업 상태 조회
+
+    - status: queued, running, retrying(재시도 대기), succeeded, failed
+    - result: 작업 결과 (성과 예측이면 예측 지표)
+    - 끝난 작업은 JOB_RESULT_TTL_SECONDS 동안만 조회 가능
+    """
+    job = await job_queue.get(job_id)
+    if job is None or job.get("user_id") not in (None, current_user.id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+
+    return {
+        "success": True,
+        "job": {
+            "id": job["id"],
+            "type": job["type"],
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "max_attempts": job["max_attempts"],
+            "result": job["result"],
+            "error": job["error"],
+            "created_at": _isoformat(job["created_at"]),
+            "started_at": _isoformat(job["started_at"]),
+            "finished_at": _isoformat(job["finished_at"])
+        }
+    }
@@ -0,0 +1,66 @@
+"""
+운영 지표 API
+LLM 캐시, 쿼터, JSON 파싱 등 서비스 내부 통계 조회
+"""
+
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+
+from app.services.admission_control import admission_control
+from app.services.circuit_breaker import circuit_breakers
+from app.services.client_pool import client_pool
+from app.services.fair_scheduler import generation_scheduler
+from app.services.hedging import request_hedger
+from app.services.job_queue import job_queue
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.prompt_registry import prompt_registry
+from app.services.provider_sim import provider_sim
+from app.services.quota_governor import gemini_quota
+from app.models.user import User
+from app.utils.auth import get_current_user
+from app.utils.metrics import metrics
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("")
+def get_metrics(current_user: User = Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    서비스 내부 통계 조회 (로그인 필요)
+
+    스케줄러 대기열은 전체 합계만 보여주며, 테넌트(사용자/프로젝트)별 값은 요청한 사용자 것만 포함합니다.
+
+    - admission: 엔드포인트 종류별 동시 처리/대기 수, 거절 수(대기열 가득/대기 시간 초과), 처리 시간 중앙값, 현재 Retry-After
+    - clients: 외부 API 클라이언트별 호출 수/상태/지연 시간/송수신 바이트, 연결 워밍업 결과
+    - circuit_breakers: 프로바이더별 서킷 상태, 연속 실패 수, open 횟수, 차단한 요청 수
+    - jobs: 백그라운드 작업 큐 백엔드, 작업 종류별 추가/성공/실패/재시도 수와 처리 지연 시간
+    - llm_cache: LLM 응답 캐시 적중/미스 카운터 (현재 워커 기준)
+    - gemini_quota: Gemini RPM/TPM 쿼터 대기 및 타임아웃 통계, 쿼터 대기열의 대기 수 (scheduler)
+    - scheduler: 생성 파이프라인 슬롯 사용량, 우선순위별 대기 수, 대기 중인 테넌트 수, 가장 오래 기다린 시간,
+      내 테넌트(프로젝트)별 실행/대기 수 (tenants)
+    - hedging: 작업별 헤지 요청 수/승률, 헤징 전후 p99, 추가 호출 비율 (비용)
+    - model_routes: 라우트별 모델 등급, 등급별 호출 수/지연 시간, escalation 횟수
+    - prompt_cache: 프롬프트별 컨텍스트 캐시 사용 횟수, 캐시 토큰 비율, 캐시/전체 전송별 지연 시간
+    - provider_sim: 기록/재생 시뮬레이터 모드, 프로바이더별 기록/재생/미스/주입 오류 수
+    - metrics: 카운터/지연 시간 지표 (llm_json.*: 모드별 JSON 파싱 시도/복구/실패,
+      scheduler.wait_seconds: 스케줄러/우선순위별 대기 시간,
+      admission.*: 엔드포인트 종류별 입장/대기/거절 수, 대기 시간, 처리 시간)
+    """
+    return {
+        "success": True,
+        "data": {
+            "admission": admission_control.get_stats(),
+            "clients": client_pool.get_stats(),
+            "circuit_breakers": circuit_breakers.get_stats(),
+            "jobs": job_queue.get_stats(),
+            "llm_cache": llm_cache.get_stats(),
+            "gemini_quota": gemini_quota.get_stats(current_user.id),
+            "scheduler": generation_scheduler.get_stats(current_user.id),
+            "hedging": request_hedger.get_stats(),
+            "model_routes": model_router.get_stats(),
+            "prompt_cache": prompt_registry.get_stats(),
+            "provider_sim": provider_sim.get_stats(),
+            "metrics": metrics.snapshot()
+        }
+    }
@@ -25,6 +25,116 @@ class Settings(BaseSettings):
     IMAGE_PROVIDER: str = "replicate"  # replicate (SDXL, Ideogram)
     IMAGE_MODE: str = "development"  # development (SDXL), production (Ideogram v3 Turbo)
     GEMINI_MODEL: str = "gemini-2.5-flash"  # gemini-2.5-flash, gemini-2.5-pro
+    GEMINI_LIGHT_MODEL: str = "gemini-2.0-flash-lite"  # 의도 분류 등 단순 작업용 (light 등급)
+    GEMINI_MODEL_ROUTES: dict = {}  # 라우트별 재정의 (예: {"analyze_chat_message": {"tier": "standard"}})
+    GEMINI_ROUTE_ESCALATION: bool = True  # light 모델 출력 검증 실패 시 기본 모델로 재생성
+    GEMINI_STRUCTURED_OUTPUT: bool = True  # JSON 응답에 response_schema 사용 (False면 프롬프트 지시만 사용)
+
+    # Gemini 쿼터 (GEMINI_API_KEY를 공유하는 모든 서비스 합산)
+    GEMINI_RPM_LIMIT: int = 60  # 분당 요청 수
+    GEMINI_TPM_LIMIT: int = 1000000  # 분당 토큰 수
+    GEMINI_QUOTA_MAX_WAIT_SECONDS: float = 30.0  # 쿼터 대기 최대 시간
+
+    # 요청 헤징 (Gemini, Replicate, Nanobanana 호출의 꼬리 지연 완화)
+    HEDGING_ENABLED: bool = False
+    HEDGING_PERCENTILE: float = 95.0  # 이 백분위 지연을 넘기면 중복 요청 전송
+    HEDGING_PERCENTILES: dict = {}  # 작업별 재정의 (예: {"replicate.run": 90})
+    HEDGING_MAX_RATIO: float = 0.1  # 최근 요청 중 헤지 요청 최대 비율
+    HEDGING_MIN_SAMPLES: int = 20  # 헤징 시작에 필요한 최소 지연 샘플 수
+    HEDGING_MIN_DELAY_SECONDS: float = 1.0  # 헤지 대기 시간 하한
+
+    # 서킷 브레이커 (프로바이더별, 장애 중에는 재시도 없이 바로 실패)
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5  # open으로 바뀌는 연속 실패 수
+    CIRCUIT_BREAKER_RECOVERY_SECONDS: float = 30.0  # open 유지 시간 (이후 시험 호출)
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS: int = 1
+    CIRCUIT_BREAKER_HALF_OPEN_TIMEOUT_SECONDS: float = 300.0  # 시험 호출 결과를 기다리는 최대 시간 (넘으면 다시 open)
+    RETRY_MAX_DELAY_SECONDS: float = 20.0  # 재시도 대기 상한 (Retry-After가 더 길면 재시도하지 않음)
+    IMAGE_PROVIDER_FALLBACK: bool = True  # 이미지 프로바이더 장애 시 nanobanana <-> replicate 자동 전환
+
+    # 콘텐츠 생성 파이프라인 단계별 타임아웃(초) 재정의 (예: {"image": 180, "rag": 10})
+    PIPELINE_STAGE_TIMEOUTS: dict = {}
+
+    # 백그라운드 작업 큐 (REDIS_URL이 있으면 Redis, 없으면 프로세스 내 큐)
+    BACKGROUND_POST_PROCESSING: bool = True  # 임베딩 저장/성과 예측을 응답 후 작업 큐에서 실행
+    JOB_WORKER_IN_PROCESS: bool = True  # API 서버 안에서 워커 실행 (False면 python -m app.worker 필요)
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_DELAY_SECONDS: float = 120.0
+    JOB_RESULT_TTL_SECONDS: int = 86400  # 끝난 작업 상태 보관 시간
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 900.0  # 작업 임대 시간 (실행 중 연장, 워커가 죽어 만료되면 다른 워커가 다시 실행)
+    JOB_EVENTS_POLL_SECONDS: float = 1.0  # 생성 작업 SSE 상태 확인 간격
+
+    # 재생성 시 원본 콘텐츠의 단계 산출물(전략, 이미지 프롬프트, 페르소나 등) 재사용
+    REGENERATE_REUSE_ARTIFACTS: bool = True
+
+    # 요청 데드라인 (X-Request-Timeout 헤더가 없을 때의 기본 시간 예산, None이면 데드라인 없음)
+    REQUEST_DEADLINE_SECONDS: Optional[float] = None
+    DEADLINE_MIN_BUDGETS: dict = {}  # 선택 단계 최소 예산(초) 재정의 (예: {"rag": 30, "performance": 15})
+    DEADLINE_TOKEN_CAP_BELOW_SECONDS: float = 20.0  # 남은 시간이 이보다 적으면 Gemini 출력 토큰 한도 축소
+    DEADLINE_MAX_OUTPUT_TOKENS: int = 2048
+    DEADLINE_FAST_IMAGE_BELOW_SECONDS: float = 30.0  # 남은 시간이 이보다 적으면 빠른 이미지 모델(SDXL, 적은 스텝) 사용
+    DEADLINE_FAST_IMAGE_STEPS: int = 20
+
+    # 타겟 인사이트 웨어하우스 (scripts/build_insight_warehouse.py로 구축, 세그먼트가 없는 조합만 LLM 분석)
+    INSIGHT_WAREHOUSE_ENABLED: bool = True
+    INSIGHT_WAREHOUSE_MIN_PROFILES: int = 5  # 합산 프로필 수가 이보다 적으면 LLM 분석
+    INSIGHT_WAREHOUSE_RELOAD_SECONDS: int = 600  # 재구축된 세그먼트를 다시 읽는 주기 (백그라운드 로드)
+
+    # 추측 이미지 채택 기준 (전략 기반 프롬프트와 카피 기반 프롬프트의 단어 코사인 유사도)
+    SPECULATIVE_IMAGE_MIN_SIMILARITY: float = 0.3
+
+    # 변형 모드 최대 변형 수 (톤 수 × 변형별 이미지 수)
+    GENERATION_MAX_VARIANTS: int = 9
+
+    # 생성 요청 중복 방지 (Idempotency-Key 헤더 응답 보관 시간, 처리 중 키 잠금 시간, 동시 동일 요청 병합)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: int = 600  # 처리 중에 서버가 죽어도 이 시간이 지나면 같은 키로 다시 실행 가능
+    GENERATION_COALESCE_ENABLED: bool = True
+
+    # 생성 작업 공정 스케줄링 (사용자/프로젝트별 가중 공정 분배, interactive > batch > background)
+    SCHEDULER_GENERATION_SLOTS: int = 8  # 워커당 동시에 실행하는 생성 파이프라인 수 (0이면 제한 없음)
+    SCHEDULER_MAX_WAIT_SECONDS: float = 120.0  # 슬롯 대기 최대 시간 (넘으면 503)
+    SCHEDULER_AGING_SECONDS: float = 30.0  # 이 시간만큼 기다릴 때마다 우선순위 한 단계 상승 (0이면 상승 없음)
+    SCHEDULER_DEFAULT_WEIGHT: float = 1.0
+    SCHEDULER_USER_WEIGHTS: dict = {}  # 사용자 ID별 가중치 (예: {"12": 0.5} - 대량 사용자 몫 축소)
+
+    # 비싼 엔드포인트 입장 제어 (생성/일괄 생성/성과 예측, 워커당, 종류별 기본값은 app/services/admission_control.py)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_CONCURRENCY: dict = {}  # 종류별 동시 처리 수 재정의 (예: {"generation": 8, "prediction": 2})
+    ADMISSION_QUEUE_SIZE: dict = {}  # 종류별 대기열 크기 재정의 (가득 차면 바로 503)
+    ADMISSION_MAX_WAIT_SECONDS: float = 10.0  # 대기열에서 기다리는 최대 시간 (넘으면 503)
+    ADMISSION_RETRY_AFTER_DEFAULT_SECONDS: float = 30.0  # 처리 시간 기록이 없을 때 Retry-After 추정에 쓰는 처리 시간
+    ADMISSION_RETRY_AFTER_MAX_SECONDS: int = 300
+
+    # WebSocket 생성 채널 (/api/content/ws/generate)
+    WS_START_TIMEOUT_SECONDS: float = 30.0  # 연결 후 start 메시지를 기다리는 시간
+    WS_STRATEGY_SELECTION_TIMEOUT_SECONDS: float = 60.0  # 전략 선택을 기다리는 최대 시간 (넘으면 요청의 strategy_id 사용)
+
+    # 일괄 생성 (/api/content/batch)
+    BATCH_MAX_ITEMS: int = 500
+    BATCH_CONCURRENCY: int = 4  # 요청에 concurrency가 없을 때 동시 생성 수
+    BATCH_MAX_CONCURRENCY: int = 16  # 요청에서 지정할 수 있는 최대 동시 생성 수 (Gemini 호출은 GEMINI_RPM_LIMIT/TPM 쿼터도 따름)
+
+    # Gemini 컨텍스트 캐싱 (자주 쓰는 프롬프트의 고정 지시문)
+    GEMINI_CONTEXT_CACHE_ENABLED: bool = True
+    GEMINI_CONTEXT_CACHE_TTL_SECONDS: int = 3600
+
+    # 외부 API HTTP 클라이언트 (커넥션 풀, 클라이언트별)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP2_ENABLED: bool = True
+    CLIENT_WARMUP_ON_STARTUP: bool = True  # 서버 시작 시 외부 API 연결 미리 열기
+
+    # 외부 API 기록/재생 시뮬레이터 (오프라인 부하 테스트용, off / record / replay)
+    PROVIDER_SIM_MODE: str = "off"
+    PROVIDER_SIM_CASSETTE_DIR: str = "cassettes"  # 상대 경로는 backend 디렉토리 기준
+    PROVIDER_SIM_LATENCY: dict = {}  # 프로바이더별 재생 지연 분포 (예: {"gemini": {"dist": "lognormal", "median": 1.5, "sigma": 0.5}})
+    PROVIDER_SIM_ERROR_RATES: dict = {}  # 프로바이더별 오류 주입 비율 (예: {"gemini": 0.02})
+    PROVIDER_SIM_SPEED: float = 1.0  # 기록된 지연 시간 배율 (0이면 지연 없음)
+    PROVIDER_SIM_SEED: Optional[int] = None
 
     # 데이터베이스
     DATABASE_URL: Optional[str] = None
@@ -32,6 +142,11 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: Optional[str] = None
 
+    # LLM 응답 캐시 (메모리 LRU + Redis)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 3600
+
     # Qdrant Vector DB
     QDRANT_URL: Optional[str] = None
     QDRANT_API_KEY: Optional[str] = None
@@ -3,10 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from pathlib import Path
+import asyncio
+import logging
 import os
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="ContentCraft AI API",
     description="AI-powered marketing content generation platform",
@@ -23,6 +27,10 @@ uploads_dir = Path(__file__).parent.parent / "static" / "uploads"
 uploads_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/static/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
 
+# 비싼 엔드포인트 입장 제어 (CORS보다 안쪽에 두어 503 응답에도 CORS 헤더 포함)
+from app.services.admission_control import AdmissionControlMiddleware
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -44,8 +52,49 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# 시작 시 띄운 백그라운드 태스크 (완료될 때까지 참조 유지)
+_background_tasks = set()
+
+def _forget_background_task(task: asyncio.Task):
+    _background_tasks.discard(task)
+    # 실패해도 서버 실행에는 영향이 없으므로 기록만 남김
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"백그라운드 작업 실패: {task.exception()}")
+
+@app.on_event("startup")
+async def warmup_clients():
+    # 외부 API 연결을 미리 열어 첫 요청 지연 감소 (시작을 막지 않도록 백그라운드 실행)
+    from app.config import settings
+    from app.services.client_pool import client_pool
+    if settings.CLIENT_WARMUP_ON_STARTUP:
+        task = asyncio.create_task(client_pool.warmup())
+        _background_tasks.add(task)
+        task.add_done_callback(_forget_background_task)
+
+@app.on_event("startup")
+async def load_insight_warehouse():
+    # 요청 처리 중 동기 DB 조회가 이벤트 루프를 막지 않도록 세그먼트를 미리 로드 (이후 주기적 재로드는 백그라운드)
+    from app.services.insight_warehouse import insight_warehouse
+    await insight_warehouse.refresh()
+
+@app.on_event("startup")
+async def start_job_worker():
+    # 내장 워커: Redis가 없으면(프로세스 내 큐) 반드시 필요, Redis 사용 시 python -m app.worker로 분리 가능
+    from app.config import settings
+    from app.services import content_jobs, generation_jobs  # noqa: F401  (작업 핸들러 등록)
+    from app.services.job_queue import job_queue
+    if settings.JOB_WORKER_IN_PROCESS:
+        job_queue.start(settings.JOB_WORKER_CONCURRENCY)
+
+@app.on_event("shutdown")
+async def close_clients():
+    from app.services.client_pool import client_pool
+    from app.services.job_queue import job_queue
+    await job_queue.stop()
+    await client_pool.aclose()
+
 # API 라우터 등록
-from app.api import content, content_generation, performance, analytics, contents, auth, projects, chat, upload
+from app.api import content, content_generation, content_ws, content_batch, performance, analytics, contents, auth, projects, chat, upload, metrics, jobs
 
 app.include_router(auth.router)
 app.include_router(projects.router)
@@ -53,6 +102,10 @@ app.include_router(chat.router)
 app.include_router(upload.router)
 app.include_router(content.router)
 app.include_router(content_generation.router)
+app.include_router(content_ws.router)
+app.include_router(content_batch.router)
 app.include_router(performance.router)
 app.include_router(analytics.router)
 app.include_router(contents.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
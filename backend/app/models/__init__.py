@@ -9,5 +9,9 @@ from app.models.target import Target
 from app.models.content import Content, ContentStatus
 from app.models.segment import Segment
 from app.models.performance import Performance, DataSource
+from app.models.generation_job import GenerationJob, GenerationJobStatus
+from app.models.content_artifact import ContentArtifact
+from app.models.idempotency_key import IdempotencyKey, IdempotencyStatus
+from app.models.insight_segment import InsightSegment
 
-__all__ = ["Base", "TimestampMixin", "User", "Project", "Target", "Content", "ContentStatus", "Segment", "Performance", "DataSource"]
+__all__ = ["Base", "TimestampMixin", "User", "Project", "Target", "Content", "ContentStatus", "Segment", "Performance", "DataSource", "GenerationJob", "GenerationJobStatus", "ContentArtifact", "IdempotencyKey", "IdempotencyStatus", "InsightSegment"]
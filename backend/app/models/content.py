@@ -45,6 +45,10 @@ class Content(Base, TimestampMixin):
     image_url = Column(String(500))  # 생성된 이미지 URL
     image_provider = Column(String(50))  # mock, stability, replicate
 
+    # 변형 모드 (같은 요청에서 함께 생성된 톤/이미지 변형)
+    variant_group_id = Column(String(32), index=True)  # 같은 그룹의 콘텐츠는 인사이트/전략 공유
+    variant_label = Column(String(50))  # 톤 (이미지가 여러 장이면 casual-2 형식)
+
     # 메타데이터
     status = Column(SQLEnum(ContentStatus), default=ContentStatus.DRAFT, nullable=False)
     generation_time = Column(Integer)  # 생성 시간 (초)
@@ -0,0 +1,31 @@
+"""
+ContentArtifact model
+콘텐츠 생성 단계별 산출물 (재생성 시 재사용)
+"""
+
+from sqlalchemy import Column, Integer, JSON, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.models.base import Base, TimestampMixin
+
+
+class ContentArtifact(Base, TimestampMixin):
+    """
+    콘텐츠별 단계 산출물 모델
+
+    인사이트, RAG 참고 자료, 전략, 선택된 전략, 이미지 프롬프트, 페르소나 등을 저장하여
+    이미지/카피 재생성 시 무효화되지 않은 단계를 다시 실행하지 않습니다.
+    콘텐츠 목록 조회에 큰 JSON이 실리지 않도록 contents와 분리된 테이블에 둡니다.
+    """
+
+    __tablename__ = "content_artifacts"
+
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True)
+    parent_content_id = Column(Integer, ForeignKey("contents.id", ondelete="SET NULL"), nullable=True)  # 재생성 원본
+    artifacts = Column(JSON, nullable=False, default=dict)  # 단계 이름 -> 산출물
+
+    # Relationships
+    content = relationship("Content", foreign_keys=[content_id])
+
+    def __repr__(self):
+        return f"<ContentArtifact(content_id={self.content_id}, parent={self.parent_content_id})>"
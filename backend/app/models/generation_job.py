@@ -0,0 +1,52 @@
+"""
+GenerationJob model
+비동기 콘텐츠 생성 작업과 단계별 체크포인트
+"""
+
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+import enum
+
+from app.models.base import Base, TimestampMixin
+
+
+class GenerationJobStatus(str, enum.Enum):
+    """생성 작업 상태"""
+    QUEUED = "queued"  # 대기 중
+    RUNNING = "running"  # 실행 중
+    RETRYING = "retrying"  # 실패 후 자동 재시도 대기
+    SUCCEEDED = "succeeded"  # 완료
+    FAILED = "failed"  # 실패 (POST /api/content/jobs/{id}/retry로 재개 가능)
+
+
+class GenerationJob(Base, TimestampMixin):
+    """
+    비동기 콘텐츠 생성 작업 모델
+
+    단계가 끝날 때마다 결과를 checkpoints에 저장하므로,
+    실패 후 재시도하면 마지막으로 완료된 단계 다음부터 다시 실행합니다.
+    """
+
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex (추측 불가능한 작업 ID)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="SET NULL"), nullable=True)  # 저장된 콘텐츠
+
+    status = Column(SQLEnum(GenerationJobStatus), default=GenerationJobStatus.QUEUED, nullable=False, index=True)
+    request = Column(JSON, nullable=False)  # FullContentGenerationRequest
+    checkpoints = Column(JSON, nullable=False, default=dict)  # 단계 이름 -> 결과
+    current_stage = Column(String(50))  # 마지막으로 완료된 단계
+    attempts = Column(Integer, default=0, nullable=False)  # 실행 횟수 (재개 포함)
+
+    result = Column(JSON)  # 완료 시 /generate 응답과 같은 data
+    error = Column(Text)  # 실패 시 에러 메시지
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    user = relationship("User")
+    content = relationship("Content")
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, status='{self.status}', stage='{self.current_stage}')>"
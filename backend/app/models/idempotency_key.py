@@ -0,0 +1,44 @@
+"""
+IdempotencyKey model
+Idempotency-Key 헤더로 보낸 생성 요청의 처리 상태와 응답
+"""
+
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, UniqueConstraint, Enum as SQLEnum
+import enum
+
+from app.models.base import Base, TimestampMixin
+
+
+class IdempotencyStatus(str, enum.Enum):
+    """멱등 요청 상태"""
+    IN_PROGRESS = "in_progress"  # 처리 중 (같은 키의 요청은 결과를 기다리거나 409)
+    SUCCEEDED = "succeeded"  # 완료 (같은 키의 요청은 저장된 응답을 그대로 반환)
+
+
+class IdempotencyKey(Base, TimestampMixin):
+    """
+    멱등 키 모델
+
+    같은 사용자가 같은 키로 다시 보낸 요청은 파이프라인을 다시 실행하지 않고 저장된 응답을 반환합니다.
+    실패한 요청은 행을 지우므로 같은 키로 다시 시도할 수 있습니다.
+    expires_at이 지난 행은 없는 것으로 취급하고 다음 요청 때 지웁니다.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "endpoint", "key", name="uq_idempotency_keys_user_endpoint_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    endpoint = Column(String(100), nullable=False)  # 예: content.generate
+    key = Column(String(255), nullable=False)  # 클라이언트가 보낸 Idempotency-Key
+    request_hash = Column(String(64), nullable=False)  # 요청 본문 해시 (같은 키로 다른 요청을 보내면 422)
+
+    status = Column(SQLEnum(IdempotencyStatus), default=IdempotencyStatus.IN_PROGRESS, nullable=False)
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="SET NULL"), nullable=True)
+    response = Column(JSON)  # 완료 시 {"data", "generation_time"}
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(user_id={self.user_id}, key='{self.key}', status='{self.status}')>"
@@ -0,0 +1,36 @@
+"""
+InsightSegment model
+타겟 인사이트 웨어하우스 (세그먼트별 프로필 집계)
+"""
+
+from sqlalchemy import Column, Integer, String, JSON, UniqueConstraint
+
+from app.models.base import Base, TimestampMixin
+
+
+class InsightSegment(Base, TimestampMixin):
+    """
+    세그먼트별 타겟 프로필 집계 모델
+
+    (카테고리, 연령대, 성별, 관심사) 조합마다 해당 프로필의 연령대/소득/관심사/고충/채널/라이프스타일
+    빈도를 미리 집계해 둡니다. "*"는 해당 조건 전체를 뜻합니다.
+    scripts/build_insight_warehouse.py가 targets 테이블(또는 target_profiles.json)로 오프라인 재구축하며,
+    생성 파이프라인은 요청에 맞는 세그먼트를 합산하여 LLM 인사이트 분석 호출을 대신합니다.
+    """
+
+    __tablename__ = "insight_segments"
+    __table_args__ = (
+        UniqueConstraint("category", "age_group", "gender", "interest", name="uq_insight_segments_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String(100), nullable=False)  # 화장품, 식품, 패션, 전자제품, 서비스
+    age_group = Column(String(50), nullable=False)  # 10대 ... 60대 이상, *
+    gender = Column(String(20), nullable=False)  # 남성, 여성, * (성별 세그먼트는 "무관" 프로필 포함)
+    interest = Column(String(100), nullable=False)  # 관심사 1개 또는 *
+
+    profile_count = Column(Integer, nullable=False, default=0)
+    stats = Column(JSON, nullable=False, default=dict)  # 항목 -> {값: 프로필 수}
+
+    def __repr__(self):
+        return f"<InsightSegment({self.category}/{self.age_group}/{self.gender}/{self.interest}, count={self.profile_count})>"
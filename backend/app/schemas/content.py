@@ -3,7 +3,7 @@
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 
 # === 전략 생성 ===
@@ -18,6 +18,14 @@ class StrategyRequest(BaseModel):
     target_interests: List[str] = Field(..., description="타겟 관심사 리스트")
 
 
+class StrategyPerformancePrediction(BaseModel):
+    """전략별 예상 성과"""
+    estimated_reach: int = Field(..., description="예상 도달 수 (명)")
+    estimated_engagement_rate: float = Field(..., description="예상 참여율 (%)")
+    estimated_conversions: int = Field(..., description="예상 전환 수 (명)")
+    confidence_score: float = Field(..., description="예측 신뢰도 (0-1)")
+
+
 class Strategy(BaseModel):
     """마케팅 전략"""
     id: int = Field(..., description="전략 ID")
@@ -25,6 +33,7 @@ class Strategy(BaseModel):
     core_message: str = Field(..., description="핵심 메시지")
     emotion: str = Field(..., description="감성 유형 (감성적/이성적/사회적)")
     expected_effect: str = Field(..., description="예상 효과")
+    performance_prediction: Optional[StrategyPerformancePrediction] = Field(None, description="예상 성과")
 
 
 class StrategyResponse(BaseModel):
@@ -127,6 +136,12 @@ class FullContentGenerationRequest(BaseModel):
     # 생성 옵션
     strategy_id: Optional[int] = Field(None, description="선택한 전략 ID (1-3). None이면 자동 선택")
     copy_tone: Optional[str] = Field("professional", description="카피 톤 (professional/casual/impact)")
+    fast_mode: bool = Field(False, description="인사이트/전략/카피를 Gemini 1회 호출로 생성 (fast 모드)")
+    speculative_image: bool = Field(False, description="카피 생성과 동시에 전략 기반 프롬프트로 이미지를 먼저 생성 (카피 기반 프롬프트와 비슷하면 채택)")
+
+    # 변형 모드 (A/B 테스트용, /api/content/generate에서만 지원)
+    variant_tones: Optional[List[str]] = Field(None, description="톤별 변형 생성 (예: [\"professional\", \"casual\", \"impact\"]). 인사이트/전략은 한 번만 생성")
+    images_per_variant: int = Field(1, ge=1, le=4, description="변형(톤)별 이미지 수")
 
     # 재생성 옵션 (수정 요청)
     regenerate_type: Optional[str] = Field(None, description="재생성 타입 (all/image/copy/auto). None이면 신규 생성")
@@ -171,6 +186,15 @@ class FullContentGenerationResponse(BaseModel):
         }
 
 
+# === 일괄 생성 API ===
+
+class BatchGenerationRequest(BaseModel):
+    """일괄 콘텐츠 생성 요청 (JSON)"""
+    # 항목별로 검증하므로 잘못된 항목이 있어도 나머지는 생성 (FullContentGenerationRequest 형식)
+    items: List[Dict[str, Any]] = Field(..., min_length=1, description="생성할 제품 목록")
+    concurrency: Optional[int] = Field(None, ge=1, description="동시 생성 수 (None이면 BATCH_CONCURRENCY)")
+
+
 # === 부분 재생성 API ===
 
 class RegenerateImageRequest(BaseModel):
@@ -195,3 +219,63 @@ class RegenerateCopyRequest(BaseModel):
     copy_tone: str = Field(..., description="새로운 카피 톤")
     strategy_name: Optional[str] = Field(None, description="전략명 (기존 전략 재사용)")
     core_message: Optional[str] = Field(None, description="핵심 메시지 (기존 전략 재사용)")
+
+
+# ============================================
+# LLM 구조화 출력 스키마
+# Gemini response_schema 생성과 응답 검증에 함께 사용
+# ============================================
+
+class StrategyListOutput(BaseModel):
+    """마케팅 전략 생성 출력"""
+    strategies: List[Strategy] = Field(..., description="서로 다른 마케팅 전략 3가지")
+
+
+class CopyListOutput(BaseModel):
+    """광고 카피 생성 출력"""
+    copies: List[Copy] = Field(..., description="광고 카피 리스트")
+
+
+class TargetInsightsOutput(BaseModel):
+    """타겟 고객 인사이트 분석 출력"""
+    target_ages: Optional[List[str]] = Field(None, description="타겟 연령대 (형식: '20-29')")
+    target_interests: Optional[List[str]] = Field(None, description="카테고리 관련 관심사 키워드")
+    pain_points: List[str] = Field(default_factory=list, description="주요 고민/문제점")
+    preferred_channels: List[str] = Field(default_factory=list, description="선호 미디어/SNS 채널")
+    tone_preferences: List[str] = Field(default_factory=list, description="선호 커뮤니케이션 톤")
+    message_strategies: List[str] = Field(default_factory=list, description="효과적인 메시지 전략")
+    lifestyle_traits: List[str] = Field(default_factory=list, description="라이프스타일 특징")
+    purchase_motivations: List[str] = Field(default_factory=list, description="구매 동기")
+
+
+class FusedContentOutput(BaseModel):
+    """인사이트 + 전략 + 카피 통합 생성 출력 (fast 모드)"""
+    insights: TargetInsightsOutput = Field(..., description="타겟 고객 인사이트")
+    strategies: List[Strategy] = Field(..., description="서로 다른 마케팅 전략 3가지")
+    selected_copy: Copy = Field(..., description="선택된 전략의 광고 카피")
+
+
+class ChatFormUpdates(BaseModel):
+    """챗봇 메시지에서 추출한 폼 데이터 (추출된 항목만)"""
+    product_name: Optional[str] = Field(None, description="제품명")
+    product_description: Optional[str] = Field(None, description="제품 설명")
+    category: Optional[str] = Field(None, description="beauty/food/fashion/electronics/service")
+    target_ages: Optional[List[str]] = Field(None, description="타겟 연령대 (10-19/20-29/.../60+)")
+    target_genders: Optional[List[str]] = Field(None, description="타겟 성별 (남성/여성/무관)")
+    target_interests: Optional[List[str]] = Field(None, description="타겟 관심사")
+    copy_tone: Optional[str] = Field(None, description="professional/casual/impact")
+
+
+class ChatAnalysisOutput(BaseModel):
+    """챗봇 메시지 분석 출력"""
+    form_updates: ChatFormUpdates = Field(default_factory=ChatFormUpdates, description="추출된 폼 데이터")
+    response: str = Field("정보 감사합니다!", description="사용자에게 보낼 응답 메시지")
+    confidence: float = Field(0.5, description="추출 신뢰도 (0-1)")
+    next_question: Optional[str] = Field(None, description="다음에 물어볼 질문")
+
+
+class UserIntentOutput(BaseModel):
+    """콘텐츠 수정 요청 의도 분석 출력"""
+    type: Literal["all", "image", "copy"] = Field(..., description="재생성 범위")
+    intent: str = Field(..., description="사용자 의도 1줄 요약")
+    modifications: List[str] = Field(default_factory=list, description="구체적인 수정사항")
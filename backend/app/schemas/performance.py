@@ -0,0 +1,64 @@
+"""
+성과 예측 관련 스키마
+"""
+
+from pydantic import BaseModel, Field, RootModel
+from typing import List, Optional
+
+
+# ============================================
+# LLM 구조화 출력 스키마 (페르소나 시뮬레이션)
+# ============================================
+
+class PersonaSnsUsage(BaseModel):
+    """페르소나 SNS 사용 패턴"""
+    platforms: List[str] = Field(default_factory=list, description="주로 사용하는 플랫폼")
+    daily_hours: float = Field(0, description="하루 사용 시간")
+
+
+class PersonaAdSensitivity(BaseModel):
+    """페르소나 광고 반응 성향"""
+    level: str = Field(..., description="반응 정도 (높음/보통/낮음)")
+    triggers: List[str] = Field(default_factory=list, description="반응 요인")
+
+
+class Persona(BaseModel):
+    """가상 사용자 페르소나"""
+    name: str = Field(..., description="이름 (가명)")
+    age: int = Field(..., description="나이")
+    occupation: str = Field(..., description="직업")
+    personality: str = Field(..., description="성격 특징")
+    sns_usage: PersonaSnsUsage = Field(..., description="SNS 사용 패턴")
+    purchase_behavior: str = Field(..., description="구매 성향")
+    ad_sensitivity: PersonaAdSensitivity = Field(..., description="광고 반응 성향")
+
+
+class PersonaListOutput(RootModel[List[Persona]]):
+    """페르소나 생성 출력 (JSON 배열)"""
+    pass
+
+
+class PersonaReaction(BaseModel):
+    """페르소나별 콘텐츠 반응"""
+    persona_name: str = Field(..., description="페르소나 이름")
+    will_click: bool = Field(..., description="클릭 여부")
+    engagement_action: Optional[str] = Field(None, description="참여 행동 (like/comment/share/save)")
+    will_convert: bool = Field(..., description="전환 여부")
+    brand_recall: float = Field(..., description="브랜드 기억도 (0-100)")
+    reason: str = Field(..., description="반응 이유")
+
+
+class SimulationOverallMetrics(BaseModel):
+    """시뮬레이션 전체 지표"""
+    total_impressions: int = Field(..., description="노출 수 (페르소나 수)")
+    total_clicks: int = Field(..., description="클릭한 페르소나 수")
+    ctr: float = Field(..., description="클릭률 (%)")
+    engagement_rate: float = Field(..., description="참여율 (%)")
+    conversion_rate: float = Field(..., description="전환율 (%)")
+    avg_brand_recall: float = Field(..., description="평균 브랜드 기억도")
+
+
+class SimulationOutput(BaseModel):
+    """반응 시뮬레이션 출력"""
+    reactions: List[PersonaReaction] = Field(..., description="페르소나별 반응")
+    overall_metrics: SimulationOverallMetrics = Field(..., description="전체 지표")
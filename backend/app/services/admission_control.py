@@ -0,0 +1,235 @@
+"""
+비싼 엔드포인트 입장 제어 (load shedding)
+외부 API 지연이 길어져도 생성/성과 예측 요청이 워커(DB 연결, 메모리)를 모두 차지하지 않도록
+엔드포인트 종류별로 동시 처리 수를 제한
+
+- 동시 처리 수(ADMISSION_CONCURRENCY)가 차면 대기열(ADMISSION_QUEUE_SIZE)에서 최대
+  ADMISSION_MAX_WAIT_SECONDS 동안 기다리고, 대기열이 가득 찼거나 시간 안에 들어가지 못하면
+  바로 503 + Retry-After로 거절합니다.
+- Retry-After는 최근 처리 시간(중앙값)과 대기 중인 요청 수로 추정합니다.
+- 제한 대상이 아닌 엔드포인트(콘텐츠 조회 등)는 그대로 통과하므로 과부하 중에도 빠르게 응답합니다.
+- WebSocket 생성 채널은 연결이 끝날 때까지 자리를 차지하며, 거절하면 503 + Retry-After 거절 응답을 보내고
+  (서버가 WebSocket 거절 응답 확장을 지원하지 않으면 연결을 수락한 뒤 1013(Try Again Later)으로 닫음).
+
+상태는 현재 프로세스 기준이며 /api/metrics의 admission에서 조회할 수 있습니다.
+생성 파이프라인 실행 순서(사용자/프로젝트별 공정 분배)는 입장한 요청 안에서 fair_scheduler가 정합니다.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from fastapi import WebSocket
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트 종류 (메서드, 경로 패턴) - WebSocket 연결은 메서드 WEBSOCKET
+ENDPOINT_CLASSES: Dict[str, List[Tuple[str, str]]] = {
+    "generation": [
+        ("POST", r"/api/content/generate"),
+        ("POST", r"/api/content/generate-stream"),
+        ("POST", r"/api/content/regenerate/(image|copy)"),
+        ("WEBSOCKET", r"/api/content/ws/generate")
+    ],
+    "batch": [
+        ("POST", r"/api/content/batch(/csv)?")
+    ],
+    "prediction": [
+        ("POST", r"/api/performance/predict/\d+")
+    ]
+}
+
+# 종류별 기본 동시 처리 수 / 대기열 크기 (워커당) - ADMISSION_CONCURRENCY, ADMISSION_QUEUE_SIZE로 재정의
+DEFAULT_CONCURRENCY = {
+    "generation": 16,  # SCHEDULER_GENERATION_SLOTS보다 크게 두어 공정 스케줄러가 순서를 정할 여유를 남김
+    "batch": 2,  # 요청 1건이 여러 항목을 생성하며 끝날 때까지 슬롯을 차지
+    "prediction": 4
+}
+DEFAULT_QUEUE_SIZE = {
+    "generation": 16,
+    "batch": 2,
+    "prediction": 8
+}
+
+
+class AdmissionRejectedError(Exception):
+    """대기열이 가득 찼거나 대기 시간 안에 입장하지 못함"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """엔드포인트 종류 하나의 동시 처리 수 + 제한된 대기열"""
+
+    def __init__(self, name: str, concurrency: int, queue_size: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._active = 0
+        self._waiting = 0
+
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0
+        }
+
+    def service_time(self) -> float:
+        """최근 처리 시간 중앙값 (기록이 없으면 ADMISSION_RETRY_AFTER_DEFAULT_SECONDS)"""
+        observed = metrics.percentile("admission.service_seconds", 50, endpoint_class=self.name)
+        return observed if observed is not None else settings.ADMISSION_RETRY_AFTER_DEFAULT_SECONDS
+
+    def retry_after(self) -> int:
+        """지금 대기열 뒤에 선 요청이 입장하기까지 걸릴 것으로 예상되는 시간(초)"""
+        estimate = (self._waiting + 1) * self.service_time() / self.concurrency
+        return max(1, min(math.ceil(estimate), settings.ADMISSION_RETRY_AFTER_MAX_SECONDS))
+
+    async def acquire(self):
+        """
+        입장 (자리가 없으면 대기열에서 기다림)
+
+        Raises:
+            AdmissionRejectedError: 대기열이 가득 찼거나 ADMISSION_MAX_WAIT_SECONDS 안에 입장하지 못한 경우
+        """
+        if self._semaphore.locked():
+            if self._waiting >= self.queue_size:
+                self.stats["rejected_queue_full"] += 1
+                metrics.incr("admission.requests", endpoint_class=self.name, outcome="rejected")
+                raise AdmissionRejectedError(
+                    f"요청이 많아 처리할 수 없습니다 ({self.name}: 처리 중 {self._active}, 대기 {self._waiting})",
+                    retry_after=self.retry_after()
+                )
+
+            self.stats["queued"] += 1
+            self._waiting += 1
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=settings.ADMISSION_MAX_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                self.stats["rejected_timeout"] += 1
+                metrics.incr("admission.requests", endpoint_class=self.name, outcome="rejected")
+                raise AdmissionRejectedError(
+                    f"요청이 많아 처리할 수 없습니다 ({self.name}: {settings.ADMISSION_MAX_WAIT_SECONDS}초 대기 초과)",
+                    retry_after=self.retry_after()
+                )
+            finally:
+                self._waiting -= 1
+            metrics.observe("admission.wait_seconds", time.monotonic() - start, endpoint_class=self.name)
+            metrics.incr("admission.requests", endpoint_class=self.name, outcome="queued")
+        else:
+            await self._semaphore.acquire()
+            metrics.incr("admission.requests", endpoint_class=self.name, outcome="admitted")
+
+        self._active += 1
+        self.stats["admitted"] += 1
+
+    def release(self, service_seconds: float):
+        self._active -= 1
+        self._semaphore.release()
+        metrics.observe("admission.service_seconds", service_seconds, endpoint_class=self.name)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "active": self._active,
+            "waiting": self._waiting,
+            "service_seconds_p50": round(self.service_time(), 3),
+            "retry_after": self.retry_after()
+        }
+
+
+class AdmissionControl:
+    """경로 → 엔드포인트 종류별 AdmissionController"""
+
+    def __init__(self):
+        self.controllers: Dict[str, AdmissionController] = {}
+        self._routes: List[Tuple[str, Pattern, AdmissionController]] = []
+        for name, routes in ENDPOINT_CLASSES.items():
+            controller = AdmissionController(
+                name,
+                concurrency=max(1, int(settings.ADMISSION_CONCURRENCY.get(name, DEFAULT_CONCURRENCY[name]))),
+                queue_size=max(0, int(settings.ADMISSION_QUEUE_SIZE.get(name, DEFAULT_QUEUE_SIZE[name])))
+            )
+            self.controllers[name] = controller
+            self._routes.extend((method, re.compile(pattern), controller) for method, pattern in routes)
+
+    def classify(self, method: str, path: str) -> Optional[AdmissionController]:
+        """제한 대상 엔드포인트면 해당 컨트롤러, 아니면 None"""
+        path = path.rstrip("/") or "/"
+        for route_method, pattern, controller in self._routes:
+            if method == route_method and pattern.fullmatch(path):
+                return controller
+        return None
+
+    def get_stats(self) -> Dict:
+        return {
+            "enabled": settings.ADMISSION_CONTROL_ENABLED,
+            "max_wait_seconds": settings.ADMISSION_MAX_WAIT_SECONDS,
+            "classes": {name: controller.get_stats() for name, controller in self.controllers.items()}
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    입장 제어 ASGI 미들웨어
+
+    응답 본문을 모두 보낼 때까지(스트리밍 포함) 자리를 차지하며,
+    거절한 요청은 라우터/인증을 거치지 않고 바로 503을 반환합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or not settings.ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["type"] == "http" else "WEBSOCKET"
+        controller = admission_control.classify(method, scope["path"])
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await controller.acquire()
+        except AdmissionRejectedError as e:
+            logger.warning(f"요청 거절 ({method} {scope['path']}): {str(e)}, Retry-After {e.retry_after}초")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": str(e)},
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            if scope["type"] == "websocket" and "websocket.http.response" not in scope.get("extensions", {}):
+                # 수락 전에 닫으면 서버가 403으로 바꾸므로, 거절 응답(503)을 보낼 수 없는 서버에서는
+                # 연결을 수락한 뒤 1013(Try Again Later)으로 닫음
+                websocket = WebSocket(scope, receive, send)
+                await websocket.accept()
+                await websocket.close(code=1013, reason=f"Retry-After {e.retry_after}")
+                return
+            # WebSocket도 거절 응답 확장을 지원하면 HTTP 503 + Retry-After로 응답
+            await response(scope, receive, send)
+            return
+
+        start = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.monotonic() - start)
+
+
+# 싱글톤 인스턴스
+admission_control = AdmissionControl()
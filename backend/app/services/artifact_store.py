@@ -0,0 +1,113 @@
+"""
+콘텐츠 단계 산출물 저장소
+생성 파이프라인의 중간 결과(인사이트, RAG 참고 자료, 전략, 이미지 프롬프트, 페르소나 등)를 콘텐츠별로 저장
+
+이미지/카피 재생성은 원본 콘텐츠의 산출물을 불러와 무효화된 단계만 다시 실행합니다.
+- 이미지 재생성 (커스텀 요청 없음): 이미지 프롬프트 재사용 → 이미지만 생성, 성과 예측은 원본 복사
+- 이미지 재생성 (커스텀 요청): 기존 프롬프트를 기준으로 수정
+- 카피 재생성: 저장된 선택 전략으로 카피만 생성, 성과 예측은 저장된 페르소나로 반응 시뮬레이션만 실행
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.content import Content
+from app.models.content_artifact import ContentArtifact
+
+logger = logging.getLogger(__name__)
+
+
+class StageArtifactStore:
+    """콘텐츠별 단계 산출물 저장/조회"""
+
+    def load(self, db: Session, content_id: Optional[int]) -> Dict[str, Any]:
+        """콘텐츠의 산출물 조회 (없거나 재사용이 꺼져 있으면 빈 dict)"""
+        if not content_id or not settings.REGENERATE_REUSE_ARTIFACTS:
+            return {}
+        row = db.query(ContentArtifact).filter(ContentArtifact.content_id == content_id).first()
+        return dict(row.artifacts or {}) if row else {}
+
+    def load_for_user(self, db: Session, content_id: Any, user_id: int) -> Dict[str, Any]:
+        """
+        재생성 요청의 원본 콘텐츠 산출물 조회
+
+        다른 사용자의 콘텐츠이거나 content_id가 올바르지 않으면 빈 dict를 반환합니다.
+        (재생성은 요청 본문만으로도 동작하므로 산출물이 없으면 기존 방식으로 처리)
+        """
+        try:
+            content_id = int(content_id)
+        except (TypeError, ValueError):
+            return {}
+        owner_id = db.query(Content.user_id).filter(Content.id == content_id).scalar()
+        if owner_id != user_id:
+            return {}
+        return self.load(db, content_id)
+
+    def save(
+        self,
+        db: Session,
+        content_id: int,
+        artifacts: Dict[str, Any],
+        parent_content_id: Optional[int] = None
+    ) -> bool:
+        """
+        산출물 저장 (기존 산출물에 병합, None 값은 건너뜀)
+
+        산출물 저장은 최적화 용도이므로 실패해도 예외를 발생시키지 않습니다.
+        """
+        updates = {name: value for name, value in artifacts.items() if value is not None}
+        try:
+            # JSON 컬럼에 저장 가능한 값으로 변환 (튜플 → 리스트 등)
+            updates = json.loads(json.dumps(updates, ensure_ascii=False, default=str))
+            row = db.query(ContentArtifact).filter(ContentArtifact.content_id == content_id).first()
+            if row is None:
+                row = ContentArtifact(content_id=content_id, parent_content_id=parent_content_id, artifacts={})
+                db.add(row)
+            elif parent_content_id is not None:
+                row.parent_content_id = parent_content_id
+            # JSON 컬럼 변경 감지를 위해 새 dict 할당
+            row.artifacts = {**(row.artifacts or {}), **updates}
+            db.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"단계 산출물 저장 실패 (content_id: {content_id}): {str(e)}")
+            db.rollback()
+            return False
+
+    def inherit(
+        self,
+        db: Session,
+        parent_content_id: Optional[int],
+        content_id: int,
+        parent_artifacts: Dict[str, Any],
+        updates: Dict[str, Any],
+        invalidate: Iterable[str] = ()
+    ) -> bool:
+        """
+        재생성 콘텐츠에 원본 산출물 상속
+
+        Args:
+            parent_content_id: 원본 콘텐츠 ID (산출물이 없는 원본이면 None)
+            content_id: 재생성으로 저장된 콘텐츠 ID
+            parent_artifacts: 원본 산출물 (load_for_user 결과, 없으면 빈 dict)
+            updates: 재생성에서 새로 만든 산출물
+            invalidate: 재생성으로 더 이상 유효하지 않은 산출물 이름
+        """
+        artifacts = {name: value for name, value in parent_artifacts.items() if name not in invalidate}
+        artifacts.update(updates)
+        return self.save(db, content_id, artifacts, parent_content_id=parent_content_id)
+
+    @staticmethod
+    def persona_key(target_age_group: str, target_gender: str, target_interests: List[str]) -> str:
+        """페르소나 재사용 키 (페르소나는 타겟 조건에만 의존)"""
+        raw = json.dumps([target_age_group, target_gender, list(target_interests or [])], ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+# 싱글톤 인스턴스
+artifact_store = StageArtifactStore()
@@ -0,0 +1,226 @@
+"""
+외부 API 서킷 브레이커 모듈
+프로바이더(gemini, nanobanana, replicate)별로 장애를 감지하여, 장애 중에는 재시도와 대기 없이 바로 실패합니다.
+
+상태:
+- closed: 정상. 재시도 대상 오류(429/5xx/타임아웃/연결 오류)가 연속 failure_threshold번 발생하면 open
+- open: 호출하지 않고 CircuitOpenError 발생. recovery_seconds가 지나면 half_open
+- half_open: half_open_max_calls개의 시험 호출만 허용. 성공하면 closed, 실패하면 다시 open
+  시험 호출이 결과 없이 끝나면(쿼터 대기 초과, 취소 등) release()로 자리를 반납하고,
+  half_open_timeout 안에 결과가 오지 않으면 다시 open (자리가 영구히 묶이지 않도록)
+
+재시도하지 않는 오류(안전 필터 차단, 잘못된 요청 등)는 프로바이더가 응답한 것이므로 성공으로 봅니다.
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.retry import is_retryable
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않고 바로 실패"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} 서비스 장애로 일시적으로 요청을 차단합니다 ({retry_after:.0f}초 후 재시도)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """프로바이더 1개의 서킷 브레이커"""
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        half_open_timeout: float = 300.0
+    ):
+        """
+        Args:
+            name: 프로바이더 이름
+            enabled: 사용 여부 (False면 항상 closed)
+            failure_threshold: open으로 바뀌는 연속 실패 수
+            recovery_seconds: open 유지 시간 (이후 half_open)
+            half_open_max_calls: half_open에서 허용할 동시 시험 호출 수
+            half_open_timeout: 시험 호출 결과를 기다리는 최대 시간 (넘으면 다시 open)
+        """
+        self.name = name
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_timeout = half_open_timeout
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        # 상태가 바뀔 때마다 증가 (이전 half_open의 시험 호출이 반납되지 않도록 구분)
+        self._epoch = 0
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (open 유지 시간이 지나면 half_open)"""
+        now = time.monotonic()
+        if self._state == OPEN and now - self._opened_at >= self.recovery_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._epoch += 1
+            logger.info(f"서킷 브레이커 half_open ({self.name}): 시험 호출 허용")
+        elif self._state == HALF_OPEN and self._probes > 0 and now - self._probe_started >= self.half_open_timeout:
+            logger.warning(f"서킷 브레이커 ({self.name}): 시험 호출 결과가 {self.half_open_timeout:.0f}초간 없어 다시 open")
+            self._open(TimeoutError("half_open 시험 호출 결과 없음"))
+        return self._state
+
+    def retry_after(self) -> float:
+        """다시 호출할 수 있을 때까지 남은 시간(초)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """호출 가능 여부 (상태만 확인, 시험 호출 자리를 차지하지 않음)"""
+        if not self.enabled:
+            return True
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and self._probes < self.half_open_max_calls)
+
+    def check(self) -> Optional[int]:
+        """
+        호출 전 확인 (시도마다 호출)
+
+        Returns:
+            half_open 시험 호출 자리를 차지했으면 그 표식 (시도가 끝나면 release()에 전달), 아니면 None
+
+        Raises:
+            CircuitOpenError: open 상태이거나 half_open 시험 호출 자리가 없음
+        """
+        if not self.enabled:
+            return None
+        state = self.state
+        if state == CLOSED:
+            return None
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            if self._probes == 0:
+                self._probe_started = time.monotonic()
+            self._probes += 1
+            return self._epoch
+
+        metrics.incr("circuit.rejected", provider=self.name)
+        raise CircuitOpenError(self.name, self.retry_after() or self.recovery_seconds)
+
+    def release(self, probe: Optional[int]):
+        """
+        시도 종료 (finally에서 호출)
+
+        성공/실패를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등)의 자리를 반납합니다.
+        이미 결과를 기록했으면(상태가 바뀌었으면) 아무것도 하지 않습니다.
+        """
+        if probe is None or probe != self._epoch or self._state != HALF_OPEN:
+            return
+        self._probes = max(0, self._probes - 1)
+
+    def record_success(self):
+        """호출 성공 (half_open이면 closed로 복구)"""
+        if self._state == HALF_OPEN:
+            logger.info(f"서킷 브레이커 closed ({self.name}): 시험 호출 성공")
+        self._state = CLOSED
+        self._failures = 0
+        self._probes = 0
+        self._epoch += 1
+
+    def record_failure(self, error: BaseException):
+        """호출 실패 (재시도 대상 오류만 장애로 집계)"""
+        if not is_retryable(error):
+            self.record_success()
+            return
+
+        metrics.incr("circuit.failures", provider=self.name)
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open(error)
+
+    def _open(self, error: BaseException):
+        if self._state != OPEN:
+            metrics.incr("circuit.opened", provider=self.name)
+            logger.warning(
+                f"서킷 브레이커 open ({self.name}): 연속 실패 {self._failures}회, "
+                f"{self.recovery_seconds:.0f}초간 요청 차단 ({type(error).__name__}: {str(error)[:100]})"
+            )
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self._epoch += 1
+
+    def get_stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_after": round(self.retry_after(), 1),
+            "failures": int(metrics.count("circuit.failures", provider=self.name)),
+            "opened": int(metrics.count("circuit.opened", provider=self.name)),
+            "rejected": int(metrics.count("circuit.rejected", provider=self.name))
+        }
+
+
+class CircuitBreakerRegistry:
+    """프로바이더별 서킷 브레이커 (같은 설정 공유)"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        half_open_timeout: float = 300.0
+    ):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_timeout = half_open_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        """프로바이더 서킷 브레이커 (처음 요청 시 생성)"""
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(
+                name,
+                enabled=self.enabled,
+                failure_threshold=self.failure_threshold,
+                recovery_seconds=self.recovery_seconds,
+                half_open_max_calls=self.half_open_max_calls,
+                half_open_timeout=self.half_open_timeout
+            )
+        return self._breakers[name]
+
+    def get_stats(self) -> Dict:
+        """프로바이더별 상태, 연속 실패 수, open 횟수, 차단한 요청 수"""
+        return {
+            "enabled": self.enabled,
+            "providers": {name: breaker.get_stats() for name, breaker in self._breakers.items()}
+        }
+
+
+# 싱글톤 인스턴스
+circuit_breakers = CircuitBreakerRegistry(
+    enabled=settings.CIRCUIT_BREAKER_ENABLED,
+    failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    recovery_seconds=settings.CIRCUIT_BREAKER_RECOVERY_SECONDS,
+    half_open_max_calls=settings.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS,
+    half_open_timeout=settings.CIRCUIT_BREAKER_HALF_OPEN_TIMEOUT_SECONDS
+)
@@ -0,0 +1,324 @@
+"""
+외부 API 클라이언트 관리 모듈
+Gemini, Replicate, Ideogram, Voyage AI, 이미지 다운로드용 클라이언트를 프로세스당 하나씩 만들어 재사용합니다.
+
+- HTTP 클라이언트는 커넥션 풀 + keep-alive + HTTP/2(h2 설치 시)로 TLS 핸드셰이크를 요청마다 반복하지 않습니다.
+- genai.configure와 GenerativeModel 생성도 이곳에서 한 번만 수행합니다.
+- 서버 시작 시 warmup()으로 미리 연결을 열어 첫 요청의 지연을 줄입니다.
+- 호출별 지연 시간, 상태, 송수신 바이트를 client.* 지표로 기록합니다.
+  (HTTP 클라이언트의 지연 시간은 응답 헤더 수신까지, 바이트는 Content-Length 기준)
+- PROVIDER_SIM_MODE가 설정되면 HTTP transport를 provider_sim의 기록/재생 transport로 감쌉니다.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+import google.generativeai as genai
+import httpx
+import replicate
+
+from app.config import settings
+from app.services.provider_sim import provider_sim
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트별 설정 (base_url이 있으면 warmup 대상)
+HTTP_CLIENTS: Dict[str, Dict[str, Any]] = {
+    "ideogram": {"base_url": "https://api.ideogram.ai/v1", "timeout": 120.0},
+    "gemini_rest": {"base_url": None, "timeout": 120.0},
+    "downloads": {"base_url": None, "timeout": 60.0}
+}
+
+# count_calls()로 시작한 요청(태스크) 단위 클라이언트별 호출 수
+_call_counts: ContextVar[Optional[Dict[str, int]]] = ContextVar("client_call_counts", default=None)
+
+VOYAGE_BASE_URL = "https://api.voyageai.com/v1"
+GEMINI_WARMUP_URL = "https://generativelanguage.googleapis.com"
+
+
+class ClientPool:
+    """프로세스 단위 외부 API 클라이언트 관리"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        http2: bool = True
+    ):
+        """
+        Args:
+            max_connections: 클라이언트별 최대 동시 연결 수
+            max_keepalive_connections: 유지할 유휴 연결 수
+            keepalive_expiry: 유휴 연결 유지 시간(초)
+            http2: HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.warning("h2 패키지가 없어 HTTP/1.1로 연결합니다 (pip install 'httpx[http2]')")
+
+        self._http: Dict[str, httpx.AsyncClient] = {}
+        self._voyage: Optional[httpx.Client] = None
+        self._replicate: Optional[replicate.Client] = None
+        self._gemini_models: Dict[str, genai.GenerativeModel] = {}
+
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.warmup_results: Dict[str, Any] = {}
+
+        # Gemini API 설정 (프로세스당 한 번)
+        if settings.GEMINI_API_KEY:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+
+    def record_call(
+        self,
+        client: str,
+        latency: float,
+        status: Any,
+        bytes_in: int = 0,
+        bytes_out: int = 0
+    ):
+        """외부 호출 1회 기록"""
+        if client not in self.stats:
+            self.stats[client] = {"calls": 0, "status": {}, "bytes_in": 0, "bytes_out": 0}
+        stats = self.stats[client]
+        stats["calls"] += 1
+        stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+        stats["bytes_in"] += bytes_in
+        stats["bytes_out"] += bytes_out
+
+        counts = _call_counts.get()
+        if counts is not None:
+            counts[client] = counts.get(client, 0) + 1
+
+        metrics.observe("client.latency", latency, client=client)
+
+    def count_calls(self) -> Dict[str, int]:
+        """
+        현재 요청(태스크)과 그 하위 태스크의 클라이언트별 호출 수 집계 시작
+
+        Returns:
+            이후 호출이 누적되는 dict (예: {"gemini": 2, "gemini_rest": 1})
+        """
+        counts: Dict[str, int] = {}
+        _call_counts.set(counts)
+        return counts
+
+    @asynccontextmanager
+    async def track(self, client: str, bytes_out: int = 0):
+        """
+        HTTP 클라이언트를 거치지 않는 호출(gRPC 등) 기록
+
+        사용 예:
+            async with client_pool.track("gemini", len(prompt)) as call:
+                response = await model.generate_content_async(prompt)
+                call["bytes_in"] = len(response.text)
+        """
+        call = {"bytes_in": 0, "status": "ok"}
+        start = time.monotonic()
+        try:
+            yield call
+        except Exception as e:
+            call["status"] = type(e).__name__
+            raise
+        finally:
+            self.record_call(client, time.monotonic() - start, call["status"], call["bytes_in"], bytes_out)
+
+    def _event_hooks(self, client: str) -> Dict[str, list]:
+        """httpx.AsyncClient 요청/응답 기록 훅"""
+        async def on_request(request: httpx.Request):
+            request.extensions["client_pool_start"] = time.monotonic()
+
+        async def on_response(response: httpx.Response):
+            self._record_response(client, response)
+
+        return {"request": [on_request], "response": [on_response]}
+
+    def _sync_event_hooks(self, client: str) -> Dict[str, list]:
+        """httpx.Client 요청/응답 기록 훅"""
+        def on_request(request: httpx.Request):
+            request.extensions["client_pool_start"] = time.monotonic()
+
+        def on_response(response: httpx.Response):
+            self._record_response(client, response)
+
+        return {"request": [on_request], "response": [on_response]}
+
+    def _record_response(self, client: str, response: httpx.Response):
+        request = response.request
+        start = request.extensions.get("client_pool_start", time.monotonic())
+        self.record_call(
+            client,
+            time.monotonic() - start,
+            response.status_code,
+            bytes_in=int(response.headers.get("content-length", 0) or 0),
+            bytes_out=int(request.headers.get("content-length", 0) or 0)
+        )
+
+    # ------------------------------------------------------------------
+    # 클라이언트
+    # ------------------------------------------------------------------
+
+    def _async_transport(self, name: str) -> httpx.AsyncBaseTransport:
+        transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits)
+        return provider_sim.wrap_async_transport(name, transport)
+
+    def http(self, name: str) -> httpx.AsyncClient:
+        """
+        이름별 공유 httpx.AsyncClient (HTTP_CLIENTS 참고)
+
+        요청마다 `async with httpx.AsyncClient()`로 새로 만들지 말고 이 클라이언트를 사용하세요.
+        """
+        client = self._http.get(name)
+        if client is None or client.is_closed:
+            config = HTTP_CLIENTS.get(name, {})
+            kwargs = {"base_url": config["base_url"]} if config.get("base_url") else {}
+            client = httpx.AsyncClient(
+                transport=self._async_transport(name),
+                timeout=config.get("timeout", 60.0),
+                event_hooks=self._event_hooks(name),
+                **kwargs
+            )
+            self._http[name] = client
+        return client
+
+    def voyage(self) -> httpx.Client:
+        """Voyage AI REST API용 공유 클라이언트 (동기, 스레드 안전)"""
+        if self._voyage is None or self._voyage.is_closed:
+            self._voyage = httpx.Client(
+                base_url=VOYAGE_BASE_URL,
+                headers={"Authorization": f"Bearer {settings.VOYAGE_AI_API_KEY}"},
+                transport=provider_sim.wrap_sync_transport(
+                    "voyage", httpx.HTTPTransport(http2=self.http2, limits=self.limits)
+                ),
+                timeout=30.0,
+                event_hooks=self._sync_event_hooks("voyage")
+            )
+        return self._voyage
+
+    def replicate_client(self) -> Optional[replicate.Client]:
+        """Replicate 공유 클라이언트 (예측 생성/대기/취소용, 토큰이 없으면 None)"""
+        if not settings.REPLICATE_API_TOKEN:
+            return None
+        if self._replicate is None:
+            # replicate.Client는 전달받은 transport를 재시도 transport로 감싸서 사용
+            self._replicate = replicate.Client(
+                api_token=settings.REPLICATE_API_TOKEN,
+                transport=self._async_transport("replicate"),
+                event_hooks=self._event_hooks("replicate")
+            )
+        return self._replicate
+
+    def gemini_model(self, model_name: str) -> genai.GenerativeModel:
+        """모델명별 공유 GenerativeModel"""
+        if model_name not in self._gemini_models:
+            self._gemini_models[model_name] = genai.GenerativeModel(model_name)
+        return self._gemini_models[model_name]
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+
+    async def _warm(self, name: str, call) -> None:
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(call(), timeout=10)
+            self.warmup_results[name] = {"ok": True, "seconds": round(time.monotonic() - start, 3)}
+        except Exception as e:
+            self.warmup_results[name] = {"ok": False, "error": str(e)[:200]}
+
+    async def warmup(self):
+        """
+        설정된 API의 연결을 미리 열어 둠 (서버 시작 시 백그라운드 실행)
+
+        응답 상태와 관계없이 TCP/TLS 연결이 풀에 남으면 성공으로 봅니다.
+        """
+        if provider_sim.enabled:
+            # 기록 중 워밍업 요청이 카세트에 섞이지 않도록, 재생 중에는 외부 연결이 없으므로 생략
+            return
+
+        tasks = []
+
+        if settings.IDEOGRAM_API_KEY:
+            tasks.append(self._warm("ideogram", lambda: self.http("ideogram").head("/")))
+
+        if settings.GEMINI_API_KEY:
+            tasks.append(self._warm(
+                "gemini_rest", lambda: self.http("gemini_rest").head(GEMINI_WARMUP_URL)
+            ))
+            # gRPC 채널 (토큰 수 계산은 과금되지 않음)
+            tasks.append(self._warm(
+                "gemini",
+                lambda: self.gemini_model(settings.GEMINI_MODEL).count_tokens_async("ping")
+            ))
+
+        client = self.replicate_client()
+        if client is not None:
+            tasks.append(self._warm("replicate", lambda: client._async_client.head("/")))
+
+        if settings.VOYAGE_AI_API_KEY:
+            tasks.append(self._warm("voyage", lambda: asyncio.to_thread(self.voyage().head, "/")))
+
+        if tasks:
+            await asyncio.gather(*tasks)
+            logger.info(f"외부 API 연결 워밍업 완료: {self.warmup_results}")
+
+    async def aclose(self):
+        """모든 HTTP 클라이언트 종료 (서버 종료 시)"""
+        for client in self._http.values():
+            await client.aclose()
+        self._http.clear()
+
+        if self._replicate is not None:
+            await self._replicate._async_client.aclose()
+            self._replicate = None
+
+        if self._voyage is not None:
+            self._voyage.close()
+            self._voyage = None
+
+    def get_stats(self) -> Dict:
+        """
+        클라이언트별 통계
+
+        - calls/status: 호출 수와 상태 코드(또는 예외 이름)별 분포
+        - latency p50/p95, 송수신 바이트
+        - warmup: 시작 시 연결 워밍업 결과
+        """
+        clients = {
+            client: {
+                **stats,
+                "latency_p50": metrics.percentile("client.latency", 50, client=client),
+                "latency_p95": metrics.percentile("client.latency", 95, client=client)
+            }
+            for client, stats in self.stats.items()
+        }
+
+        return {
+            "http2": self.http2,
+            "clients": clients,
+            "warmup": self.warmup_results
+        }
+
+
+# 싱글톤 인스턴스
+client_pool = ClientPool(
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    http2=settings.HTTP2_ENABLED
+)
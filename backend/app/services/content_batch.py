@@ -0,0 +1,209 @@
+"""
+일괄 콘텐츠 생성 서비스
+여러 제품(CSV/JSON)을 제한된 동시성으로 생성하고 항목별 결과를 완료 순서대로 전달
+
+- 카테고리와 타겟(연령대/성별/관심사)이 같은 항목은 타겟 인사이트와 RAG 검색 결과를 공유합니다.
+  그룹의 첫 항목이 계산한 결과를 나머지 항목은 체크포인트로 받아 해당 단계를 건너뜁니다.
+- 동시 생성 수는 BATCH_MAX_CONCURRENCY로 제한되고, Gemini 호출은 쿼터(gemini_quota)를 따릅니다.
+- 항목 하나가 실패해도 나머지 항목은 계속 생성합니다.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.models.base import SessionLocal
+from app.schemas.content import FullContentGenerationRequest
+from app.services.content_pipeline import content_pipeline, SharedStages, shared_checkpoints
+from app.utils.metrics import metrics
+from app.utils.tenant import BATCH, tenant_scope
+
+logger = logging.getLogger(__name__)
+
+# 같은 그룹(카테고리 + 타겟) 항목끼리 공유하는 단계
+SHARED_STAGES = ("insights", "rag")
+
+# CSV에서 리스트로 읽는 열 (값 구분자: ; 또는 |)
+CSV_LIST_COLUMNS = ("target_ages", "target_genders", "target_interests")
+CSV_REQUIRED_COLUMNS = ("product_name", "product_description", "category")
+
+# (검증된 요청, 검증 실패 메시지) - 둘 중 하나만 값이 있음
+BatchItem = Tuple[Optional[FullContentGenerationRequest], Optional[str]]
+
+
+class BatchGenerationService:
+    """일괄 생성 (항목 검증 → 그룹별 공유 단계 → 제한된 동시 생성)"""
+
+    def parse_items(self, raw_items: List[Dict[str, Any]]) -> List[BatchItem]:
+        """JSON 항목 검증 (잘못된 항목은 실패 메시지로 남기고 나머지는 생성)"""
+        return [self._validate(raw) for raw in raw_items]
+
+    def parse_csv(self, text: str) -> List[BatchItem]:
+        """
+        CSV 항목 검증
+
+        첫 줄은 열 이름(FullContentGenerationRequest 필드)이며 product_name, product_description,
+        category는 필수입니다. 타겟 열은 ; 또는 |로 여러 값을 구분합니다 (예: 20대;30대).
+
+        Raises:
+            ValueError: 필수 열이 없을 때
+        """
+        reader = csv.DictReader(io.StringIO(text))
+        missing = [column for column in CSV_REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV에 필수 열이 없습니다: {', '.join(missing)}")
+
+        items = []
+        for row in reader:
+            raw = {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value is not None and value.strip()
+            }
+            for column in CSV_LIST_COLUMNS:
+                raw[column] = [v.strip() for v in re.split(r"[;|]", raw.get(column, "")) if v.strip()]
+            items.append(self._validate(raw))
+        return items
+
+    @staticmethod
+    def _validate(raw: Any) -> BatchItem:
+        if not isinstance(raw, dict):
+            return None, "요청 형식 오류: 항목은 JSON 객체여야 합니다"
+        try:
+            request = FullContentGenerationRequest(**raw)
+        except ValidationError as e:
+            fields = "; ".join(f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors())
+            return None, f"요청 형식 오류: {fields}"
+        if request.regenerate_type:
+            return None, "일괄 생성은 신규 생성만 지원합니다 (regenerate_type 사용 불가)"
+        if request.variant_tones or request.images_per_variant > 1:
+            return None, "일괄 생성은 변형 모드를 지원하지 않습니다 (variant_tones/images_per_variant 사용 불가)"
+        return request, None
+
+    @staticmethod
+    def group_key(request: FullContentGenerationRequest) -> str:
+        """인사이트/RAG 공유 그룹 (fast 모드는 인사이트 단계가 없으므로 따로 묶음)"""
+        return json.dumps([
+            request.category,
+            sorted(request.target_ages),
+            sorted(request.target_genders),
+            sorted(request.target_interests),
+            request.fast_mode
+        ], ensure_ascii=False)
+
+    def resolve_concurrency(self, concurrency: Optional[int]) -> int:
+        return max(1, min(concurrency or settings.BATCH_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY))
+
+    async def stream(
+        self,
+        items: List[BatchItem],
+        user_id: int,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        일괄 생성 실행
+
+        Yields:
+            항목이 끝날 때마다 {"type": "item", "index", "status", ...},
+            마지막에 {"type": "summary", "total", "succeeded", "failed", ...}
+        """
+        start = time.time()
+        concurrency = self.resolve_concurrency(concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        shared: Dict[str, SharedStages] = {}
+        events: asyncio.Queue = asyncio.Queue()
+        counts = {"succeeded": 0, "failed": 0}
+        logger.info(f"일괄 생성 시작 ({len(items)}개, 동시 {concurrency})")
+
+        async def run_item(index: int, request: FullContentGenerationRequest):
+            item_start = time.time()
+            key = self.group_key(request)
+            if key not in shared:
+                # fast 모드는 인사이트가 통합 호출에 포함되므로 RAG만 공유
+                shared[key] = (
+                    SharedStages(("rag",), done_after="fused") if request.fast_mode
+                    else SharedStages(SHARED_STAGES, done_after="strategies")
+                )
+
+            try:
+                # 나머지 항목은 공유 단계 결과를 기다린 뒤 시작 (기다리는 동안 동시 생성 슬롯을 차지하지 않음)
+                # 일괄 생성은 batch 우선순위 (다른 사용자의 대화형 요청이 먼저 실행)
+                with tenant_scope(user_id, request.project_id, BATCH):
+                    async with shared_checkpoints(shared[key]) as (checkpoints, on_checkpoint):
+                        async with semaphore:
+                            db = SessionLocal()
+                            try:
+                                data, generation_time = await content_pipeline.run(
+                                    request,
+                                    user_id=user_id,
+                                    db=db,
+                                    start_time=time.time(),
+                                    checkpoints=checkpoints,
+                                    on_checkpoint=on_checkpoint
+                                )
+                            finally:
+                                db.close()
+                event = {
+                    "type": "item",
+                    "index": index,
+                    "status": "succeeded",
+                    "product_name": request.product_name,
+                    "content_id": data["content_id"],
+                    "generation_time": generation_time,
+                    "shared_stages": list(checkpoints),
+                    "data": data
+                }
+            except Exception as e:
+                logger.error(f"일괄 생성 항목 실패 (index: {index}, {request.product_name}): {str(e)}")
+                event = self._failed(index, f"{type(e).__name__}: {str(e)}", request.product_name)
+
+            metrics.observe("batch.item_latency", time.time() - item_start, status=event["status"])
+            await events.put(event)
+
+        tasks = []
+        try:
+            for index, (request, error) in enumerate(items):
+                if request is None:
+                    counts["failed"] += 1
+                    metrics.incr("batch.items", status="failed")
+                    yield self._failed(index, error)
+                    continue
+                tasks.append(asyncio.create_task(run_item(index, request)))
+
+            for _ in range(len(tasks)):
+                event = await events.get()
+                counts[event["status"]] += 1
+                metrics.incr("batch.items", status=event["status"])
+                yield event
+        finally:
+            # 클라이언트 연결이 끊기면 남은 항목 취소
+            for task in tasks:
+                task.cancel()
+
+        elapsed = round(time.time() - start, 2)
+        logger.info(f"✅ 일괄 생성 완료 (성공 {counts['succeeded']}, 실패 {counts['failed']}, {elapsed}초)")
+        yield {
+            "type": "summary",
+            "total": len(items),
+            "succeeded": counts["succeeded"],
+            "failed": counts["failed"],
+            "shared_groups": len(shared),
+            "concurrency": concurrency,
+            "elapsed_seconds": elapsed
+        }
+
+    @staticmethod
+    def _failed(index: int, error: str, product_name: Optional[str] = None) -> Dict[str, Any]:
+        return {"type": "item", "index": index, "status": "failed", "product_name": product_name, "error": error}
+
+
+# 싱글톤 인스턴스
+batch_generation_service = BatchGenerationService()
@@ -0,0 +1,119 @@
+"""
+콘텐츠 생성 후처리 작업
+콘텐츠 저장 후 응답과 무관한 작업(임베딩 저장, 성과 예측)을 백그라운드 작업 큐에서 실행
+
+API 서버와 워커(python -m app.worker) 모두 이 모듈을 import해야 핸들러가 등록됩니다.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from app.models.base import SessionLocal
+from app.models.content import Content
+from app.services.job_queue import job_queue
+from app.services.vector_service import vector_service
+from app.utils.tenant import tenant_scope
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_JOB = "content.embedding"
+PERFORMANCE_JOB = "content.performance"
+
+
+@job_queue.register(EMBEDDING_JOB)
+async def save_content_embedding(payload: Dict) -> Dict:
+    """
+    Vector DB 저장 (임베딩 생성 및 저장)
+
+    payload: content_id, copy_text, image_prompt, metadata
+    """
+    content_id = payload["content_id"]
+    if vector_service.qdrant_client is None or vector_service.voyage_client is None:
+        # Vector DB 미설정 환경에서는 재시도해도 실패하므로 건너뜀
+        logger.warning(f"Vector DB 미설정, 임베딩 저장 건너뜀 (content_id: {content_id})")
+        return {"content_id": content_id, "skipped": True}
+
+    vector_success = await asyncio.to_thread(
+        vector_service.save_content_embedding,
+        content_id=content_id,
+        copy_text=payload["copy_text"],
+        image_prompt=payload.get("image_prompt"),
+        metadata=payload.get("metadata", {})
+    )
+    if not vector_success:
+        raise RuntimeError(f"Vector DB 저장 실패 (content_id: {content_id})")
+
+    logger.info(f"✓ Vector DB 저장 완료 (content_id: {content_id})")
+    return {"content_id": content_id}
+
+
+@job_queue.register(PERFORMANCE_JOB)
+async def predict_content_performance(payload: Dict) -> Optional[Dict]:
+    """
+    성과 예측 (30개 페르소나 시뮬레이션)
+
+    payload: content_id
+    이미 예측 결과가 있으면(재시도 전에 저장된 경우 등) 다시 예측하지 않습니다.
+    """
+    from app.services.performance_service import PerformanceService
+
+    content_id = payload["content_id"]
+    db = SessionLocal()
+    try:
+        owner = db.query(Content.user_id, Content.project_id).filter(Content.id == content_id).first()
+        if owner is None:
+            # 콘텐츠가 삭제되었으면 재시도하지 않음
+            logger.warning(f"성과 예측 대상 콘텐츠 없음 (content_id: {content_id})")
+            return None
+
+        performance_service = PerformanceService(db)
+        performance = performance_service.get_performance(content_id)
+        if performance is None:
+            logger.info(f"성과 예측 시작... (content_id: {content_id})")
+            # 콘텐츠 소유자의 몫으로 쿼터 대기 (predict_performance가 background 우선순위로 낮춤)
+            with tenant_scope(owner.user_id, owner.project_id):
+                performance = await performance_service.predict_performance(content_id)
+        if not performance:
+            raise RuntimeError(f"성과 예측 실패 (content_id: {content_id})")
+
+        logger.info(f"✓ 성과 예측 완료 (content_id: {content_id})")
+        return {
+            "impressions": performance.impressions,
+            "clicks": performance.clicks,
+            "ctr": performance.ctr,
+            "engagement_rate": performance.engagement_rate,
+            "conversion_rate": performance.conversion_rate,
+            "brand_recall_score": performance.brand_recall_score,
+            "confidence_score": performance.confidence_score
+        }
+    finally:
+        db.close()
+
+
+async def enqueue_post_generation(
+    content_id: int,
+    user_id: Optional[int],
+    copy_text: str,
+    image_prompt: Optional[str],
+    metadata: Dict
+) -> Dict[str, str]:
+    """
+    콘텐츠 저장 후 임베딩 저장과 성과 예측 작업 추가
+
+    Returns:
+        {"embedding": 작업 ID, "performance": 작업 ID}
+    """
+    embedding_job = await job_queue.enqueue(
+        EMBEDDING_JOB,
+        {
+            "content_id": content_id,
+            "copy_text": copy_text,
+            "image_prompt": image_prompt,
+            "metadata": metadata
+        },
+        user_id=user_id
+    )
+    performance_job = await job_queue.enqueue(PERFORMANCE_JOB, {"content_id": content_id}, user_id=user_id)
+    logger.info(f"후처리 작업 추가 (content_id: {content_id}, embedding: {embedding_job}, performance: {performance_job})")
+    return {"embedding": embedding_job, "performance": performance_job}
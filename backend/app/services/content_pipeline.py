@@ -0,0 +1,1061 @@
+"""
+콘텐츠 생성 파이프라인 서비스
+인사이트 → (RAG) → 전략 → 카피 → 이미지 프롬프트 → 이미지 → 저장 단계를 의존 관계 그래프로 실행
+
+동기 API(/api/content/generate)와 비동기 생성 작업(/api/content/jobs)이 같은 파이프라인을 사용합니다.
+비동기 작업은 단계 결과를 체크포인트로 저장하고, 재시도 시 완료된 단계를 건너뜁니다.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.base import SessionLocal
+from app.models.content import Content, ContentStatus
+from app.schemas.content import FullContentGenerationRequest
+from app.services.artifact_store import artifact_store
+from app.services.content_jobs import enqueue_post_generation
+from app.services.fair_scheduler import Ticket, generation_scheduler
+from app.services.gemini_service import gemini_service
+from app.services.insight_warehouse import insight_warehouse
+from app.services.nanobanana_service import nanobanana_service
+from app.services.replicate_service import replicate_service
+from app.services.vector_service import vector_service
+from app.utils.deadline import cap_timeout, current_deadline
+from app.utils.metrics import metrics
+from app.utils.stage_graph import StageGraph
+from app.utils.tenant import tenant_scope
+
+logger = logging.getLogger(__name__)
+
+# 이미지 생성 프로바이더 (IMAGE_PROVIDER가 nanobanana가 아니면 replicate)
+IMAGE_PROVIDERS = {
+    "nanobanana": (nanobanana_service, "Nano Banana (Gemini 2.5 Flash Image)"),
+    "replicate": (replicate_service, "Replicate (SDXL/Ideogram)")
+}
+
+# generate 파이프라인 단계별 타임아웃(초, 재시도 포함) - PIPELINE_STAGE_TIMEOUTS 설정으로 재정의
+PIPELINE_STAGE_TIMEOUTS = {
+    "insights": 120,
+    "rag": 15,
+    "strategies": 150,
+    "copies": 120,
+    "fused": 180,
+    "image_prompt": 90,
+    "marketing_prompt": 90,
+    "image": 240,
+    "save": 30,
+    "vector": 30,
+    "performance": 180,
+    "enqueue": 10
+}
+
+# 체크포인트 저장 콜백: (단계 이름, 결과)
+CheckpointCallback = Callable[[str, Any], Awaitable[None]]
+
+# 이미지 프롬프트 유사도 계산에서 제외하는 단어 (convert_to_image_prompt가 붙이는 품질 키워드 등)
+PROMPT_STOPWORDS = {
+    "the", "and", "with", "for", "from", "that", "this", "into", "its", "their", "are",
+    "professional", "commercial", "photography", "ultra", "detailed", "award", "winning", "quality", "high"
+}
+
+
+async def run_until(call: Awaitable[Any], event: asyncio.Event, default: Any = None) -> Any:
+    """호출 실행 (끝나기 전에 event가 설정되면 호출을 취소하고 default 반환)"""
+    task = asyncio.ensure_future(call)
+    if event.is_set():
+        task.cancel()
+        return default
+    stopped = asyncio.ensure_future(event.wait())
+    try:
+        await asyncio.wait({task, stopped}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopped.cancel()
+        if not task.done():
+            # event 설정 또는 호출한 쪽이 취소됨 - 프로바이더 호출까지 취소
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+    if task.cancelled():
+        return default
+    return task.result()
+
+
+class SharedStages:
+    """
+    여러 파이프라인 실행이 앞 단계 결과를 공유 (일괄 생성의 같은 타겟 그룹, 변형 모드의 변형들)
+
+    처음 claim()한 실행(리더)이 단계를 계산해 알리고, 나머지 실행은 받은 결과를 체크포인트로 넘겨
+    해당 단계를 건너뜁니다. 공유 단계가 모두 끝나거나 done_after 단계가 끝나면(선택 단계 실패 시)
+    결과를 전달하고, 리더가 그 전에 실패하면 받은 것만 전달합니다 (나머지 단계는 각자 실행).
+    """
+
+    def __init__(self, stages: Iterable[str], done_after: Optional[str] = None):
+        self.stages = set(stages)
+        self.done_after = done_after
+        self._published: Dict[str, Any] = {}
+        self._future: Optional[asyncio.Future] = None
+
+    def claim(self) -> bool:
+        """리더가 되면 True (이미 리더가 있으면 False)"""
+        if self._future is not None:
+            return False
+        self._future = asyncio.get_running_loop().create_future()
+        return True
+
+    async def wait(self) -> Dict[str, Any]:
+        return dict(await asyncio.shield(self._future))
+
+    async def publish(self, stage: str, result: Any):
+        if stage in self.stages:
+            self._published[stage] = result
+        if set(self._published) >= self.stages or stage == self.done_after:
+            self.release()
+
+    def release(self):
+        if self._future is not None and not self._future.done():
+            self._future.set_result(dict(self._published))
+
+
+@asynccontextmanager
+async def shared_checkpoints(*shares: SharedStages):
+    """
+    공유 단계 참여 (리더면 계산해서 알리고, 아니면 결과를 기다림)
+
+    사용법:
+        async with shared_checkpoints(share) as (checkpoints, on_checkpoint):
+            await content_pipeline.run(..., checkpoints=checkpoints, on_checkpoint=on_checkpoint)
+    """
+    checkpoints: Dict[str, Any] = {}
+    leading: List[SharedStages] = []
+    for share in shares:
+        if share.claim():
+            leading.append(share)
+        else:
+            checkpoints.update(await share.wait())
+
+    async def publish(stage: str, result: Any):
+        for share in leading:
+            await share.publish(stage, result)
+
+    try:
+        yield checkpoints, (publish if leading else None)
+    finally:
+        for share in leading:
+            share.release()
+
+
+class GenerationControls:
+    """
+    실행 중인 파이프라인 제어 (WebSocket 생성 채널)
+
+    - select_strategy(n): 전략 단계가 끝난 뒤 카피/이미지에 사용할 전략 변경
+      (await_strategy=True이면 전략을 고를 때까지 최대 WS_STRATEGY_SELECTION_TIMEOUT_SECONDS 동안 기다림)
+    - skip_image(): 이미지 관련 단계를 건너뜀 (실행 중이면 취소하고 이미지 없이 저장)
+    """
+
+    def __init__(self, await_strategy: bool = False):
+        self.await_strategy = await_strategy
+        self._strategy_id: Optional[int] = None
+        self._strategy_chosen = asyncio.Event()
+        self._image_skipped = asyncio.Event()
+
+    def select_strategy(self, strategy_id: int):
+        self._strategy_id = strategy_id
+        self._strategy_chosen.set()
+
+    def skip_image(self):
+        self._image_skipped.set()
+
+    @property
+    def image_skipped(self) -> bool:
+        return self._image_skipped.is_set()
+
+    @property
+    def strategy_pending(self) -> bool:
+        """strategy_id()가 사용자 선택을 기다려야 하는지"""
+        return self.await_strategy and not self._strategy_chosen.is_set()
+
+    async def strategy_id(self, default: int) -> int:
+        """사용할 전략 ID (기다리는 중 시간이 지나면 default)"""
+        if self.strategy_pending:
+            try:
+                await asyncio.wait_for(
+                    self._strategy_chosen.wait(),
+                    timeout=cap_timeout(settings.WS_STRATEGY_SELECTION_TIMEOUT_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                logger.info(f"전략 선택 대기 시간 초과, 전략 {default} 사용")
+        return self._strategy_id if self._strategy_id is not None else default
+
+    async def run_unless_image_skipped(self, call: Awaitable[Any], default: Any) -> Any:
+        """이미지 단계 실행 (건너뛰기 요청이 오면 실행 중인 호출을 취소하고 default 반환)"""
+        return await run_until(call, self._image_skipped, default)
+
+
+class ContentPipeline:
+    """통합 콘텐츠 생성 파이프라인"""
+
+    @staticmethod
+    def target_strings(request: FullContentGenerationRequest) -> Tuple[str, str]:
+        """다중 타겟을 문자열로 변환 (빈 배열이면 "AI 자동 분석" / "무관"으로 표시)"""
+        if len(request.target_ages) > 1:
+            target_age_str = ", ".join(request.target_ages)
+        elif len(request.target_ages) == 1:
+            target_age_str = request.target_ages[0]
+        else:
+            target_age_str = "AI 자동 분석"
+
+        if len(request.target_genders) > 1:
+            target_gender_str = ", ".join(request.target_genders)
+        elif len(request.target_genders) == 1:
+            target_gender_str = request.target_genders[0]
+        else:
+            target_gender_str = "무관"
+
+        return target_age_str, target_gender_str
+
+    async def analyze_target_insights(self, request: FullContentGenerationRequest) -> Dict:
+        """
+        타겟 인사이트 (인사이트 웨어하우스에 해당 세그먼트가 있으면 LLM을 호출하지 않음)
+
+        세그먼트가 없는 타겟 조합만 gemini_service.analyze_target_insights로 분석합니다.
+        """
+        insights = insight_warehouse.lookup(
+            request.category, request.target_ages, request.target_genders, request.target_interests
+        )
+        if insights is not None:
+            logger.info(f"✓ 인사이트 웨어하우스 적중 (세그먼트 프로필 {insights['segment_profiles']}개)")
+            return insights
+
+        return await gemini_service.analyze_target_insights(
+            product_name=request.product_name,
+            product_description=request.product_description,
+            category=request.category,
+            target_ages=request.target_ages,
+            target_genders=request.target_genders,
+            target_interests=request.target_interests
+        )
+
+    async def generate_image(self, prompt: str) -> Tuple[Dict, str]:
+        """
+        이미지 생성 (IMAGE_PROVIDER 우선, 장애 시 다른 프로바이더로 대체)
+
+        IMAGE_PROVIDER_FALLBACK이 켜져 있고 다른 프로바이더가 설정되어 있으면,
+        기본 프로바이더의 서킷이 열려 있을 때는 바로, 생성에 실패했을 때는 실패 후 nanobanana ↔ replicate로 전환합니다.
+        요청 남은 시간이 DEADLINE_FAST_IMAGE_BELOW_SECONDS보다 적으면 Replicate는 빠른 모델(SDXL, 적은 스텝)을 쓰고
+        실패 후 대체 프로바이더로 다시 생성하지 않습니다.
+
+        Returns:
+            (이미지 생성 결과, 사용한 프로바이더 이름)
+        """
+        primary = "nanobanana" if settings.IMAGE_PROVIDER.lower() == "nanobanana" else "replicate"
+        providers = [primary]
+        fallback = "replicate" if primary == "nanobanana" else "nanobanana"
+        if settings.IMAGE_PROVIDER_FALLBACK and IMAGE_PROVIDERS[fallback][0].client is not None:
+            providers.append(fallback)
+
+        deadline = current_deadline()
+        low_budget = deadline is not None and deadline.remaining() < settings.DEADLINE_FAST_IMAGE_BELOW_SECONDS
+
+        for provider_name in providers:
+            service, label = IMAGE_PROVIDERS[provider_name]
+            is_last = provider_name == providers[-1]
+
+            if not is_last and not service.breaker.allow():
+                logger.warning(f"{provider_name} 서킷 open, {providers[-1]}로 이미지 생성")
+                metrics.incr("image.fallback", provider=providers[-1], reason="circuit_open")
+                continue
+
+            logger.info(f"이미지 생성 서비스: {label}")
+            options = {}
+            if low_budget and provider_name == "replicate":
+                options["fast"] = True
+                deadline.degrade("image", "fast_model")
+            try:
+                image_result = await service.generate_image(
+                    prompt=prompt,
+                    width=1024,
+                    height=1024,
+                    save_local=True,
+                    **options
+                )
+            except Exception as e:
+                if is_last:
+                    raise
+                if low_budget:
+                    deadline.degrade("image", "no_fallback")
+                    raise
+                logger.warning(f"{provider_name} 이미지 생성 실패, {providers[-1]}로 대체: {str(e)}")
+                metrics.incr("image.fallback", provider=providers[-1], reason="error")
+                continue
+
+            return image_result, provider_name
+
+    def search_past_performance(
+        self,
+        request: FullContentGenerationRequest,
+        target_age: Optional[str],
+        target_gender: str
+    ) -> List[Dict]:
+        """
+        RAG: 과거 유사 콘텐츠 성과 검색 (실패해도 빈 리스트로 계속 진행)
+
+        Args:
+            target_age: 연령대 필터 (단일 연령대일 때만, None이면 필터 없음)
+            target_gender: 성별 ("무관"이면 필터 없음)
+        """
+        try:
+            logger.info("📊 RAG: 유사 콘텐츠 성과 검색 중...")
+            # 검색 쿼리 생성 (제품 설명 + 카테고리)
+            query_text = f"제품: {request.product_name}\n설명: {request.product_description}\n카테고리: {request.category}"
+
+            past_performance = vector_service.get_performance_reference(
+                query_text=query_text,
+                target_age=target_age,
+                target_gender=target_gender if target_gender != "무관" else None,
+                category=request.category,
+                limit=3  # 최대 3개 참조
+            )
+
+            if past_performance:
+                logger.info(f"✓ RAG: {len(past_performance)}개 유사 콘텐츠 발견")
+                for i, perf in enumerate(past_performance, 1):
+                    logger.info(f"  {i}. 유사도: {perf['similarity_score']:.2f}, 성과: 도달 {perf['performance']['impressions']:,}명")
+            else:
+                logger.info("  RAG: 유사 콘텐츠 없음 (첫 콘텐츠 또는 유사도 낮음)")
+        except Exception as e:
+            logger.warning(f"⚠️  RAG 검색 실패 (계속 진행): {str(e)}")
+            return []
+
+        return past_performance
+
+    async def run(
+        self,
+        request: FullContentGenerationRequest,
+        user_id: int,
+        db: Session,
+        start_time: Optional[float] = None,
+        checkpoints: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        variant_group_id: Optional[str] = None,
+        variant_label: Optional[str] = None,
+        controls: Optional[GenerationControls] = None
+    ) -> Tuple[Dict, int]:
+        """
+        전체 콘텐츠 생성 파이프라인 실행
+
+        각 단계는 의존 관계 그래프(StageGraph)로 실행되어 서로 의존하지 않는 단계는 동시에 진행됩니다.
+        (연령대 입력 시 RAG 검색 ∥ 인사이트 분석, 제품 이미지 프롬프트 ∥ 카피 생성, Vector DB 저장 ∥ 성과 예측)
+
+        동시에 실행하는 파이프라인 수는 SCHEDULER_GENERATION_SLOTS로 제한되며, 슬롯이 모두 차 있으면
+        사용자/프로젝트별 공정 스케줄러(generation_scheduler) 순서대로 기다립니다.
+        우선순위는 호출하는 쪽의 tenant_scope를 따릅니다 (기본 interactive, 일괄/비동기 생성은 batch).
+        사용자가 전략을 고르기를 기다리는 동안(controls.await_strategy)은 슬롯을 반납했다가 선택 후 다시 얻습니다.
+
+        Args:
+            request: 생성 요청 (auto 재생성이면 regenerate_type이 분석 결과로 바뀜)
+            user_id: 콘텐츠 소유자
+            db: 콘텐츠 저장에 사용할 세션
+            start_time: 생성 시간 기준 (None이면 지금)
+            checkpoints: 이전 실행에서 완료된 단계 결과 (해당 단계는 다시 실행하지 않음)
+            on_checkpoint: 단계가 완료될 때마다 (단계 이름, 결과)로 호출
+            variant_group_id: 변형 그룹 ID (run_variants에서 지정, 저장되는 콘텐츠에 기록)
+            variant_label: 변형 이름 (톤)
+            controls: 실행 중 전략 선택/이미지 건너뛰기 (WebSocket 생성 채널)
+
+        Returns:
+            (/generate 응답 data, 생성 시간(초))
+
+        Raises:
+            SchedulerTimeoutError: SCHEDULER_MAX_WAIT_SECONDS(또는 남은 데드라인) 안에 슬롯을 얻지 못한 경우
+        """
+        start_time = start_time or time.time()
+        with tenant_scope(user_id, request.project_id):
+            async with generation_scheduler.slot(timeout=cap_timeout(settings.SCHEDULER_MAX_WAIT_SECONDS)) as ticket:
+                return await self._run(
+                    request, user_id, db, start_time, checkpoints, on_checkpoint,
+                    variant_group_id, variant_label, controls, ticket
+                )
+
+    async def _run(
+        self,
+        request: FullContentGenerationRequest,
+        user_id: int,
+        db: Session,
+        start_time: float,
+        checkpoints: Optional[Dict[str, Any]],
+        on_checkpoint: Optional[CheckpointCallback],
+        variant_group_id: Optional[str],
+        variant_label: Optional[str],
+        controls: Optional[GenerationControls],
+        ticket: Ticket
+    ) -> Tuple[Dict, int]:
+        checkpoints = checkpoints or {}
+
+        # === regenerate_type 처리 ===
+        if request.regenerate_type:
+            logger.info(f"재생성 요청: {request.regenerate_type}")
+
+            # auto인 경우 사용자 의도 분석
+            if request.regenerate_type == "auto" and request.custom_request:
+                if "intent" in checkpoints:
+                    intent_analysis = checkpoints["intent"]
+                else:
+                    logger.info(f"사용자 요청 분석 중: {request.custom_request}")
+                    intent_analysis = await gemini_service.analyze_user_intent(request.custom_request)
+                    if on_checkpoint:
+                        await on_checkpoint("intent", intent_analysis)
+                logger.info(f"분석 결과: {intent_analysis}")
+
+                # 분석 결과에 따라 regenerate_type 변경
+                request.regenerate_type = intent_analysis.get("type", "all")
+                logger.info(f"재생성 타입 결정: {request.regenerate_type}")
+
+        target_age_str, target_gender_str = self.target_strings(request)
+        logger.info(f"카테고리: {request.category} / 타겟: {target_age_str} / {target_gender_str}")
+
+        fast_mode = request.fast_mode and request.regenerate_type != "image"
+        selected_strategy_id = request.strategy_id or 1
+
+        # 단계 결과로 채워지는 상태 (on_result: 실행 또는 체크포인트 복원 시 갱신)
+        target_insights: Dict = {}
+        final_target_ages = request.target_ages
+        final_target_interests = request.target_interests
+        strategies: List[Dict] = []
+        selected_strategy: Dict = {}
+        selected_copy = {"text": "", "tone": request.copy_tone, "hashtags": [], "length": 0}
+        generation_time = 0
+
+        def apply_insights(insights: Dict):
+            """AI 인사이트의 연령대/관심사는 사용자 입력이 비어 있을 때만 사용"""
+            nonlocal target_insights, final_target_ages, final_target_interests, target_age_str
+            target_insights = insights
+            final_target_ages = insights.get('target_ages', request.target_ages) if not request.target_ages or len(request.target_ages) == 0 else request.target_ages
+            final_target_interests = insights.get('target_interests', request.target_interests) if not request.target_interests or len(request.target_interests) == 0 else request.target_interests
+            # 연령대 문자열 생성 (AI가 생성한 연령대 사용)
+            target_age_str = ", ".join(final_target_ages) if len(final_target_ages) > 1 else final_target_ages[0] if final_target_ages else "20-29"
+
+        def select_strategy(generated: List[Dict]):
+            nonlocal strategies, selected_strategy
+            strategies = generated
+            # 전략 선택 (사용자 지정 또는 첫 번째 전략)
+            selected_strategy = next(
+                (s for s in strategies if s["id"] == selected_strategy_id),
+                strategies[0]
+            )
+            logger.info(f"✓ 전략 선택: {selected_strategy.get('name', 'Unknown')}")
+
+        def select_copy(copy: Dict):
+            nonlocal selected_copy
+            selected_copy = copy
+
+        def apply_fused(fused: Dict):
+            apply_insights(fused["insights"])
+            select_strategy(fused["strategies"])
+            select_copy(fused["copy"])
+
+        # === RAG: 과거 유사 콘텐츠 성과 검색 (연령대 필터는 단일 연령대일 때만) ===
+        # 연령대를 입력했으면 인사이트 결과와 관계없이 입력값을 쓰므로 인사이트 분석과 동시에 검색
+        rag_after_insights = not fast_mode and not request.target_ages
+        rag_target_age = target_age_str if len(request.target_ages) == 1 else None
+
+        def search_past_performance(results: Dict) -> List[Dict]:
+            target_age = rag_target_age
+            if rag_after_insights:
+                target_age = target_age_str if len(final_target_ages) == 1 else None
+            return self.search_past_performance(request, target_age=target_age, target_gender=target_gender_str)
+
+        graph = StageGraph("generate", timeouts=settings.PIPELINE_STAGE_TIMEOUTS)
+
+        if fast_mode:
+            # === fast 모드: 인사이트 + 전략 + 카피를 Gemini 1회 호출로 생성 ===
+            async def generate_fused(results: Dict) -> Dict:
+                logger.info(f"0-2/5 인사이트 + 전략 + 카피 통합 생성 중... (fast 모드, 톤: {request.copy_tone})")
+                fused = await gemini_service.generate_fused_content(
+                    product_name=request.product_name,
+                    product_description=request.product_description,
+                    category=request.category,
+                    target_ages=request.target_ages,
+                    target_genders=request.target_genders,
+                    target_interests=request.target_interests,
+                    copy_tone=request.copy_tone,
+                    strategy_id=selected_strategy_id,
+                    past_performance=results["rag"]
+                )
+                logger.info(f"✓ 통합 생성 완료 ({fused['copy']['tone']})")
+                return fused
+
+            graph.add("rag", search_past_performance, timeout=PIPELINE_STAGE_TIMEOUTS["rag"],
+                      optional=True, default=[], blocking=True)
+            graph.add("fused", generate_fused, deps=["rag"], timeout=PIPELINE_STAGE_TIMEOUTS["fused"],
+                      on_result=apply_fused)
+            strategy_stage = copy_stage = "fused"
+            strategy_deps = [strategy_stage]
+        else:
+            # === 0단계: AI 타겟 인사이트 분석 ===
+            async def analyze_insights(results: Dict) -> Dict:
+                logger.info("0/5 AI 타겟 인사이트 분석 중...")
+                insights = await self.analyze_target_insights(request)
+                logger.info(f"✓ 타겟 인사이트 분석 완료")
+                logger.info(f"  - Target Ages: {len(insights.get('target_ages', []))}개")
+                logger.info(f"  - Target Interests: {len(insights.get('target_interests', []))}개")
+                logger.info(f"  - Pain Points: {len(insights.get('pain_points', []))}개")
+                logger.info(f"  - Preferred Channels: {len(insights.get('preferred_channels', []))}개")
+                return insights
+
+            # === 1단계: 마케팅 전략 생성 (RAG 활용) ===
+            async def generate_strategies(results: Dict) -> List[Dict]:
+                logger.info("1/5 마케팅 전략 생성 중...")
+                generated = await gemini_service.generate_marketing_strategies(
+                    product_name=request.product_name,
+                    product_description=request.product_description,
+                    category=request.category,
+                    target_age=target_age_str,
+                    target_gender=target_gender_str,
+                    target_interests=final_target_interests,
+                    past_performance=results["rag"]  # RAG 데이터 전달
+                )
+                logger.info(f"✓ 전략 생성 완료 ({len(generated)}개)")
+                return generated
+
+            # === 2단계: 카피 생성 (regenerate_type이 'image'가 아닐 때만) ===
+            async def generate_copy(results: Dict) -> Dict:
+                logger.info(f"2/5 카피 생성 중... (톤: {request.copy_tone})")
+                copies = await gemini_service.generate_copies(
+                    product_name=request.product_name,
+                    product_description=request.product_description,
+                    strategy=selected_strategy,
+                    target_age=target_age_str,
+                    target_gender=target_gender_str,
+                    target_interests=final_target_interests,
+                    copy_tone=request.copy_tone  # 요청된 톤 전달
+                )
+                # 첫 번째 카피 사용 (이제 하나만 생성됨)
+                logger.info(f"✓ 카피 생성 완료 ({copies[0]['tone']})")
+                return copies[0]
+
+            if request.regenerate_type == "image":
+                # 이미지만 재생성 - 기존 카피 유지 (임시로 빈 카피)
+                logger.info("2/5 카피 생성 스킵 (이미지만 재생성)")
+
+            graph.add("insights", analyze_insights, timeout=PIPELINE_STAGE_TIMEOUTS["insights"],
+                      on_result=apply_insights)
+            graph.add("rag", search_past_performance, deps=["insights"] if rag_after_insights else [],
+                      timeout=PIPELINE_STAGE_TIMEOUTS["rag"], optional=True, default=[], blocking=True)
+            graph.add("strategies", generate_strategies, deps=["insights", "rag"],
+                      timeout=PIPELINE_STAGE_TIMEOUTS["strategies"], on_result=select_strategy)
+            # === 전략 선택: 실행 중 제어(controls)로 사용자가 전략을 고르면 카피/이미지에 반영 ===
+            async def choose_strategy(results: Dict) -> int:
+                if not controls.strategy_pending:
+                    return await controls.strategy_id(selected_strategy_id)
+                # 사용자 응답을 기다리는 동안 생성 슬롯을 다른 테넌트에게 넘기고, 선택 후 다시 대기열에 섬
+                async with generation_scheduler.suspended(
+                    ticket, timeout=cap_timeout(settings.SCHEDULER_MAX_WAIT_SECONDS)
+                ):
+                    strategy_id = await controls.strategy_id(selected_strategy_id)
+                return strategy_id
+
+            def apply_strategy_choice(strategy_id: int):
+                nonlocal selected_strategy_id
+                selected_strategy_id = strategy_id
+                select_strategy(strategies)
+
+            graph.add("strategy_choice", choose_strategy, deps=["strategies"], enabled=controls is not None,
+                      default=selected_strategy_id, on_result=apply_strategy_choice)
+            graph.add("copies", generate_copy, deps=["strategies", "strategy_choice"],
+                      timeout=PIPELINE_STAGE_TIMEOUTS["copies"],
+                      enabled=request.regenerate_type != "image", on_result=select_copy)
+            strategy_stage, copy_stage = "strategies", "copies"
+            # 선택된 전략으로 프롬프트를 만듦
+            strategy_deps = [strategy_stage, "strategy_choice"]
+
+        # === 3단계: 이미지 프롬프트 변환 (regenerate_type이 'copy'가 아닐 때만) ===
+        async def convert_image_prompt(results: Dict) -> str:
+            logger.info("3/5 이미지 프롬프트 변환 중...")
+            prompt = await gemini_service.convert_to_image_prompt(
+                copy_text=selected_copy["text"] if selected_copy["text"] else request.product_description,
+                product_name=request.product_name,
+                target_age=target_age_str,
+                target_gender=target_gender_str,
+                strategy=selected_strategy
+            )
+            logger.info(f"✓ 이미지 프롬프트 생성 완료")
+            return prompt
+
+        if request.regenerate_type == "copy":
+            # 카피만 재생성 - 이미지 생성 스킵
+            logger.info("3/5 이미지 프롬프트 변환 스킵 (카피만 재생성)")
+            logger.info("4/5 이미지 생성 스킵 (카피만 재생성)")
+
+        # 제품 이미지가 있으면 제품 기반 마케팅 이미지 생성 (카피/이미지 프롬프트와 무관하므로 전략 직후 시작)
+        use_product_image = False
+        if request.regenerate_type != "copy" and request.product_image_path:
+            use_product_image = os.path.exists(request.product_image_path)
+            if use_product_image:
+                logger.info(f"제품 이미지 기반 마케팅 이미지 생성 모드")
+                logger.info(f"제품 이미지 경로: {request.product_image_path}")
+            else:
+                logger.warning(f"제품 이미지 파일을 찾을 수 없음: {request.product_image_path}")
+                logger.info("일반 이미지 생성으로 대체")
+
+        async def generate_marketing_prompt(results: Dict) -> str:
+            marketing_prompt = await gemini_service.generate_text(
+                f"""You will see a product image. Create a new marketing image that includes this EXACT product.
+
+Product: {request.product_name}
+Description: {request.product_description}
+Target Audience: {target_age_str}, {target_gender_str}
+Marketing Strategy: {selected_strategy.get('name', '')} - {selected_strategy.get('core_message', '')}
+
+CRITICAL RULE: The product itself (design, color, shape, branding) MUST remain EXACTLY as shown in the provided image. Do not change the product at all.
+
+Generate a complete marketing scene that features this product:
+- A person holding, wearing, or using the product
+- The product placed in an attractive lifestyle setting
+- A professional product showcase with appropriate background
+
+Focus on:
+- Keeping the product identical to the reference image
+- Natural composition and lighting
+- Authentic human features (hands, face) if people are included
+- Professional photography style
+- Matching the target audience's preferences
+
+Generate a photorealistic marketing scene with the EXACT product from the image.""",
+                temperature=0.5
+            )
+            logger.info(f"마케팅 프롬프트: {marketing_prompt[:100]}...")
+            return marketing_prompt
+
+        # === 4단계: 이미지 생성 (regenerate_type이 'copy'가 아닐 때만) ===
+        async def generate_image(results: Dict) -> Tuple[Dict, str]:
+            logger.info("4/5 이미지 생성 중...")
+            if use_product_image:
+                # Gemini로 제품 이미지 기반 마케팅 이미지 생성
+                image_result = await nanobanana_service.generate_from_product_image(
+                    product_image_path=request.product_image_path,
+                    prompt=results["marketing_prompt"],
+                    save_local=True
+                )
+                logger.info(f"✓ 제품 이미지 기반 마케팅 이미지 생성 완료")
+                return image_result, "nanobanana (product-based)"
+
+            speculation = results.get("speculation") or {}
+            if speculation.get("accepted"):
+                logger.info(f"✓ 추측 이미지 채택 (유사도 {speculation['similarity']})")
+                return results["spec_image"]
+
+            # 일반 이미지 생성 (IMAGE_PROVIDER, 장애 시 대체 프로바이더)
+            image_result, provider_name = await self.generate_image(results["image_prompt"])
+            logger.info(f"✓ 이미지 생성 완료 (provider: {provider_name})")
+            return image_result, provider_name
+
+        # === 추측(speculative) 이미지: 카피를 기다리지 않고 전략만으로 만든 프롬프트로 이미지를 먼저 생성 ===
+        # 카피 기반 프롬프트와 충분히 비슷하면 그 이미지를 쓰고, 아니면 추측 이미지를 취소하고 바로 다시 생성
+        # (판단은 두 프롬프트만으로 하므로 거절할 때는 추측 이미지가 끝나기를 기다리지 않음)
+        speculative = (
+            request.speculative_image and not fast_mode and not use_product_image
+            and not request.regenerate_type and variant_group_id is None
+        )
+
+        async def convert_spec_image_prompt(results: Dict) -> str:
+            logger.info("3/5 추측 이미지 프롬프트 변환 중... (전략 기반, 카피 생성과 동시에)")
+            return await gemini_service.convert_to_image_prompt(
+                copy_text=selected_strategy.get("core_message") or request.product_description,
+                product_name=request.product_name,
+                target_age=target_age_str,
+                target_gender=target_gender_str,
+                strategy=selected_strategy
+            )
+
+        # 거절하면 설정 (진행 중인 추측 이미지 생성 취소)
+        spec_rejected = asyncio.Event()
+        spec_timing: Dict[str, float] = {}
+
+        async def generate_spec_image(results: Dict) -> Optional[Tuple[Dict, str]]:
+            if not results["spec_image_prompt"]:
+                return None
+            logger.info("4/5 추측 이미지 생성 중... (카피 생성과 동시에)")
+            spec_timing["start"] = time.monotonic()
+            result = await run_until(self.generate_image(results["spec_image_prompt"]), spec_rejected)
+            if result is None:
+                logger.info("추측 이미지 생성 취소 (카피 기반 프롬프트와 다름)")
+            else:
+                spec_timing["end"] = time.monotonic()
+            return result
+
+        async def judge_speculation(results: Dict) -> Dict:
+            """추측 이미지 채택 여부 (카피 기반 프롬프트와의 유사도) 및 절약한 시간 추정"""
+            prompt_end = time.monotonic()
+            similarity = round(
+                self.prompt_similarity(results["spec_image_prompt"] or "", results["image_prompt"] or ""), 3
+            )
+            matched = bool(results["spec_image_prompt"]) and similarity >= settings.SPECULATIVE_IMAGE_MIN_SIMILARITY
+            spec_image = None
+            if matched:
+                # 프롬프트가 비슷할 때만 추측 이미지가 끝나기를 기다림
+                spec_image = await graph.wait_result("spec_image")
+            else:
+                spec_rejected.set()
+            accepted = spec_image is not None
+            outcome = "accepted" if accepted else "failed" if matched else "rejected"
+
+            # 추측하지 않았다면 카피 기반 프롬프트 이후에 같은 시간 동안 이미지를 생성했을 것
+            saved_seconds = None
+            if accepted and "end" in spec_timing:
+                spec_seconds = spec_timing["end"] - spec_timing["start"]
+                saved_seconds = round(prompt_end + spec_seconds - max(prompt_end, spec_timing["end"]), 3)
+                metrics.observe("speculative_image.saved_seconds", saved_seconds)
+
+            metrics.incr("speculative_image.outcomes", outcome=outcome)
+            metrics.observe("speculative_image.similarity", similarity)
+            logger.info(f"추측 이미지 {outcome} (유사도 {similarity}, 절약 {saved_seconds}초)")
+            return {
+                "accepted": accepted,
+                "outcome": outcome,
+                "similarity": similarity,
+                "prompt": results["spec_image_prompt"],
+                "saved_seconds": saved_seconds
+            }
+
+        def skippable(func: Callable[[Dict], Awaitable[Any]], default: Any = None) -> Callable[[Dict], Awaitable[Any]]:
+            """이미지 관련 단계: 실행 중 제어로 이미지를 건너뛰면 default 반환"""
+            if controls is None:
+                return func
+
+            async def run_stage(results: Dict) -> Any:
+                return await controls.run_unless_image_skipped(func(results), default)
+            return run_stage
+
+        no_image = ({"original_url": "", "local_url": None}, "none")
+        generate_images = request.regenerate_type != "copy"
+        graph.add("image_prompt", skippable(convert_image_prompt), deps=[copy_stage],
+                  timeout=PIPELINE_STAGE_TIMEOUTS["image_prompt"], enabled=generate_images)
+        graph.add("marketing_prompt", skippable(generate_marketing_prompt), deps=strategy_deps,
+                  timeout=PIPELINE_STAGE_TIMEOUTS["marketing_prompt"], enabled=use_product_image)
+        graph.add("spec_image_prompt", skippable(convert_spec_image_prompt), deps=strategy_deps,
+                  timeout=PIPELINE_STAGE_TIMEOUTS["image_prompt"], optional=True, enabled=speculative)
+        graph.add("spec_image", skippable(generate_spec_image), deps=["spec_image_prompt"],
+                  timeout=PIPELINE_STAGE_TIMEOUTS["image"], optional=True, enabled=speculative)
+        # 두 프롬프트만으로 판단 (거절하면 추측 이미지를 기다리지 않고 바로 이미지 생성 시작)
+        graph.add("speculation", skippable(judge_speculation), deps=["spec_image_prompt", "image_prompt"],
+                  enabled=speculative)
+        image_deps = ["marketing_prompt"] if use_product_image else ["image_prompt", "speculation"]
+        graph.add("image", skippable(generate_image, no_image), deps=image_deps,
+                  timeout=PIPELINE_STAGE_TIMEOUTS["image"], enabled=generate_images, default=no_image)
+
+        def final_image_prompt(results: Dict) -> Optional[str]:
+            """이미지를 만든 프롬프트 (추측 이미지를 채택했으면 전략 기반 프롬프트)"""
+            speculation = results.get("speculation") or {}
+            return speculation["prompt"] if speculation.get("accepted") else results["image_prompt"]
+
+        # === 5단계: 데이터베이스 저장 (항상 저장) ===
+        async def save_content(results: Dict) -> Optional[int]:
+            nonlocal generation_time
+            # 생성 시간: 이미지 생성까지
+            generation_time = int(time.time() - start_time)
+            image_result, provider_name = results["image"]
+            try:
+                content = Content(
+                    user_id=user_id,  # 로그인한 사용자 ID
+                    project_id=request.project_id,
+                    product_name=request.product_name,
+                    product_description=request.product_description,
+                    category=request.category,
+                    target_age_group=target_age_str,
+                    target_gender=target_gender_str,
+                    target_income_level=request.target_income_level,
+                    target_interests=request.target_interests,
+                    strategy=selected_strategy,
+                    copy_text=selected_copy["text"],
+                    copy_tone=selected_copy["tone"],
+                    hashtags=selected_copy.get("hashtags", []),
+                    image_prompt=final_image_prompt(results),
+                    image_url=image_result.get("local_url") or image_result["original_url"],
+                    image_provider=provider_name,
+                    status=ContentStatus.COMPLETED,
+                    generation_time=generation_time,
+                    variant_group_id=variant_group_id,
+                    variant_label=variant_label
+                )
+
+                db.add(content)
+                db.commit()
+                db.refresh(content)
+
+                logger.info(f"✓ 데이터베이스 저장 완료 (ID: {content.id})")
+
+                # 재생성 시 다시 실행하지 않도록 단계 산출물 저장
+                content_id = content.id
+                artifact_store.save(db, content_id, {
+                    "insights": target_insights,
+                    "rag": results.get("rag"),
+                    "strategies": strategies,
+                    "selected_strategy": selected_strategy,
+                    "copy": selected_copy,
+                    "image_prompt": final_image_prompt(results),
+                    "marketing_prompt": results.get("marketing_prompt")
+                })
+                return content_id
+
+            except Exception as e:
+                logger.error(f"데이터베이스 저장 실패: {str(e)}")
+                db.rollback()
+                # 저장 실패해도 생성된 콘텐츠는 반환
+                return None
+
+        def embedding_metadata() -> Dict:
+            return {
+                "target_age": target_age_str,
+                "target_gender": target_gender_str,
+                "category": request.category,
+                "product_name": request.product_name,
+                "strategy_name": selected_strategy.get("name", ""),
+                "copy_tone": selected_copy["tone"]
+            }
+
+        # === Vector DB 저장 (임베딩 생성 및 저장, 실패해도 계속 진행) ===
+        def save_embedding(results: Dict) -> bool:
+            content_id = results["save"]
+            if content_id is None:
+                return False
+            logger.info(f"Vector DB 저장 중... (content_id: {content_id})")
+            vector_success = vector_service.save_content_embedding(
+                content_id=content_id,
+                copy_text=selected_copy["text"],
+                image_prompt=final_image_prompt(results),
+                metadata=embedding_metadata()
+            )
+            if vector_success:
+                logger.info(f"✓ Vector DB 저장 완료 (content_id: {content_id})")
+            else:
+                logger.warning(f"⚠️  Vector DB 저장 실패 (content_id: {content_id})")
+            return vector_success
+
+        # === 성과 예측 자동 실행 (Vector DB 저장과 동시에, 실패해도 계속 진행) ===
+        async def predict_performance(results: Dict) -> Optional[Dict]:
+            content_id = results["save"]
+            if content_id is None:
+                return None
+            logger.info(f"성과 예측 시작... (content_id: {content_id})")
+            from app.services.performance_service import PerformanceService
+            performance_service = PerformanceService(db)
+
+            performance = await performance_service.predict_performance(content_id)
+            if not performance:
+                logger.warning(f"⚠️  성과 예측 실패 (content_id: {content_id})")
+                return None
+
+            logger.info(f"✓ 성과 예측 완료 (content_id: {content_id})")
+            # 성과 예측 결과를 딕셔너리로 변환
+            return {
+                "impressions": performance.impressions,
+                "clicks": performance.clicks,
+                "ctr": performance.ctr,
+                "engagement_rate": performance.engagement_rate,
+                "conversion_rate": performance.conversion_rate,
+                "brand_recall_score": performance.brand_recall_score,
+                "confidence_score": performance.confidence_score
+            }
+
+        graph.add("save", save_content, deps=["image", "image_prompt", copy_stage],
+                  timeout=PIPELINE_STAGE_TIMEOUTS["save"], optional=True)
+        if settings.BACKGROUND_POST_PROCESSING:
+            # 임베딩 저장과 성과 예측은 작업 큐로 넘기고 카피/이미지가 준비되면 바로 응답
+            async def enqueue_post_processing(results: Dict) -> Optional[Dict[str, str]]:
+                content_id = results["save"]
+                if content_id is None:
+                    return None
+                return await enqueue_post_generation(
+                    content_id=content_id,
+                    user_id=user_id,
+                    copy_text=selected_copy["text"],
+                    image_prompt=final_image_prompt(results),
+                    metadata=embedding_metadata()
+                )
+
+            graph.add("enqueue", enqueue_post_processing, deps=["save"],
+                      timeout=PIPELINE_STAGE_TIMEOUTS["enqueue"], optional=True)
+        else:
+            graph.add("vector", save_embedding, deps=["save"], timeout=PIPELINE_STAGE_TIMEOUTS["vector"],
+                      optional=True, default=False, blocking=True)
+            graph.add("performance", predict_performance, deps=["save"],
+                      timeout=PIPELINE_STAGE_TIMEOUTS["performance"], optional=True)
+
+        results = await graph.run(checkpoints=checkpoints, on_complete=on_checkpoint)
+        content_id = results["save"]
+        image_prompt = final_image_prompt(results)
+        image_result, provider_name = results["image"]
+        # 백그라운드 처리 시 성과 예측은 GET /api/jobs/{job_id} 또는 GET /api/performance/{content_id}로 조회
+        performance_data = results.get("performance")
+        background_jobs = results.get("enqueue")
+        if not generation_time:
+            # 저장 단계가 체크포인트에서 복원된 경우
+            generation_time = int(time.time() - start_time)
+        stage_timings = graph.get_timings()
+        logger.info(f"단계별 소요 시간: { {name: t['seconds'] for name, t in stage_timings['stages'].items()} }")
+        logger.info(f"critical path: {' → '.join(stage_timings['critical_path'])}")
+
+        # === 응답 구성 ===
+        response_data = {
+            "content_id": content_id,
+            "target_insights": target_insights,  # AI 분석 인사이트 추가
+            # 타겟 세그먼트 정보 추가
+            "target_age_group": target_age_str,
+            "target_gender": target_gender_str,
+            "target_ages": final_target_ages,  # AI가 생성한 연령대 또는 사용자 입력
+            "target_genders": request.target_genders,
+            "target_interests": final_target_interests,  # AI가 생성한 관심사 또는 사용자 입력
+            "strategies": strategies,
+            "pipeline_mode": "fast" if fast_mode else "staged",
+            "selected_strategy_id": selected_strategy_id,
+            "selected_strategy": selected_strategy,
+            "copy": {
+                "text": selected_copy["text"],
+                "tone": selected_copy["tone"],
+                "hashtags": selected_copy.get("hashtags", []),
+                "length": selected_copy.get("length")
+            },
+            "image": {
+                "prompt": image_prompt,
+                "original_url": image_result["original_url"],
+                "local_url": image_result.get("local_url"),
+                "file_path": image_result.get("file_path")
+            },
+            "performance_prediction": performance_data,  # 성과 예측 데이터 추가
+            "background_jobs": background_jobs,  # 후처리 작업 ID (embedding, performance)
+            "stage_timings": stage_timings  # 단계별 소요 시간 / critical path
+        }
+        if speculative:
+            # 추측 이미지 채택 여부 / 유사도 / 절약한 시간 (speculative_image=True일 때)
+            response_data["speculative_image"] = results.get("speculation")
+        deadline = current_deadline()
+        if deadline is not None:
+            # 요청 데드라인 때문에 생략/축소한 단계 (X-Request-Timeout)
+            response_data["deadline"] = deadline.to_dict()
+
+        return response_data, generation_time
+
+    @staticmethod
+    def prompt_similarity(a: str, b: str) -> float:
+        """두 이미지 프롬프트의 단어 빈도 코사인 유사도 (0-1)"""
+        def terms(text: str) -> Counter:
+            return Counter(
+                word for word in re.findall(r"[a-z]{3,}", (text or "").lower())
+                if word not in PROMPT_STOPWORDS
+            )
+
+        va, vb = terms(a), terms(b)
+        dot = sum(count * vb[word] for word, count in va.items())
+        norm = math.sqrt(sum(c * c for c in va.values())) * math.sqrt(sum(c * c for c in vb.values()))
+        return dot / norm if norm else 0.0
+
+    @staticmethod
+    def variant_specs(request: FullContentGenerationRequest) -> List[Tuple[str, str]]:
+        """변형 목록 [(톤, 변형 이름)] - 톤 순서대로, 톤마다 images_per_variant개"""
+        tones = list(dict.fromkeys(request.variant_tones or [request.copy_tone]))
+        return [
+            (tone, tone if request.images_per_variant == 1 else f"{tone}-{index + 1}")
+            for tone in tones
+            for index in range(request.images_per_variant)
+        ]
+
+    async def run_variants(
+        self,
+        request: FullContentGenerationRequest,
+        user_id: int,
+        start_time: Optional[float] = None
+    ) -> Tuple[Dict, int]:
+        """
+        변형 모드: 인사이트/RAG/전략은 한 번만 생성하고 톤별 카피와 변형별 이미지를 동시에 생성
+
+        변형마다 파이프라인을 동시에 실행하되, 첫 변형이 계산한 앞 단계 결과를 나머지 변형이 받아
+        건너뜁니다. 같은 톤의 이미지 변형은 카피와 이미지 프롬프트도 공유합니다.
+        변형은 같은 variant_group_id를 가진 별도 콘텐츠로 저장되며, 일부 변형이 실패해도
+        나머지 변형은 반환합니다 (모두 실패하면 첫 예외를 다시 발생).
+        fast 모드 통합 호출은 톤 하나의 카피만 만들기 때문에 변형 모드에서는 사용하지 않습니다.
+
+        Returns:
+            (첫 번째 성공한 변형의 /generate 응답 data + variant_group_id/variants, 전체 생성 시간(초))
+        """
+        start_time = start_time or time.time()
+        specs = self.variant_specs(request)
+        variant_group_id = uuid.uuid4().hex
+        logger.info(f"변형 모드: {len(specs)}개 변형 ({', '.join(label for _, label in specs)})")
+
+        upstream = SharedStages(("insights", "rag", "strategies"), done_after="strategies")
+        per_tone = {tone: SharedStages(("copies", "image_prompt"), done_after="image_prompt") for tone, _ in specs}
+
+        async def run_variant(tone: str, label: str) -> Tuple[Dict, List[str]]:
+            variant_request = request.model_copy(update={
+                "copy_tone": tone,
+                "fast_mode": False,
+                "variant_tones": None,
+                "images_per_variant": 1
+            })
+            # 변형마다 별도 세션 (동시에 저장/성과 예측)
+            db = SessionLocal()
+            try:
+                async with shared_checkpoints(upstream, per_tone[tone]) as (checkpoints, on_checkpoint):
+                    data, _ = await self.run(
+                        variant_request,
+                        user_id=user_id,
+                        db=db,
+                        start_time=start_time,
+                        checkpoints=checkpoints,
+                        on_checkpoint=on_checkpoint,
+                        variant_group_id=variant_group_id,
+                        variant_label=label
+                    )
+                return data, list(checkpoints)
+            finally:
+                db.close()
+
+        outcomes = await asyncio.gather(*(run_variant(tone, label) for tone, label in specs), return_exceptions=True)
+
+        variants = []
+        primary = None
+        for (tone, label), outcome in zip(specs, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"변형 생성 실패 ({label}): {str(outcome)}")
+                metrics.incr("pipeline.variants", status="failed")
+                variants.append({"label": label, "tone": tone, "status": "failed", "error": f"{type(outcome).__name__}: {str(outcome)}"})
+                continue
+            data, shared_stages = outcome
+            primary = primary or data
+            metrics.incr("pipeline.variants", status="succeeded")
+            variants.append({
+                "label": label,
+                "tone": tone,
+                "status": "succeeded",
+                "content_id": data["content_id"],
+                "copy": data["copy"],
+                "image": data["image"],
+                "performance_prediction": data["performance_prediction"],
+                "background_jobs": data["background_jobs"],
+                "shared_stages": shared_stages
+            })
+
+        if primary is None:
+            raise next(outcome for outcome in outcomes if isinstance(outcome, BaseException))
+
+        generation_time = int(time.time() - start_time)
+        logger.info(f"✓ 변형 생성 완료 ({sum(v['status'] == 'succeeded' for v in variants)}/{len(specs)}, {generation_time}초)")
+        return {**primary, "variant_group_id": variant_group_id, "variants": variants}, generation_time
+
+
+# 싱글톤 인스턴스
+content_pipeline = ContentPipeline()
@@ -0,0 +1,312 @@
+"""
+가중 공정 스케줄러
+생성 파이프라인과 외부 API 쿼터를 사용자/프로젝트별로 공정하게 나눔
+
+선착순으로 실행하면 한 사용자가 일괄 생성으로 수십 개를 넣었을 때 다른 사용자의 대화형 요청이
+그 뒤에서 기다리게 되므로, 슬롯이 모두 찼을 때 다음 실행 순서를 다음 기준으로 정합니다.
+
+1. 우선순위: interactive > batch > background (app.utils.tenant)
+   SCHEDULER_AGING_SECONDS만큼 기다릴 때마다 한 단계씩 올라가므로 낮은 우선순위도 결국 실행됩니다.
+2. 사용자 간 가중 공정 분배: 사용자마다 가상 시간(받은 몫 / 가중치)을 누적하고 가장 적게 받은 사용자부터 실행
+   (쉬다가 돌아온 사용자는 현재 가상 시간에서 시작하므로 밀린 몫을 한꺼번에 가져가지 않음)
+   가중치는 SCHEDULER_USER_WEIGHTS (기본 SCHEDULER_DEFAULT_WEIGHT)
+3. 같은 사용자 안에서는 프로젝트 간 같은 방식으로 분배, 같은 대기열 안에서는 선착순
+
+대기열/상태는 현재 프로세스 기준이며 우선순위별 대기 수와 대기 시간(테넌트별은 본인 것만)은 /api/metrics에서 조회합니다.
+
+사용 예:
+    async with generation_scheduler.slot(timeout=60) as ticket:
+        ...
+        async with generation_scheduler.suspended(ticket, timeout=60):
+            ...  # 사용자 입력 대기 등 일하지 않는 구간은 슬롯을 반납했다가 다시 얻음
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.tenant import PRIORITIES, Tenant, current_tenant
+
+logger = logging.getLogger(__name__)
+
+# (사용자 ID, 프로젝트 ID, 우선순위)
+FlowKey = Tuple[Optional[int], Optional[int], str]
+
+
+class SchedulerTimeoutError(Exception):
+    """최대 대기 시간 안에 슬롯을 얻지 못한 경우"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """슬롯 요청 1건"""
+
+    __slots__ = ("tenant", "cost", "enqueued_at", "future", "granted")
+
+    def __init__(self, tenant: Tenant, cost: float):
+        self.tenant = tenant
+        self.cost = cost
+        self.enqueued_at = time.monotonic()
+        self.future: Optional[asyncio.Future] = None
+        # 슬롯을 차지하고 있는지 (반납을 한 번만 반영)
+        self.granted = False
+
+    @property
+    def flow(self) -> FlowKey:
+        return (self.tenant.user_id, self.tenant.project_id, self.tenant.priority)
+
+
+class FairScheduler:
+    """슬롯 수 제한 + 가중 공정 대기열"""
+
+    def __init__(self, name: str, slots: int):
+        """
+        Args:
+            name: 지표 라벨 (예: generation, gemini_quota)
+            slots: 동시에 실행할 수 있는 작업 수 (0 이하이면 제한 없이 통계만 기록)
+        """
+        self.name = name
+        self.slots = slots
+        self._running = 0
+        self._running_by_tenant: Counter = Counter()
+        self._queues: Dict[FlowKey, Deque[Ticket]] = {}
+        # 가상 시간: 사용자별 (받은 몫 / 가중치), 사용자 안에서 프로젝트별 받은 몫
+        self._vclock = 0.0
+        self._user_vtime: Dict[Optional[int], float] = {}
+        self._project_vclock: Dict[Optional[int], float] = {}
+        self._project_vtime: Dict[Tuple[Optional[int], Optional[int]], float] = {}
+
+        self.stats = {
+            "granted": 0,
+            "queued": 0,
+            "timeouts": 0,
+            "cancelled": 0
+        }
+
+    @staticmethod
+    def weight(user_id: Optional[int]) -> float:
+        weight = settings.SCHEDULER_USER_WEIGHTS.get(str(user_id), settings.SCHEDULER_DEFAULT_WEIGHT)
+        return max(float(weight), 1e-3)
+
+    @asynccontextmanager
+    async def slot(self, cost: float = 1.0, timeout: Optional[float] = None) -> AsyncIterator[Ticket]:
+        """슬롯을 얻어 블록을 실행하고 반납"""
+        ticket = await self.acquire(cost, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    @asynccontextmanager
+    async def suspended(self, ticket: Ticket, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        블록을 실행하는 동안 슬롯을 반납하고, 끝나면 같은 테넌트로 다시 대기열에 서서 슬롯을 얻음
+
+        사용자 입력을 기다리는 등 일하지 않는 구간이 다른 테넌트의 실행을 막지 않도록 합니다.
+        블록이 예외로 끝나면 슬롯을 다시 얻지 않습니다 (바깥 slot()의 반납은 무시됨).
+
+        Raises:
+            SchedulerTimeoutError: 블록이 끝난 뒤 timeout 안에 슬롯을 다시 얻지 못한 경우
+        """
+        self.release(ticket)
+        yield
+        ticket.enqueued_at = time.monotonic()
+        await self._wait(ticket, timeout)
+
+    async def acquire(self, cost: float = 1.0, timeout: Optional[float] = None) -> Ticket:
+        """
+        현재 테넌트(app.utils.tenant)로 슬롯 요청
+
+        Args:
+            cost: 이 작업이 차지하는 몫 (예: 파이프라인 1회 = 1, 쿼터는 토큰 수)
+            timeout: 최대 대기 시간 (None이면 무제한)
+
+        Raises:
+            SchedulerTimeoutError: timeout 안에 슬롯을 얻지 못한 경우
+        """
+        return await self._wait(Ticket(current_tenant(), cost), timeout)
+
+    async def _wait(self, ticket: Ticket, timeout: Optional[float]) -> Ticket:
+        """슬롯이 비어 있으면 바로, 아니면 대기열에서 차례가 올 때까지 기다림"""
+        if self.slots <= 0 or (self._running < self.slots and not self._queues):
+            self._grant(ticket)
+            return ticket
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._activate(ticket)
+        self._queues.setdefault(ticket.flow, deque()).append(ticket)
+        self.stats["queued"] += 1
+        metrics.incr("scheduler.queued", scheduler=self.name, priority=ticket.tenant.priority)
+        self._dispatch()
+
+        try:
+            # 대기가 끝나는 순간 슬롯을 받은 경우를 구분하기 위해 future 자체는 취소하지 않음
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if ticket.future.done():
+                self.release(ticket)
+            else:
+                ticket.future.cancel()
+                self._remove(ticket)
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+                metrics.incr("scheduler.timeouts", scheduler=self.name, priority=ticket.tenant.priority)
+                raise SchedulerTimeoutError(
+                    f"작업 대기 시간 초과 ({self.name}, {ticket.tenant.key}, 대기 {self.queue_depth()}건)",
+                    retry_after=timeout
+                )
+            self.stats["cancelled"] += 1
+            raise
+        return ticket
+
+    def release(self, ticket: Ticket):
+        """슬롯 반납 후 다음 작업 실행"""
+        if not ticket.granted:
+            return
+        ticket.granted = False
+        self._running -= 1
+        key = ticket.tenant.key
+        self._running_by_tenant[key] -= 1
+        if self._running_by_tenant[key] <= 0:
+            del self._running_by_tenant[key]
+        self._dispatch()
+
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    # === 내부 ===
+
+    def _activate(self, ticket: Ticket):
+        """대기열이 비어 있던 사용자/프로젝트는 현재 가상 시간에서 시작 (쉬는 동안 몫이 쌓이지 않음)"""
+        user_id, project_id, _ = ticket.flow
+        if not any(flow[0] == user_id for flow in self._queues):
+            self._user_vtime[user_id] = max(self._user_vtime.get(user_id, 0.0), self._vclock)
+        if not any(flow[:2] == (user_id, project_id) for flow in self._queues):
+            project = (user_id, project_id)
+            self._project_vtime[project] = max(
+                self._project_vtime.get(project, 0.0), self._project_vclock.get(user_id, 0.0)
+            )
+
+    def _rank(self, ticket: Ticket, now: float) -> int:
+        rank = PRIORITIES.index(ticket.tenant.priority)
+        if settings.SCHEDULER_AGING_SECONDS > 0:
+            rank -= int((now - ticket.enqueued_at) / settings.SCHEDULER_AGING_SECONDS)
+        return max(0, rank)
+
+    def _select(self) -> FlowKey:
+        """우선순위 → 사용자 가상 시간 → 프로젝트 가상 시간 → 도착 순서로 다음 대기열 선택"""
+        now = time.monotonic()
+
+        def order(flow: FlowKey):
+            head = self._queues[flow][0]
+            return (
+                self._rank(head, now),
+                self._user_vtime.get(flow[0], 0.0),
+                self._project_vtime.get(flow[:2], 0.0),
+                head.enqueued_at
+            )
+
+        return min(self._queues, key=order)
+
+    def _dispatch(self):
+        while self._queues and self._running < self.slots:
+            flow = self._select()
+            queue = self._queues[flow]
+            ticket = queue.popleft()
+            if not queue:
+                del self._queues[flow]
+            self._charge(ticket)
+            self._grant(ticket)
+            ticket.future.set_result(None)
+
+    def _charge(self, ticket: Ticket):
+        """대기열에서 꺼낸 작업의 몫을 사용자/프로젝트 가상 시간에 반영"""
+        user_id, project_id, _ = ticket.flow
+        project = (user_id, project_id)
+        self._vclock = max(self._vclock, self._user_vtime.get(user_id, 0.0))
+        self._user_vtime[user_id] = self._user_vtime.get(user_id, 0.0) + ticket.cost / self.weight(user_id)
+        self._project_vclock[user_id] = max(self._project_vclock.get(user_id, 0.0), self._project_vtime.get(project, 0.0))
+        self._project_vtime[project] = self._project_vtime.get(project, 0.0) + ticket.cost
+
+        # 현재 가상 시간보다 뒤처진 사용자는 다시 들어올 때 현재 가상 시간에서 시작하므로 기록 정리
+        for idle in [u for u, vtime in self._user_vtime.items() if vtime <= self._vclock]:
+            if not any(flow[0] == idle for flow in self._queues):
+                del self._user_vtime[idle]
+                self._project_vclock.pop(idle, None)
+                for key in [key for key in self._project_vtime if key[0] == idle]:
+                    del self._project_vtime[key]
+
+    def _grant(self, ticket: Ticket):
+        ticket.granted = True
+        self._running += 1
+        self._running_by_tenant[ticket.tenant.key] += 1
+        self.stats["granted"] += 1
+        metrics.observe(
+            "scheduler.wait_seconds",
+            time.monotonic() - ticket.enqueued_at,
+            scheduler=self.name,
+            priority=ticket.tenant.priority
+        )
+
+    def _remove(self, ticket: Ticket):
+        queue = self._queues.get(ticket.flow)
+        if queue is None:
+            return
+        try:
+            queue.remove(ticket)
+        except ValueError:
+            return
+        if not queue:
+            del self._queues[ticket.flow]
+
+    def get_stats(self, user_id: Optional[int] = None) -> Dict:
+        """
+        슬롯 사용량, 우선순위별 대기 수, 가장 오래 기다린 시간
+
+        다른 사용자의 사용/프로젝트 정보가 드러나지 않도록 전체 값은 합계(테넌트 수)만 보여주고,
+        테넌트별 실행/대기 수는 user_id 사용자의 테넌트만 포함합니다.
+        """
+        now = time.monotonic()
+        own_prefix = f"user:{user_id}/" if user_id is not None else None
+        active = set(self._running_by_tenant)
+        queued_by_priority: Counter = Counter()
+        oldest_wait = 0.0
+        tenants: Dict[str, Dict] = {}
+        for key, running in self._running_by_tenant.items():
+            if own_prefix and key.startswith(own_prefix):
+                tenants.setdefault(key, {"running": 0, "queued": {}, "oldest_wait_seconds": 0.0})["running"] = running
+        for flow, queue in self._queues.items():
+            tenant = queue[0].tenant
+            wait = round(now - queue[0].enqueued_at, 3)
+            active.add(tenant.key)
+            queued_by_priority[tenant.priority] += len(queue)
+            oldest_wait = max(oldest_wait, wait)
+            if not (own_prefix and tenant.key.startswith(own_prefix)):
+                continue
+            entry = tenants.setdefault(tenant.key, {"running": 0, "queued": {}, "oldest_wait_seconds": 0.0})
+            entry["queued"][tenant.priority] = len(queue)
+            entry["oldest_wait_seconds"] = max(entry["oldest_wait_seconds"], wait)
+            entry["weight"] = self.weight(tenant.user_id)
+
+        return {
+            **self.stats,
+            "slots": self.slots,
+            "running": self._running,
+            "queue_depth": self.queue_depth(),
+            "queued_by_priority": dict(queued_by_priority),
+            "oldest_wait_seconds": oldest_wait,
+            "active_tenants": len(active),
+            "tenants": tenants
+        }
+
+
+# 싱글톤 인스턴스 (생성 파이프라인 동시 실행 수, ContentPipeline.run에서 사용)
+generation_scheduler = FairScheduler("generation", slots=settings.SCHEDULER_GENERATION_SLOTS)
@@ -4,17 +4,176 @@ Gemini API 서비스 모듈
 """
 
 import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Type, TypeVar
 import logging
 import json
 import time
+import asyncio
+from pydantic import BaseModel
 from app.config import settings
+from app.schemas.content import (
+    StrategyListOutput,
+    CopyListOutput,
+    TargetInsightsOutput,
+    ChatAnalysisOutput,
+    UserIntentOutput,
+    FusedContentOutput
+)
+from app.services.circuit_breaker import circuit_breakers, CircuitOpenError
+from app.services.client_pool import client_pool
+from app.services.hedging import request_hedger
+from app.services.llm_cache import llm_cache
+from app.services.model_router import model_router
+from app.services.prompt_registry import prompt_registry
+from app.services.provider_sim import provider_sim
+from app.services.quota_governor import gemini_quota, QuotaTimeoutError
+from app.utils.gemini_schema import finish_reason_name, parse_llm_json, structured_generation_config
+from app.utils.json_stream import parse_partial_json
+from app.utils.metrics import metrics
+from app.utils.deadline import cap_timeout, current_deadline, remaining_budget
+from app.utils.retry import backoff_delay
 
 logger = logging.getLogger(__name__)
 
-# Gemini API 설정
-if settings.GEMINI_API_KEY:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
+T = TypeVar("T")
+
+# 카피 톤별 설명
+COPY_TONE_DESCRIPTIONS = {
+    "professional": "격식 있고 전문적인 톤, 40-50자",
+    "casual": "친근하고 편안한 톤, 30-40자",
+    "impact": "짧고 강렬한 톤, 15-25자"
+}
+
+# 자주 쓰는 프롬프트의 고정 지시문 (컨텍스트 캐시에 등록, 요청별 입력은 뒤에 붙임)
+COPY_PROMPT_PREFIX = """
+당신은 전문 카피라이터이자 SNS 마케팅 전문가입니다.
+아래에 주어지는 제품, 전략, 타겟 정보를 바탕으로 요청된 톤의 광고 카피를 작성합니다.
+
+**카피 작성 원칙:**
+1. **강력한 후크**: 첫 3초 안에 타겟의 관심을 사로잡아야 합니다
+2. **감정 유발**: 공감, 설렘, 궁금증, 욕구 중 하나를 강하게 자극하세요
+3. **차별화된 가치**: 경쟁사와 구별되는 핵심 베네핏을 명확하게 전달하세요
+4. **행동 유도**: 클릭, 구매, 저장 등 구체적인 행동을 유도하세요
+5. **타겟 언어 사용**: 타겟이 일상에서 쓰는 표현과 말투를 사용하세요
+
+**성과 높은 카피의 특징:**
+- 타겟의 pain point를 정확히 짚어냅니다
+- 구체적인 숫자나 사실을 포함합니다
+- 호기심을 자극하는 질문이나 문장을 사용합니다
+- 타겟이 원하는 결과를 명확히 제시합니다
+- 긴급성이나 희소성을 암시합니다
+
+**해시태그 생성 가이드 (15-20개):**
+1. **제품 관련** (5-7개): 제품명, 카테고리, 주요 특징
+2. **타겟 관련** (3-5개): 연령대, 라이프스타일, 관심사
+3. **트렌드 키워드** (3-5개): 인기 검색어, 시즌, 트렌드
+4. **감성 키워드** (2-3개): 감정, 분위기, 느낌
+5. **실용 키워드** (2-3개): 용도, 장소, 상황
+
+해시태그는 다음 원칙을 따라주세요:
+- 실제 SNS에서 검색량이 많은 키워드 우선
+- 너무 일반적이거나 너무 구체적이지 않게
+- 한글과 영문 적절히 혼합
+- # 기호 포함
+
+JSON 형식으로 출력:
+{
+  "copies": [
+    {
+      "id": 1,
+      "tone": "요청된 톤",
+      "text": "카피 내용",
+      "hashtags": ["#태그1", "#태그2", ... 15-20개],
+      "length": 글자수
+    }
+  ]
+}
+
+JSON만 출력해주세요.
+"""
+
+IMAGE_PROMPT_PREFIX = """
+You are an expert at creating highly detailed image generation prompts for high-converting marketing and advertising visuals.
+
+Create a professional, detailed image generation prompt that will maximize engagement, clicks, and conversion rates,
+based on the copy, product, target audience and marketing strategy given below.
+
+**CRITICAL: The image must be eye-catching, scroll-stopping, and highly shareable.**
+
+REQUIREMENTS for a HIGH-PERFORMING visual:
+
+1. COMPOSITION & SUBJECT:
+   - Clearly describe the main subject (product, person, or scene)
+   - Specify exact positioning, angles, and framing
+   - Include product details (packaging, texture, materials)
+
+2. LIGHTING & ATMOSPHERE:
+   - Professional studio lighting or natural lighting setup
+   - Specific mood (bright, warm, moody, fresh, luxurious, etc.)
+   - Time of day if relevant
+
+3. COLOR PALETTE:
+   - Specific color schemes that match the brand/product
+   - Color harmony and complementary colors
+   - Saturation levels (vibrant, muted, pastel, etc.)
+
+4. STYLE & QUALITY:
+   - Photography style: commercial product photography, lifestyle photography, flat lay, etc.
+   - Camera details: shallow depth of field, bokeh, sharp focus
+   - Quality markers: 8K, ultra detailed, professional, award-winning
+
+5. BACKGROUND & CONTEXT:
+   - Specific background elements
+   - Props or supporting elements
+   - Environmental context
+
+6. BRAND ALIGNMENT:
+   - Match the visual style to target demographic
+   - Align with the marketing strategy emotion
+
+OUTPUT FORMAT:
+Write a single, detailed English prompt (100-200 words) that combines all these elements.
+Use professional photography and advertising terminology.
+Focus on visual impact and commercial appeal.
+DO NOT include any explanations - output ONLY the prompt.
+
+Example structure:
+"Professional commercial photography of [product], [key features], [composition], [lighting setup], [color palette], [background], [mood], [camera settings], [quality markers], [style references]"
+"""
+
+TARGET_INSIGHTS_PROMPT_PREFIX = """
+당신은 마케팅 인사이트 전문가입니다.
+
+아래에 주어지는 제품과 타겟 고객 정보를 분석하여 마케팅에 필요한 핵심 인사이트를 제공해주세요.
+
+**중요**: 제품 카테고리를 필수적으로 고려하여 분석해주세요.
+예를 들어, 패션/의류 제품이라면 패션, 스타일, 트렌드 등 패션 관련 키워드를 중심으로 분석해야 합니다.
+
+타겟 고객을 위한 마케팅 인사이트를 JSON 형식으로 제공해주세요:
+
+{
+  "target_ages": ["타겟 연령대 2-3개 (형식: '20-29', '30-39' 등)"],
+  "target_interests": ["제품 카테고리와 가장 관련성 높은 관심사 키워드 7-10개 (패션이면 패션 관련, 뷰티면 뷰티 관련)"],
+  "pain_points": ["이 타겟 고객이 겪는 주요 고민/문제점 5-7가지"],
+  "preferred_channels": ["이 타겟이 자주 사용하는 미디어/SNS 채널 5-7가지"],
+  "tone_preferences": ["이 타겟이 선호하는 커뮤니케이션 톤 3가지"],
+  "message_strategies": ["효과적인 메시지 전략 5-7가지"],
+  "lifestyle_traits": ["이 타겟의 라이프스타일 특징 5-7가지"],
+  "purchase_motivations": ["구매를 결정하는 주요 동기 5-7가지"]
+}
+
+**반드시 지켜야 할 원칙**:
+1. target_ages는 사용자가 지정하지 않은 경우에만 생성 (지정된 경우 해당 연령대 그대로 사용)
+2. target_interests는 제품 카테고리와 직접적으로 연관된 키워드로만 구성
+3. 각 배열은 최소 5개, 최대 10개의 항목을 포함
+4. 구체적이고 실행 가능한 인사이트로 작성
+
+JSON만 출력하고 다른 설명은 하지 마세요.
+"""
+
+prompt_registry.register("copy", COPY_PROMPT_PREFIX)
+prompt_registry.register("image_prompt", IMAGE_PROMPT_PREFIX)
+prompt_registry.register("target_insights", TARGET_INSIGHTS_PROMPT_PREFIX)
 
 
 class GeminiService:
@@ -22,63 +181,516 @@ class GeminiService:
 
     def __init__(self):
         self.model_name = settings.GEMINI_MODEL
-        self.model = genai.GenerativeModel(self.model_name)
+        self.model = client_pool.gemini_model(self.model_name)
+        self.breaker = circuit_breakers.get("gemini")
+
+    def _build_generation_config(
+        self,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+        schema_model: Optional[Type[BaseModel]] = None
+    ) -> Dict:
+        """
+        generation_config 구성
+
+        schema_model이 주어지고 GEMINI_STRUCTURED_OUTPUT이 켜져 있으면
+        response_mime_type/response_schema를 추가해 스키마에 맞는 JSON만 생성하게 합니다.
+        """
+        generation_config = {
+            "temperature": temperature,
+        }
+        if max_tokens:
+            generation_config["max_output_tokens"] = max_tokens
+        if schema_model is not None and settings.GEMINI_STRUCTURED_OUTPUT:
+            generation_config.update(structured_generation_config(schema_model))
+        return generation_config
+
+    def _get_model(self, model_name: str) -> genai.GenerativeModel:
+        """모델명에 해당하는 GenerativeModel (기본 모델이 아니면 model_router에서 조회)"""
+        if model_name == self.model_name:
+            return self.model
+        return model_router.get_model(model_name)
+
+    def _resolve_route(self, route: Optional[str], tier: Optional[str], max_tokens: Optional[int]) -> Tuple[Optional[Dict], str, Optional[int], Optional[float]]:
+        """
+        라우트 설정 적용
+
+        Returns:
+            (라우트 설정, 모델명, 최대 토큰 수, 타임아웃) - 라우트가 없으면 기본 모델, 타임아웃 없음
+            호출자가 max_tokens를 지정하면 라우트의 토큰 한도보다 우선합니다.
+            요청 남은 시간이 DEADLINE_TOKEN_CAP_BELOW_SECONDS보다 적으면 토큰 한도를 DEADLINE_MAX_OUTPUT_TOKENS로 줄입니다.
+        """
+        if not route:
+            return None, self.model_name, self._deadline_token_cap(max_tokens, "gemini"), None
+        route_config = model_router.resolve(route, tier)
+        return (
+            route_config,
+            route_config["model_name"],
+            self._deadline_token_cap(max_tokens or route_config["max_tokens"], route),
+            route_config["timeout"]
+        )
+
+    @staticmethod
+    def _deadline_token_cap(max_tokens: Optional[int], stage: str) -> Optional[int]:
+        """남은 시간이 부족하면 출력 토큰 한도 축소 (출력이 짧을수록 응답이 빨리 끝남)"""
+        deadline = current_deadline()
+        cap = settings.DEADLINE_MAX_OUTPUT_TOKENS
+        if deadline is None or deadline.remaining() >= settings.DEADLINE_TOKEN_CAP_BELOW_SECONDS:
+            return max_tokens
+        if max_tokens is not None and max_tokens <= cap:
+            return max_tokens
+        deadline.degrade(stage, f"max_output_tokens={cap}")
+        return cap
+
+    def _record_usage(self, response, model_name: Optional[str] = None):
+        """응답의 토큰 사용량을 지표로 기록 (gemini.prompt_tokens / gemini.output_tokens)"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        model_name = model_name or self.model_name
+        metrics.incr("gemini.calls", model=model_name)
+        metrics.incr("gemini.prompt_tokens", usage.prompt_token_count or 0, model=model_name)
+        metrics.incr("gemini.output_tokens", usage.candidates_token_count or 0, model=model_name)
+
+    async def _send(
+        self,
+        prompt: str,
+        generation_config: Dict,
+        prompt_name: Optional[str] = None,
+        stream: bool = False,
+        model_name: Optional[str] = None,
+        operation: Optional[str] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Gemini 호출 1회
+
+        prompt_name이 주어지면 prompt는 요청별 입력 부분이며, 등록된 고정 지시문은
+        컨텍스트 캐시로 전송합니다 (캐시를 쓸 수 없으면 전체 프롬프트 전송).
+        호출 지연 시간/상태는 client_pool에 "gemini"로 기록됩니다 (스트리밍은 첫 응답까지).
+        PROVIDER_SIM_MODE가 설정되면 provider_sim을 거쳐 기록/재생합니다
+        (operation은 재생 시 같은 작업의 기록을 찾는 데 사용, 기본값은 prompt_name 또는 모델명).
+
+        Returns:
+            (응답, 컨텍스트 캐시 사용 여부)
+        """
+        model_name = model_name or self.model_name
+        model = self._get_model(model_name)
+        sent = {"cached": False}
+
+        async def generate():
+            if prompt_name:
+                response, sent["cached"] = await prompt_registry.generate(
+                    prompt_name, prompt, model, model_name,
+                    generation_config=generation_config, stream=stream
+                )
+                return response
+            return await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=stream
+            )
+
+        async with client_pool.track("gemini", len(prompt.encode())) as call:
+            if provider_sim.enabled:
+                full_prompt = prompt_registry.full_prompt(prompt_name, prompt) if prompt_name else prompt
+                response = await provider_sim.gemini(
+                    operation or prompt_name or model_name,
+                    (model_name, full_prompt, generation_config),
+                    generate,
+                    stream=stream
+                )
+            else:
+                response = await generate()
+
+            if not stream and response.parts:
+                call["bytes_in"] = len(response.text.encode())
+
+        return response, sent["cached"]
+
+    async def _generate_with_retry(
+        self,
+        prompt: str,
+        generation_config: Dict,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3,
+        prompt_name: Optional[str] = None,
+        model_name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        route: Optional[str] = None
+    ) -> Any:
+        """
+        Gemini 호출 (쿼터 확보 + 지수 백오프 재시도, timeout은 시도 1회 기준)
+
+        429/5xx/타임아웃만 재시도하고(Retry-After 우선, 지터 적용), 안전 필터 차단 등은 바로 실패합니다.
+        gemini 서킷이 열려 있으면 호출하지 않고 CircuitOpenError를 발생시킵니다.
+        요청 데드라인이 있으면 시도마다 타임아웃을 남은 시간으로 제한하고, 데드라인을 넘기는 재시도는 하지 않습니다.
+        텍스트와 finish_reason을 모두 확인할 수 있도록 응답 객체를 반환합니다.
+        """
+        full_prompt = prompt_registry.full_prompt(prompt_name, prompt) if prompt_name else prompt
+        last_error = None
+
+        for attempt in range(max_retries):
+            attempt_timeout = cap_timeout(timeout)
+            probe = None
+            try:
+                probe = self.breaker.check()
+                await gemini_quota.acquire(
+                    gemini_quota.estimate_tokens(full_prompt, max_tokens),
+                    caller="gemini_service"
+                )
+
+                # 응답이 p95 지연을 넘기면 중복 요청 (HEDGING_ENABLED)
+                response, _ = await asyncio.wait_for(
+                    request_hedger.run(
+                        "gemini.generate",
+                        lambda: self._send(
+                            prompt, generation_config, prompt_name, model_name=model_name, operation=route
+                        ),
+                        before_hedge=lambda: gemini_quota.acquire(
+                            gemini_quota.estimate_tokens(full_prompt, max_tokens),
+                            caller="gemini_service.hedge"
+                        )
+                    ),
+                    attempt_timeout
+                )
+
+                # finish_reason 확인
+                if not response.parts:
+                    logger.error(f"응답 없음. finish_reason: {response.candidates[0].finish_reason}")
+                    raise Exception(f"텍스트 생성 실패: finish_reason={response.candidates[0].finish_reason}")
+
+                self.breaker.record_success()
+                self._record_usage(response, model_name)
+                return response
+
+            except (QuotaTimeoutError, CircuitOpenError):
+                # 쿼터는 이미 최대 대기 시간만큼 기다렸고, 서킷이 열려 있으면 바로 실패
+                raise
+            except Exception as e:
+                last_error = e
+                self.breaker.record_failure(e)
+                if isinstance(e, asyncio.TimeoutError):
+                    logger.warning(f"Gemini 텍스트 생성 시도 {attempt + 1}/{max_retries} 시간 초과 ({attempt_timeout:.1f}초)")
+                else:
+                    logger.warning(f"Gemini 텍스트 생성 시도 {attempt + 1}/{max_retries} 실패: {str(e)}")
+
+                # 지수 백오프 (2초, 4초 기준 + 지터), 재시도해도 같은 결과인 오류는 바로 실패
+                wait_time = backoff_delay(e, attempt, 2.0, settings.RETRY_MAX_DELAY_SECONDS)
+                remaining = remaining_budget()
+                if wait_time is None or attempt == max_retries - 1 or (remaining is not None and wait_time >= remaining):
+                    break
+                logger.info(f"{wait_time:.1f}초 후 재시도...")
+                await asyncio.sleep(wait_time)
+            finally:
+                # 결과를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등) 자리 반납
+                self.breaker.release(probe)
+
+        logger.error(f"Gemini 텍스트 생성 최종 실패 (시도 {attempt + 1}회): {str(last_error)}")
+        raise last_error
+
+    async def _timed_route(self, route_config: Optional[Dict], call: Awaitable[T]) -> T:
+        """라우트 호출 지연 시간/실패 기록 (라우트가 없으면 그대로 실행)"""
+        if route_config is None:
+            return await call
+
+        start = time.monotonic()
+        try:
+            result = await call
+        except Exception:
+            model_router.record(route_config["route"], route_config["tier"], time.monotonic() - start, False)
+            raise
+        model_router.record(route_config["route"], route_config["tier"], time.monotonic() - start, True)
+        return result
 
     async def generate_text(
         self,
         prompt: str,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        use_cache: bool = True,
+        prompt_name: Optional[str] = None,
+        route: Optional[str] = None
     ) -> str:
         """
         텍스트 생성 (재시도 로직 포함)
 
+        Gemini 비동기 클라이언트(generate_content_async)를 사용하므로
+        응답을 기다리는 동안 이벤트 루프를 점유하지 않습니다.
+        동일한 (모델, 프롬프트, 생성 설정) 요청은 LLM 응답 캐시에서 반환합니다.
+
         Args:
             prompt: 입력 프롬프트
             temperature: 창의성 조절 (0.0-1.0)
             max_tokens: 최대 토큰 수
             max_retries: 최대 재시도 횟수
+            use_cache: 응답 캐시 사용 여부 (창의적인 생성은 False 권장)
+            prompt_name: 등록된 프롬프트 이름 (prompt는 요청별 입력 부분, prompt_registry 참고)
+            route: 라우트 이름 (모델 등급/토큰 한도/타임아웃, model_router 참고)
 
         Returns:
             생성된 텍스트
         """
-        last_error = None
+        route_config, model_name, max_tokens, timeout = self._resolve_route(route, None, max_tokens)
+        generation_config = self._build_generation_config(temperature, max_tokens)
+
+        cache_key = None
+        if use_cache and settings.LLM_CACHE_ENABLED:
+            cache_key = llm_cache.make_key(
+                model_name,
+                prompt_registry.full_prompt(prompt_name, prompt) if prompt_name else prompt,
+                generation_config
+            )
+            cached_text = await llm_cache.get(cache_key)
+            if cached_text is not None:
+                logger.info("LLM 응답 캐시 적중")
+                return cached_text
+        else:
+            llm_cache.record_bypass()
+
+        response = await self._timed_route(
+            route_config,
+            self._generate_with_retry(
+                prompt, generation_config, max_tokens, max_retries, prompt_name, model_name, timeout, route
+            )
+        )
+        response_text = response.text
+
+        if cache_key:
+            await llm_cache.set(cache_key, response_text)
+
+        return response_text
+
+    async def generate_json(
+        self,
+        prompt: str,
+        schema_model: Type[BaseModel],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3,
+        use_cache: bool = True,
+        prompt_name: Optional[str] = None,
+        route: Optional[str] = None,
+        tier: Optional[str] = None
+    ) -> Any:
+        """
+        스키마에 맞는 JSON 생성
+
+        구조화 출력(response_schema)으로 생성하고, 형식 오류는 재호출 없이
+        복구 파서로 처리합니다. 출력 토큰 한도로 잘린 응답은 복구하지 않고 실패로 처리합니다.
+        재시도는 API 호출 실패에만 적용되며, 캐시에는 스키마 검증을 통과한 결과만 저장합니다.
+        light 등급 라우트의 출력이 잘렸거나 스키마 검증에 실패하면 standard 모델로 다시 생성합니다.
+
+        Args:
+            prompt: 입력 프롬프트
+            schema_model: 출력 형식을 정의한 Pydantic 모델 (app/schemas)
+            temperature: 창의성 조절 (0.0-1.0)
+            max_tokens: 최대 토큰 수
+            max_retries: 최대 재시도 횟수
+            use_cache: 응답 캐시 사용 여부 (창의적인 생성은 False 권장)
+            prompt_name: 등록된 프롬프트 이름 (prompt는 요청별 입력 부분, prompt_registry 참고)
+            route: 라우트 이름 (모델 등급/토큰 한도/타임아웃, model_router 참고)
+            tier: 라우트 등급 강제 지정 (escalation 시 사용)
+
+        Returns:
+            검증된 JSON 데이터 (dict 또는 list)
+
+        Raises:
+            ValueError: 파싱 또는 스키마 검증 실패, 잘린 응답 (TruncatedOutputError)
+        """
+        route_config, model_name, routed_max_tokens, timeout = self._resolve_route(route, tier, max_tokens)
+        generation_config = self._build_generation_config(temperature, routed_max_tokens, schema_model)
+        mode = "structured" if "response_schema" in generation_config else "text"
+
+        cache_key = None
+        if use_cache and settings.LLM_CACHE_ENABLED:
+            cache_key = llm_cache.make_key(
+                model_name,
+                prompt_registry.full_prompt(prompt_name, prompt) if prompt_name else prompt,
+                {**generation_config, "output_schema": schema_model.__name__}
+            )
+            cached_json = await llm_cache.get(cache_key)
+            if cached_json is not None:
+                logger.info("LLM 응답 캐시 적중")
+                return json.loads(cached_json)
+        else:
+            llm_cache.record_bypass()
+
+        async def generate_and_parse():
+            response = await self._generate_with_retry(
+                prompt, generation_config, routed_max_tokens, max_retries, prompt_name, model_name, timeout, route
+            )
+            return parse_llm_json(response.text, schema_model, mode, finish_reason_name(response))
+
+        try:
+            parsed_data = await self._timed_route(route_config, generate_and_parse())
+        except ValueError as e:
+            next_tier = model_router.escalation_tier(route_config["tier"]) if route_config else None
+            if next_tier is None:
+                raise
+            model_router.record_escalation(route, route_config["tier"], next_tier, str(e))
+            return await self.generate_json(
+                prompt, schema_model, temperature, max_tokens, max_retries,
+                use_cache, prompt_name, route=route, tier=next_tier
+            )
+
+        if cache_key:
+            await llm_cache.set(cache_key, json.dumps(parsed_data, ensure_ascii=False))
+
+        return parsed_data
+
+    async def stream_text(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3,
+        schema_model: Optional[Type[BaseModel]] = None,
+        prompt_name: Optional[str] = None,
+        route: Optional[str] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        텍스트 생성 (토큰 스트리밍)
+
+        Gemini가 출력하는 텍스트 조각을 도착하는 즉시 반환합니다.
+        첫 조각을 받기 전에 실패한 경우에만 재시도하며, 스트리밍 결과는 캐시하지 않습니다.
+
+        Args:
+            prompt: 입력 프롬프트
+            temperature: 창의성 조절 (0.0-1.0)
+            max_tokens: 최대 토큰 수
+            max_retries: 최대 재시도 횟수
+            schema_model: JSON 출력 스키마 (구조화 출력 사용 시)
+            prompt_name: 등록된 프롬프트 이름 (prompt는 요청별 입력 부분, prompt_registry 참고)
+            route: 라우트 이름 (타임아웃은 첫 응답까지 적용, model_router 참고)
+            outcome: 스트림이 끝나면 {"finish_reason": 마지막 조각의 finish_reason}을 기록할 dict
+
+        Yields:
+            생성된 텍스트 조각
+        """
+        route_config, model_name, max_tokens, timeout = self._resolve_route(route, None, max_tokens)
+        generation_config = self._build_generation_config(temperature, max_tokens, schema_model)
+        full_prompt = prompt_registry.full_prompt(prompt_name, prompt) if prompt_name else prompt
+
+        llm_cache.record_bypass()
+        route_start = time.monotonic()
 
         for attempt in range(max_retries):
+            received = False
+            probe = None
             try:
-                generation_config = {
-                    "temperature": temperature,
-                }
-                if max_tokens:
-                    generation_config["max_output_tokens"] = max_tokens
+                probe = self.breaker.check()
+                await gemini_quota.acquire(
+                    gemini_quota.estimate_tokens(full_prompt, max_tokens),
+                    caller="gemini_service"
+                )
 
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config=generation_config
+                start = time.monotonic()
+                response, cached = await asyncio.wait_for(
+                    self._send(
+                        prompt, generation_config, prompt_name,
+                        stream=True, model_name=model_name, operation=route
+                    ),
+                    cap_timeout(timeout)
                 )
 
-                # finish_reason 확인
-                if not response.parts:
-                    logger.error(f"응답 없음. finish_reason: {response.candidates[0].finish_reason}")
-                    raise Exception(f"텍스트 생성 실패: finish_reason={response.candidates[0].finish_reason}")
+                last_chunk = None
+                async for chunk in response:
+                    last_chunk = chunk
+                    if chunk.parts:
+                        received = True
+                        yield chunk.text
+
+                if not received:
+                    raise Exception("텍스트 생성 실패: 스트리밍 응답이 비어 있습니다")
+
+                # 토큰 사용량과 finish_reason은 마지막 조각에 포함됨
+                if outcome is not None:
+                    outcome["finish_reason"] = finish_reason_name(last_chunk)
+                self.breaker.record_success()
+                self._record_usage(last_chunk, model_name)
+                if prompt_name:
+                    prompt_registry.record(prompt_name, cached, time.monotonic() - start, last_chunk)
+                if route_config:
+                    model_router.record(route, route_config["tier"], time.monotonic() - route_start, True)
+                return
+
+            except QuotaTimeoutError:
+                raise
+            except Exception as e:
+                if not isinstance(e, CircuitOpenError):
+                    self.breaker.record_failure(e)
+                wait_time = backoff_delay(e, attempt, 2.0, settings.RETRY_MAX_DELAY_SECONDS)
+
+                # 이미 일부를 전송했다면 재시도하면 출력이 중복되므로 그대로 실패 처리
+                if received or wait_time is None or attempt == max_retries - 1:
+                    logger.error(f"Gemini 스트리밍 생성 실패: {str(e)}")
+                    if route_config:
+                        model_router.record(route, route_config["tier"], time.monotonic() - route_start, False)
+                    raise
+
+                logger.warning(f"Gemini 스트리밍 시도 {attempt + 1}/{max_retries} 실패: {str(e)}, {wait_time:.1f}초 후 재시도...")
+                await asyncio.sleep(wait_time)
+            finally:
+                # 결과를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등) 자리 반납
+                self.breaker.release(probe)
+
+    async def _stream_json(
+        self,
+        prompt: str,
+        result_key: str,
+        schema_model: Type[BaseModel],
+        temperature: float = 0.7,
+        prompt_name: Optional[str] = None,
+        route: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        JSON 응답 스트리밍 생성
 
-                return response.text
+        Yields:
+            {"type": "partial", "delta": "새 텍스트 조각", "data": [지금까지 파싱된 항목]}
+            {"type": "final", "data": [완성된 항목 리스트]}
+        """
+        mode = "structured" if settings.GEMINI_STRUCTURED_OUTPUT else "text"
+        response_text = ""
+        last_partial = None
+        outcome: Dict[str, Any] = {}
 
-            except Exception as e:
-                last_error = e
-                logger.warning(f"Gemini 텍스트 생성 시도 {attempt + 1}/{max_retries} 실패: {str(e)}")
+        async for delta in self.stream_text(
+            prompt, temperature=temperature, schema_model=schema_model,
+            prompt_name=prompt_name, route=route, outcome=outcome
+        ):
+            response_text += delta
 
-                if attempt < max_retries - 1:
-                    # 지수 백오프: 2초, 4초, 8초
-                    wait_time = 2 ** (attempt + 1)
-                    logger.info(f"{wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
+            partial = parse_partial_json(response_text)
+            partial_items = partial.get(result_key, []) if isinstance(partial, dict) else []
 
-        logger.error(f"Gemini 텍스트 생성 최종 실패 (재시도 {max_retries}회): {str(last_error)}")
-        raise last_error
+            if partial_items != last_partial:
+                last_partial = partial_items
+                yield {"type": "partial", "delta": delta, "data": partial_items}
 
-    async def generate_marketing_strategies(
+        # 출력 토큰 한도로 잘린 스트림은 비스트리밍 호출과 같이 TruncatedOutputError
+        parsed_data = parse_llm_json(response_text, schema_model, mode, outcome.get("finish_reason"))
+
+        yield {"type": "final", "data": parsed_data[result_key]}
+
+    def _format_past_performance(self, past_performance: Optional[List[Dict]]) -> str:
+        """RAG로 찾은 과거 유사 콘텐츠 성과를 프롬프트 섹션으로 변환 (없으면 빈 문자열)"""
+        if not past_performance:
+            return ""
+
+        rag_section = "\n\n**과거 유사 콘텐츠 성과 데이터 (참고용):**\n"
+        for i, perf in enumerate(past_performance, 1):
+            rag_section += f"""
+{i}. 유사도: {perf['similarity_score']:.2f}
+   - 카피: "{perf['copy_text'][:100]}..."
+   - 성과: 도달 {perf['performance']['impressions']:,}명, 참여율 {perf['performance']['engagement_rate']:.1f}%, CTR {perf['performance']['ctr']:.2f}%, 전환율 {perf['performance']['conversion_rate']:.2f}%
+"""
+        rag_section += "\n위 데이터를 참고하여 더 현실적이고 효과적인 전략을 수립해주세요.\n"
+        return rag_section
+
+    def _build_strategy_prompt(
         self,
         product_name: str,
         product_description: str,
@@ -87,37 +699,12 @@ class GeminiService:
         target_gender: str,
         target_interests: List[str],
         past_performance: Optional[List[Dict]] = None
-    ) -> List[Dict]:
-        """
-        마케팅 전략 3가지 제안 (RAG 활용)
-
-        Args:
-            past_performance: 과거 유사 콘텐츠 성과 데이터 (RAG)
-
-        Returns:
-            [
-                {
-                    "id": 1,
-                    "name": "전략명",
-                    "core_message": "핵심 메시지",
-                    "emotion": "감성적|이성적|사회적",
-                    "expected_effect": "예상 효과"
-                }
-            ]
-        """
+    ) -> str:
+        """마케팅 전략 생성 프롬프트 구성 (RAG 데이터 포함)"""
         interests_str = ", ".join(target_interests)
 
         # RAG 데이터 포함 여부에 따라 프롬프트 구성
-        rag_section = ""
-        if past_performance and len(past_performance) > 0:
-            rag_section = "\n\n**과거 유사 콘텐츠 성과 데이터 (참고용):**\n"
-            for i, perf in enumerate(past_performance, 1):
-                rag_section += f"""
-{i}. 유사도: {perf['similarity_score']:.2f}
-   - 카피: "{perf['copy_text'][:100]}..."
-   - 성과: 도달 {perf['performance']['impressions']:,}명, 참여율 {perf['performance']['engagement_rate']:.1f}%, CTR {perf['performance']['ctr']:.2f}%, 전환율 {perf['performance']['conversion_rate']:.2f}%
-"""
-            rag_section += "\n위 데이터를 참고하여 더 현실적이고 효과적인 전략을 수립해주세요.\n"
+        rag_section = self._format_past_performance(past_performance)
 
         prompt = f"""
 당신은 전문 마케팅 전략가입니다.
@@ -163,15 +750,46 @@ class GeminiService:
 
 JSON만 출력해주세요.
 """
+        return prompt
 
-        try:
-            response_text = await self.generate_text(prompt, temperature=0.8)
+    async def generate_marketing_strategies(
+        self,
+        product_name: str,
+        product_description: str,
+        category: str,
+        target_age: str,
+        target_gender: str,
+        target_interests: List[str],
+        past_performance: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        마케팅 전략 3가지 제안 (RAG 활용)
 
-            # JSON 파싱
-            parsed_data = self._parse_json_response(response_text)
+        Args:
+            past_performance: 과거 유사 콘텐츠 성과 데이터 (RAG)
 
-            if "strategies" not in parsed_data:
-                raise ValueError("응답에 'strategies' 키가 없습니다.")
+        Returns:
+            [
+                {
+                    "id": 1,
+                    "name": "전략명",
+                    "core_message": "핵심 메시지",
+                    "emotion": "감성적|이성적|사회적",
+                    "expected_effect": "예상 효과"
+                }
+            ]
+        """
+        prompt = self._build_strategy_prompt(
+            product_name, product_description, category,
+            target_age, target_gender, target_interests, past_performance
+        )
+
+        try:
+            # 창의적인 생성이므로 캐시 사용 안 함 (재생성 시 새로운 전략 필요)
+            parsed_data = await self.generate_json(
+                prompt, StrategyListOutput, temperature=0.8, use_cache=False,
+                route="generate_marketing_strategies"
+            )
 
             strategies = parsed_data["strategies"]
 
@@ -185,6 +803,67 @@ JSON만 출력해주세요.
             logger.error(f"전략 생성 실패: {str(e)}")
             raise
 
+    async def stream_marketing_strategies(
+        self,
+        product_name: str,
+        product_description: str,
+        category: str,
+        target_age: str,
+        target_gender: str,
+        target_interests: List[str],
+        past_performance: Optional[List[Dict]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        마케팅 전략 3가지 제안 (토큰 스트리밍)
+
+        Yields:
+            {"type": "partial", "delta": "...", "data": [부분 전략 리스트]}
+            {"type": "final", "data": [전략 리스트]}
+        """
+        prompt = self._build_strategy_prompt(
+            product_name, product_description, category,
+            target_age, target_gender, target_interests, past_performance
+        )
+
+        try:
+            async for event in self._stream_json(
+                prompt, "strategies", StrategyListOutput, temperature=0.8,
+                route="generate_marketing_strategies"
+            ):
+                if event["type"] == "final" and len(event["data"]) != 3:
+                    logger.warning(f"전략 개수가 3개가 아닙니다: {len(event['data'])}개")
+                yield event
+
+        except Exception as e:
+            logger.error(f"전략 스트리밍 생성 실패: {str(e)}")
+            raise
+
+    def _build_copy_prompt(
+        self,
+        product_name: str,
+        product_description: str,
+        strategy: Dict,
+        target_age: str,
+        target_gender: str,
+        target_interests: List[str],
+        copy_tone: str = "professional"
+    ) -> str:
+        """광고 카피 생성 프롬프트의 요청별 입력 부분 (고정 지시문은 COPY_PROMPT_PREFIX)"""
+        interests_str = ", ".join(target_interests)
+
+        tone_desc = COPY_TONE_DESCRIPTIONS.get(copy_tone, COPY_TONE_DESCRIPTIONS["professional"])
+
+        prompt = f"""
+제품: {product_name}
+설명: {product_description}
+전략: {strategy.get('name')} - {strategy.get('core_message')}
+타겟: {target_age} {target_gender}, 관심사: {interests_str}
+요청된 톤: {copy_tone} ({tone_desc})
+
+위 전략을 기반으로 **{copy_tone}** 톤의 광고 카피를 작성해주세요. (JSON의 tone 값은 "{copy_tone}")
+"""
+        return prompt
+
     async def generate_copies(
         self,
         product_name: str,
@@ -212,86 +891,57 @@ JSON만 출력해주세요.
                 }
             ]
         """
-        interests_str = ", ".join(target_interests)
-
-        # 톤별 설명
-        tone_descriptions = {
-            "professional": "격식 있고 전문적인 톤, 40-50자",
-            "casual": "친근하고 편안한 톤, 30-40자",
-            "impact": "짧고 강렬한 톤, 15-25자"
-        }
-
-        tone_desc = tone_descriptions.get(copy_tone, tone_descriptions["professional"])
-
-        prompt = f"""
-당신은 전문 카피라이터이자 SNS 마케팅 전문가입니다.
-
-제품: {product_name}
-설명: {product_description}
-전략: {strategy.get('name')} - {strategy.get('core_message')}
-타겟: {target_age} {target_gender}, 관심사: {interests_str}
-요청된 톤: {copy_tone} ({tone_desc})
-
-**카피 작성 원칙:**
-1. **강력한 후크**: 첫 3초 안에 타겟의 관심을 사로잡아야 합니다
-2. **감정 유발**: 공감, 설렘, 궁금증, 욕구 중 하나를 강하게 자극하세요
-3. **차별화된 가치**: 경쟁사와 구별되는 핵심 베네핏을 명확하게 전달하세요
-4. **행동 유도**: 클릭, 구매, 저장 등 구체적인 행동을 유도하세요
-5. **타겟 언어 사용**: 타겟이 일상에서 쓰는 표현과 말투를 사용하세요
+        prompt = self._build_copy_prompt(
+            product_name, product_description, strategy,
+            target_age, target_gender, target_interests, copy_tone
+        )
 
-**성과 높은 카피의 특징:**
-- 타겟의 pain point를 정확히 짚어냅니다
-- 구체적인 숫자나 사실을 포함합니다
-- 호기심을 자극하는 질문이나 문장을 사용합니다
-- 타겟이 원하는 결과를 명확히 제시합니다
-- 긴급성이나 희소성을 암시합니다
+        try:
+            # 창의적인 생성이므로 캐시 사용 안 함 (재생성 시 새로운 카피 필요)
+            parsed_data = await self.generate_json(
+                prompt, CopyListOutput, temperature=0.9, use_cache=False, prompt_name="copy",
+                route="generate_copies"
+            )
 
-위 전략을 기반으로 **{copy_tone}** 톤의 광고 카피를 작성해주세요.
+            copies = parsed_data["copies"]
 
-**해시태그 생성 가이드 (15-20개):**
-1. **제품 관련** (5-7개): 제품명, 카테고리, 주요 특징
-2. **타겟 관련** (3-5개): 연령대, 라이프스타일, 관심사
-3. **트렌드 키워드** (3-5개): 인기 검색어, 시즌, 트렌드
-4. **감성 키워드** (2-3개): 감정, 분위기, 느낌
-5. **실용 키워드** (2-3개): 용도, 장소, 상황
+            return copies
 
-해시태그는 다음 원칙을 따라주세요:
-- 실제 SNS에서 검색량이 많은 키워드 우선
-- 너무 일반적이거나 너무 구체적이지 않게
-- 한글과 영문 적절히 혼합
-- # 기호 포함
+        except Exception as e:
+            logger.error(f"카피 생성 실패: {str(e)}")
+            raise
 
-JSON 형식으로 출력:
-{{
-  "copies": [
-    {{
-      "id": 1,
-      "tone": "{copy_tone}",
-      "text": "카피 내용",
-      "hashtags": ["#태그1", "#태그2", ... 15-20개],
-      "length": 글자수
-    }}
-  ]
-}}
+    async def stream_copies(
+        self,
+        product_name: str,
+        product_description: str,
+        strategy: Dict,
+        target_age: str,
+        target_gender: str,
+        target_interests: List[str],
+        copy_tone: str = "professional"
+    ) -> AsyncIterator[Dict]:
+        """
+        요청된 톤의 광고 카피 생성 (토큰 스트리밍)
 
-JSON만 출력해주세요.
-"""
+        Yields:
+            {"type": "partial", "delta": "...", "data": [부분 카피 리스트]}
+            {"type": "final", "data": [카피 리스트]}
+        """
+        prompt = self._build_copy_prompt(
+            product_name, product_description, strategy,
+            target_age, target_gender, target_interests, copy_tone
+        )
 
         try:
-            response_text = await self.generate_text(prompt, temperature=0.9)
-
-            # JSON 파싱
-            parsed_data = self._parse_json_response(response_text)
-
-            if "copies" not in parsed_data:
-                raise ValueError("응답에 'copies' 키가 없습니다.")
-
-            copies = parsed_data["copies"]
-
-            return copies
+            async for event in self._stream_json(
+                prompt, "copies", CopyListOutput, temperature=0.9, prompt_name="copy",
+                route="generate_copies"
+            ):
+                yield event
 
         except Exception as e:
-            logger.error(f"카피 생성 실패: {str(e)}")
+            logger.error(f"카피 스트리밍 생성 실패: {str(e)}")
             raise
 
     async def convert_to_image_prompt(
@@ -309,60 +959,16 @@ JSON만 출력해주세요.
             영어 이미지 프롬프트
         """
         prompt = f"""
-You are an expert at creating highly detailed image generation prompts for high-converting marketing and advertising visuals.
-
-Create a professional, detailed image generation prompt that will maximize engagement, clicks, and conversion rates.
-
 Copy: "{copy_text}"
 Product: {product_name}
 Target Audience: {target_age} {target_gender}
 Marketing Strategy: {strategy.get('name')}
-
-**CRITICAL: The image must be eye-catching, scroll-stopping, and highly shareable.**
-
-REQUIREMENTS for a HIGH-PERFORMING visual:
-
-1. COMPOSITION & SUBJECT:
-   - Clearly describe the main subject (product, person, or scene)
-   - Specify exact positioning, angles, and framing
-   - Include product details (packaging, texture, materials)
-
-2. LIGHTING & ATMOSPHERE:
-   - Professional studio lighting or natural lighting setup
-   - Specific mood (bright, warm, moody, fresh, luxurious, etc.)
-   - Time of day if relevant
-
-3. COLOR PALETTE:
-   - Specific color schemes that match the brand/product
-   - Color harmony and complementary colors
-   - Saturation levels (vibrant, muted, pastel, etc.)
-
-4. STYLE & QUALITY:
-   - Photography style: commercial product photography, lifestyle photography, flat lay, etc.
-   - Camera details: shallow depth of field, bokeh, sharp focus
-   - Quality markers: 8K, ultra detailed, professional, award-winning
-
-5. BACKGROUND & CONTEXT:
-   - Specific background elements
-   - Props or supporting elements
-   - Environmental context
-
-6. BRAND ALIGNMENT:
-   - Match the visual style to target demographic
-   - Align with the marketing strategy emotion
-
-OUTPUT FORMAT:
-Write a single, detailed English prompt (100-200 words) that combines all these elements.
-Use professional photography and advertising terminology.
-Focus on visual impact and commercial appeal.
-DO NOT include any explanations - output ONLY the prompt.
-
-Example structure:
-"Professional commercial photography of [product], [key features], [composition], [lighting setup], [color palette], [background], [mood], [camera settings], [quality markers], [style references]"
 """
 
         try:
-            image_prompt = await self.generate_text(prompt, temperature=0.8)
+            image_prompt = await self.generate_text(
+                prompt, temperature=0.8, prompt_name="image_prompt", route="convert_to_image_prompt"
+            )
 
             # 후처리: 따옴표나 설명 제거
             image_prompt = image_prompt.strip()
@@ -425,10 +1031,6 @@ Example structure:
             interests_str = ", ".join(target_interests)
 
         prompt = f"""
-당신은 마케팅 인사이트 전문가입니다.
-
-다음 제품과 타겟 고객 정보를 분석하여 마케팅에 필요한 핵심 인사이트를 제공해주세요.
-
 제품 정보:
 - 제품명: {product_name}
 - 설명: {product_description}
@@ -438,52 +1040,168 @@ Example structure:
 - 나이: {ages_str}{ages_note}
 - 성별: {genders_str}
 - 관심사: {interests_str}{interests_note}
+"""
 
-**중요**: 제품 카테고리({category})를 필수적으로 고려하여 분석해주세요.
-예를 들어, 패션/의류 제품이라면 패션, 스타일, 트렌드 등 패션 관련 키워드를 중심으로 분석해야 합니다.
+        try:
+            # 누락된 인사이트 항목은 스키마 기본값(빈 리스트)으로 채워짐
+            parsed_data = await self.generate_json(
+                prompt, TargetInsightsOutput, temperature=0.7, prompt_name="target_insights",
+                route="analyze_target_insights"
+            )
 
-위 타겟 고객을 위한 마케팅 인사이트를 JSON 형식으로 제공해주세요:
+            logger.info(f"✓ 타겟 인사이트 분석 완료")
+            return parsed_data
+
+        except Exception as e:
+            logger.error(f"타겟 인사이트 분석 실패: {str(e)}")
+            raise
+
+    def _build_fused_prompt(
+        self,
+        product_name: str,
+        product_description: str,
+        category: str,
+        target_ages: List[str],
+        target_genders: List[str],
+        target_interests: List[str],
+        copy_tone: str = "professional",
+        strategy_id: int = 1,
+        past_performance: Optional[List[Dict]] = None
+    ) -> str:
+        """인사이트 + 전략 + 카피 통합 생성 프롬프트 구성 (fast 모드)"""
+        ages_str = ", ".join(target_ages) if target_ages else "자동 분석 필요 (카테고리와 설명을 기반으로 2-3개 선정)"
+        genders_str = ", ".join(target_genders) if target_genders else "무관"
+        interests_str = ", ".join(target_interests) if target_interests else "자동 분석 필요 (카테고리 관련 키워드 7-10개 생성)"
+        tone_desc = COPY_TONE_DESCRIPTIONS.get(copy_tone, COPY_TONE_DESCRIPTIONS["professional"])
+        rag_section = self._format_past_performance(past_performance)
 
+        prompt = f"""
+당신은 마케팅 인사이트 전문가이자 전략가, SNS 카피라이터입니다.
+아래 제품과 타겟 고객 정보로 인사이트 분석 → 전략 수립 → 카피 작성을 한 번에 수행해주세요.
+
+제품 정보:
+- 제품명: {product_name}
+- 설명: {product_description}
+- 카테고리: {category}
+
+타겟 고객:
+- 나이: {ages_str}
+- 성별: {genders_str}
+- 관심사: {interests_str}
+{rag_section}
+**1. insights (타겟 인사이트)**
+- target_ages: 사용자가 연령대를 지정하지 않은 경우에만 2-3개 생성 (형식: '20-29')
+- target_interests: 관심사를 지정하지 않은 경우에만 카테고리({category})와 직접 관련된 키워드 7-10개
+- pain_points, preferred_channels, message_strategies, lifestyle_traits, purchase_motivations: 각 5-7개
+- tone_preferences: 3개
+
+**2. strategies (마케팅 전략)**
+- 위 인사이트를 바탕으로 서로 다른 전략 3가지 (id 1, 2, 3)
+- name, core_message(한 문장), emotion(감성적|이성적|사회적), expected_effect
+- performance_prediction: estimated_reach(명), estimated_engagement_rate(%), estimated_conversions(명), confidence_score(0-1)를 현실적인 수치로
+
+**3. selected_copy (광고 카피)**
+- id {strategy_id} 전략을 기반으로 한 {copy_tone} 톤 카피 1개 ({tone_desc})
+- 첫 3초 안에 관심을 끄는 후크, 타겟의 pain point, 구체적인 베네핏, 행동 유도를 포함
+- hashtags: 제품/타겟/트렌드/감성/실용 키워드를 섞은 15-20개 (# 포함, 한글과 영문 혼합)
+- length: 카피 글자 수
+
+JSON 형식으로 출력:
 {{
-  "target_ages": ["타겟 연령대 2-3개 (형식: '20-29', '30-39' 등)"],
-  "target_interests": ["제품 카테고리와 가장 관련성 높은 관심사 키워드 7-10개 (패션이면 패션 관련, 뷰티면 뷰티 관련)"],
-  "pain_points": ["이 타겟 고객이 겪는 주요 고민/문제점 5-7가지"],
-  "preferred_channels": ["이 타겟이 자주 사용하는 미디어/SNS 채널 5-7가지"],
-  "tone_preferences": ["이 타겟이 선호하는 커뮤니케이션 톤 3가지"],
-  "message_strategies": ["효과적인 메시지 전략 5-7가지"],
-  "lifestyle_traits": ["이 타겟의 라이프스타일 특징 5-7가지"],
-  "purchase_motivations": ["구매를 결정하는 주요 동기 5-7가지"]
+  "insights": {{
+    "target_ages": ["20-29"],
+    "target_interests": ["..."],
+    "pain_points": ["..."],
+    "preferred_channels": ["..."],
+    "tone_preferences": ["..."],
+    "message_strategies": ["..."],
+    "lifestyle_traits": ["..."],
+    "purchase_motivations": ["..."]
+  }},
+  "strategies": [
+    {{
+      "id": 1,
+      "name": "전략명",
+      "core_message": "핵심 메시지",
+      "emotion": "감성적",
+      "expected_effect": "예상 효과 설명",
+      "performance_prediction": {{
+        "estimated_reach": 10000,
+        "estimated_engagement_rate": 3.5,
+        "estimated_conversions": 150,
+        "confidence_score": 0.75
+      }}
+    }}
+  ],
+  "selected_copy": {{
+    "id": 1,
+    "tone": "{copy_tone}",
+    "text": "카피 내용",
+    "hashtags": ["#태그1", "#태그2"],
+    "length": 45
+  }}
 }}
 
-**반드시 지켜야 할 원칙**:
-1. target_ages는 사용자가 지정하지 않은 경우에만 생성 (지정된 경우 해당 연령대 그대로 사용)
-2. target_interests는 제품 카테고리({category})와 직접적으로 연관된 키워드로만 구성
-3. 각 배열은 최소 5개, 최대 10개의 항목을 포함
-4. 구체적이고 실행 가능한 인사이트로 작성
-
-JSON만 출력하고 다른 설명은 하지 마세요.
+JSON만 출력해주세요.
 """
+        return prompt
 
-        try:
-            response_text = await self.generate_text(prompt, temperature=0.7)
-            parsed_data = self._parse_json_response(response_text)
+    async def generate_fused_content(
+        self,
+        product_name: str,
+        product_description: str,
+        category: str,
+        target_ages: List[str],
+        target_genders: List[str],
+        target_interests: List[str],
+        copy_tone: str = "professional",
+        strategy_id: int = 1,
+        past_performance: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        인사이트 + 전략 3가지 + 카피를 한 번의 호출로 생성 (fast 모드)
 
-            # 필수 키 검증
-            required_keys = [
-                "pain_points", "preferred_channels", "tone_preferences",
-                "message_strategies", "lifestyle_traits", "purchase_motivations"
-            ]
+        단계별 파이프라인(analyze_target_insights → generate_marketing_strategies →
+        generate_copies)은 같은 제품/타겟 정보를 3번 전송하고 3번 왕복하므로,
+        하나의 구조화 출력 호출로 합쳐 지연 시간과 입력 토큰을 줄입니다.
 
-            for key in required_keys:
-                if key not in parsed_data:
-                    logger.warning(f"인사이트 응답에 '{key}' 키가 없습니다")
-                    parsed_data[key] = []
+        Args:
+            copy_tone: 카피 톤 ("professional", "casual", "impact")
+            strategy_id: 카피를 작성할 전략 ID (1-3)
+            past_performance: 과거 유사 콘텐츠 성과 데이터 (RAG)
 
-            logger.info(f"✓ 타겟 인사이트 분석 완료")
-            return parsed_data
+        Returns:
+            {
+                "insights": {analyze_target_insights와 동일한 형식},
+                "strategies": [generate_marketing_strategies와 동일한 형식],
+                "copy": {"id": 1, "tone": "...", "text": "...", "hashtags": [...], "length": 45}
+            }
+        """
+        prompt = self._build_fused_prompt(
+            product_name, product_description, category,
+            target_ages, target_genders, target_interests,
+            copy_tone, strategy_id, past_performance
+        )
+
+        try:
+            # 전략/카피가 포함된 창의적인 생성이므로 캐시 사용 안 함
+            parsed_data = await self.generate_json(
+                prompt, FusedContentOutput, temperature=0.8, use_cache=False,
+                route="generate_fused_content"
+            )
+
+            if len(parsed_data["strategies"]) != 3:
+                logger.warning(f"전략 개수가 3개가 아닙니다: {len(parsed_data['strategies'])}개")
+
+            logger.info("✓ 인사이트 + 전략 + 카피 통합 생성 완료")
+            return {
+                "insights": parsed_data["insights"],
+                "strategies": parsed_data["strategies"],
+                "copy": parsed_data["selected_copy"]
+            }
 
         except Exception as e:
-            logger.error(f"타겟 인사이트 분석 실패: {str(e)}")
+            logger.error(f"통합 생성 실패: {str(e)}")
             raise
 
     async def analyze_chat_message(
@@ -558,16 +1276,10 @@ JSON만 출력하고 다른 설명은 하지 마세요.
 """
 
         try:
-            response_text = await self.generate_text(prompt, temperature=0.7)
-            parsed_data = self._parse_json_response(response_text)
-
-            # 기본값 설정
-            if "form_updates" not in parsed_data:
-                parsed_data["form_updates"] = {}
-            if "response" not in parsed_data:
-                parsed_data["response"] = "정보 감사합니다!"
-            if "confidence" not in parsed_data:
-                parsed_data["confidence"] = 0.5
+            # 누락된 항목은 스키마 기본값으로 채워짐 (form_updates는 추출된 항목만 포함)
+            parsed_data = await self.generate_json(
+                prompt, ChatAnalysisOutput, temperature=0.7, route="analyze_chat_message"
+            )
 
             logger.info(f"✓ 챗봇 메시지 분석 완료 (confidence: {parsed_data['confidence']})")
             return parsed_data
@@ -581,37 +1293,6 @@ JSON만 출력하고 다른 설명은 하지 마세요.
                 "confidence": 0.0
             }
 
-    def _parse_json_response(self, response_text: str) -> Dict:
-        """
-        Gemini 응답에서 JSON 추출 및 파싱
-
-        Args:
-            response_text: Gemini API 응답 텍스트
-
-        Returns:
-            파싱된 JSON 딕셔너리
-        """
-        # Gemini가 ```json ``` 으로 감쌀 수 있으므로 제거
-        cleaned_text = response_text.strip()
-
-        # 코드 블록 제거
-        if cleaned_text.startswith("```json"):
-            cleaned_text = cleaned_text[7:]
-        elif cleaned_text.startswith("```"):
-            cleaned_text = cleaned_text[3:]
-
-        if cleaned_text.endswith("```"):
-            cleaned_text = cleaned_text[:-3]
-
-        cleaned_text = cleaned_text.strip()
-
-        try:
-            return json.loads(cleaned_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON 파싱 실패: {str(e)}")
-            logger.error(f"응답 내용 (처음 500자): {cleaned_text[:500]}")
-            raise ValueError(f"JSON 파싱 실패: {str(e)}")
-
     async def analyze_user_intent(self, user_request: str) -> Dict:
         """
         사용자의 콘텐츠 수정 요청을 분석하여 의도를 파악
@@ -659,8 +1340,9 @@ JSON만 출력하고 다른 설명은 하지 마세요.
 """
 
         try:
-            response = await self.generate_text(prompt, temperature=0.3)
-            result = self._parse_json_response(response)
+            result = await self.generate_json(
+                prompt, UserIntentOutput, temperature=0.3, route="analyze_user_intent"
+            )
 
             logger.info(f"사용자 의도 분석 완료: {result}")
             return result
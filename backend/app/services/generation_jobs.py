@@ -0,0 +1,174 @@
+"""
+비동기 콘텐츠 생성 작업
+POST /api/content/jobs로 만든 GenerationJob을 작업 큐 워커에서 실행
+
+- 단계가 끝날 때마다 결과를 GenerationJob.checkpoints에 저장합니다.
+- 실패하면 작업 큐가 재시도하고(JOB_MAX_ATTEMPTS), 재시도는 완료된 단계를 건너뛰고 이어서 실행합니다.
+- 자동 재시도까지 실패한 작업은 retry()로 다시 대기열에 넣을 수 있습니다 (체크포인트 유지).
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.base import SessionLocal
+from app.models.generation_job import GenerationJob, GenerationJobStatus
+from app.schemas.content import FullContentGenerationRequest
+from app.services.content_pipeline import content_pipeline
+from app.services.job_queue import job_queue
+from app.utils.tenant import BATCH, tenant_scope
+
+logger = logging.getLogger(__name__)
+
+GENERATE_JOB = "content.generate"
+
+
+class GenerationJobService:
+    """생성 작업 생성/실행/재개"""
+
+    def create(self, db: Session, request: FullContentGenerationRequest, user_id: int) -> GenerationJob:
+        """생성 작업 저장 (실행은 enqueue 후 워커가 담당)"""
+        job = GenerationJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            status=GenerationJobStatus.QUEUED,
+            request=request.model_dump(),
+            checkpoints={},
+            attempts=0
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    async def enqueue(self, job: GenerationJob):
+        await job_queue.enqueue(GENERATE_JOB, {"generation_job_id": job.id}, user_id=job.user_id)
+
+    def retry(self, db: Session, job: GenerationJob) -> GenerationJob:
+        """실패한 작업을 다시 대기열 상태로 (체크포인트는 유지, enqueue는 호출하는 쪽에서)"""
+        job.status = GenerationJobStatus.QUEUED
+        job.attempts = 0
+        job.error = None
+        job.finished_at = None
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def to_dict(self, job: GenerationJob) -> Dict[str, Any]:
+        """상태 조회 응답"""
+        checkpoints = job.checkpoints or {}
+        return {
+            "id": job.id,
+            "status": job.status.value,
+            "current_stage": job.current_stage,
+            "completed_stages": list(checkpoints.keys()),
+            "attempts": job.attempts,
+            "content_id": job.content_id,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+
+    async def run(self, job_id: str) -> Optional[Dict]:
+        """
+        생성 작업 실행 (작업 큐 핸들러)
+
+        체크포인트가 있으면 완료된 단계를 건너뛰고, 실패 시 상태를 기록한 뒤 예외를 다시 발생시켜
+        작업 큐가 재시도하게 합니다.
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+            if job is None:
+                logger.warning(f"생성 작업 없음 (job_id: {job_id})")
+                return None
+            if job.status == GenerationJobStatus.SUCCEEDED:
+                return {"content_id": job.content_id}
+
+            job.status = GenerationJobStatus.RUNNING
+            job.attempts += 1
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+
+            checkpoints = dict(job.checkpoints or {})
+            if checkpoints:
+                logger.info(f"생성 작업 재개 (job_id: {job_id}, 완료된 단계: {', '.join(checkpoints)})")
+            lock = asyncio.Lock()
+
+            async def save_checkpoint(stage: str, result: Any):
+                if result is None:
+                    # 실패를 None으로 돌려주는 단계(저장 실패 등)는 재시도 시 다시 실행
+                    return
+                async with lock:
+                    # JSON 컬럼에 저장 가능한 값으로 변환 (튜플 → 리스트 등)
+                    checkpoints[stage] = json.loads(json.dumps(result, ensure_ascii=False, default=str))
+                    await asyncio.to_thread(self._update, job_id, checkpoints=dict(checkpoints), current_stage=stage)
+
+            request = FullContentGenerationRequest(**job.request)
+            start_time = time.time() - (datetime.utcnow() - job.created_at).total_seconds()
+            try:
+                # 비동기 생성 작업은 batch 우선순위 (대화형 요청이 먼저 실행)
+                with tenant_scope(job.user_id, request.project_id, BATCH):
+                    response_data, generation_time = await content_pipeline.run(
+                        request,
+                        user_id=job.user_id,
+                        db=db,
+                        start_time=start_time,
+                        checkpoints=checkpoints,
+                        on_checkpoint=save_checkpoint
+                    )
+            except Exception as e:
+                final = job.attempts >= job_queue.max_attempts
+                await asyncio.to_thread(
+                    self._update,
+                    job_id,
+                    status=GenerationJobStatus.FAILED if final else GenerationJobStatus.RETRYING,
+                    error=f"{type(e).__name__}: {str(e)}",
+                    finished_at=datetime.utcnow() if final else None
+                )
+                raise
+
+            await asyncio.to_thread(
+                self._update,
+                job_id,
+                status=GenerationJobStatus.SUCCEEDED,
+                content_id=response_data["content_id"],
+                result=json.loads(json.dumps(
+                    {**response_data, "generation_time": generation_time}, ensure_ascii=False, default=str
+                )),
+                error=None,
+                finished_at=datetime.utcnow()
+            )
+            logger.info(f"✅ 생성 작업 완료 (job_id: {job_id}, content_id: {response_data['content_id']})")
+            return {"content_id": response_data["content_id"]}
+        finally:
+            db.close()
+
+    @staticmethod
+    def _update(job_id: str, **fields):
+        """작업 행 갱신 (파이프라인 세션과 분리된 짧은 세션)"""
+        db = SessionLocal()
+        try:
+            db.query(GenerationJob).filter(GenerationJob.id == job_id).update(
+                {**fields, "updated_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+# 싱글톤 인스턴스
+generation_job_service = GenerationJobService()
+
+
+@job_queue.register(GENERATE_JOB)
+async def run_generation_job(payload: Dict) -> Optional[Dict]:
+    return await generation_job_service.run(payload["generation_job_id"])
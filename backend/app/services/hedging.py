@@ -0,0 +1,213 @@
+"""
+요청 헤징(hedged request) 모듈
+외부 API 호출의 꼬리 지연(p99)을 줄이기 위해, 호출이 평소의 p95(설정 가능) 시간을
+넘기면 같은 요청을 한 번 더 보내고 먼저 끝난 응답을 사용한 뒤 나머지는 취소합니다.
+
+- 작업(operation)별로 최근 지연 시간 분포를 기록하여 헤지 시점을 정합니다.
+- 추가 호출 비용을 제한하기 위해 최근 요청 중 헤지 비율이 max_hedge_ratio를 넘지 않게 합니다.
+- 샘플이 부족한 초기에는 헤지하지 않습니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestHedger:
+    """작업별 지연 시간 백분위수 기반 요청 헤징"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        percentiles: Optional[Dict[str, float]] = None,
+        max_hedge_ratio: float = 0.1,
+        min_samples: int = 20,
+        min_delay_seconds: float = 1.0,
+        window: int = 200
+    ):
+        """
+        Args:
+            enabled: 헤징 사용 여부 (False여도 지연 시간은 기록)
+            percentile: 헤지를 보내는 기본 지연 백분위
+            percentiles: 작업별 백분위 재정의 (예: {"replicate.run": 90})
+            max_hedge_ratio: 최근 요청 중 헤지 요청 최대 비율
+            min_samples: 헤지를 시작하기 위한 최소 지연 샘플 수
+            min_delay_seconds: 헤지 대기 시간 하한 (빠른 호출에 중복 요청 방지)
+            window: 헤지 비율을 계산할 최근 요청 수
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.percentiles = percentiles or {}
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.window = window
+
+        # 작업별 최근 요청의 헤지 여부
+        self._recent: Dict[str, Deque[bool]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _op_stats(self, operation: str) -> Dict[str, int]:
+        if operation not in self.stats:
+            self.stats[operation] = {
+                "requests": 0,
+                "hedged": 0,
+                "hedge_wins": 0,
+                "skipped_by_ratio": 0,
+                "errors": 0
+            }
+        return self.stats[operation]
+
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """
+        헤지를 보낼 시점(초)
+
+        Returns:
+            대기 시간 또는 None (샘플 부족)
+        """
+        if metrics.sample_count("hedge.primary_latency", operation=operation) < self.min_samples:
+            return None
+        q = self.percentiles.get(operation, self.percentile)
+        delay = metrics.percentile("hedge.primary_latency", q, operation=operation)
+        return max(delay, self.min_delay_seconds)
+
+    def _within_ratio(self, operation: str) -> bool:
+        """최근 요청 중 헤지 비율이 한도 이내인지"""
+        recent = self._recent.get(operation)
+        if not recent:
+            return True
+        return (sum(recent) + 1) / (len(recent) + 1) <= self.max_hedge_ratio
+
+    def _record(self, operation: str, hedged: bool):
+        if operation not in self._recent:
+            self._recent[operation] = deque(maxlen=self.window)
+        self._recent[operation].append(hedged)
+
+    async def run(
+        self,
+        operation: str,
+        call: Callable[[], Awaitable[T]],
+        before_hedge: Optional[Callable[[], Awaitable]] = None
+    ) -> T:
+        """
+        헤징을 적용하여 호출
+
+        Args:
+            operation: 작업 이름 (지연 분포/통계 구분용, 예: "gemini.generate")
+            call: 실제 API 호출을 만드는 함수 (호출할 때마다 새 요청)
+            before_hedge: 헤지 요청 직전에 실행할 함수 (예: 쿼터 확보)
+
+        Returns:
+            먼저 성공한 호출의 결과
+        """
+        stats = self._op_stats(operation)
+        stats["requests"] += 1
+        start = time.monotonic()
+
+        delay = self.hedge_delay(operation) if self.enabled else None
+        primary = asyncio.ensure_future(call())
+        hedge = None
+
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    if self._within_ratio(operation):
+                        hedge = asyncio.ensure_future(self._hedge_call(call, before_hedge))
+                        stats["hedged"] += 1
+                        logger.info(f"헤지 요청 전송 ({operation}, {delay:.2f}초 경과)")
+                    else:
+                        stats["skipped_by_ratio"] += 1
+
+            if hedge is None:
+                try:
+                    result = await primary
+                except Exception:
+                    stats["errors"] += 1
+                    raise
+                self._finish(operation, start, primary_latency=time.monotonic() - start, hedged=False)
+                return result
+
+            pending = {primary, hedge}
+            last_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+
+                    elapsed = time.monotonic() - start
+                    if task is hedge:
+                        stats["hedge_wins"] += 1
+                        logger.info(f"헤지 요청이 먼저 완료 ({operation}, {elapsed:.2f}초)")
+                    # 헤지가 이긴 경우 원 요청은 최소한 지금까지 걸렸음 (하한값으로 기록)
+                    self._finish(operation, start, primary_latency=elapsed, hedged=True)
+                    return task.result()
+
+            stats["errors"] += 1
+            raise last_error
+
+        finally:
+            # 늦게 끝난 요청 취소 (호출자가 취소된 경우 두 요청 모두 취소)
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    async def _hedge_call(call: Callable[[], Awaitable[T]], before_hedge: Optional[Callable[[], Awaitable]]) -> T:
+        """헤지 요청 (필요하면 쿼터 확보 후 호출)"""
+        if before_hedge is not None:
+            await before_hedge()
+        return await call()
+
+    def _finish(self, operation: str, start: float, primary_latency: float, hedged: bool):
+        """지연 시간 기록 (실제 응답 시간 + 원 요청 기준 시간)"""
+        metrics.observe("hedge.latency", time.monotonic() - start, operation=operation)
+        metrics.observe("hedge.primary_latency", primary_latency, operation=operation)
+        self._record(operation, hedged)
+
+    def get_stats(self) -> Dict:
+        """
+        작업별 헤징 통계
+
+        - latency_p99: 헤징 적용 후 실제 응답 시간
+        - primary_latency_p99: 원 요청 기준 응답 시간 (헤지가 이긴 경우 하한값)
+        - extra_call_ratio: 추가 호출 비율 (= 비용 증가분 상한)
+        """
+        result = {}
+        for operation, stats in self.stats.items():
+            requests = stats["requests"]
+            result[operation] = {
+                **stats,
+                "extra_call_ratio": round(stats["hedged"] / requests, 4) if requests else 0.0,
+                "hedge_delay": self.hedge_delay(operation),
+                "latency_p99": metrics.percentile("hedge.latency", 99, operation=operation),
+                "primary_latency_p99": metrics.percentile("hedge.primary_latency", 99, operation=operation)
+            }
+        return {
+            "enabled": self.enabled,
+            "max_hedge_ratio": self.max_hedge_ratio,
+            "operations": result
+        }
+
+
+# 싱글톤 인스턴스 (Gemini, Replicate, Nanobanana 호출이 공유)
+request_hedger = RequestHedger(
+    enabled=settings.HEDGING_ENABLED,
+    percentile=settings.HEDGING_PERCENTILE,
+    percentiles=settings.HEDGING_PERCENTILES,
+    max_hedge_ratio=settings.HEDGING_MAX_RATIO,
+    min_samples=settings.HEDGING_MIN_SAMPLES,
+    min_delay_seconds=settings.HEDGING_MIN_DELAY_SECONDS
+)
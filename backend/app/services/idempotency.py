@@ -0,0 +1,246 @@
+"""
+생성 요청 중복 방지 서비스
+더블 클릭/클라이언트 재시도로 같은 생성 파이프라인이 두 번 실행되는 것을 막음
+
+- 멱등 키: Idempotency-Key 헤더로 보낸 요청은 (사용자, 엔드포인트, 키)로 idempotency_keys 테이블에 기록합니다.
+  완료된 키로 다시 요청하면 저장된 응답을 그대로 반환하고(IDEMPOTENCY_TTL_SECONDS 동안),
+  같은 키로 다른 본문을 보내면 422, 다른 서버 프로세스에서 처리 중이면 409를 반환합니다.
+  실패한 요청은 키를 지우므로 같은 키로 다시 시도할 수 있습니다.
+- 동시 요청 병합(single-flight): 같은 사용자의 동일한 요청(본문 해시)이 처리 중이면
+  새 파이프라인을 시작하지 않고 실행 중인 파이프라인의 결과를 함께 받습니다 (프로세스 내).
+  파이프라인은 먼저 보낸 요청의 데드라인/테넌트(contextvar)로 실행되므로, 시간 예산과 우선순위가 같은
+  요청끼리만 병합하고 병합된 요청은 파이프라인의 데드라인(먼저 시작했으므로 가장 엄격함)을 따릅니다.
+
+파이프라인은 요청과 분리된 태스크에서 실행되므로 먼저 보낸 클라이언트의 연결이 끊겨도 계속 진행되며,
+결과는 기다리던 요청과 멱등 키에 전달됩니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.base import SessionLocal
+from app.models.idempotency_key import IdempotencyKey, IdempotencyStatus
+from app.utils.deadline import Deadline, current_deadline, set_deadline
+from app.utils.metrics import metrics
+from app.utils.tenant import current_tenant
+
+logger = logging.getLogger(__name__)
+
+# 파이프라인 실행 함수: {"data": /generate 응답 data, "generation_time": 초}를 반환
+Producer = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class IdempotencyError(Exception):
+    """멱등 키로 요청을 처리할 수 없음 (status_code로 응답)"""
+
+    status_code = 409
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class IdempotencyKeyMismatchError(IdempotencyError):
+    """같은 키로 다른 요청 본문을 보냄"""
+
+    status_code = 422
+
+
+class IdempotencyInProgressError(IdempotencyError):
+    """같은 키의 요청을 다른 프로세스에서 처리 중"""
+
+    status_code = 409
+
+
+class IdempotencyService:
+    """멱등 키 조회/기록 + 동일 요청 병합"""
+
+    def __init__(self):
+        # (사용자 ID, 엔드포인트, 요청 해시) -> 실행 중인 파이프라인 태스크
+        self._flights: Dict[Tuple, asyncio.Task] = {}
+        self._flight_deadlines: Dict[Tuple, Optional[Deadline]] = {}
+
+    @staticmethod
+    def request_hash(payload: Dict[str, Any]) -> str:
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def execute(
+        self,
+        user_id: int,
+        endpoint: str,
+        payload: Dict[str, Any],
+        key: Optional[str],
+        produce: Producer
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        중복 방지를 적용하여 요청 처리
+
+        Args:
+            endpoint: 멱등 키/병합 범위 (예: content.generate)
+            payload: 요청 본문 (해시하여 동일 요청 판단)
+            key: Idempotency-Key 헤더 (없으면 동시 요청 병합만 적용)
+            produce: 파이프라인 실행 함수 (한 번만 실행됨)
+
+        Returns:
+            (produce 결과, "created" | "coalesced" | "replayed")
+
+        Raises:
+            IdempotencyKeyMismatchError: 같은 키로 다른 본문을 보냄 (422)
+            IdempotencyInProgressError: 같은 키를 다른 프로세스에서 처리 중 (409)
+            produce의 예외
+        """
+        request_hash = self.request_hash(payload)
+        # 파이프라인은 먼저 보낸 요청의 컨텍스트로 실행되므로 실행 조건(시간 예산, 우선순위)이 같을 때만 병합
+        deadline = current_deadline()
+        flight_key = (
+            user_id, endpoint, request_hash,
+            deadline.budget if deadline else None, current_tenant().priority
+        )
+
+        row_id = None
+        if key:
+            db = SessionLocal()
+            try:
+                replay, row_id = self._claim(db, user_id, endpoint, key, request_hash, flight_key)
+            finally:
+                db.close()
+            if replay is not None:
+                metrics.incr("idempotency.requests", endpoint=endpoint, outcome="replayed")
+                logger.info(f"멱등 키 응답 재사용 (사용자: {user_id}, key: {key})")
+                return replay, "replayed"
+
+        # 같은 멱등 키로 처리 중인 요청은 병합 설정과 관계없이 결과를 기다림
+        coalesce = settings.GENERATION_COALESCE_ENABLED or (key and row_id is None)
+        flight = self._flights.get(flight_key) if coalesce else None
+        outcome = "coalesced" if flight else "created"
+        if flight is None:
+            flight = asyncio.create_task(produce())
+            self._flights[flight_key] = flight
+            self._flight_deadlines[flight_key] = deadline
+            flight.add_done_callback(lambda task: self._forget(flight_key, task))
+        else:
+            logger.info(f"처리 중인 동일 요청에 병합 (사용자: {user_id}, {endpoint})")
+            # 결과는 파이프라인의 데드라인으로 만들어지므로 응답(504 판단 등)도 그 데드라인 기준
+            set_deadline(self._flight_deadlines.get(flight_key, deadline))
+
+        if row_id is not None:
+            # 요청이 취소되어도 파이프라인이 끝나면 키에 결과 기록
+            flight.add_done_callback(lambda task: self._finish(row_id, task))
+
+        metrics.incr("idempotency.requests", endpoint=endpoint, outcome=outcome)
+        # 이 요청이 취소되어도 병합된 다른 요청을 위해 파이프라인은 계속 실행
+        result = await asyncio.shield(flight)
+        return result, outcome
+
+    def _claim(
+        self,
+        db: Session,
+        user_id: int,
+        endpoint: str,
+        key: str,
+        request_hash: str,
+        flight_key: Tuple
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        멱등 키 확보
+
+        Returns:
+            (저장된 응답, None) - 이미 완료된 키
+            (None, 새로 기록한 행 ID) - 처음 보는 키
+            (None, None) - 이 프로세스에서 처리 중인 키 (실행 중인 파이프라인에 병합)
+        """
+        now = datetime.utcnow()
+        for _ in range(2):
+            row = (
+                db.query(IdempotencyKey)
+                .filter(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.endpoint == endpoint,
+                    IdempotencyKey.key == key
+                )
+                .first()
+            )
+            if row is not None and row.expires_at <= now:
+                db.delete(row)
+                db.commit()
+                row = None
+
+            if row is not None:
+                if row.request_hash != request_hash:
+                    raise IdempotencyKeyMismatchError(
+                        "같은 Idempotency-Key로 다른 요청을 보냈습니다. 새 요청에는 새 키를 사용하세요"
+                    )
+                if row.status == IdempotencyStatus.SUCCEEDED:
+                    return row.response, None
+                if flight_key in self._flights:
+                    return None, None
+                raise IdempotencyInProgressError(
+                    "같은 Idempotency-Key의 요청을 처리 중입니다",
+                    retry_after=(row.expires_at - now).total_seconds()
+                )
+
+            # 만료된 키 정리 (사용자별, 키를 새로 기록할 때만)
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.expires_at <= now
+            ).delete(synchronize_session=False)
+
+            row = IdempotencyKey(
+                user_id=user_id,
+                endpoint=endpoint,
+                key=key,
+                request_hash=request_hash,
+                status=IdempotencyStatus.IN_PROGRESS,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+            )
+            db.add(row)
+            try:
+                db.commit()
+                return None, row.id
+            except IntegrityError:
+                # 같은 키의 요청이 동시에 도착 - 먼저 기록한 요청 기준으로 다시 판단
+                db.rollback()
+
+        raise IdempotencyInProgressError("같은 Idempotency-Key의 요청을 처리 중입니다")
+
+    def _forget(self, flight_key: Tuple, task: asyncio.Task):
+        self._flights.pop(flight_key, None)
+        self._flight_deadlines.pop(flight_key, None)
+        # 기다리던 요청이 모두 끊긴 경우에도 예외가 처리되지 않은 채 남지 않도록 확인
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"병합된 파이프라인 실패: {task.exception()}")
+
+    def _finish(self, row_id: int, task: asyncio.Task):
+        """파이프라인 결과를 멱등 키에 기록 (실패하면 키를 지워 같은 키로 다시 시도 가능)"""
+        db = SessionLocal()
+        try:
+            row = db.query(IdempotencyKey).filter(IdempotencyKey.id == row_id).first()
+            if row is None:
+                return
+            if task.cancelled() or task.exception() is not None:
+                db.delete(row)
+            else:
+                result = json.loads(json.dumps(task.result(), ensure_ascii=False, default=str))
+                row.status = IdempotencyStatus.SUCCEEDED
+                row.response = result
+                row.content_id = (result.get("data") or {}).get("content_id")
+                row.expires_at = datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"멱등 키 결과 기록 실패 (id: {row_id}): {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+# 싱글톤 인스턴스
+idempotency_service = IdempotencyService()
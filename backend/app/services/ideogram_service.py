@@ -9,6 +9,7 @@ import logging
 import base64
 from typing import Dict, Optional
 from app.config import settings
+from app.services.client_pool import client_pool
 
 logger = logging.getLogger(__name__)
 
@@ -57,43 +58,44 @@ class IdeogramService:
                 image_data = base64.b64encode(image_file.read()).decode('utf-8')
 
             # Ideogram API 요청
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/remix",
-                    headers={
-                        "Api-Key": self.api_key,
-                        "Content-Type": "application/json"
+            # 공유 클라이언트 사용 (커넥션 재사용)
+            client = client_pool.http("ideogram")
+            response = await client.post(
+                f"{self.base_url}/remix",
+                headers={
+                    "Api-Key": self.api_key,
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "image_request": {
+                        "prompt": prompt,
+                        "aspect_ratio": aspect_ratio,
+                        "model": "V_2",  # Ideogram V2 (최신 버전)
+                        "magic_prompt_option": magic_prompt_option,
+                        "style_type": style_type
                     },
-                    json={
-                        "image_request": {
-                            "prompt": prompt,
-                            "aspect_ratio": aspect_ratio,
-                            "model": "V_2",  # Ideogram V2 (최신 버전)
-                            "magic_prompt_option": magic_prompt_option,
-                            "style_type": style_type
-                        },
-                        "image_file": {
-                            "data": image_data,
-                            "type": "image/png"
-                        }
+                    "image_file": {
+                        "data": image_data,
+                        "type": "image/png"
                     }
-                )
+                }
+            )
 
-                response.raise_for_status()
-                result = response.json()
+            response.raise_for_status()
+            result = response.json()
 
-                logger.info(f"✅ Ideogram Remix 성공")
+            logger.info(f"✅ Ideogram Remix 성공")
 
-                # 첫 번째 이미지 URL 추출
-                image_url = result['data'][0]['url']
+            # 첫 번째 이미지 URL 추출
+            image_url = result['data'][0]['url']
 
-                return {
-                    "original_url": image_url,
-                    "local_url": None,  # 나중에 다운로드 후 설정
-                    "file_path": None,
-                    "prompt": prompt,
-                    "is_remix": True
-                }
+            return {
+                "original_url": image_url,
+                "local_url": None,  # 나중에 다운로드 후 설정
+                "file_path": None,
+                "prompt": prompt,
+                "is_remix": True
+            }
 
         except httpx.HTTPStatusError as e:
             logger.error(f"❌ Ideogram API 오류: {e.response.status_code}")
@@ -134,37 +136,38 @@ class IdeogramService:
             # 비율 계산
             aspect_ratio = self._get_aspect_ratio(width, height)
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/generate",
-                    headers={
-                        "Api-Key": self.api_key,
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "image_request": {
-                            "prompt": prompt,
-                            "aspect_ratio": aspect_ratio,
-                            "model": "V_2",  # Ideogram V2
-                            "magic_prompt_option": magic_prompt_option,
-                            "style_type": style_type
-                        }
+            # 공유 클라이언트 사용 (커넥션 재사용)
+            client = client_pool.http("ideogram")
+            response = await client.post(
+                f"{self.base_url}/generate",
+                headers={
+                    "Api-Key": self.api_key,
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "image_request": {
+                        "prompt": prompt,
+                        "aspect_ratio": aspect_ratio,
+                        "model": "V_2",  # Ideogram V2
+                        "magic_prompt_option": magic_prompt_option,
+                        "style_type": style_type
                     }
-                )
+                }
+            )
 
-                response.raise_for_status()
-                result = response.json()
+            response.raise_for_status()
+            result = response.json()
 
-                logger.info(f"✅ Ideogram 이미지 생성 성공")
+            logger.info(f"✅ Ideogram 이미지 생성 성공")
 
-                image_url = result['data'][0]['url']
+            image_url = result['data'][0]['url']
 
-                return {
-                    "original_url": image_url,
-                    "local_url": None,
-                    "file_path": None,
-                    "prompt": prompt
-                }
+            return {
+                "original_url": image_url,
+                "local_url": None,
+                "file_path": None,
+                "prompt": prompt
+            }
 
         except Exception as e:
             logger.error(f"❌ Ideogram 이미지 생성 실패: {str(e)}")
@@ -203,44 +206,45 @@ class IdeogramService:
             with open(mask_image_path, "rb") as f:
                 mask_data = base64.b64encode(f.read()).decode('utf-8')
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/edit",
-                    headers={
-                        "Api-Key": self.api_key,
-                        "Content-Type": "application/json"
+            # 공유 클라이언트 사용 (커넥션 재사용)
+            client = client_pool.http("ideogram")
+            response = await client.post(
+                f"{self.base_url}/edit",
+                headers={
+                    "Api-Key": self.api_key,
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "image_request": {
+                        "prompt": prompt,
+                        "model": "V_2",
+                        "style_type": style_type
+                    },
+                    "image_file": {
+                        "data": original_data,
+                        "type": "image/png"
                     },
-                    json={
-                        "image_request": {
-                            "prompt": prompt,
-                            "model": "V_2",
-                            "style_type": style_type
-                        },
-                        "image_file": {
-                            "data": original_data,
-                            "type": "image/png"
-                        },
-                        "mask": {
-                            "data": mask_data,
-                            "type": "image/png"
-                        }
+                    "mask": {
+                        "data": mask_data,
+                        "type": "image/png"
                     }
-                )
+                }
+            )
 
-                response.raise_for_status()
-                result = response.json()
+            response.raise_for_status()
+            result = response.json()
 
-                logger.info(f"✅ Ideogram Edit 성공")
+            logger.info(f"✅ Ideogram Edit 성공")
 
-                image_url = result['data'][0]['url']
+            image_url = result['data'][0]['url']
 
-                return {
-                    "original_url": image_url,
-                    "local_url": None,
-                    "file_path": None,
-                    "prompt": prompt,
-                    "is_edited": True
-                }
+            return {
+                "original_url": image_url,
+                "local_url": None,
+                "file_path": None,
+                "prompt": prompt,
+                "is_edited": True
+            }
 
         except Exception as e:
             logger.error(f"❌ Ideogram Edit 실패: {str(e)}")
@@ -7,16 +7,13 @@ import os
 import logging
 from typing import Optional
 from enum import Enum
-import google.generativeai as genai
 import requests
 from app.config import settings
+from app.services.client_pool import client_pool
+from app.services.quota_governor import gemini_quota
 
 logger = logging.getLogger(__name__)
 
-# Gemini API 설정 (나노바나나용)
-if settings.GEMINI_API_KEY:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-
 
 class ImageProvider(str, Enum):
     """이미지 생성 프로바이더"""
@@ -159,7 +156,12 @@ class ImageService:
         logger.info(f"나노바나나 이미지 생성 중...")
 
         try:
-            model = genai.GenerativeModel('gemini-2.5-flash-image')
+            await gemini_quota.acquire(
+                gemini_quota.estimate_tokens(prompt, 1290),
+                caller="image_service"
+            )
+
+            model = client_pool.gemini_model('gemini-2.5-flash-image')
 
             response = model.generate_content([prompt])
 
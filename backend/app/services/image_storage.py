@@ -5,7 +5,6 @@
 TODO: 프로덕션에서는 S3/CloudFlare R2 등 클라우드 스토리지로 교체
 """
 
-import aiohttp
 import aiofiles
 from pathlib import Path
 from typing import Optional
@@ -15,6 +14,8 @@ from datetime import datetime
 from PIL import Image
 import io
 
+from app.services.client_pool import client_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,15 +61,14 @@ class ImageStorageService:
         try:
             logger.info(f"이미지 다운로드 시작: {image_url}")
 
-            # 이미지 다운로드
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status != 200:
-                        logger.error(f"이미지 다운로드 실패: HTTP {response.status}")
-                        return None
+            # 이미지 다운로드 (공유 클라이언트, 같은 CDN 연결 재사용)
+            response = await client_pool.http("downloads").get(image_url, follow_redirects=True)
+            if response.status_code != 200:
+                logger.error(f"이미지 다운로드 실패: HTTP {response.status_code}")
+                return None
 
-                    image_data = await response.read()
-                    logger.info(f"이미지 다운로드 완료: {len(image_data)} bytes (타입: {type(image_data)})")
+            image_data = response.content
+            logger.info(f"이미지 다운로드 완료: {len(image_data)} bytes (타입: {type(image_data)})")
 
             # 파일명 생성 (URL 해시 + 타임스탬프)
             url_hash = hashlib.md5(image_url.encode()).hexdigest()[:12]
@@ -0,0 +1,269 @@
+"""
+타겟 인사이트 웨어하우스
+세그먼트별 타겟 프로필 집계(insight_segments)로 LLM 인사이트 분석(analyze_target_insights) 호출을 대신
+
+- 오프라인 구축: scripts/build_insight_warehouse.py가 targets 테이블(또는 target_profiles.json)의 프로필을
+  (카테고리, 연령대, 성별, 관심사) 세그먼트별로 집계하여 insight_segments에 저장합니다.
+- 조회: 세그먼트를 메모리에 올려 두고 요청의 연령대 × 성별 × 관심사 세그먼트를 합산하여
+  인사이트를 만듭니다 (LLM 호출 없음). 서버 시작 시 로드하고, INSIGHT_WAREHOUSE_RELOAD_SECONDS가 지나면
+  조회 중에 백그라운드 스레드에서 다시 읽습니다 (이벤트 루프를 막지 않고, 그동안은 이전 세그먼트로 조회).
+- 요청한 관심사가 세그먼트에 없거나 합산 프로필 수가 INSIGHT_WAREHOUSE_MIN_PROFILES보다 적으면
+  None을 반환하고, 호출하는 쪽은 LLM으로 분석합니다.
+
+여러 관심사/연령대를 합산할 때 여러 세그먼트에 속한 프로필은 중복 집계되지만 순위(상위 N개)만 사용하므로 허용합니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.base import SessionLocal
+from app.models.insight_segment import InsightSegment
+from app.services.segmentation_service import SegmentationService
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ANY = "*"
+
+# 요청 형식(프론트엔드) → 프로필 데이터 형식
+CATEGORY_NAMES = {
+    "beauty": "화장품",
+    "food": "식품",
+    "fashion": "패션",
+    "electronics": "전자제품",
+    "service": "서비스"
+}
+AGE_GROUPS = {
+    "10-19": "10대",
+    "20-29": "20대",
+    "30-39": "30대",
+    "40-49": "40대",
+    "50-59": "50대",
+    "60+": "60대 이상"
+}
+AGE_RANGES = {group: age_range for age_range, group in AGE_GROUPS.items()}
+
+# 세그먼트별로 집계하는 프로필 항목 (항목 -> 프로필 필드)
+STAT_FIELDS = {
+    "age_groups": "age_group",
+    "income_levels": "income_level",
+    "interests": "interests",
+    "pain_points": "pain_points",
+    "channels": "preferred_channels",
+    "lifestyles": "lifestyle"
+}
+
+SegmentKey = Tuple[str, str, str, str]
+
+
+class InsightWarehouse:
+    """세그먼트 집계 구축/조회"""
+
+    def __init__(self):
+        # (카테고리, 연령대, 성별, 관심사) -> {"profile_count", "stats"}
+        self._segments: Dict[SegmentKey, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        # 진행 중인 백그라운드 로드 (완료될 때까지 참조 유지)
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # === 오프라인 구축 ===
+
+    def build(self, profiles: Iterable[Dict]) -> Dict[SegmentKey, Dict[str, Any]]:
+        """
+        프로필을 세그먼트별로 집계
+
+        프로필 1개는 (연령대 | *) × (성별 | *) × (관심사들 | *) 세그먼트에 모두 포함됩니다.
+        성별 "무관" 프로필은 SegmentationService.filter_profiles와 같이 남성/여성 세그먼트에도 포함됩니다.
+        """
+        counters: Dict[SegmentKey, Dict[str, Counter]] = {}
+        counts: Counter = Counter()
+
+        for profile in profiles:
+            category = profile.get("category")
+            if not category:
+                continue
+            gender = profile.get("gender")
+            genders = [ANY, "남성", "여성"] if gender == "무관" else [ANY, gender]
+            interests = [self._normalize(i) for i in profile.get("interests") or []]
+
+            for key in product([category], [ANY, profile.get("age_group")], genders, [ANY, *set(interests)]):
+                counts[key] += 1
+                stats = counters.setdefault(key, {name: Counter() for name in STAT_FIELDS})
+                for name, field in STAT_FIELDS.items():
+                    value = profile.get(field)
+                    values = value if isinstance(value, list) else [value]
+                    stats[name].update(v for v in values if v)
+
+        return {
+            key: {"profile_count": counts[key], "stats": {name: dict(c) for name, c in stats.items()}}
+            for key, stats in counters.items()
+        }
+
+    def save(self, db: Session, segments: Dict[SegmentKey, Dict[str, Any]]) -> int:
+        """insight_segments 전체 교체 (한 트랜잭션)"""
+        db.query(InsightSegment).delete()
+        db.add_all(
+            InsightSegment(
+                category=category,
+                age_group=age_group,
+                gender=gender,
+                interest=interest,
+                profile_count=segment["profile_count"],
+                stats=segment["stats"]
+            )
+            for (category, age_group, gender, interest), segment in segments.items()
+        )
+        db.commit()
+        self._segments = dict(segments)
+        self._loaded_at = time.monotonic()
+        return len(segments)
+
+    # === 조회 ===
+
+    def load(self, db: Session) -> int:
+        """insight_segments를 메모리로 로드 (다 읽은 뒤 한 번에 교체)"""
+        rows = db.query(InsightSegment).all()
+        self._segments = {
+            (row.category, row.age_group, row.gender, row.interest): {
+                "profile_count": row.profile_count,
+                "stats": row.stats or {}
+            }
+            for row in rows
+        }
+        self._loaded_at = time.monotonic()
+        logger.info(f"✓ 인사이트 웨어하우스 로드 ({len(self._segments)}개 세그먼트)")
+        return len(self._segments)
+
+    async def refresh(self):
+        """DB에서 세그먼트를 다시 읽음 (동기 DB 조회는 스레드에서 실행, 서버 시작 시 호출)"""
+        if settings.INSIGHT_WAREHOUSE_ENABLED:
+            await asyncio.to_thread(self._reload)
+
+    def _reload(self):
+        db = SessionLocal()
+        try:
+            self.load(db)
+        except Exception as e:
+            # 테이블이 없거나 DB 오류면 이전 세그먼트를 유지하고 다음 주기에 다시 시도
+            logger.warning(f"인사이트 웨어하우스 로드 실패: {str(e)}")
+            self._loaded_at = time.monotonic()
+        finally:
+            db.close()
+
+    def _refresh_if_stale(self):
+        """다시 읽을 때가 되었으면 백그라운드에서 로드 시작 (조회는 기다리지 않음)"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.INSIGHT_WAREHOUSE_RELOAD_SECONDS:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖(스크립트)에서는 바로 로드
+            self._reload()
+            return
+        self._refresh_task = loop.create_task(self.refresh())
+
+    def lookup(
+        self,
+        category: str,
+        target_ages: List[str],
+        target_genders: List[str],
+        target_interests: List[str]
+    ) -> Optional[Dict]:
+        """
+        요청 타겟의 인사이트 (analyze_target_insights와 같은 형식)
+
+        Returns:
+            인사이트 dict (source="warehouse", segment_profiles 포함), 세그먼트가 없으면 None
+        """
+        if not settings.INSIGHT_WAREHOUSE_ENABLED:
+            return None
+        # 첫 로드가 끝나기 전에는 세그먼트가 없으므로 LLM 분석으로 처리
+        self._refresh_if_stale()
+
+        segments = self._match(category, target_ages, target_genders, target_interests)
+        if segments is None:
+            metrics.incr("insight_warehouse.lookups", result="miss")
+            return None
+
+        merged = {name: Counter() for name in STAT_FIELDS}
+        for segment in segments:
+            for name in STAT_FIELDS:
+                merged[name].update(segment["stats"].get(name, {}))
+
+        metrics.incr("insight_warehouse.lookups", result="hit")
+        return self._to_insights(merged, sum(segment["profile_count"] for segment in segments))
+
+    def _match(
+        self,
+        category: str,
+        target_ages: List[str],
+        target_genders: List[str],
+        target_interests: List[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """요청에 해당하는 세그먼트 목록 (요청 조건을 세그먼트로 나타낼 수 없으면 None)"""
+        category = CATEGORY_NAMES.get(category, category)
+
+        ages = [AGE_GROUPS.get(age, age) for age in target_ages or []] or [ANY]
+        genders = [gender for gender in target_genders or [] if gender != "무관"]
+        if not genders or set(genders) >= {"남성", "여성"}:
+            genders = [ANY]
+        interests = list(dict.fromkeys(self._normalize(i) for i in target_interests or [])) or [ANY]
+
+        segments = []
+        covered = set()
+        for key in product([category], ages, genders, interests):
+            segment = self._segments.get(key)
+            if segment:
+                segments.append(segment)
+                covered.add(key[3])
+
+        # 요청한 관심사가 하나라도 데이터에 없으면 LLM으로 분석
+        if len(covered) < len(interests):
+            return None
+        if sum(segment["profile_count"] for segment in segments) < settings.INSIGHT_WAREHOUSE_MIN_PROFILES:
+            return None
+        return segments
+
+    def _to_insights(self, stats: Dict[str, Counter], profile_count: int) -> Dict:
+        def top(name: str, n: int) -> List[str]:
+            return [value for value, _ in stats[name].most_common(n)]
+
+        pain_points = top("pain_points", 5)
+        interests = top("interests", 10)
+        dominant_age = top("age_groups", 1)
+        dominant_income = top("income_levels", 1)
+
+        return {
+            "target_ages": [AGE_RANGES.get(age, age) for age in top("age_groups", 3)],
+            "target_interests": interests,
+            "pain_points": pain_points,
+            "preferred_channels": top("channels", 5),
+            "tone_preferences": [
+                SegmentationService._recommend_tone(
+                    dominant_age[0] if dominant_age else "", dominant_income[0] if dominant_income else ""
+                )
+            ],
+            "message_strategies": SegmentationService._recommend_message_strategy(pain_points[:3], interests[:3]),
+            "lifestyle_traits": top("lifestyles", 5),
+            # 프로필 데이터에 구매 동기가 없으므로 주요 고충의 해결을 구매 동기로 사용
+            "purchase_motivations": [f"{pain_point} 해결" for pain_point in pain_points[:3]],
+            "source": "warehouse",
+            "segment_profiles": profile_count
+        }
+
+    @staticmethod
+    def _normalize(interest: str) -> str:
+        return (interest or "").strip()
+
+
+# 싱글톤 인스턴스
+insight_warehouse = InsightWarehouse()
@@ -0,0 +1,480 @@
+"""
+백그라운드 작업 큐 모듈
+응답과 무관한 후처리(임베딩 저장, 성과 예측 등)를 HTTP 요청 밖에서 실행
+
+- Redis가 설정되어 있으면 Redis 리스트 기반 큐를 사용하므로 서버가 재시작되어도 작업이 남아 있고,
+  별도 워커 프로세스(python -m app.worker)가 처리할 수 있습니다.
+- Redis가 없으면(테스트, 로컬 개발) 프로세스 내 큐로 동작합니다 (서버 재시작 시 유실).
+- 실패한 작업은 지수 백오프 후 최대 JOB_MAX_ATTEMPTS번까지 재시도합니다.
+- 작업 상태(queued/running/retrying/succeeded/failed)는 JOB_RESULT_TTL_SECONDS 동안 조회할 수 있습니다.
+- 워커는 작업을 가져가면서 임대(lease)를 기록하고 실행 중에 주기적으로 연장합니다.
+  임대가 만료된 작업(워커 종료, 멈춤)만 다시 대기열에 넣으므로 실행 중인 작업이 중복 실행되지 않습니다.
+- 워커 루프는 작업 하나의 오류(Redis 일시 장애 등)로 멈추지 않고, 루프 자체가 죽으면 다시 시작합니다.
+
+사용 예:
+    @job_queue.register("content.embedding")
+    async def save_embedding(payload: Dict) -> Dict:
+        ...
+
+    job_id = await job_queue.enqueue("content.embedding", {"content_id": 1}, user_id=user.id)
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.redis_client import get_redis
+from app.utils.retry import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class LocalJobBackend:
+    """프로세스 내 작업 큐 (테스트 및 Redis 미사용 환경용)"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._expires: Dict[str, float] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        # 워커가 가져간 작업 ID -> 임대 만료 시각
+        self._leases: Dict[str, float] = {}
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # 이벤트 루프 안에서 생성
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def save(self, job: Dict, ttl: Optional[int] = None):
+        self._jobs[job["id"]] = job
+        if ttl:
+            self._expires[job["id"]] = time.monotonic() + ttl
+        self._evict()
+
+    async def load(self, job_id: str) -> Optional[Dict]:
+        self._evict()
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def push(self, job_id: str, delay: float = 0.0):
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.queue.put_nowait, job_id)
+        else:
+            self.queue.put_nowait(job_id)
+
+    async def pop(self, timeout: float, lease_seconds: float) -> Optional[str]:
+        try:
+            job_id = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._leases[job_id] = time.time() + lease_seconds
+        return job_id
+
+    async def touch(self, job_id: str, lease_seconds: float):
+        if job_id in self._leases:
+            self._leases[job_id] = time.time() + lease_seconds
+
+    async def ack(self, job_id: str):
+        self._leases.pop(job_id, None)
+
+    async def requeue_stale(self) -> int:
+        """임대가 만료된 작업(실행 중 워커 루프 오류 등)을 다시 대기열로"""
+        requeued = 0
+        now = time.time()
+        for job_id in [job_id for job_id, expires in self._leases.items() if expires <= now]:
+            del self._leases[job_id]
+            job = self._jobs.get(job_id)
+            if job and job["status"] not in (SUCCEEDED, FAILED):
+                self.queue.put_nowait(job_id)
+                requeued += 1
+        return requeued
+
+    async def size(self) -> int:
+        return self.queue.qsize()
+
+    def _evict(self):
+        now = time.monotonic()
+        for job_id in [job_id for job_id, expires in self._expires.items() if expires <= now]:
+            self._jobs.pop(job_id, None)
+            self._expires.pop(job_id, None)
+
+
+class RedisJobBackend:
+    """
+    Redis 작업 큐 (여러 API/워커 프로세스 공유)
+
+    - {prefix}queue: 대기 중인 작업 ID 리스트
+    - {prefix}processing: 워커가 가져간 작업 ID 리스트 (워커가 죽으면 requeue_stale로 복구)
+    - {prefix}leases: 워커가 가져간 작업의 임대 (score = 만료 시각, 가져갈 때 processing 이동과 함께 원자적으로 기록)
+    - {prefix}delayed: 재시도 대기 중인 작업 (score = 실행 시각)
+    - {prefix}job:{id}: 작업 상태 JSON
+    """
+
+    # 대기열에서 processing으로 옮기면서 임대를 같이 기록 (옮긴 직후 임대가 없는 순간이 없도록)
+    CLAIM_SCRIPT = """
+local job_id = redis.call('RPOP', KEYS[1])
+if job_id then
+    redis.call('LPUSH', KEYS[2], job_id)
+    redis.call('ZADD', KEYS[3], ARGV[1], job_id)
+end
+return job_id
+"""
+
+    # 대기열이 비어 있을 때 다시 확인하는 간격(초)
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, redis, prefix: str = "jobs:"):
+        self.redis = redis
+        self.prefix = prefix
+        self._claim = redis.register_script(self.CLAIM_SCRIPT)
+
+    def _key(self, name: str) -> str:
+        return self.prefix + name
+
+    async def save(self, job: Dict, ttl: Optional[int] = None):
+        await self.redis.set(self._key(f"job:{job['id']}"), json.dumps(job, ensure_ascii=False), ex=ttl)
+
+    async def load(self, job_id: str) -> Optional[Dict]:
+        value = await self.redis.get(self._key(f"job:{job_id}"))
+        return json.loads(value) if value else None
+
+    async def push(self, job_id: str, delay: float = 0.0):
+        if delay > 0:
+            await self.redis.zadd(self._key("delayed"), {job_id: time.time() + delay})
+        else:
+            await self.redis.lpush(self._key("queue"), job_id)
+
+    async def pop(self, timeout: float, lease_seconds: float) -> Optional[str]:
+        await self._promote_delayed()
+        deadline = time.monotonic() + timeout
+        keys = [self._key("queue"), self._key("processing"), self._key("leases")]
+        while True:
+            job_id = await self._claim(keys=keys, args=[time.time() + lease_seconds])
+            if job_id:
+                return job_id.decode() if isinstance(job_id, bytes) else job_id
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.POLL_INTERVAL, remaining))
+
+    async def touch(self, job_id: str, lease_seconds: float):
+        await self.redis.zadd(self._key("leases"), {job_id: time.time() + lease_seconds}, xx=True)
+
+    async def ack(self, job_id: str):
+        await self.redis.lrem(self._key("processing"), 1, job_id)
+        await self.redis.zrem(self._key("leases"), job_id)
+
+    async def requeue_stale(self) -> int:
+        """processing에 남아 있지만 임대가 만료된 작업(워커 종료, 멈춤)을 다시 대기열로"""
+        requeued = 0
+        now = time.time()
+        for job_id in await self.redis.lrange(self._key("processing"), 0, -1):
+            expires = await self.redis.zscore(self._key("leases"), job_id)
+            # 임대가 없으면 이전 버전 워커가 가져간 작업 (가져갈 때 임대를 같이 기록하므로 실행 중인 작업은 항상 있음)
+            if expires is not None and expires > now:
+                continue
+            if await self.redis.lrem(self._key("processing"), 1, job_id):
+                await self.redis.zrem(self._key("leases"), job_id)
+                job = await self.load(job_id)
+                if job and job["status"] not in (SUCCEEDED, FAILED):
+                    await self.redis.lpush(self._key("queue"), job_id)
+                    requeued += 1
+        return requeued
+
+    async def size(self) -> int:
+        return await self.redis.llen(self._key("queue")) + await self.redis.zcard(self._key("delayed"))
+
+    async def _promote_delayed(self):
+        """실행 시각이 된 재시도 작업을 대기열로 이동 (ZREM에 성공한 워커만 이동)"""
+        for job_id in await self.redis.zrangebyscore(self._key("delayed"), 0, time.time(), start=0, num=100):
+            if await self.redis.zrem(self._key("delayed"), job_id):
+                await self.redis.lpush(self._key("queue"), job_id)
+
+
+class JobQueue:
+    """작업 등록/실행/재시도 관리"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        retry_base_seconds: float = 2.0,
+        retry_max_delay_seconds: float = 60.0,
+        result_ttl_seconds: int = 86400,
+        visibility_timeout_seconds: float = 600.0
+    ):
+        """
+        Args:
+            max_attempts: 작업당 최대 시도 횟수
+            retry_base_seconds: 첫 재시도 대기 시간 (시도마다 2배)
+            retry_max_delay_seconds: 재시도 대기 상한
+            result_ttl_seconds: 끝난 작업 상태 보관 시간
+            visibility_timeout_seconds: 작업 임대 시간 (실행 중에는 주기적으로 연장, 만료되면 워커가 죽은 것으로 보고 다시 실행)
+        """
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_delay_seconds = retry_max_delay_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._backend = None
+        self._workers: List[asyncio.Task] = []
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def backend(self):
+        """Redis가 있으면 RedisJobBackend, 없으면 LocalJobBackend (처음 사용할 때 결정)"""
+        if self._backend is None:
+            redis = get_redis()
+            self._backend = RedisJobBackend(redis) if redis is not None else LocalJobBackend()
+            logger.info(f"작업 큐 백엔드: {type(self._backend).__name__}")
+        return self._backend
+
+    def register(self, job_type: str) -> Callable[[JobHandler], JobHandler]:
+        """작업 핸들러 등록 데코레이터 (payload dict를 받는 비동기 함수, 반환값은 작업 결과로 저장)"""
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[job_type] = func
+            return func
+        return decorator
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        user_id: Optional[int] = None,
+        max_attempts: Optional[int] = None
+    ) -> str:
+        """
+        작업 추가
+
+        Args:
+            job_type: 등록된 작업 종류
+            payload: 핸들러에 전달할 JSON 직렬화 가능한 값
+            user_id: 상태 조회를 허용할 사용자
+            max_attempts: 최대 시도 횟수 (None이면 기본값)
+
+        Returns:
+            작업 ID
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류: {job_type}")
+
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "type": job_type,
+            "payload": payload,
+            "user_id": user_id,
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts or self.max_attempts,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None
+        }
+        await self.backend.save(job, ttl=self.result_ttl_seconds)
+        await self.backend.push(job["id"])
+        metrics.incr("jobs.enqueued", type=job_type)
+        return job["id"]
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 조회 (없거나 보관 시간이 지났으면 None)"""
+        return await self.backend.load(job_id)
+
+    async def run_worker(self, concurrency: int = 1, stop: Optional[asyncio.Event] = None):
+        """
+        워커 실행 (stop 이벤트가 설정될 때까지)
+
+        Args:
+            concurrency: 동시에 실행할 작업 수
+            stop: 종료 신호 (None이면 취소될 때까지 실행)
+        """
+        stop = stop or asyncio.Event()
+        logger.info(f"작업 큐 워커 시작 (동시 {concurrency}개, 작업 종류: {', '.join(sorted(self._handlers))})")
+        await asyncio.gather(
+            self._supervise("reaper", self._reaper, stop),
+            *(self._supervise(f"worker-{i}", self._worker_loop, stop) for i in range(concurrency))
+        )
+        logger.info("작업 큐 워커 종료")
+
+    def start(self, concurrency: int = 1):
+        """현재 이벤트 루프에서 워커 실행 (API 서버 내장 워커)"""
+        if self._workers:
+            return
+        self._stop = asyncio.Event()
+        self._workers = [asyncio.create_task(self.run_worker(concurrency, self._stop))]
+
+    async def stop(self, timeout: float = 10.0):
+        """내장 워커 종료 (실행 중인 작업은 timeout까지 기다린 뒤 취소)"""
+        if not self._workers:
+            return
+        self._stop.set()
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _supervise(self, name: str, loop: Callable[[asyncio.Event], Awaitable[None]], stop: asyncio.Event):
+        """루프가 예상치 못한 오류로 끝나면 잠시 후 다시 시작 (stop 전까지)"""
+        restarts = 0
+        while not stop.is_set():
+            try:
+                await loop(stop)
+            except Exception as e:
+                restarts += 1
+                delay = min(30.0, 2.0 ** min(restarts, 5))
+                logger.exception(f"작업 큐 {name} 비정상 종료, {delay:.0f}초 후 다시 시작: {str(e)}")
+                metrics.incr("jobs.worker_restarts")
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _worker_loop(self, stop: asyncio.Event):
+        errors = 0
+        while not stop.is_set():
+            try:
+                job_id = await self.backend.pop(timeout=1.0, lease_seconds=self.visibility_timeout_seconds)
+                if job_id:
+                    await self._execute(job_id)
+                errors = 0
+            except Exception as e:
+                # 조회/상태 저장 실패 (Redis 일시 장애 등) - 가져간 작업은 임대가 만료되면 reaper가 다시 대기열에 넣음
+                errors += 1
+                delay = min(30.0, 2.0 ** min(errors - 1, 5))
+                logger.error(f"작업 큐 처리 실패, {delay:.0f}초 후 계속: {type(e).__name__}: {str(e)}")
+                metrics.incr("jobs.worker_errors")
+                await asyncio.sleep(delay)
+
+    async def _heartbeat(self, job_id: str):
+        """실행 중인 작업의 임대 연장 (다른 워커가 중단된 작업으로 보고 다시 실행하지 않도록)"""
+        interval = max(1.0, self.visibility_timeout_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.backend.touch(job_id, self.visibility_timeout_seconds)
+            except Exception as e:
+                logger.warning(f"작업 임대 연장 실패 ({job_id}): {str(e)}")
+
+    async def _reaper(self, stop: asyncio.Event):
+        """중단된 작업(워커 프로세스 종료 등) 주기적 복구"""
+        interval = max(1.0, min(60.0, self.visibility_timeout_seconds / 4))
+        while not stop.is_set():
+            try:
+                requeued = await self.backend.requeue_stale()
+                if requeued:
+                    logger.warning(f"중단된 작업 {requeued}개를 다시 대기열에 추가")
+                    metrics.incr("jobs.requeued", requeued)
+            except Exception as e:
+                logger.error(f"중단된 작업 복구 실패: {str(e)}")
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job_id: str):
+        job = await self.backend.load(job_id)
+        if job is None or job["status"] in (SUCCEEDED, FAILED):
+            await self.backend.ack(job_id)
+            return
+
+        handler = self._handlers.get(job["type"])
+        if handler is None:
+            # 이 워커에 등록되지 않은 작업 종류 (핸들러 모듈 import 누락)
+            logger.error(f"등록되지 않은 작업 종류: {job['type']} (job_id: {job_id})")
+            await self._finish(job, FAILED, error=f"등록되지 않은 작업 종류: {job['type']}")
+            return
+
+        job["status"] = RUNNING
+        job["attempts"] += 1
+        job["started_at"] = time.time()
+        await self.backend.save(job, ttl=self.result_ttl_seconds)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            result = await handler(job["payload"])
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+            if job["attempts"] >= job["max_attempts"]:
+                logger.error(f"작업 실패 ({job['type']}, {job_id}, {job['attempts']}회 시도): {error}")
+                await self._finish(job, FAILED, error=error)
+                return
+
+            delay = backoff_delay(e, job["attempts"] - 1, self.retry_base_seconds, self.retry_max_delay_seconds)
+            if delay is None:
+                # 프로바이더 오류가 아닌 실패(DB, 응답 형식 등)도 작업은 재시도
+                base = min(self.retry_max_delay_seconds, self.retry_base_seconds * (2 ** (job["attempts"] - 1)))
+                delay = base / 2 + random.uniform(0, base / 2)
+            logger.warning(
+                f"작업 재시도 예정 ({job['type']}, {job_id}, {job['attempts']}/{job['max_attempts']}회, "
+                f"{delay:.1f}초 후): {error}"
+            )
+            metrics.incr("jobs.retried", type=job["type"])
+            job["status"] = RETRYING
+            job["error"] = error
+            await self.backend.save(job, ttl=self.result_ttl_seconds)
+            await self.backend.ack(job_id)
+            await self.backend.push(job_id, delay=delay)
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self._finish(job, SUCCEEDED, result=result)
+
+    async def _finish(self, job: Dict, status: str, result: Any = None, error: Optional[str] = None):
+        job["status"] = status
+        job["result"] = result
+        job["error"] = error
+        job["finished_at"] = time.time()
+        await self.backend.save(job, ttl=self.result_ttl_seconds)
+        await self.backend.ack(job["id"])
+
+        metrics.incr(f"jobs.{status}", type=job["type"])
+        metrics.observe("jobs.latency", job["finished_at"] - job["created_at"], type=job["type"])
+
+    def get_stats(self) -> Dict:
+        """작업 종류별 추가/성공/실패/재시도 수와 처리 지연 시간 (현재 프로세스 기준)"""
+        types = {}
+        for job_type in sorted(self._handlers):
+            types[job_type] = {
+                "enqueued": int(metrics.count("jobs.enqueued", type=job_type)),
+                "succeeded": int(metrics.count("jobs.succeeded", type=job_type)),
+                "failed": int(metrics.count("jobs.failed", type=job_type)),
+                "retried": int(metrics.count("jobs.retried", type=job_type)),
+                "p50_seconds": metrics.percentile("jobs.latency", 50, type=job_type),
+                "p95_seconds": metrics.percentile("jobs.latency", 95, type=job_type)
+            }
+        return {
+            "backend": type(self._backend).__name__ if self._backend else None,
+            "in_process_workers": len(self._workers),
+            "requeued": int(metrics.count("jobs.requeued")),
+            "types": types
+        }
+
+
+# 싱글톤 인스턴스
+job_queue = JobQueue(
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+    retry_max_delay_seconds=settings.JOB_RETRY_MAX_DELAY_SECONDS,
+    result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS,
+    visibility_timeout_seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+)
@@ -0,0 +1,140 @@
+"""
+LLM 응답 캐시 모듈
+(모델, 프롬프트 해시, 생성 설정)을 키로 Gemini 응답을 캐싱
+
+1차: 프로세스 내 LRU 캐시 (크기 + TTL 기반 제거)
+2차: Redis 공유 캐시 (uvicorn 워커 간 공유, settings.REDIS_URL 사용)
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """2단계(메모리 LRU + Redis) LLM 응답 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: int = 3600,
+        redis_prefix: str = "llm_cache:"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_prefix = redis_prefix
+
+        # key -> (만료 시각, 응답 텍스트)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        self.stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "redis_errors": 0
+        }
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, generation_config: Dict) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            model_name: Gemini 모델명
+            prompt: 입력 프롬프트
+            generation_config: temperature, max_output_tokens 등 생성 설정
+
+        Returns:
+            SHA-256 캐시 키
+        """
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw_key = json.dumps(
+            {"model": model_name, "prompt": prompt_hash, "config": generation_config},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (메모리 → Redis 순서, Redis 적중 시 메모리로 승격)"""
+        entry = self._memory.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return value
+            # TTL 만료
+            del self._memory[key]
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                value = await redis.get(self.redis_prefix + key)
+                if value is not None:
+                    self._set_memory(key, value)
+                    self.stats["redis_hits"] += 1
+                    return value
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                logger.warning(f"Redis 캐시 조회 실패 (무시): {str(e)}")
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """캐시 저장 (메모리 + Redis)"""
+        self._set_memory(key, value)
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(self.redis_prefix + key, value, ex=self.ttl_seconds)
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                logger.warning(f"Redis 캐시 저장 실패 (무시): {str(e)}")
+
+    def record_bypass(self):
+        """캐시를 사용하지 않은 호출 기록 (창의적 생성 등)"""
+        self.stats["bypassed"] += 1
+
+    def clear(self):
+        """메모리 캐시 비우기"""
+        self._memory.clear()
+
+    def get_stats(self) -> Dict:
+        """적중률 포함 캐시 통계"""
+        hits = self.stats["memory_hits"] + self.stats["redis_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "redis_enabled": get_redis() is not None
+        }
+
+    def _set_memory(self, key: str, value: str):
+        """메모리 LRU에 저장하고 최대 크기를 넘으면 오래된 항목 제거"""
+        self._memory[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+
+# 싱글톤 인스턴스
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+)
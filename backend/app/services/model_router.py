@@ -0,0 +1,160 @@
+"""
+Gemini 모델 라우팅 모듈
+GeminiService 메서드(route)별로 모델 등급(tier), 출력 토큰 한도, 타임아웃을 정합니다.
+
+- 의도 분류, 챗봇 메시지 분석처럼 단순한 작업은 가벼운(light) 모델로 보내 지연 시간을 줄입니다.
+- light 모델의 출력이 스키마 검증에 실패하면 standard 모델로 한 번 더 생성합니다 (escalation).
+- 라우트/등급별 지연 시간을 기록하여 모델 선택에 따른 절감 효과를 확인할 수 있습니다.
+
+라우팅 표는 GEMINI_MODEL_ROUTES 설정으로 라우트별 재정의할 수 있습니다.
+예: {"analyze_chat_message": {"tier": "standard"}, "generate_copies": {"timeout": 60}}
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import google.generativeai as genai
+
+from app.config import settings
+from app.services.client_pool import client_pool
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 스키마 검증 실패 시 올려 보낼 등급
+ESCALATION_TIERS = {
+    "light": "standard"
+}
+
+# 라우트별 기본 설정
+# max_tokens는 gemini-2.5 계열의 thinking 토큰을 포함하므로 여유 있게 설정
+DEFAULT_ROUTES: Dict[str, Dict[str, Any]] = {
+    "analyze_user_intent": {"tier": "light", "max_tokens": 512, "timeout": 10},
+    "analyze_chat_message": {"tier": "light", "max_tokens": 2048, "timeout": 15},
+    "analyze_target_insights": {"tier": "standard", "max_tokens": 4096, "timeout": 45},
+    "generate_marketing_strategies": {"tier": "standard", "max_tokens": 8192, "timeout": 60},
+    "generate_copies": {"tier": "standard", "max_tokens": 4096, "timeout": 45},
+    "convert_to_image_prompt": {"tier": "standard", "max_tokens": 2048, "timeout": 30},
+    "generate_fused_content": {"tier": "standard", "max_tokens": 16384, "timeout": 90}
+}
+
+
+class ModelRouter:
+    """라우트별 모델 등급/토큰 한도/타임아웃 결정 + 라우트별 지연 시간 기록"""
+
+    def __init__(
+        self,
+        tiers: Dict[str, str],
+        routes: Optional[Dict[str, Dict[str, Any]]] = None,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+        escalation_enabled: bool = True
+    ):
+        """
+        Args:
+            tiers: 등급 -> 모델명 (예: {"light": "gemini-2.0-flash-lite", "standard": "gemini-2.5-flash"})
+            routes: 라우트별 기본 설정 ({"tier", "max_tokens", "timeout"})
+            overrides: 라우트별 재정의 (설정값, 지정한 키만 덮어씀)
+            escalation_enabled: light 모델 스키마 검증 실패 시 standard 모델로 재생성 여부
+        """
+        self.tiers = tiers
+        self.routes = {name: dict(config) for name, config in (routes or DEFAULT_ROUTES).items()}
+        for name, override in (overrides or {}).items():
+            self.routes.setdefault(name, {}).update(override)
+        self.escalation_enabled = escalation_enabled
+
+    def resolve(self, route: str, tier: Optional[str] = None) -> Dict[str, Any]:
+        """
+        라우트 설정 조회
+
+        Args:
+            route: 라우트 이름 (GeminiService 메서드명)
+            tier: 등급 강제 지정 (escalation 시 사용)
+
+        Returns:
+            {"route", "tier", "model_name", "max_tokens", "timeout"}
+            (등록되지 않은 라우트는 standard 등급, 한도/타임아웃 없음)
+        """
+        config = self.routes.get(route, {})
+        tier = tier or config.get("tier", "standard")
+        if tier not in self.tiers:
+            logger.warning(f"알 수 없는 모델 등급 '{tier}' ({route}), standard로 대체")
+            tier = "standard"
+
+        return {
+            "route": route,
+            "tier": tier,
+            "model_name": self.tiers[tier],
+            "max_tokens": config.get("max_tokens"),
+            "timeout": config.get("timeout")
+        }
+
+    def escalation_tier(self, tier: str) -> Optional[str]:
+        """스키마 검증 실패 시 올려 보낼 등급 (없으면 None)"""
+        if not self.escalation_enabled:
+            return None
+        next_tier = ESCALATION_TIERS.get(tier)
+        # 두 등급이 같은 모델이면 재생성해도 의미 없음
+        if next_tier is None or self.tiers.get(next_tier) == self.tiers.get(tier):
+            return None
+        return next_tier
+
+    def get_model(self, model_name: str) -> genai.GenerativeModel:
+        """모델명별 GenerativeModel (client_pool에서 재사용)"""
+        return client_pool.gemini_model(model_name)
+
+    def record(self, route: str, tier: str, latency: float, success: bool):
+        """라우트 호출 결과 기록"""
+        metrics.incr("model_route.calls", route=route, tier=tier)
+        if success:
+            metrics.observe("model_route.latency", latency, route=route, tier=tier)
+        else:
+            metrics.incr("model_route.failures", route=route, tier=tier)
+
+    def record_escalation(self, route: str, from_tier: str, to_tier: str, reason: str):
+        """등급 상향 기록"""
+        metrics.incr("model_route.escalations", route=route)
+        logger.warning(f"{route}: {from_tier} 모델 출력 검증 실패, {to_tier} 모델로 재생성 ({reason[:100]})")
+
+    def get_stats(self) -> Dict:
+        """
+        라우트별 통계
+
+        - tiers: 등급별 호출 수, 실패 수, p50/p95 지연 시간 (light와 standard 비교로 절감 효과 확인)
+        - escalations: light 모델 검증 실패로 standard 모델을 다시 호출한 횟수
+        """
+        result = {}
+        for route in self.routes:
+            tiers = {}
+            for tier in self.tiers:
+                calls = metrics.count("model_route.calls", route=route, tier=tier)
+                if not calls:
+                    continue
+                tiers[tier] = {
+                    "calls": calls,
+                    "failures": metrics.count("model_route.failures", route=route, tier=tier),
+                    "p50": metrics.percentile("model_route.latency", 50, route=route, tier=tier),
+                    "p95": metrics.percentile("model_route.latency", 95, route=route, tier=tier)
+                }
+
+            result[route] = {
+                **self.resolve(route),
+                "escalations": metrics.count("model_route.escalations", route=route),
+                "tiers": tiers
+            }
+
+        return {
+            "tiers": self.tiers,
+            "escalation_enabled": self.escalation_enabled,
+            "routes": result
+        }
+
+
+# 싱글톤 인스턴스
+model_router = ModelRouter(
+    tiers={
+        "light": settings.GEMINI_LIGHT_MODEL,
+        "standard": settings.GEMINI_MODEL
+    },
+    overrides=settings.GEMINI_MODEL_ROUTES,
+    escalation_enabled=settings.GEMINI_ROUTE_ESCALATION
+)
@@ -4,26 +4,39 @@ Google의 Gemini 2.5 Flash Image를 사용한 이미지 생성
 """
 
 import google.genai as genai
+from google.genai import types
 from typing import Optional, Dict
 import logging
-import time
+import asyncio
 import base64
 from PIL import Image
 from io import BytesIO
 from app.config import settings
+from app.services.circuit_breaker import circuit_breakers, CircuitOpenError
+from app.services.client_pool import client_pool
+from app.services.hedging import request_hedger
 from app.services.image_storage import image_storage
+from app.services.quota_governor import gemini_quota, QuotaTimeoutError
+from app.utils.retry import backoff_delay
 
 logger = logging.getLogger(__name__)
 
+# 이미지 1장 생성 시 출력 토큰 수 (쿼터 계산용)
+IMAGE_OUTPUT_TOKENS = 1290
+
 
 class NanobananaService:
     """Gemini 2.5 Flash Image 생성 서비스 (Nano Banana)"""
 
     def __init__(self):
         self.api_key = settings.GEMINI_API_KEY
+        self.breaker = circuit_breakers.get("nanobanana")
         if self.api_key:
-            # Gemini Client 초기화
-            self.client = genai.Client(api_key=self.api_key)
+            # Gemini Client 초기화 (비동기 호출은 공유 httpx 커넥션 풀 사용)
+            self.client = genai.Client(
+                api_key=self.api_key,
+                http_options=types.HttpOptions(httpx_async_client=client_pool.http("gemini_rest"))
+            )
             logger.info("Gemini 2.5 Flash Image (Nano Banana) 클라이언트 초기화 완료")
         else:
             self.client = None
@@ -60,17 +73,23 @@ class NanobananaService:
         last_error = None
 
         for attempt in range(max_retries):
+            probe = None
             try:
+                probe = self.breaker.check()
                 logger.info(f"이미지 생성 시작 (모델: gemini-2.5-flash-image, 시도: {attempt + 1}/{max_retries})")
                 logger.info(f"프롬프트: {prompt[:100]}...")
 
-                # Gemini 2.5 Flash Image API 호출
-                import asyncio
-
-                response = await asyncio.to_thread(
-                    self.client.models.generate_content,
-                    model="gemini-2.5-flash-image",
-                    contents=prompt
+                # Gemini 2.5 Flash Image API 호출 (비동기, p95 지연을 넘기면 중복 요청)
+                tokens = gemini_quota.estimate_tokens(prompt, IMAGE_OUTPUT_TOKENS)
+                await gemini_quota.acquire(tokens, caller="nanobanana_service")
+
+                response = await request_hedger.run(
+                    "nanobanana.generate",
+                    lambda: self.client.aio.models.generate_content(
+                        model="gemini-2.5-flash-image",
+                        contents=prompt
+                    ),
+                    before_hedge=lambda: gemini_quota.acquire(tokens, caller="nanobanana_service.hedge")
                 )
 
                 logger.info(f"응답 수신 완료")
@@ -106,23 +125,31 @@ class NanobananaService:
                                         else:
                                             logger.warning("로컬 저장 실패, Base64 URL만 반환")
 
+                                    self.breaker.record_success()
                                     return result
 
                 # 이미지 데이터를 찾지 못한 경우
                 logger.warning(f"응답에서 이미지를 찾을 수 없음")
                 raise ValueError("Gemini 2.5 Flash Image 응답에 이미지가 없습니다")
 
+            except (QuotaTimeoutError, CircuitOpenError):
+                raise
             except Exception as e:
                 last_error = e
+                self.breaker.record_failure(e)
                 logger.warning(f"이미지 생성 시도 {attempt + 1}/{max_retries} 실패: {str(e)}")
 
-                if attempt < max_retries - 1:
-                    # 지수 백오프: 3초, 6초, 12초
-                    wait_time = 3 * (2 ** attempt)
-                    logger.info(f"{wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-
-        logger.error(f"이미지 생성 최종 실패 (재시도 {max_retries}회): {str(last_error)}")
+                # 지수 백오프 (3초, 6초 기준 + 지터), 이미지 없음(안전 필터 차단) 등은 바로 실패
+                wait_time = backoff_delay(e, attempt, 3.0, settings.RETRY_MAX_DELAY_SECONDS)
+                if wait_time is None or attempt == max_retries - 1:
+                    break
+                logger.info(f"{wait_time:.1f}초 후 재시도...")
+                await asyncio.sleep(wait_time)
+            finally:
+                # 결과를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등) 자리 반납
+                self.breaker.release(probe)
+
+        logger.error(f"이미지 생성 최종 실패 (시도 {attempt + 1}회): {str(last_error)}")
         raise last_error
 
     async def generate_from_product_image(
@@ -153,7 +180,9 @@ class NanobananaService:
         last_error = None
 
         for attempt in range(max_retries):
+            probe = None
             try:
+                probe = self.breaker.check()
                 logger.info(f"제품 이미지 기반 마케팅 이미지 생성 시작 (시도: {attempt + 1}/{max_retries})")
                 logger.info(f"제품 이미지: {product_image_path}")
                 logger.info(f"프롬프트: {prompt[:100]}...")
@@ -168,15 +197,20 @@ class NanobananaService:
                 logger.info(f"제품 이미지 로드 완료: {product_image.size}")
 
                 # Gemini 2.5 Flash Image API 호출 (이미지 + 텍스트)
-                import asyncio
-
-                response = await asyncio.to_thread(
-                    self.client.models.generate_content,
-                    model="gemini-2.5-flash-image",
-                    contents=[
-                        product_image,  # 제품 이미지
-                        prompt  # 생성할 마케팅 이미지에 대한 설명
-                    ]
+                # 입력 이미지 토큰 + 출력 이미지 토큰
+                tokens = gemini_quota.estimate_tokens(prompt, IMAGE_OUTPUT_TOKENS * 2)
+                await gemini_quota.acquire(tokens, caller="nanobanana_service")
+
+                response = await request_hedger.run(
+                    "nanobanana.product_image",
+                    lambda: self.client.aio.models.generate_content(
+                        model="gemini-2.5-flash-image",
+                        contents=[
+                            product_image,  # 제품 이미지
+                            prompt  # 생성할 마케팅 이미지에 대한 설명
+                        ]
+                    ),
+                    before_hedge=lambda: gemini_quota.acquire(tokens, caller="nanobanana_service.hedge")
                 )
 
                 logger.info(f"응답 수신 완료")
@@ -213,22 +247,30 @@ class NanobananaService:
                                         else:
                                             logger.warning("로컬 저장 실패, Base64 URL만 반환")
 
+                                    self.breaker.record_success()
                                     return result
 
                 # 이미지 데이터를 찾지 못한 경우
                 logger.warning(f"응답에서 이미지를 찾을 수 없음")
                 raise ValueError("Gemini 2.5 Flash Image 응답에 이미지가 없습니다")
 
+            except (QuotaTimeoutError, CircuitOpenError):
+                raise
             except Exception as e:
                 last_error = e
+                self.breaker.record_failure(e)
                 logger.warning(f"제품 이미지 기반 생성 시도 {attempt + 1}/{max_retries} 실패: {str(e)}")
 
-                if attempt < max_retries - 1:
-                    wait_time = 3 * (2 ** attempt)
-                    logger.info(f"{wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
+                wait_time = backoff_delay(e, attempt, 3.0, settings.RETRY_MAX_DELAY_SECONDS)
+                if wait_time is None or attempt == max_retries - 1:
+                    break
+                logger.info(f"{wait_time:.1f}초 후 재시도...")
+                await asyncio.sleep(wait_time)
+            finally:
+                # 결과를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등) 자리 반납
+                self.breaker.release(probe)
 
-        logger.error(f"제품 이미지 기반 생성 최종 실패 (재시도 {max_retries}회): {str(last_error)}")
+        logger.error(f"제품 이미지 기반 생성 최종 실패 (시도 {attempt + 1}회): {str(last_error)}")
         raise last_error
 
 
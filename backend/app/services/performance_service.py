@@ -5,19 +5,63 @@ Performance analysis service
 import logging
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-import google.generativeai as genai
 import json
-import asyncio
 
 from app.models.performance import Performance, DataSource
 from app.models.content import Content
 from app.config import settings
+from app.services.artifact_store import artifact_store
+from app.services.circuit_breaker import circuit_breakers
+from app.services.client_pool import client_pool
 from app.services.vector_service import vector_service
+from app.services.prompt_registry import prompt_registry
+from app.services.provider_sim import provider_sim
+from app.services.quota_governor import gemini_quota
+from app.schemas.performance import PersonaListOutput, SimulationOutput
+from app.utils.gemini_schema import finish_reason_name, parse_llm_json, structured_generation_config
+from app.utils.tenant import BACKGROUND, tenant_scope
 
 logger = logging.getLogger(__name__)
 
-# Gemini API 설정
-genai.configure(api_key=settings.GEMINI_API_KEY)
+SIMULATION_MODEL_NAME = "gemini-2.0-flash-exp"
+
+# 반응 시뮬레이션 고정 지시문 (컨텍스트 캐시에 등록, 페르소나/콘텐츠 정보는 뒤에 붙임)
+SIMULATE_REACTIONS_PROMPT_PREFIX = """
+당신은 마케팅 성과 분석 전문가입니다.
+아래 페르소나들이 주어진 마케팅 콘텐츠를 봤을 때의 반응을 객관적으로 시뮬레이션하세요.
+
+각 페르소나의 반응을 예측하세요:
+1. will_click: 클릭 여부 (true/false)
+2. engagement_action: 참여 행동 (null, "like", "comment", "share", "save")
+3. will_convert: 전환 여부 (true/false)
+4. brand_recall: 브랜드 기억도 (0-100)
+5. reason: 이유 (1-2줄)
+
+**출력 형식은 JSON 객체여야 합니다:**
+
+{
+  "reactions": [
+    {
+      "persona_name": "김미래",
+      "will_click": true,
+      "engagement_action": "save",
+      "will_convert": false,
+      "brand_recall": 75,
+      "reason": "비주얼이 예쁘고 트렌디해서 관심이 가지만, 당장 필요한 제품은 아니라 나중을 위해 저장만 함"
+    }
+  ],
+  "overall_metrics": {
+    "total_impressions": <페르소나 수>,
+    "total_clicks": <클릭한 페르소나 수>,
+    "ctr": <클릭률 %>,
+    "engagement_rate": <참여한 페르소나 비율 %>,
+    "conversion_rate": <전환한 페르소나 비율 %>,
+    "avg_brand_recall": <평균 브랜드 기억도>
+  }
+}
+"""
+
+prompt_registry.register("simulate_reactions", SIMULATE_REACTIONS_PROMPT_PREFIX)
 
 
 class PerformanceService:
@@ -25,7 +69,71 @@ class PerformanceService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.gemini_model = genai.GenerativeModel("gemini-2.0-flash-exp")
+        # 요청마다 모델을 새로 만들지 않고 공유 인스턴스 사용
+        self.gemini_model = client_pool.gemini_model(SIMULATION_MODEL_NAME)
+
+    async def _generate_json(
+        self,
+        prompt: str,
+        schema_model,
+        max_output_tokens: int,
+        prompt_name: Optional[str] = None
+    ) -> Any:
+        """
+        구조화 출력으로 JSON 생성 후 공용 파서로 검증
+
+        prompt_name이 주어지면 prompt는 요청별 입력 부분이며,
+        등록된 고정 지시문은 컨텍스트 캐시로 전송합니다.
+        PROVIDER_SIM_MODE가 설정되면 스키마 이름을 작업 이름으로 기록/재생합니다.
+        gemini 서킷이 열려 있으면 호출하지 않고 CircuitOpenError를 발생시킵니다.
+        """
+        breaker = circuit_breakers.get("gemini")
+        probe = breaker.check()
+        try:
+            full_prompt = prompt_registry.full_prompt(prompt_name, prompt) if prompt_name else prompt
+            await gemini_quota.acquire(
+                gemini_quota.estimate_tokens(full_prompt, max_output_tokens),
+                caller="performance_service"
+            )
+
+            generation_config = {}
+            mode = "text"
+            if settings.GEMINI_STRUCTURED_OUTPUT:
+                generation_config = structured_generation_config(schema_model)
+                mode = "structured"
+
+            async def generate():
+                if prompt_name:
+                    response, _ = await prompt_registry.generate(
+                        prompt_name, prompt, self.gemini_model, SIMULATION_MODEL_NAME,
+                        generation_config=generation_config
+                    )
+                    return response
+                return await self.gemini_model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config
+                )
+
+            try:
+                async with client_pool.track("gemini", len(prompt.encode())) as call:
+                    if provider_sim.enabled:
+                        response = await provider_sim.gemini(
+                            schema_model.__name__,
+                            (SIMULATION_MODEL_NAME, full_prompt, generation_config),
+                            generate
+                        )
+                    else:
+                        response = await generate()
+                    call["bytes_in"] = len(response.text.encode())
+            except Exception as e:
+                breaker.record_failure(e)
+                raise
+            breaker.record_success()
+        finally:
+            # 결과를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등) 자리 반납
+            breaker.release(probe)
+
+        return parse_llm_json(response.text, schema_model, mode, finish_reason_name(response))
 
     async def generate_personas(
         self,
@@ -75,19 +183,7 @@ class PerformanceService:
 """
 
         try:
-            response = await asyncio.to_thread(
-                self.gemini_model.generate_content,
-                prompt
-            )
-
-            text = response.text.strip()
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-                text = text.strip()
-
-            personas = json.loads(text)
+            personas = await self._generate_json(prompt, PersonaListOutput, 4096)
             logger.info(f"✅ {len(personas)}명의 페르소나 생성 완료")
             return personas
 
@@ -122,10 +218,7 @@ class PerformanceService:
                 reference_section += "\n"
 
         prompt = f"""
-당신은 마케팅 성과 분석 전문가입니다.
-아래 페르소나들이 주어진 마케팅 콘텐츠를 봤을 때의 반응을 객관적으로 시뮬레이션하세요.
-
-**페르소나 정보:**
+**페르소나 정보 ({len(personas)}명):**
 {json.dumps(personas, ensure_ascii=False, indent=2)}
 
 **마케팅 콘텐츠:**
@@ -134,51 +227,11 @@ class PerformanceService:
 - 카피: {content_data.get('copy_text')}
 - 해시태그: {', '.join(content_data.get('hashtags', []))}
 {reference_section}
-각 페르소나의 반응을 예측하세요:
-1. will_click: 클릭 여부 (true/false)
-2. engagement_action: 참여 행동 (null, "like", "comment", "share", "save")
-3. will_convert: 전환 여부 (true/false)
-4. brand_recall: 브랜드 기억도 (0-100)
-5. reason: 이유 (1-2줄)
-
-**출력 형식은 JSON 객체여야 합니다:**
-
-{{
-  "reactions": [
-    {{
-      "persona_name": "김미래",
-      "will_click": true,
-      "engagement_action": "save",
-      "will_convert": false,
-      "brand_recall": 75,
-      "reason": "비주얼이 예쁘고 트렌디해서 관심이 가지만, 당장 필요한 제품은 아니라 나중을 위해 저장만 함"
-    }}
-  ],
-  "overall_metrics": {{
-    "total_impressions": {len(personas)},
-    "total_clicks": <클릭한 페르소나 수>,
-    "ctr": <클릭률 %>,
-    "engagement_rate": <참여한 페르소나 비율 %>,
-    "conversion_rate": <전환한 페르소나 비율 %>,
-    "avg_brand_recall": <평균 브랜드 기억도>
-  }}
-}}
+overall_metrics.total_impressions는 {len(personas)}입니다.
 """
 
         try:
-            response = await asyncio.to_thread(
-                self.gemini_model.generate_content,
-                prompt
-            )
-
-            text = response.text.strip()
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-                text = text.strip()
-
-            result = json.loads(text)
+            result = await self._generate_json(prompt, SimulationOutput, 8192, "simulate_reactions")
             logger.info(f"✅ 성과 시뮬레이션 완료 - CTR: {result['overall_metrics']['ctr']:.2f}%")
             return result
 
@@ -193,12 +246,18 @@ class PerformanceService:
         """
         콘텐츠 성과 예측 (AI 시뮬레이션)
 
+        Gemini 호출은 background 우선순위로 쿼터를 기다립니다 (대화형 생성 요청이 먼저 실행).
+
         Args:
             content_id: 콘텐츠 ID
 
         Returns:
             Performance 객체
         """
+        with tenant_scope(priority=BACKGROUND):
+            return await self._predict_performance(content_id)
+
+    async def _predict_performance(self, content_id: int) -> Optional[Performance]:
         try:
             # 콘텐츠 조회
             content = self.db.query(Content).filter(Content.id == content_id).first()
@@ -216,18 +275,29 @@ class PerformanceService:
                 "image_prompt": content.image_prompt
             }
 
-            # 1. 페르소나 생성
-            logger.info(f"[1/4] 페르소나 생성 중...")
-            personas = await self.generate_personas(
-                target_age_group=content.target_age_group or "20대",
-                target_gender=content.target_gender or "무관",
-                target_interests=content.target_interests or ["일반"],
-                count=30  # 30명 페르소나 (100명은 JSON 파싱 에러 발생) + scale_factor로 실제 규모 반영
-            )
+            # 1. 페르소나 생성 (같은 타겟으로 만든 페르소나가 산출물에 있으면 재사용)
+            target_age_group = content.target_age_group or "20대"
+            target_gender = content.target_gender or "무관"
+            target_interests = content.target_interests or ["일반"]
+            persona_key = artifact_store.persona_key(target_age_group, target_gender, target_interests)
+            cached = artifact_store.load(self.db, content_id).get("personas") or {}
+
+            if cached.get("key") == persona_key and cached.get("items"):
+                personas = cached["items"]
+                logger.info(f"[1/4] 저장된 페르소나 재사용 ({len(personas)}명)")
+            else:
+                logger.info(f"[1/4] 페르소나 생성 중...")
+                personas = await self.generate_personas(
+                    target_age_group=target_age_group,
+                    target_gender=target_gender,
+                    target_interests=target_interests,
+                    count=30  # 30명 페르소나 (100명은 JSON 파싱 에러 발생) + scale_factor로 실제 규모 반영
+                )
 
-            if not personas:
-                logger.error("페르소나 생성 실패")
-                return None
+                if not personas:
+                    logger.error("페르소나 생성 실패")
+                    return None
+                artifact_store.save(self.db, content_id, {"personas": {"key": persona_key, "items": personas}})
 
             # 2. RAG: 유사 콘텐츠 검색 및 성과 데이터 수집
             logger.info(f"[2/4] 유사 콘텐츠 검색 중... (RAG)")
@@ -321,6 +391,46 @@ class PerformanceService:
             self.db.rollback()
             return None
 
+    def copy_performance(self, source_content_id: int, content_id: int) -> Optional[Performance]:
+        """
+        원본 콘텐츠의 성과 예측을 재생성 콘텐츠로 복사
+
+        카피/전략/타겟이 같아 시뮬레이션 입력이 바뀌지 않은 재생성(이미지만 재생성)에 사용합니다.
+        원본에 AI 예측이 없으면 None을 반환합니다.
+        """
+        source = self.db.query(Performance).filter(
+            Performance.content_id == source_content_id,
+            Performance.data_source == DataSource.AI_SIMULATION
+        ).first()
+        if not source:
+            return None
+
+        try:
+            performance = Performance(
+                content_id=content_id,
+                data_source=DataSource.AI_SIMULATION,
+                impressions=source.impressions,
+                clicks=source.clicks,
+                ctr=source.ctr,
+                engagement_rate=source.engagement_rate,
+                conversion_rate=source.conversion_rate,
+                brand_recall_score=source.brand_recall_score,
+                target_breakdown=source.target_breakdown,
+                personas_data=source.personas_data,
+                confidence_score=source.confidence_score
+            )
+            self.db.add(performance)
+            self.db.commit()
+            self.db.refresh(performance)
+
+            logger.info(f"✅ 성과 예측 복사 완료 (원본: {source_content_id} → {content_id})")
+            return performance
+
+        except Exception as e:
+            logger.error(f"❌ 성과 예측 복사 오류: {e}")
+            self.db.rollback()
+            return None
+
     def get_performance(self, content_id: int) -> Optional[Performance]:
         """콘텐츠의 성과 데이터 조회"""
         return self.db.query(Performance).filter(
@@ -0,0 +1,262 @@
+"""
+프롬프트 레지스트리 + Gemini 컨텍스트 캐싱 모듈
+
+자주 쓰는 프롬프트를 고정 지시문(static prefix)과 요청별 입력(dynamic suffix)으로 나누고,
+고정 지시문을 Gemini 컨텍스트 캐시(CachedContent)의 system_instruction으로 등록합니다.
+캐시된 모델에는 dynamic suffix만 전송하므로 매 호출마다 같은 지시문을 다시 보내지 않습니다.
+
+- 캐시는 TTL 만료 전에 백그라운드에서 새로 만들어 교체합니다.
+- API 키가 없거나, 지시문이 모델의 최소 캐시 크기보다 작거나, 캐시 생성/사용에 실패하면
+  기존처럼 전체 프롬프트(prefix + suffix)를 보내는 방식으로 자동 대체합니다.
+  (prefix를 앞에 두므로 대체 시에도 Gemini 암시적 캐싱의 대상이 됩니다)
+- 프롬프트별 입력 토큰(캐시 적중 토큰 포함)과 지연 시간을 기록합니다.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 캐시된 콘텐츠가 만료/삭제되었을 때 발생하는 오류 (대체 경로로 한 번 더 시도)
+_CACHE_ERRORS = (
+    google_exceptions.NotFound,
+    google_exceptions.FailedPrecondition,
+    google_exceptions.InvalidArgument,
+    google_exceptions.PermissionDenied
+)
+
+
+class PromptRegistry:
+    """고정 지시문 등록 + 컨텍스트 캐시 관리"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl_seconds: int = 3600,
+        refresh_margin_seconds: int = 120,
+        retry_after_seconds: int = 600
+    ):
+        """
+        Args:
+            enabled: 컨텍스트 캐싱 사용 여부 (False면 항상 전체 프롬프트 전송)
+            ttl_seconds: 캐시 TTL
+            refresh_margin_seconds: 만료 몇 초 전에 새 캐시로 교체할지
+            retry_after_seconds: 캐시 생성 실패 후 다시 시도하기까지 대기 시간
+        """
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+        # 이름 -> 고정 지시문
+        self._prefixes: Dict[str, str] = {}
+        # (이름, 모델명) -> {"model": GenerativeModel, "cache_name": str, "expires_at": float}
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # (이름, 모델명) -> 다음 생성 시도 시각
+        self._retry_at: Dict[Tuple[str, str], float] = {}
+        # 생성 중인 (이름, 모델명)
+        self._creating: Set[Tuple[str, str]] = set()
+        # 백그라운드 캐시 생성 태스크 (완료될 때까지 참조 유지)
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, static_prefix: str):
+        """프롬프트 고정 지시문 등록"""
+        self._prefixes[name] = static_prefix.strip()
+        self.stats.setdefault(name, {
+            "cached_calls": 0,
+            "fallback_calls": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "caches_created": 0,
+            "cache_errors": 0,
+            "unavailable_reason": None
+        })
+
+    def get_prefix(self, name: str) -> str:
+        return self._prefixes[name]
+
+    def full_prompt(self, name: str, dynamic_suffix: str) -> str:
+        """캐시를 사용하지 않을 때 보낼 전체 프롬프트 (prefix + suffix)"""
+        return f"{self._prefixes[name]}\n\n{dynamic_suffix.strip()}"
+
+    def _mark_unavailable(self, key: Tuple[str, str], reason: str):
+        """캐시 사용 불가 기록 후 retry_after_seconds 동안 대체 경로 사용"""
+        self.stats[key[0]]["unavailable_reason"] = reason
+        self._retry_at[key] = time.monotonic() + self.retry_after_seconds
+
+    async def get_cached_model(self, name: str, model_name: str) -> Optional[genai.GenerativeModel]:
+        """
+        캐시된 지시문을 사용하는 모델 반환
+
+        캐시 생성/갱신은 백그라운드에서 진행하므로 요청이 캐시 생성을 기다리지 않습니다.
+        만료가 가까워지면 기존 캐시를 계속 사용하면서 새 캐시를 만들어 교체합니다.
+
+        Returns:
+            GenerativeModel 또는 None (캐시 사용 불가 → 전체 프롬프트 전송)
+        """
+        if not self.enabled or not settings.GEMINI_API_KEY:
+            return None
+
+        key = (name, model_name)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        needs_refresh = entry is None or entry["expires_at"] - self.refresh_margin_seconds <= now
+        if needs_refresh and key not in self._creating and self._retry_at.get(key, 0) <= now:
+            self._creating.add(key)
+            task = asyncio.create_task(self._create(key))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        if entry and entry["expires_at"] > now:
+            return entry["model"]
+        return None
+
+    async def _create(self, key: Tuple[str, str]):
+        """컨텍스트 캐시 생성 (백그라운드)"""
+        name, model_name = key
+        try:
+            cached_content = await asyncio.to_thread(
+                caching.CachedContent.create,
+                model=model_name,
+                display_name=f"contentcraft-{name}",
+                system_instruction=self._prefixes[name],
+                ttl=timedelta(seconds=self.ttl_seconds)
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content)
+
+            self._entries[key] = {
+                "model": model,
+                "cache_name": cached_content.name,
+                "expires_at": time.monotonic() + self.ttl_seconds
+            }
+            self.stats[name]["caches_created"] += 1
+            self.stats[name]["unavailable_reason"] = None
+            logger.info(f"컨텍스트 캐시 생성 ({name}, {model_name}): {cached_content.name}")
+
+        except Exception as e:
+            # 최소 캐시 크기 미달, 지원하지 않는 모델 등
+            logger.warning(f"컨텍스트 캐시 생성 실패 ({name}), 전체 프롬프트로 대체: {str(e)}")
+            self._mark_unavailable(key, str(e)[:200])
+        finally:
+            self._creating.discard(key)
+
+    def invalidate(self, name: str, model_name: str):
+        """캐시 항목 제거 (서버에서 만료/삭제된 경우)"""
+        self._entries.pop((name, model_name), None)
+
+    async def generate(
+        self,
+        name: str,
+        dynamic_suffix: str,
+        fallback_model: genai.GenerativeModel,
+        model_name: str,
+        generation_config: Optional[Dict] = None,
+        stream: bool = False
+    ) -> Tuple[Any, bool]:
+        """
+        등록된 프롬프트로 생성 요청
+
+        캐시가 있으면 캐시된 모델에 dynamic suffix만 보내고,
+        없으면 fallback_model에 전체 프롬프트를 보냅니다.
+
+        Args:
+            name: 등록된 프롬프트 이름
+            dynamic_suffix: 요청별 입력 부분
+            fallback_model: 캐시를 사용할 수 없을 때 사용할 모델
+            model_name: 캐시를 만들 모델명 (fallback_model과 같은 모델)
+            generation_config: 생성 설정
+            stream: 스트리밍 여부
+
+        Returns:
+            (generate_content_async 응답, 캐시 사용 여부)
+            스트리밍은 기록하지 않으므로 마지막 조각을 받은 뒤 record()를 호출해야 합니다.
+        """
+        cached_model = await self.get_cached_model(name, model_name)
+        start = time.monotonic()
+
+        if cached_model is not None:
+            try:
+                response = await cached_model.generate_content_async(
+                    dynamic_suffix,
+                    generation_config=generation_config,
+                    stream=stream
+                )
+                if not stream:
+                    self.record(name, True, time.monotonic() - start, response)
+                return response, True
+            except _CACHE_ERRORS as e:
+                logger.warning(f"컨텍스트 캐시 사용 실패 ({name}), 전체 프롬프트로 재시도: {str(e)}")
+                self.stats[name]["cache_errors"] += 1
+                self.invalidate(name, model_name)
+                start = time.monotonic()
+
+        response = await fallback_model.generate_content_async(
+            self.full_prompt(name, dynamic_suffix),
+            generation_config=generation_config,
+            stream=stream
+        )
+        if not stream:
+            self.record(name, False, time.monotonic() - start, response)
+        return response, False
+
+    def record(self, name: str, cached: bool, latency: float, response):
+        """호출 결과 기록 (스트리밍은 마지막 조각을 받은 뒤 호출)"""
+        stats = self.stats[name]
+        stats["cached_calls" if cached else "fallback_calls"] += 1
+
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            stats["prompt_tokens"] += usage.prompt_token_count or 0
+            # 명시적 캐시 + Gemini 암시적 캐싱으로 재사용된 입력 토큰
+            stats["cached_tokens"] += getattr(usage, "cached_content_token_count", 0) or 0
+
+        metrics.observe("prompt.latency", latency, prompt=name, mode="cached" if cached else "full")
+
+    def get_stats(self) -> Dict:
+        """
+        프롬프트별 캐시 사용 통계
+
+        - cached_token_ratio: 입력 토큰 중 캐시에서 재사용된 비율 (캐시 토큰은 할인 요금)
+        - latency: 캐시 사용/전체 전송별 평균, p95 지연 시간
+        """
+        result = {}
+        for name, stats in self.stats.items():
+            latency = {}
+            for mode in ("cached", "full"):
+                count = metrics.sample_count("prompt.latency", prompt=name, mode=mode)
+                if count:
+                    latency[mode] = {
+                        "count": count,
+                        "p50": metrics.percentile("prompt.latency", 50, prompt=name, mode=mode),
+                        "p95": metrics.percentile("prompt.latency", 95, prompt=name, mode=mode)
+                    }
+
+            result[name] = {
+                **stats,
+                "prefix_chars": len(self._prefixes.get(name, "")),
+                "cached_token_ratio": round(stats["cached_tokens"] / stats["prompt_tokens"], 4)
+                if stats["prompt_tokens"] else 0.0,
+                "latency": latency
+            }
+
+        return {"enabled": self.enabled, "prompts": result}
+
+
+# 싱글톤 인스턴스
+prompt_registry = PromptRegistry(
+    enabled=settings.GEMINI_CONTEXT_CACHE_ENABLED,
+    ttl_seconds=settings.GEMINI_CONTEXT_CACHE_TTL_SECONDS
+)
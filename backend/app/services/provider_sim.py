@@ -0,0 +1,448 @@
+"""
+외부 API 기록/재생(record/replay) 시뮬레이터
+실제 Gemini, Replicate, Ideogram, Voyage AI 응답을 카세트 파일에 기록하고,
+네트워크 없이 재생하여 생성 파이프라인을 부하 테스트할 수 있게 합니다.
+
+모드 (PROVIDER_SIM_MODE):
+- off: 사용하지 않음 (기본)
+- record: 실제 API를 호출하고 응답을 카세트에 추가
+- replay: 카세트의 응답을 반환 (외부 호출 없음)
+
+가로채는 위치:
+- HTTP 기반 클라이언트 (Ideogram, Replicate, Voyage, 이미지 다운로드, Nanobanana REST):
+  client_pool의 httpx transport를 감싸서 요청/응답 단위로 기록
+- Gemini (google.generativeai, gRPC): GeminiService/PerformanceService의 호출 지점에서
+  응답 텍스트와 토큰 사용량을 기록
+
+재생 시 정확히 같은 요청(메서드/URL/본문 또는 모델/프롬프트/설정)이 없으면
+같은 작업(label)으로 기록된 응답 중 하나를 사용합니다. 입력이 조금씩 다른 부하 테스트 요청도 재생할 수 있습니다.
+
+카세트는 프로바이더별 JSONL 파일({cassette_dir}/{provider}.jsonl)이며 한 줄에 응답 하나입니다.
+{"key": 요청 지문, "label": 작업 이름, "latency": 기록 당시 지연(초), "response": {...}}
+
+재생 시 지연 시간은 기록된 값 × PROVIDER_SIM_SPEED를 기본으로 하고,
+PROVIDER_SIM_LATENCY에 프로바이더별 분포를 지정하면 그 분포에서 뽑습니다.
+PROVIDER_SIM_ERROR_RATES에 지정한 비율만큼 503(Gemini는 ServiceUnavailable) 오류를 주입합니다.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from google.api_core import exceptions as google_exceptions
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 경로 일반화: 예측 ID 등 긴 식별자 세그먼트를 {id}로 치환
+_ID_SEGMENT = re.compile(r"^[A-Za-z0-9]{16,}$")
+
+# 응답 재구성 시 유지할 헤더
+_KEPT_HEADERS = ("content-type",)
+
+# 기록 모드에서 본문을 디코딩해서 돌려주므로 원래 인코딩/길이 헤더는 제거 (클라이언트가 다시 디코딩하지 않도록)
+_ENCODING_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _decoded_response(response: httpx.Response, body: bytes, request: httpx.Request) -> httpx.Response:
+    """디코딩된 본문으로 응답 재구성 (Content-Length는 httpx가 본문 기준으로 다시 설정)"""
+    headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _ENCODING_HEADERS]
+    return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+
+class CassetteMissError(RuntimeError):
+    """재생 모드에서 카세트에 해당 요청이 없음"""
+
+
+def _fingerprint(*parts: Any) -> str:
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def http_label(request: httpx.Request) -> str:
+    """HTTP 요청의 작업 이름 (메서드 + 호스트 + 일반화된 경로)"""
+    segments = ["{id}" if _ID_SEGMENT.match(seg) else seg for seg in request.url.path.split("/")]
+    return f"{request.method} {request.url.host}{'/'.join(segments)}"
+
+
+class SimulatedGeminiResponse:
+    """기록된 텍스트로 만든 google.generativeai 응답 대용 객체"""
+
+    def __init__(self, text: str, usage: Optional[Dict[str, int]] = None):
+        self.text = text
+        self.parts = [SimpleNamespace(text=text)] if text else []
+        self.candidates = [SimpleNamespace(finish_reason="STOP")]
+        usage = usage or {}
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=usage.get("prompt_token_count", 0),
+            cached_content_token_count=usage.get("cached_content_token_count", 0),
+            candidates_token_count=usage.get("candidates_token_count", 0)
+        )
+
+
+def _usage_dict(response) -> Dict[str, int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    return {
+        "prompt_token_count": getattr(usage, "prompt_token_count", 0) or 0,
+        "cached_content_token_count": getattr(usage, "cached_content_token_count", 0) or 0,
+        "candidates_token_count": getattr(usage, "candidates_token_count", 0) or 0
+    }
+
+
+class ProviderSimulator:
+    """카세트 기반 외부 API 기록/재생 + 지연/오류 주입"""
+
+    def __init__(
+        self,
+        mode: str = "off",
+        cassette_dir: str = "cassettes",
+        latency: Optional[Dict[str, Dict[str, Any]]] = None,
+        error_rates: Optional[Dict[str, float]] = None,
+        speed: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            mode: off / record / replay
+            cassette_dir: 카세트 디렉토리 (상대 경로는 backend 디렉토리 기준)
+            latency: 프로바이더별 재생 지연 분포
+                {"gemini": {"dist": "lognormal", "median": 1.5, "sigma": 0.5}}
+                dist: fixed(value) / uniform(min, max) / lognormal(median, sigma)
+            error_rates: 프로바이더별 오류 주입 비율 (예: {"gemini": 0.02})
+            speed: 기록된 지연 시간 배율 (0이면 지연 없음, latency 분포가 없을 때만 사용)
+            seed: 난수 시드 (재현 가능한 부하 테스트용)
+        """
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"알 수 없는 PROVIDER_SIM_MODE: {mode}")
+
+        self.mode = mode
+        path = Path(cassette_dir)
+        self.cassette_dir = path if path.is_absolute() else Path(__file__).parent.parent.parent / path
+        self.latency = latency or {}
+        self.error_rates = error_rates or {}
+        self.speed = speed
+        self._random = random.Random(seed)
+
+        # 프로바이더 -> 요청 지문 -> 기록 목록 (같은 요청의 반복 응답은 순서대로 재생, 예: 폴링)
+        self._exact: Dict[str, Dict[str, List[Dict]]] = {}
+        # 프로바이더 -> label -> 기록 목록
+        self._by_label: Dict[str, Dict[str, List[Dict]]] = {}
+        # 요청 지문별 재생 위치
+        self._cursor: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+        if mode != "off":
+            logger.warning(f"외부 API 시뮬레이터 활성화 (mode={mode}, cassette_dir={self.cassette_dir})")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _stat(self, provider: str, name: str):
+        stats = self.stats.setdefault(provider, {"recorded": 0, "replayed": 0, "label_matches": 0, "misses": 0, "injected_errors": 0})
+        stats[name] += 1
+
+    # ------------------------------------------------------------------
+    # 카세트
+    # ------------------------------------------------------------------
+
+    def _load(self, provider: str):
+        """프로바이더 카세트 로드 (처음 사용 시 한 번)"""
+        if provider in self._exact:
+            return
+        self._exact[provider] = {}
+        self._by_label[provider] = {}
+
+        path = self.cassette_dir / f"{provider}.jsonl"
+        if not path.exists():
+            if self.replaying:
+                logger.warning(f"카세트 파일 없음: {path}")
+            return
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self._index(provider, json.loads(line))
+
+    def _index(self, provider: str, entry: Dict):
+        if entry.get("key"):
+            self._exact[provider].setdefault(entry["key"], []).append(entry)
+        self._by_label[provider].setdefault(entry["label"], []).append(entry)
+
+    def save(self, provider: str, key: str, label: str, response: Dict, latency: float):
+        """카세트에 응답 1건 추가 (record 모드)"""
+        entry = {"key": key, "label": label, "latency": round(latency, 4), "response": response}
+        with self._lock:
+            self._load(provider)
+            self._index(provider, entry)
+            self.cassette_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cassette_dir / f"{provider}.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._stat(provider, "recorded")
+
+    def lookup(self, provider: str, key: str, label: str) -> Dict:
+        """
+        재생할 기록 조회
+
+        같은 요청이 여러 번 기록되어 있으면 순서대로 반환하고 마지막 기록을 반복합니다.
+        정확히 같은 요청이 없으면 같은 label의 기록 중 하나를 반환합니다.
+
+        Raises:
+            CassetteMissError: 해당 작업의 기록이 없음
+        """
+        with self._lock:
+            self._load(provider)
+            entries = self._exact[provider].get(key)
+            if entries:
+                cursor = self._cursor.get((provider, key), 0)
+                self._cursor[(provider, key)] = cursor + 1
+                self._stat(provider, "replayed")
+                return entries[min(cursor, len(entries) - 1)]
+
+            entries = self._by_label[provider].get(label)
+            if entries:
+                self._stat(provider, "replayed")
+                self._stat(provider, "label_matches")
+                return self._random.choice(entries)
+
+        self._stat(provider, "misses")
+        raise CassetteMissError(f"카세트에 기록 없음 ({provider}: {label})")
+
+    # ------------------------------------------------------------------
+    # 지연/오류 주입
+    # ------------------------------------------------------------------
+
+    def sample_latency(self, provider: str, recorded: float) -> float:
+        """재생 지연 시간 (분포 설정이 없으면 기록된 지연 × speed)"""
+        config = self.latency.get(provider)
+        if not config:
+            return recorded * self.speed
+
+        dist = config.get("dist", "fixed")
+        if dist == "uniform":
+            return self._random.uniform(config.get("min", 0.0), config.get("max", 1.0))
+        if dist == "lognormal":
+            import math
+            return self._random.lognormvariate(math.log(config.get("median", 1.0)), config.get("sigma", 0.5))
+        return float(config.get("value", recorded))
+
+    def should_fail(self, provider: str) -> bool:
+        """오류 주입 여부"""
+        rate = self.error_rates.get(provider, 0.0)
+        if rate and self._random.random() < rate:
+            self._stat(provider, "injected_errors")
+            return True
+        return False
+
+    def _observe(self, provider: str, latency: float):
+        metrics.observe("provider_sim.latency", latency, provider=provider)
+
+    # ------------------------------------------------------------------
+    # Gemini (gRPC)
+    # ------------------------------------------------------------------
+
+    async def gemini(
+        self,
+        operation: str,
+        key_parts: Tuple,
+        call: Callable[[], Awaitable[Any]],
+        stream: bool = False
+    ) -> Any:
+        """
+        Gemini generate_content_async 호출 기록/재생
+
+        Args:
+            operation: 작업 이름 (재생 시 label 매칭용, 예: 라우트 이름)
+            key_parts: 요청 지문을 만들 값 (모델명, 프롬프트, 생성 설정 등)
+            call: 실제 호출 (record 모드에서만 실행)
+            stream: 스트리밍 여부
+
+        Returns:
+            응답 객체 (스트리밍이면 조각을 내는 비동기 이터레이터)
+        """
+        key = _fingerprint(*key_parts)
+
+        if self.replaying:
+            entry = self.lookup("gemini", key, operation)
+            delay = self.sample_latency("gemini", entry["latency"])
+            if self.should_fail("gemini"):
+                await asyncio.sleep(delay / 2)
+                raise google_exceptions.ServiceUnavailable("시뮬레이터 주입 오류")
+
+            recorded = entry["response"]
+            chunks = recorded.get("chunks") or [recorded.get("text", "")]
+            usage = recorded.get("usage")
+            self._observe("gemini", delay)
+
+            if not stream:
+                await asyncio.sleep(delay)
+                return SimulatedGeminiResponse("".join(chunks), usage)
+            return self._replay_stream(chunks, usage, delay)
+
+        start = time.monotonic()
+        response = await call()
+        if stream:
+            return self._record_stream(operation, key, response, start)
+
+        text = response.text if response.parts else ""
+        self.save("gemini", key, operation, {"text": text, "usage": _usage_dict(response)}, time.monotonic() - start)
+        return response
+
+    async def _replay_stream(self, chunks: List[str], usage: Optional[Dict], delay: float) -> AsyncIterator:
+        # 첫 조각까지 지연의 절반, 나머지 조각에 고르게 분배
+        await asyncio.sleep(delay / 2)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(delay / 2 / max(1, len(chunks) - 1))
+            yield SimulatedGeminiResponse(chunk, usage if i == len(chunks) - 1 else None)
+
+    async def _record_stream(self, operation: str, key: str, response, start: float) -> AsyncIterator:
+        chunks = []
+        last_chunk = None
+        async for chunk in response:
+            last_chunk = chunk
+            if chunk.parts:
+                chunks.append(chunk.text)
+            yield chunk
+        self.save("gemini", key, operation, {"chunks": chunks, "usage": _usage_dict(last_chunk)}, time.monotonic() - start)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def http_key(self, request: httpx.Request) -> str:
+        return _fingerprint(request.method, str(request.url), hashlib.sha256(request.content).hexdigest())
+
+    def replay_response(self, provider: str, request: httpx.Request) -> Tuple[httpx.Response, float]:
+        """재생할 HTTP 응답과 지연 시간"""
+        entry = self.lookup(provider, self.http_key(request), http_label(request))
+        delay = self.sample_latency(provider, entry["latency"])
+        self._observe(provider, delay)
+
+        if self.should_fail(provider):
+            return httpx.Response(503, json={"error": "시뮬레이터 주입 오류"}, request=request), delay
+
+        recorded = entry["response"]
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded.get("headers", {}),
+            content=base64.b64decode(recorded["body"]),
+            request=request
+        ), delay
+
+    def record_response(self, provider: str, request: httpx.Request, response: httpx.Response, body: bytes, latency: float):
+        """HTTP 응답 기록"""
+        self.save(
+            provider,
+            self.http_key(request),
+            http_label(request),
+            {
+                "status": response.status_code,
+                "headers": {k: v for k, v in response.headers.items() if k.lower() in _KEPT_HEADERS},
+                "body": base64.b64encode(body).decode()
+            },
+            latency
+        )
+
+    def wrap_async_transport(self, provider: str, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        """httpx.AsyncClient transport를 기록/재생 transport로 감쌈 (off면 그대로 반환)"""
+        if not self.enabled:
+            return transport
+        return SimulatedAsyncTransport(self, provider, transport)
+
+    def wrap_sync_transport(self, provider: str, transport: httpx.BaseTransport) -> httpx.BaseTransport:
+        """httpx.Client transport를 기록/재생 transport로 감쌈 (off면 그대로 반환)"""
+        if not self.enabled:
+            return transport
+        return SimulatedSyncTransport(self, provider, transport)
+
+    def get_stats(self) -> Dict:
+        """프로바이더별 기록/재생/미스/주입 오류 수"""
+        return {
+            "mode": self.mode,
+            "cassette_dir": str(self.cassette_dir),
+            "providers": self.stats
+        }
+
+
+class SimulatedAsyncTransport(httpx.AsyncBaseTransport):
+    """비동기 HTTP 기록/재생 transport"""
+
+    def __init__(self, simulator: ProviderSimulator, provider: str, wrapped: httpx.AsyncBaseTransport):
+        self.simulator = simulator
+        self.provider = provider
+        self.wrapped = wrapped
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+
+        if self.simulator.replaying:
+            response, delay = self.simulator.replay_response(self.provider, request)
+            await asyncio.sleep(delay)
+            return response
+
+        start = time.monotonic()
+        response = await self.wrapped.handle_async_request(request)
+        body = await response.aread()
+        self.simulator.record_response(self.provider, request, response, body, time.monotonic() - start)
+        return _decoded_response(response, body, request)
+
+    async def aclose(self):
+        await self.wrapped.aclose()
+
+
+class SimulatedSyncTransport(httpx.BaseTransport):
+    """동기 HTTP 기록/재생 transport (Voyage)"""
+
+    def __init__(self, simulator: ProviderSimulator, provider: str, wrapped: httpx.BaseTransport):
+        self.simulator = simulator
+        self.provider = provider
+        self.wrapped = wrapped
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+
+        if self.simulator.replaying:
+            response, delay = self.simulator.replay_response(self.provider, request)
+            time.sleep(delay)
+            return response
+
+        start = time.monotonic()
+        response = self.wrapped.handle_request(request)
+        body = response.read()
+        self.simulator.record_response(self.provider, request, response, body, time.monotonic() - start)
+        return _decoded_response(response, body, request)
+
+    def close(self):
+        self.wrapped.close()
+
+
+# 싱글톤 인스턴스
+provider_sim = ProviderSimulator(
+    mode=settings.PROVIDER_SIM_MODE,
+    cassette_dir=settings.PROVIDER_SIM_CASSETTE_DIR,
+    latency=settings.PROVIDER_SIM_LATENCY,
+    error_rates=settings.PROVIDER_SIM_ERROR_RATES,
+    speed=settings.PROVIDER_SIM_SPEED,
+    seed=settings.PROVIDER_SIM_SEED
+)
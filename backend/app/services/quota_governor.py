@@ -0,0 +1,248 @@
+"""
+Gemini API 쿼터 관리 모듈
+동일한 GEMINI_API_KEY를 사용하는 모든 호출(텍스트, 이미지, 성과 예측)이
+분당 요청 수(RPM)와 분당 토큰 수(TPM) 한도를 공유하도록 토큰 버킷으로 제어
+
+- Redis가 설정되어 있으면 uvicorn 워커 간에 버킷을 공유합니다.
+- Redis가 없으면(테스트, 로컬 개발) 프로세스 내 버킷으로 동작합니다.
+- 한도를 넘으면 에러 대신 대기열에서 기다리며, 최대 대기 시간을 넘으면
+  QuotaTimeoutError를 발생시킵니다.
+- 대기열은 선착순이 아니라 공정 스케줄러(FairScheduler)로 사용자/프로젝트별로 나누고 토큰 수만큼 몫을 차감하므로,
+  대량 생성 중인 사용자가 쿼터를 독점하지 못하고 대화형 요청이 성과 예측 등 백그라운드 호출보다 먼저 실행됩니다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.fair_scheduler import FairScheduler, SchedulerTimeoutError
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaTimeoutError(Exception):
+    """최대 대기 시간 안에 쿼터를 확보하지 못한 경우"""
+    pass
+
+
+class LocalTokenBucketBackend:
+    """프로세스 내 토큰 버킷 (테스트 및 Redis 미사용 환경용)"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        now = time.monotonic()
+        self._buckets = {
+            "requests": {"level": float(rpm), "updated": now},
+            "tokens": {"level": float(tpm), "updated": now}
+        }
+
+    async def try_acquire(self, requests: int, tokens: int) -> float:
+        """
+        쿼터 차감 시도
+
+        Returns:
+            0이면 차감 성공, 양수이면 다시 시도하기까지 기다려야 하는 시간(초)
+        """
+        now = time.monotonic()
+        waits = []
+
+        for name, capacity, amount in (
+            ("requests", self.rpm, requests),
+            ("tokens", self.tpm, tokens)
+        ):
+            bucket = self._buckets[name]
+            rate = capacity / 60.0
+            bucket["level"] = min(capacity, bucket["level"] + (now - bucket["updated"]) * rate)
+            bucket["updated"] = now
+            amount = min(amount, capacity)
+            if bucket["level"] < amount:
+                waits.append((amount - bucket["level"]) / rate)
+
+        if waits:
+            return max(waits)
+
+        self._buckets["requests"]["level"] -= min(requests, self.rpm)
+        self._buckets["tokens"]["level"] -= min(tokens, self.tpm)
+        return 0.0
+
+
+class RedisTokenBucketBackend:
+    """Redis 기반 토큰 버킷 (uvicorn 워커 간 공유)"""
+
+    # 두 버킷(요청 수, 토큰 수)을 원자적으로 보충/차감
+    # 반환값: 0이면 성공, 양수이면 대기 시간(ms)
+    LUA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local caps = {tonumber(ARGV[1]), tonumber(ARGV[2])}
+local amounts = {tonumber(ARGV[3]), tonumber(ARGV[4])}
+local levels = {}
+local wait = 0
+
+for i = 1, 2 do
+    local rate = caps[i] / 60.0
+    local state = redis.call('HMGET', KEYS[i], 'level', 'updated')
+    local level = tonumber(state[1]) or caps[i]
+    local updated = tonumber(state[2]) or now
+    level = math.min(caps[i], level + (now - updated) * rate)
+    levels[i] = level
+    local amount = math.min(amounts[i], caps[i])
+    if level < amount then
+        wait = math.max(wait, (amount - level) / rate)
+    end
+end
+
+for i = 1, 2 do
+    local level = levels[i]
+    if wait == 0 then
+        level = level - math.min(amounts[i], caps[i])
+    end
+    redis.call('HSET', KEYS[i], 'level', level, 'updated', now)
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+
+return math.ceil(wait * 1000)
+"""
+
+    def __init__(self, redis, rpm: int, tpm: int, key_prefix: str = "gemini_quota:"):
+        self.redis = redis
+        self.rpm = rpm
+        self.tpm = tpm
+        self.keys = [f"{key_prefix}requests", f"{key_prefix}tokens"]
+        self._script = redis.register_script(self.LUA_SCRIPT)
+
+    async def try_acquire(self, requests: int, tokens: int) -> float:
+        wait_ms = await self._script(
+            keys=self.keys,
+            args=[self.rpm, self.tpm, requests, tokens]
+        )
+        return int(wait_ms) / 1000.0
+
+
+class QuotaGovernor:
+    """RPM/TPM 토큰 버킷 쿼터 관리자"""
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_wait_seconds: float = 30.0,
+        backend=None
+    ):
+        """
+        Args:
+            rpm: 분당 최대 요청 수
+            tpm: 분당 최대 토큰 수 (입력 + 출력 추정치)
+            max_wait_seconds: 쿼터 확보를 위한 최대 대기 시간
+            backend: 버킷 백엔드 (None이면 Redis 유무에 따라 자동 선택)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait_seconds = max_wait_seconds
+        self._backend = backend
+        self._local_backend = LocalTokenBucketBackend(rpm, tpm)
+        # 프로세스 내 대기열 (한 번에 한 호출만 버킷을 확인, 순서는 테넌트별 가중 공정 분배)
+        self._scheduler = FairScheduler("gemini_quota", slots=1)
+
+        self.stats = {
+            "acquired": 0,
+            "waited": 0,
+            "timeouts": 0,
+            "total_wait_seconds": 0.0,
+            "backend_errors": 0
+        }
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_output_tokens: Optional[int] = None) -> int:
+        """
+        프롬프트 토큰 수 추정 (한국어 기준 약 2자당 1토큰 + 예상 출력 토큰)
+        """
+        return len(prompt) // 2 + (max_output_tokens or 1024)
+
+    def _get_backend(self):
+        """Redis가 있으면 공유 버킷, 없으면 로컬 버킷 사용"""
+        if self._backend is None:
+            redis = get_redis()
+            if redis is not None:
+                self._backend = RedisTokenBucketBackend(redis, self.rpm, self.tpm)
+                logger.info("Gemini 쿼터 관리: Redis 공유 버킷 사용")
+            else:
+                self._backend = self._local_backend
+                logger.info("Gemini 쿼터 관리: 로컬 버킷 사용")
+        return self._backend
+
+    async def _try_acquire(self, tokens: int) -> float:
+        backend = self._get_backend()
+        try:
+            return await backend.try_acquire(1, tokens)
+        except Exception as e:
+            # Redis 장애 시 로컬 버킷으로 대체
+            self.stats["backend_errors"] += 1
+            logger.warning(f"쿼터 백엔드 오류, 로컬 버킷으로 대체: {str(e)}")
+            return await self._local_backend.try_acquire(1, tokens)
+
+    async def acquire(self, tokens: int, caller: str = "unknown"):
+        """
+        요청 1건과 토큰을 쿼터에서 차감 (부족하면 대기)
+
+        Args:
+            tokens: 예상 토큰 수
+            caller: 호출자 이름 (로그용)
+
+        Raises:
+            QuotaTimeoutError: max_wait_seconds 안에 쿼터를 확보하지 못한 경우
+        """
+        start = time.monotonic()
+        deadline = start + self.max_wait_seconds
+
+        try:
+            ticket = await self._scheduler.acquire(cost=tokens, timeout=self.max_wait_seconds)
+        except SchedulerTimeoutError:
+            self.stats["timeouts"] += 1
+            raise QuotaTimeoutError(f"Gemini 쿼터 대기 시간 초과 ({caller})")
+
+        try:
+            while True:
+                wait = await self._try_acquire(tokens)
+                if wait <= 0:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if wait > remaining:
+                    self.stats["timeouts"] += 1
+                    raise QuotaTimeoutError(
+                        f"Gemini 쿼터 대기 시간 초과 ({caller}, 필요 대기: {wait:.1f}초)"
+                    )
+
+                logger.info(f"Gemini 쿼터 대기 중 ({caller}): {wait:.2f}초")
+                await asyncio.sleep(wait)
+        finally:
+            self._scheduler.release(ticket)
+
+        waited = time.monotonic() - start
+        self.stats["acquired"] += 1
+        if waited > 0.01:
+            self.stats["waited"] += 1
+            self.stats["total_wait_seconds"] += waited
+
+    def get_stats(self, user_id: Optional[int] = None) -> Dict:
+        """쿼터 사용 통계 (대기열의 테넌트별 대기 수는 user_id 사용자 것만)"""
+        return {
+            **self.stats,
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "backend": type(self._backend).__name__ if self._backend else None,
+            "scheduler": self._scheduler.get_stats(user_id)
+        }
+
+
+# 싱글톤 인스턴스 (GEMINI_API_KEY를 사용하는 모든 서비스가 공유)
+gemini_quota = QuotaGovernor(
+    rpm=settings.GEMINI_RPM_LIMIT,
+    tpm=settings.GEMINI_TPM_LIMIT,
+    max_wait_seconds=settings.GEMINI_QUOTA_MAX_WAIT_SECONDS
+)
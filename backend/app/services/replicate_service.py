@@ -3,12 +3,19 @@ Replicate API 서비스 모듈
 이미지 생성 (SDXL, Ideogram v3 Turbo)
 """
 
-import replicate
-from typing import Optional, Dict
+from typing import Any, Dict, Optional, Set
 import logging
-import time
+import asyncio
+from replicate import identifier
+from replicate.exceptions import ModelError
+from replicate.helpers import transform_output
 from app.config import settings
+from app.services.circuit_breaker import circuit_breakers, CircuitOpenError
+from app.services.client_pool import client_pool
+from app.services.hedging import request_hedger
 from app.services.image_storage import image_storage
+from app.utils.deadline import remaining_budget
+from app.utils.retry import backoff_delay
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +25,14 @@ class ReplicateService:
 
     def __init__(self):
         self.api_token = settings.REPLICATE_API_TOKEN
-        # Replicate Client 생성 (토큰 명시적 전달)
-        if self.api_token:
-            self.client = replicate.Client(api_token=self.api_token)
+        self.breaker = circuit_breakers.get("replicate")
+        # 취소된 예측의 업스트림 취소 요청 (완료될 때까지 참조 유지)
+        self._cancel_tasks: Set[asyncio.Task] = set()
+        # Replicate 공유 클라이언트 (토큰 명시적 전달, 커넥션 풀 사용)
+        self.client = client_pool.replicate_client()
+        if self.client is not None:
             logger.info("Replicate API 클라이언트 초기화 완료")
         else:
-            self.client = None
             logger.warning("Replicate API 토큰이 설정되지 않았습니다")
 
     async def generate_image(
@@ -35,7 +44,8 @@ class ReplicateService:
         guidance_scale: float = 7.5,
         num_inference_steps: int = 50,
         max_retries: int = 3,
-        save_local: bool = True
+        save_local: bool = True,
+        fast: bool = False
     ) -> Optional[Dict[str, str]]:
         """
         이미지 생성 (환경별 모델 자동 선택)
@@ -49,6 +59,7 @@ class ReplicateService:
             num_inference_steps: 추론 스텝 수
             max_retries: 최대 재시도 횟수
             save_local: 로컬에 저장 여부
+            fast: 빠른 생성 (요청 남은 시간이 부족할 때, 환경과 관계없이 SDXL + 적은 추론 스텝)
 
         Returns:
             {
@@ -58,12 +69,16 @@ class ReplicateService:
             }
         """
         # 환경별 모델 선택
-        model = self._get_model()
+        model = self._get_model(fast=fast)
+        if fast:
+            num_inference_steps = min(num_inference_steps, settings.DEADLINE_FAST_IMAGE_STEPS)
 
         last_error = None
 
         for attempt in range(max_retries):
+            probe = None
             try:
+                probe = self.breaker.check()
                 logger.info(f"이미지 생성 시작 (모델: {model}, 시도: {attempt + 1}/{max_retries})")
                 logger.info(f"프롬프트: {prompt[:100]}...")
 
@@ -78,8 +93,13 @@ class ReplicateService:
                     num_inference_steps=num_inference_steps
                 )
 
-                # Replicate API 호출
-                output = self.client.run(model, input=input_params)
+                # Replicate API 호출 (비동기, p95 지연을 넘기면 중복 요청)
+                output = await request_hedger.run(
+                    "replicate.run",
+                    lambda: self._run_prediction(model, input_params)
+                )
+
+                self.breaker.record_success()
 
                 # 결과 처리
                 if isinstance(output, list) and len(output) > 0:
@@ -109,29 +129,78 @@ class ReplicateService:
                     logger.warning(f"응답 형식 오류: {output}")
                     raise ValueError(f"예상치 못한 응답 형식: {type(output)}")
 
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 last_error = e
+                self.breaker.record_failure(e)
                 logger.warning(f"이미지 생성 시도 {attempt + 1}/{max_retries} 실패: {str(e)}")
 
-                if attempt < max_retries - 1:
-                    # 지수 백오프: 3초, 6초, 12초
-                    wait_time = 3 * (2 ** attempt)
-                    logger.info(f"{wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-
-        logger.error(f"이미지 생성 최종 실패 (재시도 {max_retries}회): {str(last_error)}")
+                # 지수 백오프 (3초, 6초 기준 + 지터), 예측 실패(ModelError, NSFW 등)는 바로 실패
+                wait_time = backoff_delay(e, attempt, 3.0, settings.RETRY_MAX_DELAY_SECONDS)
+                remaining = remaining_budget()
+                if wait_time is None or attempt == max_retries - 1 or (remaining is not None and wait_time >= remaining):
+                    break
+                logger.info(f"{wait_time:.1f}초 후 재시도...")
+                await asyncio.sleep(wait_time)
+            finally:
+                # 결과를 기록하지 않고 끝난 시험 호출(쿼터 대기 초과, 취소 등) 자리 반납
+                self.breaker.release(probe)
+
+        logger.error(f"이미지 생성 최종 실패 (시도 {attempt + 1}회): {str(last_error)}")
         raise last_error
 
-    def _get_model(self) -> str:
+    async def _run_prediction(self, model: str, input_params: Dict) -> Any:
+        """
+        예측 생성 후 완료될 때까지 대기 (client.async_run과 같은 결과)
+
+        client.async_run은 호출이 취소되어도 Replicate 쪽 예측은 계속 실행되어 비용이 발생하므로,
+        예측을 직접 만들고 대기 중에 취소되면(클라이언트 연결 종료, 헤징에서 진 요청, 요청 시간 초과)
+        업스트림 예측도 취소합니다.
+        """
+        version, owner, name, version_id = identifier._resolve(model)
+        # 생성 요청이 완료까지 붙잡혀 있지 않도록 wait=False (예측 ID를 바로 받아야 취소 가능)
+        if version or version_id:
+            prediction = await self.client.predictions.async_create(
+                version=(version or version_id), input=input_params, wait=False
+            )
+        else:
+            prediction = await self.client.models.predictions.async_create(
+                model=(owner, name), input=input_params, wait=False
+            )
+
+        try:
+            await prediction.async_wait()
+        except asyncio.CancelledError:
+            logger.info(f"이미지 생성 취소, Replicate 예측 취소 요청: {prediction.id}")
+            task = asyncio.create_task(self._cancel_prediction(prediction))
+            self._cancel_tasks.add(task)
+            task.add_done_callback(self._cancel_tasks.discard)
+            raise
+
+        if prediction.status == "failed":
+            raise ModelError(prediction)
+
+        return transform_output(prediction.output, self.client)
+
+    @staticmethod
+    async def _cancel_prediction(prediction):
+        try:
+            await prediction.async_cancel()
+        except Exception as e:
+            logger.warning(f"Replicate 예측 취소 실패 ({prediction.id}): {str(e)}")
+
+    def _get_model(self, fast: bool = False) -> str:
         """
         환경별 모델 선택
 
         개발 환경: SDXL (빠르고 저렴)
         프로덕션: Ideogram v3 Turbo (고품질)
+        fast=True: SDXL (요청 남은 시간이 부족할 때)
         """
         image_mode = getattr(settings, 'IMAGE_MODE', 'development')
 
-        if image_mode == 'production':
+        if image_mode == 'production' and not fast:
             # Ideogram v3 Turbo
             model = "ideogram-ai/ideogram-v2-turbo"
             logger.info("프로덕션 모드: Ideogram v3 Turbo 사용")
@@ -246,7 +246,8 @@ class SegmentationService:
             }
         }
 
-    def _recommend_tone(self, age_group: str, income_level: str) -> str:
+    @staticmethod
+    def _recommend_tone(age_group: str, income_level: str) -> str:
         """나이대와 소득 수준에 따른 톤앤매너 추천"""
         if age_group in ["10대", "20대"]:
             return "친근하고 트렌디한 톤, 이모티콘 활용, 반말 가능"
@@ -261,8 +262,8 @@ class SegmentationService:
             else:
                 return "신뢰감 있고 따뜻한 톤, 존댓말"
 
+    @staticmethod
     def _recommend_message_strategy(
-        self,
         pain_points: List[str],
         interests: List[str]
     ) -> List[str]:
@@ -5,10 +5,11 @@ Vector DB 서비스 모듈 (Qdrant + Voyage AI)
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, VectorParams, PointStruct, PayloadSchemaType
-import voyageai
 from typing import List, Dict, Optional
 import logging
 from app.config import settings
+from app.services.client_pool import client_pool
+from app.utils.stage_graph import stage_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +29,9 @@ class VectorService:
             self.qdrant_client = None
             logger.warning("Qdrant URL 또는 API 키가 설정되지 않았습니다")
 
-        # Voyage AI 클라이언트 초기화
+        # Voyage AI 클라이언트 초기화 (REST API, 공유 커넥션 풀 사용)
         if settings.VOYAGE_AI_API_KEY:
-            self.voyage_client = voyageai.Client(api_key=settings.VOYAGE_AI_API_KEY)
+            self.voyage_client = client_pool.voyage()
             logger.info("Voyage AI 클라이언트 초기화 완료")
         else:
             self.voyage_client = None
@@ -107,13 +108,17 @@ class VectorService:
 
         try:
             # Voyage AI API 호출
-            result = self.voyage_client.embed(
-                [text],
-                model="voyage-3-large",  # 2048 차원
-                input_type="document"  # 문서 저장용
+            response = self.voyage_client.post(
+                "/embeddings",
+                json={
+                    "input": [text],
+                    "model": "voyage-3-large",  # 2048 차원
+                    "input_type": "document"  # 문서 저장용
+                }
             )
+            response.raise_for_status()
 
-            embedding = result.embeddings[0]
+            embedding = response.json()["data"][0]["embedding"]
             logger.info(f"임베딩 생성 완료 (차원: {len(embedding)})")
             return embedding
 
@@ -155,6 +160,10 @@ class VectorService:
             embedding = self.generate_embedding(content_text)
             if not embedding:
                 return False
+            if stage_cancelled():
+                # 파이프라인이 취소/시간 초과됨 - 저장하지 않음
+                logger.info(f"콘텐츠 임베딩 저장 취소: content_id={content_id}")
+                return False
 
             # Vector DB에 저장
             self.qdrant_client.upsert(
@@ -210,6 +219,9 @@ class VectorService:
             query_embedding = self.generate_embedding(query_text)
             if not query_embedding:
                 return []
+            if stage_cancelled():
+                logger.info("유사 콘텐츠 검색 취소")
+                return []
 
             # 필터 조건 생성
             must_conditions = []
@@ -145,6 +145,30 @@ async def get_current_user(
     return user
 
 
+def get_user_from_token(token: Optional[str], db: Session) -> Optional[User]:
+    """
+    토큰으로 활성 사용자 조회 (헤더를 보낼 수 없는 WebSocket 연결용, 쿼리 파라미터로 토큰 전달)
+
+    Args:
+        token: JWT 토큰
+        db: 데이터베이스 세션
+
+    Returns:
+        User 객체 (토큰이 없거나 유효하지 않거나 비활성 사용자면 None)
+    """
+    if not token:
+        return None
+
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+
+    user = db.query(User).filter(User.id == payload.get("sub")).first()
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
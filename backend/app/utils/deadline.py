@@ -0,0 +1,140 @@
+"""
+요청 데드라인 (남은 시간 예산) 전파
+
+클라이언트가 X-Request-Timeout 헤더(초)로 보내거나 REQUEST_DEADLINE_SECONDS 설정으로 정한 시간 예산을
+contextvar로 전달하므로, 파이프라인 단계(StageGraph)와 하위 태스크/스레드까지 같은 데드라인을 봅니다.
+
+남은 시간이 부족하면 각 단계가 동작을 줄이고(degradation) Deadline.degradations에 기록합니다.
+- 선택 단계(RAG, Vector DB 저장, 성과 예측): 최소 예산보다 적게 남았으면 건너뜀
+- Gemini 호출: 타임아웃을 남은 시간으로 제한, 적게 남았으면 출력 토큰 한도 축소, 데드라인을 넘기는 재시도 중단
+- 이미지 생성: 적게 남았으면 빠른 모델/적은 추론 스텝 사용, 대체 프로바이더 재시도 생략
+"""
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from fastapi import Header, HTTPException
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 선택 단계를 시작하는 데 필요한 최소 남은 시간(초) - DEADLINE_MIN_BUDGETS 설정으로 재정의
+STAGE_MIN_BUDGETS = {
+    "rag": 40.0,  # 남은 시간이 적으면 전략/카피/이미지에 예산을 씀
+    "vector": 3.0,
+    "performance": 20.0  # 페르소나 생성 + 반응 시뮬레이션 (Gemini 2회)
+}
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar("request_deadline", default=None)
+
+
+class Deadline:
+    """요청 시간 예산과 적용된 degradation 기록"""
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.degradations: List[Dict[str, Any]] = []
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def degrade(self, stage: str, action: str):
+        """degradation 기록 (같은 단계/동작은 한 번만)"""
+        if any(d["stage"] == stage and d["action"] == action for d in self.degradations):
+            return
+        remaining = round(self.remaining(), 2)
+        self.degradations.append({"stage": stage, "action": action, "remaining_seconds": remaining})
+        metrics.incr("deadline.degradations", stage=stage, action=action)
+        logger.info(f"⏱️  데드라인 degradation: {stage} → {action} (남은 시간 {remaining}초)")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budget_seconds": self.budget,
+            "remaining_seconds": round(self.remaining(), 2),
+            "degradations": list(self.degradations)
+        }
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def set_deadline(deadline: Optional[Deadline]):
+    """현재 요청(태스크)의 데드라인 지정 (이후 생성되는 하위 태스크/스레드에 전파)"""
+    _current.set(deadline)
+
+
+def remaining_budget() -> Optional[float]:
+    """남은 시간(초), 데드라인이 없으면 None"""
+    deadline = _current.get()
+    return deadline.remaining() if deadline else None
+
+
+def cap_timeout(timeout: Optional[float]) -> Optional[float]:
+    """타임아웃을 남은 시간 이하로 제한 (데드라인이 없으면 그대로)"""
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def stage_min_budget(stage: str) -> Optional[float]:
+    return settings.DEADLINE_MIN_BUDGETS.get(stage, STAGE_MIN_BUDGETS.get(stage))
+
+
+def should_skip(stage: str) -> bool:
+    """선택 단계를 건너뛸지 판단 (남은 시간이 최소 예산보다 적으면 기록 후 True)"""
+    deadline = _current.get()
+    min_budget = stage_min_budget(stage)
+    if deadline is None or min_budget is None or deadline.remaining() >= min_budget:
+        return False
+    deadline.degrade(stage, "skipped")
+    return True
+
+
+def parse_timeout(value: str) -> float:
+    """
+    타임아웃 헤더 값 파싱 ("30", "30s", "1500ms")
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 0 이하일 때
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(ms|s)?\s*", value or "")
+    if not match:
+        raise ValueError(f"잘못된 타임아웃 형식: {value}")
+    seconds = float(match.group(1)) / (1000 if match.group(2) == "ms" else 1)
+    if seconds <= 0:
+        raise ValueError(f"타임아웃은 0보다 커야 합니다: {value}")
+    return seconds
+
+
+async def request_deadline(
+    x_request_timeout: Optional[str] = Header(None, description="요청 시간 예산 (초, 예: 30, 30s, 1500ms)")
+) -> Optional[Deadline]:
+    """
+    요청 데드라인 Dependency
+
+    X-Request-Timeout 헤더가 있으면 그 값, 없으면 REQUEST_DEADLINE_SECONDS 설정을 사용하고
+    둘 다 없으면 데드라인 없이 실행합니다.
+    """
+    seconds = settings.REQUEST_DEADLINE_SECONDS
+    if x_request_timeout:
+        try:
+            seconds = parse_timeout(x_request_timeout)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    deadline = Deadline(seconds) if seconds else None
+    # 요청마다 지정 (데드라인이 없는 요청도 None으로 덮어써 이전 값이 남지 않게 함)
+    set_deadline(deadline)
+    return deadline
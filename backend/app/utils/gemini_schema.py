@@ -0,0 +1,159 @@
+"""
+Gemini 구조화 출력 유틸리티
+
+- Pydantic 모델 → Gemini response_schema 변환
+  Gemini의 구조화 출력(response_mime_type="application/json")은
+  OpenAPI 스키마의 일부만 지원하므로 Pydantic JSON 스키마에서
+  $ref를 펼치고 지원하지 않는 키를 제거합니다.
+- LLM 응답 파싱 + 스키마 검증 (파싱 실패율 지표 기록)
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.utils.json_stream import repair_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 출력 토큰 한도에 걸려 생성이 중단된 경우의 finish_reason
+FINISH_REASON_MAX_TOKENS = "MAX_TOKENS"
+
+# Gemini response_schema가 지원하는 키
+_SUPPORTED_KEYS = {"type", "format", "description", "nullable", "enum", "properties", "required", "items"}
+
+
+def _convert(node: Any, defs: Dict[str, Any]) -> Any:
+    """JSON 스키마 노드를 재귀적으로 변환"""
+    if not isinstance(node, dict):
+        return node
+
+    if "$ref" in node:
+        ref_name = node["$ref"].split("/")[-1]
+        return _convert(defs[ref_name], defs)
+
+    # Optional[X] → anyOf: [X, {"type": "null"}] → X + nullable
+    if "anyOf" in node:
+        variants = [v for v in node["anyOf"] if v.get("type") != "null"]
+        converted = _convert(variants[0], defs) if variants else {"type": "string"}
+        if len(variants) != len(node["anyOf"]):
+            converted = {**converted, "nullable": True}
+        if "description" in node:
+            converted["description"] = node["description"]
+        return converted
+
+    result = {}
+    for key, value in node.items():
+        if key not in _SUPPORTED_KEYS:
+            continue
+        if key == "properties":
+            result[key] = {name: _convert(prop, defs) for name, prop in value.items()}
+        elif key == "items":
+            result[key] = _convert(value, defs)
+        else:
+            result[key] = value
+
+    return result
+
+
+@lru_cache(maxsize=None)
+def to_gemini_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Pydantic 모델을 Gemini response_schema 딕셔너리로 변환
+
+    Args:
+        model: 출력 형식을 정의한 Pydantic 모델
+
+    Returns:
+        generation_config["response_schema"]에 전달할 딕셔너리
+    """
+    json_schema = model.model_json_schema()
+    defs = json_schema.get("$defs", {})
+    return _convert(json_schema, defs)
+
+
+def structured_generation_config(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    구조화 출력용 generation_config 항목
+
+    Returns:
+        {"response_mime_type": "application/json", "response_schema": {...}}
+    """
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": to_gemini_schema(model)
+    }
+
+
+class TruncatedOutputError(ValueError):
+    """출력 토큰 한도(MAX_TOKENS)에 걸려 잘린 응답"""
+
+
+def finish_reason_name(response: Any) -> Optional[str]:
+    """Gemini 응답의 finish_reason 이름 (STOP, MAX_TOKENS 등, 없으면 None)"""
+    candidates = getattr(response, "candidates", None)
+    if not candidates:
+        return None
+    reason = candidates[0].finish_reason
+    return getattr(reason, "name", str(reason))
+
+
+def parse_llm_json(
+    response_text: str,
+    model: Type[BaseModel],
+    mode: str = "text",
+    finish_reason: Optional[str] = None
+) -> Any:
+    """
+    LLM 응답을 JSON으로 파싱하고 스키마로 검증
+
+    형식 오류(코드 블록, 설명 문구, 후행 쉼표)는 repair_json으로 복구하지만, 잘린 응답은
+    빠진 내용을 채울 수 없으므로 복구하지 않고 실패로 처리합니다 (호출한 쪽에서 재생성/대체).
+    다음 지표를 기록합니다.
+    (mode: structured=response_schema 사용, text=프롬프트 지시만 사용)
+        llm_json.calls     전체 파싱 시도
+        llm_json.repaired  복구가 필요했던 응답 (기존 json.loads였다면 실패)
+        llm_json.failures  복구/검증 실패, 잘린 응답
+
+    Args:
+        response_text: LLM 응답 텍스트
+        model: 출력 형식을 정의한 Pydantic 모델
+        mode: "structured" 또는 "text"
+        finish_reason: 응답의 finish_reason (finish_reason_name, MAX_TOKENS면 실패)
+
+    Returns:
+        검증된 데이터 (dict 또는 list, None 값 필드는 제외)
+
+    Raises:
+        TruncatedOutputError: 출력 토큰 한도로 응답이 잘린 경우
+        ValueError: 파싱 또는 스키마 검증 실패
+    """
+    labels = {"mode": mode, "schema": model.__name__}
+    metrics.incr("llm_json.calls", **labels)
+
+    if finish_reason == FINISH_REASON_MAX_TOKENS:
+        metrics.incr("llm_json.failures", **labels)
+        logger.error(f"출력 토큰 한도로 응답이 잘림 ({model.__name__}, {len(response_text)}자)")
+        raise TruncatedOutputError(f"출력 토큰 한도로 응답이 잘렸습니다 ({model.__name__})")
+
+    try:
+        data, repaired = repair_json(response_text)
+        validated = model.model_validate(data)
+    except ValidationError as e:
+        metrics.incr("llm_json.failures", **labels)
+        logger.error(f"JSON 스키마 검증 실패 ({model.__name__}): {str(e)}")
+        raise ValueError(f"JSON 스키마 검증 실패: {str(e)}")
+    except ValueError as e:
+        metrics.incr("llm_json.failures", **labels)
+        logger.error(f"JSON 파싱 실패 ({model.__name__}): {str(e)}")
+        logger.error(f"응답 내용 (처음 500자): {response_text[:500]}")
+        raise
+
+    if repaired:
+        metrics.incr("llm_json.repaired", **labels)
+        logger.warning(f"JSON 형식 오류 복구 ({model.__name__})")
+
+    return validated.model_dump(exclude_none=True)
@@ -0,0 +1,162 @@
+"""
+스트리밍 JSON 파싱 유틸리티
+
+LLM이 토큰 단위로 출력 중인 미완성 JSON 텍스트를
+현재까지 완성된 필드만 담은 딕셔너리로 변환합니다.
+
+예:
+    '{"copies": [{"text": "피부가 달라'
+    → {"copies": [{"text": "피부가 달라"}]}
+
+완성된 응답은 repair_json으로 파싱하며, 코드 블록/설명 문구/후행 쉼표 등
+흔한 형식 오류를 재호출 없이 복구합니다. 잘린 출력 복구(allow_partial)는 스트리밍 미리보기용이며,
+최종 응답이 잘렸다면 내용이 빠진 것이므로 복구하지 않고 실패로 처리합니다.
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_decoder = json.JSONDecoder()
+
+# 닫는 괄호 앞의 후행 쉼표: [1, 2, ] / {"a": 1, }
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def strip_code_fence(text: str) -> str:
+    """```json ... ``` 코드 블록 표시 제거 (닫는 표시가 아직 없어도 동작)"""
+    cleaned = text.strip()
+
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[7:]
+    elif cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+
+    # 닫는 표시가 일부만 도착한 경우(` 또는 ``)도 제거
+    return cleaned.rstrip("`").strip()
+
+
+def _closers(stack: List[str]) -> str:
+    """열린 괄호 스택을 닫는 문자열"""
+    return "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """
+    미완성 JSON 텍스트를 가능한 범위까지 파싱
+
+    1. 열린 문자열과 괄호를 닫아서 그대로 파싱을 시도합니다.
+    2. 실패하면 마지막 쉼표/여는 괄호 위치까지 잘라낸 뒤 다시 시도합니다.
+       (값이 없는 키, 미완성 숫자/리터럴 등을 제거)
+
+    Args:
+        text: 지금까지 수신한 LLM 출력
+
+    Returns:
+        파싱된 값 또는 None (아직 JSON 시작 전)
+    """
+    cleaned = strip_code_fence(text)
+    start = _find_json_start(cleaned)
+    if start < 0:
+        return None
+    cleaned = cleaned[start:]
+
+    stack: List[str] = []
+    # (잘라낼 위치, 그 시점의 괄호 스택)
+    cut_points: List[Tuple[int, List[str]]] = []
+    in_string = False
+    escaped = False
+
+    for i, ch in enumerate(cleaned):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+            cut_points.append((i + 1, list(stack)))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            cut_points.append((i, list(stack)))
+
+    # 1) 현재 상태 그대로 닫아서 시도
+    candidate = cleaned
+    if in_string:
+        if escaped:
+            candidate = candidate[:-1]
+        candidate += '"'
+    try:
+        # 완성된 JSON 뒤에 붙은 설명 문구 등은 무시
+        return _decoder.raw_decode(candidate + _closers(stack))[0]
+    except json.JSONDecodeError:
+        pass
+
+    # 2) 안전한 위치까지 잘라서 시도
+    for cut, cut_stack in reversed(cut_points):
+        try:
+            return _decoder.raw_decode(cleaned[:cut] + _closers(cut_stack))[0]
+        except json.JSONDecodeError:
+            continue
+
+    return None
+
+
+def _find_json_start(text: str) -> int:
+    """첫 번째 '{' 또는 '[' 위치 (없으면 -1)"""
+    return min(
+        (i for i in (text.find("{"), text.find("[")) if i >= 0),
+        default=-1
+    )
+
+
+def repair_json(text: str, allow_partial: bool = False) -> Tuple[Any, bool]:
+    """
+    LLM 출력 JSON 파싱 (관대한 복구 포함)
+
+    1. 코드 블록 제거 후 그대로 파싱
+    2. JSON 앞뒤의 설명 문구 무시, 후행 쉼표 제거
+    3. allow_partial이면 잘린 출력을 parse_partial_json으로 완성된 부분까지 복구
+
+    Args:
+        text: LLM 응답 텍스트
+        allow_partial: 잘린 출력 복구 여부 (미리보기용, 최종 응답에는 사용하지 않음)
+
+    Returns:
+        (파싱 결과, 복구 여부) - 2, 3단계를 거친 경우 복구 여부가 True
+
+    Raises:
+        ValueError: JSON을 찾을 수 없거나 복구할 수 없는 경우
+    """
+    cleaned = strip_code_fence(text)
+
+    try:
+        return json.loads(cleaned), False
+    except json.JSONDecodeError as e:
+        first_error = e
+
+    start = _find_json_start(cleaned)
+    if start < 0:
+        raise ValueError(f"JSON 파싱 실패: {str(first_error)}")
+
+    body = cleaned[start:]
+    for candidate in (body, _TRAILING_COMMA.sub(r"\1", body)):
+        try:
+            return _decoder.raw_decode(candidate)[0], True
+        except json.JSONDecodeError:
+            continue
+
+    if allow_partial:
+        partial = parse_partial_json(_TRAILING_COMMA.sub(r"\1", body))
+        if partial:
+            return partial, True
+
+    raise ValueError(f"JSON 파싱 실패: {str(first_error)}")
@@ -0,0 +1,107 @@
+"""
+프로세스 내 운영 지표 수집 유틸리티
+
+카운터와 지연 시간(최근 N개 샘플 기반 백분위수)을 라벨별로 집계합니다.
+값은 현재 uvicorn 워커 기준이며 /api/metrics에서 조회할 수 있습니다.
+"""
+
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+
+def _metric_key(name: str, labels: Dict[str, str]) -> str:
+    """지표 이름과 라벨을 'name{k=v,...}' 형태의 키로 변환"""
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+class MetricsRegistry:
+    """카운터 + 지연 시간 샘플 저장소"""
+
+    def __init__(self, max_samples: int = 1000):
+        """
+        Args:
+            max_samples: 지표별로 보관할 최근 샘플 수 (백분위수 계산용)
+        """
+        self.max_samples = max_samples
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        self._counters[_metric_key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels):
+        """샘플(지연 시간 등) 기록"""
+        key = _metric_key(name, labels)
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.max_samples)
+        self._samples[key].append(value)
+
+    def count(self, name: str, **labels) -> float:
+        """카운터 값 조회"""
+        return self._counters.get(_metric_key(name, labels), 0)
+
+    def sample_count(self, name: str, **labels) -> int:
+        """보관 중인 샘플 수"""
+        samples = self._samples.get(_metric_key(name, labels))
+        return len(samples) if samples else 0
+
+    def percentile(self, name: str, q: float, **labels) -> Optional[float]:
+        """
+        최근 샘플의 백분위수
+
+        Args:
+            q: 0-100 사이 백분위 (예: 95)
+
+        Returns:
+            백분위 값 또는 None (샘플 없음)
+        """
+        samples = self._samples.get(_metric_key(name, labels))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict:
+        """
+        전체 지표 스냅샷
+
+        Returns:
+            {
+                "counters": {"name{label=v}": 3, ...},
+                "latencies": {"name{label=v}": {"count": 10, "avg": .., "p50": .., "p95": .., "p99": ..}}
+            }
+        """
+        counters = {
+            key: value for key, value in self._counters.items()
+            if prefix is None or key.startswith(prefix)
+        }
+
+        latencies = {}
+        for key, samples in self._samples.items():
+            if prefix is not None and not key.startswith(prefix):
+                continue
+            if not samples:
+                continue
+            ordered = sorted(samples)
+
+            def pick(q: float) -> float:
+                return round(ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))], 4)
+
+            latencies[key] = {
+                "count": len(ordered),
+                "avg": round(sum(ordered) / len(ordered), 4),
+                "p50": pick(50),
+                "p95": pick(95),
+                "p99": pick(99)
+            }
+
+        return {"counters": counters, "latencies": latencies}
+
+
+# 싱글톤 인스턴스
+metrics = MetricsRegistry()
@@ -0,0 +1,49 @@
+"""
+Redis 클라이언트 유틸리티
+
+settings.REDIS_URL이 설정된 경우에만 비동기 Redis 클라이언트를 생성합니다.
+redis 패키지가 설치되지 않았거나 URL이 없으면 None을 반환하므로
+호출하는 쪽에서는 로컬(in-process) 동작으로 대체해야 합니다.
+"""
+
+import logging
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis 패키지 미설치
+    aioredis = None
+
+_redis_client = None
+_initialized = False
+
+
+def get_redis() -> Optional["aioredis.Redis"]:
+    """
+    공유 비동기 Redis 클라이언트 반환 (지연 생성)
+
+    Returns:
+        redis.asyncio.Redis 인스턴스 또는 None (Redis 미사용)
+    """
+    global _redis_client, _initialized
+
+    if _initialized:
+        return _redis_client
+
+    _initialized = True
+
+    if not settings.REDIS_URL:
+        logger.info("REDIS_URL이 설정되지 않았습니다. 로컬 모드로 동작합니다")
+        return None
+
+    if aioredis is None:
+        logger.warning("redis 패키지가 설치되지 않았습니다. 로컬 모드로 동작합니다")
+        return None
+
+    _redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    logger.info("Redis 클라이언트 초기화 완료")
+    return _redis_client
@@ -0,0 +1,110 @@
+"""
+외부 API 재시도 판단 유틸리티
+
+- 재시도해도 결과가 같은 오류(안전 필터 차단, 잘못된 요청, JSON/스키마 오류 등)는 재시도하지 않습니다.
+- 429/5xx/타임아웃/연결 오류만 재시도하며, 서버가 Retry-After(또는 gRPC RetryInfo)를 주면 그 시간만큼 기다립니다.
+- 백오프 대기 시간에 지터(jitter)를 넣어 여러 요청이 동시에 재시도하지 않게 합니다.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+from google.api_core import exceptions as google_exceptions
+
+# 재시도할 HTTP 상태 코드 (5xx는 모두 재시도)
+RETRYABLE_STATUS = {408, 429}
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """
+    오류의 HTTP 상태 코드
+
+    httpx.HTTPStatusError(response.status_code), google.api_core / google.genai 오류(code),
+    replicate.exceptions.ReplicateError(status)를 지원합니다.
+    """
+    response = getattr(error, "response", None)
+    for value in (getattr(response, "status_code", None), getattr(error, "code", None), getattr(error, "status", None)):
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    재시도할 오류인지 판단 (일시적인 프로바이더 장애만 True)
+
+    상태 코드가 없는 오류(ValueError, 응답 형식 오류, 예측 실패 등)는 재시도하지 않습니다.
+    """
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    if isinstance(error, (google_exceptions.ServerError, google_exceptions.TooManyRequests)):
+        return True
+
+    code = status_code(error)
+    if code is None:
+        return False
+    return code in RETRYABLE_STATUS or code >= 500
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    서버가 지정한 재시도 대기 시간(초)
+
+    - HTTP 응답의 Retry-After 헤더 (초 또는 HTTP 날짜)
+    - gRPC 오류의 RetryInfo.retry_delay
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+
+    return None
+
+
+def backoff_delay(
+    error: BaseException,
+    attempt: int,
+    base_seconds: float,
+    max_delay_seconds: float = 30.0
+) -> Optional[float]:
+    """
+    재시도 전 대기 시간
+
+    Args:
+        error: 실패 원인
+        attempt: 실패한 시도 번호 (0부터)
+        base_seconds: 첫 재시도 기준 대기 시간 (시도마다 2배)
+        max_delay_seconds: 최대 대기 시간 (Retry-After가 이보다 길면 재시도하지 않음)
+
+    Returns:
+        대기 시간(초) 또는 None (재시도하지 않음)
+    """
+    if not is_retryable(error):
+        return None
+
+    retry_after = retry_after_seconds(error)
+    if retry_after is not None:
+        if retry_after > max_delay_seconds:
+            return None
+        # 같은 시각에 몰리지 않도록 최대 20% 늦춤
+        return retry_after * random.uniform(1.0, 1.2)
+
+    # 지수 백오프 + equal jitter (기준 시간의 절반은 보장)
+    delay = min(max_delay_seconds, base_seconds * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,295 @@
+"""
+단계 그래프(stage graph) 실행 유틸리티
+
+파이프라인을 의존 관계가 있는 단계(stage)들로 정의하고, 의존하는 단계가 모두 끝나는 즉시 다음 단계를 시작합니다.
+서로 의존하지 않는 단계는 동시에 실행되므로 전체 지연 시간은 모든 단계의 합이 아니라
+가장 긴 의존 경로(critical path)로 결정됩니다.
+
+- 단계별 타임아웃과 소요 시간 기록 (pipeline.stage_latency 지표)
+- optional 단계는 실패/타임아웃 시 default 값으로 대신하고 계속 진행
+- 필수 단계가 실패하면 실행 중인 나머지 단계를 취소하고 예외를 그대로 발생
+- blocking=True인 동기 함수(Qdrant, Voyage AI 등)는 스레드에서 실행하여 이벤트 루프를 막지 않음
+  스레드는 중간에 멈출 수 없으므로 단계가 취소/시간 초과되면 취소 신호를 설정하고,
+  동기 함수는 외부 호출 사이에 stage_cancelled()로 확인하여 남은 호출을 생략
+- 요청 데드라인(app.utils.deadline)이 있으면 단계 타임아웃을 남은 시간으로 제한하고,
+  optional 단계는 남은 시간이 단계 최소 예산(STAGE_MIN_BUDGETS)보다 적으면 실행하지 않고 default 사용 (status "degraded")
+- 체크포인트: run(checkpoints=...)에 이전 실행의 단계 결과를 넘기면 그 단계는 실행하지 않고 복원하며,
+  on_complete 콜백으로 새로 끝난 단계의 결과를 저장할 수 있음 (실패한 작업을 마지막 완료 단계부터 재개)
+
+사용 예:
+    graph = StageGraph("generate", timeouts=settings.PIPELINE_STAGE_TIMEOUTS)
+    graph.add("insights", analyze_insights, timeout=120)
+    graph.add("rag", search_past_performance, blocking=True, optional=True, default=[])
+    graph.add("strategies", make_strategies, deps=["insights", "rag"])
+    results = await graph.run()  # {"insights": ..., "rag": ..., "strategies": ...}
+
+단계 함수는 지금까지의 결과 dict를 인자로 받습니다 (의존 단계의 결과는 항상 들어 있음).
+단계 결과로 호출하는 쪽의 상태를 갱신해야 하면 on_result를 지정합니다 (체크포인트에서 복원할 때도 호출됨).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.utils.deadline import cap_timeout, should_skip
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# blocking 단계 스레드의 취소 신호 (단계가 취소/시간 초과되면 설정)
+_thread_cancel: ContextVar[Optional[threading.Event]] = ContextVar("stage_thread_cancel", default=None)
+
+
+def stage_cancelled() -> bool:
+    """현재 스레드에서 실행 중인 blocking 단계가 취소되었는지 (단계 밖에서는 항상 False)"""
+    event = _thread_cancel.get()
+    return event is not None and event.is_set()
+
+
+def _run_blocking(func: Callable[[Dict[str, Any]], Any], results: Dict[str, Any], cancel: threading.Event) -> Any:
+    _thread_cancel.set(cancel)
+    return func(results)
+
+
+class StageTimeoutError(Exception):
+    """필수 단계가 타임아웃 안에 끝나지 않음"""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"'{stage}' 단계 시간 초과 ({timeout}초)")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class Stage:
+    """파이프라인 단계 1개"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        deps: List[str],
+        timeout: Optional[float],
+        optional: bool,
+        default: Any,
+        blocking: bool,
+        enabled: bool,
+        on_result: Optional[Callable[[Any], None]]
+    ):
+        self.name = name
+        self.func = func
+        self.deps = deps
+        self.timeout = timeout
+        self.optional = optional
+        self.default = default
+        self.blocking = blocking
+        self.enabled = enabled
+        self.on_result = on_result
+
+
+class StageGraph:
+    """의존 관계 기반 비동기 단계 실행기"""
+
+    def __init__(self, name: str, timeouts: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            name: 파이프라인 이름 (지표 라벨)
+            timeouts: 단계별 타임아웃 재정의 (add()의 timeout보다 우선)
+        """
+        self.name = name
+        self.timeouts = timeouts or {}
+        self._stages: Dict[str, Stage] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        self.results: Dict[str, Any] = {}
+        # 단계별 {"status", "start", "seconds"} (start는 run() 시작 기준 초)
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        deps: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        optional: bool = False,
+        default: Any = None,
+        blocking: bool = False,
+        enabled: bool = True,
+        on_result: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        단계 추가
+
+        Args:
+            name: 단계 이름
+            func: 결과 dict를 받는 비동기 함수 (blocking=True면 동기 함수)
+            deps: 먼저 끝나야 하는 단계 (먼저 추가되어 있어야 함, 순환 방지)
+            timeout: 타임아웃(초, 재시도 포함 단계 전체)
+            optional: 실패/타임아웃 시 default로 대신하고 계속 진행
+            default: optional 단계 실패 또는 enabled=False일 때의 결과
+            blocking: 동기 함수를 스레드에서 실행
+            enabled: False면 실행하지 않고 default를 결과로 사용 (조건부 단계)
+            on_result: 단계가 성공하거나 체크포인트에서 복원되면 결과로 호출 (의존 단계 시작 전)
+        """
+        if name in self._stages:
+            raise ValueError(f"이미 추가된 단계: {name}")
+        deps = list(deps)
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"'{name}' 단계의 의존 단계 '{dep}'가 먼저 추가되어야 합니다")
+
+        self._stages[name] = Stage(
+            name, func, deps, self.timeouts.get(name, timeout), optional, default, blocking, enabled, on_result
+        )
+
+    async def run(
+        self,
+        checkpoints: Optional[Dict[str, Any]] = None,
+        on_complete: Optional[Callable[[str, Any], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        모든 단계 실행
+
+        Args:
+            checkpoints: 이전 실행에서 완료된 단계의 결과 (해당 단계는 실행하지 않고 복원)
+            on_complete: 단계가 성공할 때마다 (단계 이름, 결과)로 호출 (체크포인트 저장용)
+
+        Returns:
+            단계 이름 -> 결과
+
+        Raises:
+            필수 단계의 예외 (StageTimeoutError 포함), 나머지 단계는 취소됨
+        """
+        self.results = {}
+        self.timings = {}
+        checkpoints = checkpoints or {}
+        started_at = time.monotonic()
+        tasks: Dict[str, asyncio.Task] = {}
+        self._tasks = tasks
+
+        async def run_stage(stage: Stage):
+            if stage.deps:
+                await asyncio.gather(*(tasks[dep] for dep in stage.deps))
+
+            if not stage.enabled:
+                self.results[stage.name] = stage.default
+                self.timings[stage.name] = {"status": "skipped", "start": None, "seconds": 0.0}
+                return
+
+            if stage.name in checkpoints:
+                result = checkpoints[stage.name]
+                if stage.on_result:
+                    stage.on_result(result)
+                self.results[stage.name] = result
+                self.timings[stage.name] = {"status": "restored", "start": None, "seconds": 0.0}
+                logger.info(f"[{self.name}] '{stage.name}' 단계 체크포인트에서 복원")
+                return
+
+            if stage.optional and should_skip(stage.name):
+                self.results[stage.name] = stage.default
+                self.timings[stage.name] = {"status": "degraded", "start": None, "seconds": 0.0}
+                metrics.incr("pipeline.stage_errors", pipeline=self.name, stage=stage.name, status="degraded")
+                logger.info(f"[{self.name}] '{stage.name}' 단계 남은 시간 부족, 건너뜀")
+                return
+
+            start = time.monotonic()
+            status = "ok"
+            timeout = cap_timeout(stage.timeout)
+            cancel = threading.Event()
+            try:
+                if stage.blocking:
+                    call = asyncio.to_thread(_run_blocking, stage.func, self.results, cancel)
+                else:
+                    call = stage.func(self.results)
+                if timeout is not None:
+                    result = await asyncio.wait_for(call, timeout)
+                else:
+                    result = await call
+
+            except asyncio.CancelledError:
+                status = "cancelled"
+                raise
+            except asyncio.TimeoutError:
+                status = "timeout"
+                if not stage.optional:
+                    raise StageTimeoutError(stage.name, round(timeout, 2))
+                logger.warning(f"[{self.name}] '{stage.name}' 단계 시간 초과 ({round(timeout, 2)}초), 건너뜀")
+                result = stage.default
+            except Exception as e:
+                status = "failed"
+                if not stage.optional:
+                    raise
+                logger.warning(f"[{self.name}] '{stage.name}' 단계 실패, 건너뜀: {str(e)}")
+                result = stage.default
+            finally:
+                if status != "ok":
+                    # 스레드에서 계속 실행 중인 blocking 함수가 남은 외부 호출을 생략하도록
+                    cancel.set()
+                seconds = time.monotonic() - start
+                self.timings[stage.name] = {
+                    "status": status,
+                    "start": round(start - started_at, 3),
+                    "seconds": round(seconds, 3)
+                }
+                metrics.observe("pipeline.stage_latency", seconds, pipeline=self.name, stage=stage.name)
+                if status != "ok":
+                    metrics.incr("pipeline.stage_errors", pipeline=self.name, stage=stage.name, status=status)
+
+            if status == "ok":
+                if stage.on_result:
+                    stage.on_result(result)
+                if on_complete:
+                    await on_complete(stage.name, result)
+            self.results[stage.name] = result
+
+        for stage in self._stages.values():
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            # 실패(또는 요청 취소) 시 아직 실행 중인 단계 취소
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            metrics.observe("pipeline.latency", time.monotonic() - started_at, pipeline=self.name)
+
+        return self.results
+
+    async def wait_result(self, name: str) -> Any:
+        """
+        실행 중인 단계 안에서 의존하지 않는 단계의 결과를 기다림 (조건에 따라 필요할 때만 기다리는 경우)
+
+        실패한 optional 단계나 건너뛴 단계는 default를 반환합니다.
+        """
+        task = self._tasks[name]
+        # 기다리는 쪽이 취소되어도 해당 단계는 취소하지 않음
+        await asyncio.shield(task)
+        return self.results[name]
+
+    def critical_path(self) -> List[str]:
+        """
+        가장 늦게 끝난 단계에서 거꾸로 따라간 의존 경로 (전체 지연 시간을 결정한 단계들)
+        """
+        def end(name: str) -> float:
+            timing = self.timings.get(name) or {}
+            return (timing.get("start") or 0.0) + timing.get("seconds", 0.0)
+
+        if not self.timings:
+            return []
+
+        path = [max(self.timings, key=end)]
+        while self._stages[path[-1]].deps:
+            path.append(max(self._stages[path[-1]].deps, key=end))
+        return list(reversed(path))
+
+    def get_timings(self) -> Dict[str, Any]:
+        """응답에 포함할 단계별 소요 시간과 critical path"""
+        return {
+            "stages": self.timings,
+            "critical_path": self.critical_path()
+        }
@@ -0,0 +1,97 @@
+"""
+요청 테넌트(사용자/프로젝트)와 작업 우선순위 전파
+
+생성 파이프라인과 외부 API 호출이 누구의 어떤 작업인지 contextvar로 전달하므로,
+공정 스케줄러(FairScheduler)가 하위 태스크/스레드에서도 같은 테넌트로 대기열을 나눕니다.
+
+우선순위:
+- interactive: 사용자가 응답을 기다리는 요청 (/generate, 재생성, 스트리밍)
+- batch: 일괄 생성, 비동기 생성 작업
+- background: 응답과 무관한 후처리 (성과 예측 등)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from fastapi import Depends
+
+from app.models.user import User
+from app.utils.auth import get_current_user
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+BACKGROUND = "background"
+
+# 앞에 있을수록 먼저 실행
+PRIORITIES = (INTERACTIVE, BATCH, BACKGROUND)
+
+
+class Tenant:
+    """스케줄링 단위 (사용자, 프로젝트, 우선순위)"""
+
+    def __init__(self, user_id: Optional[int] = None, project_id: Optional[int] = None, priority: str = INTERACTIVE):
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위: {priority}")
+        self.user_id = user_id
+        self.project_id = project_id
+        self.priority = priority
+
+    @property
+    def key(self) -> str:
+        """지표/통계용 이름 (예: user:3/project:12)"""
+        return f"user:{self.user_id if self.user_id is not None else '-'}/project:{self.project_id if self.project_id is not None else '-'}"
+
+    def __repr__(self) -> str:
+        return f"<Tenant({self.key}, {self.priority})>"
+
+
+_current: ContextVar[Optional[Tenant]] = ContextVar("request_tenant", default=None)
+
+# 테넌트를 지정하지 않은 호출 (스크립트, 테넌트 없는 작업)
+ANONYMOUS = Tenant()
+
+
+def current_tenant() -> Tenant:
+    return _current.get() or ANONYMOUS
+
+
+def set_tenant(tenant: Optional[Tenant]):
+    """현재 요청(태스크)의 테넌트 지정 (이후 생성되는 하위 태스크/스레드에 전파)"""
+    _current.set(tenant)
+
+
+@contextmanager
+def tenant_scope(
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    priority: Optional[str] = None
+) -> Iterator[Tenant]:
+    """
+    블록 안에서만 테넌트 변경 (지정하지 않은 값은 현재 테넌트에서 물려받음)
+
+    예: with tenant_scope(priority=BACKGROUND): ...  # 같은 사용자/프로젝트의 후처리
+    """
+    base = _current.get()
+    tenant = Tenant(
+        user_id=user_id if user_id is not None else (base.user_id if base else None),
+        project_id=project_id if project_id is not None else (base.project_id if base else None),
+        priority=priority or (base.priority if base else INTERACTIVE)
+    )
+    token = _current.set(tenant)
+    try:
+        yield tenant
+    finally:
+        _current.reset(token)
+
+
+async def request_tenant(current_user: User = Depends(get_current_user)) -> Tenant:
+    """
+    대화형 요청 테넌트 Dependency
+
+    로그인한 사용자를 interactive 우선순위로 지정합니다 (프로젝트는 파이프라인에서 요청 본문으로 지정).
+    """
+    tenant = Tenant(user_id=current_user.id)
+    # 요청마다 지정 (이전 요청의 값이 남지 않게 함)
+    set_tenant(tenant)
+    return tenant
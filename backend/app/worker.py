@@ -0,0 +1,57 @@
+"""
+백그라운드 작업 워커
+
+API 서버와 같은 Redis(REDIS_URL)를 바라보는 별도 프로세스로 작업 큐를 처리합니다.
+Redis 없이 실행하면 프로세스 내 큐라서 API 서버의 작업을 받을 수 없으므로,
+이 경우에는 API 서버 내장 워커(JOB_WORKER_IN_PROCESS=True)를 사용하세요.
+
+사용법 (backend 디렉토리에서):
+    python -m app.worker
+    python -m app.worker --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.config import settings
+from app.services import content_jobs, generation_jobs  # noqa: F401  (작업 핸들러 등록)
+from app.services.client_pool import client_pool
+from app.services.insight_warehouse import insight_warehouse
+from app.services.job_queue import job_queue, LocalJobBackend
+
+logger = logging.getLogger(__name__)
+
+
+async def main(concurrency: int):
+    if isinstance(job_queue.backend, LocalJobBackend):
+        logger.warning("REDIS_URL이 설정되지 않았습니다. 이 워커는 API 서버의 작업을 받을 수 없습니다")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    await insight_warehouse.refresh()
+    try:
+        await job_queue.run_worker(concurrency=concurrency, stop=stop)
+    finally:
+        await client_pool.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="백그라운드 작업 워커")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                        help="동시에 실행할 작업 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(args.concurrency))
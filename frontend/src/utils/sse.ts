@@ -4,8 +4,10 @@
  */
 
 export interface SSEMessage {
-  type: 'progress' | 'complete' | 'error';
+  type: 'progress' | 'partial' | 'complete' | 'error';
   step?: number;
+  stage?: 'strategies' | 'copies';  // partial: 토큰 스트리밍 중인 단계
+  delta?: string;  // partial: 새로 도착한 텍스트 조각
   total?: number;
   message?: string;
   data?: any;
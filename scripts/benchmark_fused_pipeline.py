@@ -0,0 +1,313 @@
+"""
+fast 모드(통합 호출) vs 단계별 파이프라인 벤치마크 스크립트
+
+같은 제품/타겟 입력으로 두 방식을 실행하여 비교합니다.
+- 단계별: analyze_target_insights → generate_marketing_strategies → generate_copies (Gemini 3회)
+- fast 모드: generate_fused_content (Gemini 1회)
+
+비교 항목:
+- 지연 시간 (평균, p50, 최대)
+- Gemini 호출 수, 입력/출력 토큰, 예상 비용
+- 출력 품질 체크 (전략 3개, 성과 예측 포함, 톤별 카피 길이, 해시태그 15-20개, 인사이트 항목 수)
+
+사용법:
+    # 오프라인 (가짜 Gemini 모델, 토큰 수에 비례한 지연)
+    python scripts/benchmark_fused_pipeline.py --runs 5
+
+    # 실제 Gemini API 사용 (API 쿼터 소모, 품질 비교는 실제 API에서만 의미 있음)
+    python scripts/benchmark_fused_pipeline.py --runs 3 --live
+"""
+
+import sys
+import time
+import json
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+# .env 파일 로드
+from dotenv import load_dotenv
+load_dotenv(project_root / "backend" / ".env")
+
+from app.config import settings
+from app.services.gemini_service import gemini_service
+from app.utils.metrics import metrics
+
+
+PRODUCT = {
+    "product_name": "수분 진정 크림",
+    "product_description": "민감한 피부를 위한 저자극 수분 크림. 판테놀과 세라마이드로 피부 장벽을 강화합니다.",
+    "category": "beauty",
+    "target_ages": ["20-29"],
+    "target_genders": ["여성"],
+    "target_interests": ["뷰티", "스킨케어"]
+}
+
+# 톤별 권장 카피 길이 (gemini_service.COPY_TONE_DESCRIPTIONS 기준, 앞뒤 여유 포함)
+TONE_LENGTH_RANGE = {
+    "professional": (30, 60),
+    "casual": (20, 50),
+    "impact": (10, 35)
+}
+
+
+# ============================================================
+# 가짜 Gemini 모델 (오프라인 벤치마크용)
+# ============================================================
+
+class _FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+
+
+class _FakeResponse:
+    """generate_content 응답 흉내 (usage_metadata 포함)"""
+
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        self.parts = [text]
+        self.candidates = []
+        self.usage_metadata = _FakeUsage(len(prompt) // 2, len(text) // 2)
+
+
+class FakeGeminiModel:
+    """
+    (기본 지연 + 출력 토큰당 지연) 후 프롬프트에 맞는 JSON을 반환하는 가짜 모델
+
+    실제 API처럼 호출마다 고정 지연(네트워크, 대기열, 첫 토큰)이 있고
+    출력 길이에 비례해서 시간이 늘어납니다.
+    """
+
+    def __init__(self, base_latency: float, per_token_latency: float):
+        self.base_latency = base_latency
+        self.per_token_latency = per_token_latency
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        text = self._answer(prompt)
+        await asyncio.sleep(self.base_latency + (len(text) // 2) * self.per_token_latency)
+        return _FakeResponse(text, prompt)
+
+    def _insights(self) -> dict:
+        return {
+            "pain_points": ["건조함", "민감성", "붉은기", "트러블", "각질"],
+            "preferred_channels": ["Instagram", "YouTube", "TikTok", "네이버 블로그", "올리브영 앱"],
+            "tone_preferences": ["친근함", "솔직함", "전문성"],
+            "message_strategies": ["성분 강조", "전후 비교", "후기 활용", "루틴 제안", "한정 혜택"],
+            "lifestyle_traits": ["바쁜 출근", "자기관리", "SNS 활발", "가성비 중시", "트렌드 민감"],
+            "purchase_motivations": ["효능", "저자극", "리뷰", "가격", "브랜드 신뢰"]
+        }
+
+    def _strategies(self) -> list:
+        return [
+            {"id": i, "name": f"전략 {i}", "core_message": "피부 장벽부터 지키세요", "emotion": "감성적",
+             "expected_effect": "공감을 통한 관심 유도",
+             "performance_prediction": {"estimated_reach": 10000, "estimated_engagement_rate": 3.5,
+                                        "estimated_conversions": 150, "confidence_score": 0.7}}
+            for i in range(1, 4)
+        ]
+
+    def _copy(self) -> dict:
+        text = "예민한 피부도 하루 종일 촉촉하게, 판테놀 세라마이드 장벽 크림으로 시작하세요"
+        return {"id": 1, "tone": "professional", "text": text,
+                "hashtags": [f"#태그{i}" for i in range(1, 18)], "length": len(text)}
+
+    def _answer(self, prompt: str) -> str:
+        if '"selected_copy"' in prompt:
+            return json.dumps({"insights": self._insights(), "strategies": self._strategies(),
+                               "selected_copy": self._copy()}, ensure_ascii=False)
+        if '"strategies"' in prompt:
+            return json.dumps({"strategies": self._strategies()}, ensure_ascii=False)
+        if '"copies"' in prompt:
+            return json.dumps({"copies": [self._copy()]}, ensure_ascii=False)
+        return json.dumps(self._insights(), ensure_ascii=False)
+
+
+# ============================================================
+# 파이프라인
+# ============================================================
+
+async def run_staged(copy_tone: str) -> dict:
+    """단계별 파이프라인 (Gemini 3회)"""
+    insights = await gemini_service.analyze_target_insights(
+        product_name=PRODUCT["product_name"],
+        product_description=PRODUCT["product_description"],
+        category=PRODUCT["category"],
+        target_ages=PRODUCT["target_ages"],
+        target_genders=PRODUCT["target_genders"],
+        target_interests=PRODUCT["target_interests"]
+    )
+    strategies = await gemini_service.generate_marketing_strategies(
+        product_name=PRODUCT["product_name"],
+        product_description=PRODUCT["product_description"],
+        category=PRODUCT["category"],
+        target_age=", ".join(PRODUCT["target_ages"]),
+        target_gender=", ".join(PRODUCT["target_genders"]),
+        target_interests=PRODUCT["target_interests"]
+    )
+    copies = await gemini_service.generate_copies(
+        product_name=PRODUCT["product_name"],
+        product_description=PRODUCT["product_description"],
+        strategy=strategies[0],
+        target_age=", ".join(PRODUCT["target_ages"]),
+        target_gender=", ".join(PRODUCT["target_genders"]),
+        target_interests=PRODUCT["target_interests"],
+        copy_tone=copy_tone
+    )
+    return {"insights": insights, "strategies": strategies, "copy": copies[0]}
+
+
+async def run_fused(copy_tone: str) -> dict:
+    """fast 모드 (Gemini 1회)"""
+    return await gemini_service.generate_fused_content(
+        product_name=PRODUCT["product_name"],
+        product_description=PRODUCT["product_description"],
+        category=PRODUCT["category"],
+        target_ages=PRODUCT["target_ages"],
+        target_genders=PRODUCT["target_genders"],
+        target_interests=PRODUCT["target_interests"],
+        copy_tone=copy_tone,
+        strategy_id=1
+    )
+
+
+def check_quality(result: dict, copy_tone: str) -> dict:
+    """
+    출력 품질 체크 (프롬프트에서 요구한 형식/분량을 지켰는지)
+
+    Returns:
+        {체크 이름: 통과 여부}
+    """
+    insights = result["insights"]
+    strategies = result["strategies"]
+    copy = result["copy"]
+    min_len, max_len = TONE_LENGTH_RANGE.get(copy_tone, TONE_LENGTH_RANGE["professional"])
+    insight_keys = ["pain_points", "preferred_channels", "message_strategies",
+                    "lifestyle_traits", "purchase_motivations"]
+
+    return {
+        "전략 3개": len(strategies) == 3,
+        "전략명 중복 없음": len({s.get("name") for s in strategies}) == len(strategies),
+        "성과 예측 포함": all("performance_prediction" in s for s in strategies),
+        "카피 톤 일치": copy.get("tone") == copy_tone,
+        "카피 길이": min_len <= len(copy.get("text", "")) <= max_len,
+        "해시태그 15-20개": 15 <= len(copy.get("hashtags", [])) <= 20,
+        "해시태그 # 포함": all(tag.startswith("#") for tag in copy.get("hashtags", [])),
+        "인사이트 항목 5개 이상": all(len(insights.get(key, [])) >= 5 for key in insight_keys)
+    }
+
+
+def _token_counters() -> dict:
+    """현재까지 누적된 Gemini 호출/토큰 수"""
+    return {
+        name: metrics.count(f"gemini.{name}", model=gemini_service.model_name)
+        for name in ("calls", "prompt_tokens", "output_tokens")
+    }
+
+
+async def benchmark(name: str, pipeline, runs: int, copy_tone: str) -> dict:
+    """파이프라인을 runs회 순차 실행하여 지연 시간/토큰/품질 집계"""
+    durations = []
+    quality_passed = 0
+    quality_total = 0
+    failures = {}
+    before = _token_counters()
+
+    for i in range(runs):
+        start = time.perf_counter()
+        result = await pipeline(copy_tone)
+        durations.append(time.perf_counter() - start)
+
+        checks = check_quality(result, copy_tone)
+        quality_passed += sum(checks.values())
+        quality_total += len(checks)
+        for check, passed in checks.items():
+            if not passed:
+                failures[check] = failures.get(check, 0) + 1
+
+        print(f"  {name} #{i + 1}: {durations[-1]:.2f}초, 품질 {sum(checks.values())}/{len(checks)}")
+
+    after = _token_counters()
+    usage = {key: (after[key] - before[key]) / runs for key in after}
+
+    return {
+        "name": name,
+        "avg": statistics.mean(durations),
+        "p50": statistics.median(durations),
+        "max": max(durations),
+        "calls": usage["calls"],
+        "prompt_tokens": usage["prompt_tokens"],
+        "output_tokens": usage["output_tokens"],
+        "quality": quality_passed / quality_total if quality_total else 0.0,
+        "failures": failures
+    }
+
+
+def print_comparison(staged: dict, fused: dict, input_price: float, output_price: float):
+    """단계별 vs fast 모드 비교표 출력 (가격: 100만 토큰당 USD)"""
+
+    def cost(result: dict) -> float:
+        return (result["prompt_tokens"] * input_price + result["output_tokens"] * output_price) / 1_000_000
+
+    def change(before: float, after: float) -> str:
+        if not before:
+            return "-"
+        return f"{(after - before) / before * 100:+.0f}%"
+
+    rows = [
+        ("평균 지연 (초)", staged["avg"], fused["avg"], "{:.2f}"),
+        ("p50 지연 (초)", staged["p50"], fused["p50"], "{:.2f}"),
+        ("최대 지연 (초)", staged["max"], fused["max"], "{:.2f}"),
+        ("Gemini 호출 수", staged["calls"], fused["calls"], "{:.1f}"),
+        ("입력 토큰", staged["prompt_tokens"], fused["prompt_tokens"], "{:,.0f}"),
+        ("출력 토큰", staged["output_tokens"], fused["output_tokens"], "{:,.0f}"),
+        ("예상 비용 (USD)", cost(staged), cost(fused), "{:.5f}"),
+        ("품질 체크 통과율", staged["quality"], fused["quality"], "{:.0%}"),
+    ]
+
+    print("\n" + "=" * 72)
+    print("📊 단계별 파이프라인 vs fast 모드 (1회 실행 기준)")
+    print("=" * 72)
+    print(f"{'항목':<20}{'단계별':>16}{'fast 모드':>16}{'변화':>12}")
+    print("-" * 72)
+    for label, before, after, fmt in rows:
+        print(f"{label:<20}{fmt.format(before):>16}{fmt.format(after):>16}{change(before, after):>12}")
+
+    for result in (staged, fused):
+        if result["failures"]:
+            print(f"\n⚠️  {result['name']} 품질 체크 실패 항목: {result['failures']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="fast 모드 vs 단계별 파이프라인 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="방식별 실행 횟수")
+    parser.add_argument("--tone", default="professional", choices=["professional", "casual", "impact"], help="카피 톤")
+    parser.add_argument("--live", action="store_true", help="실제 Gemini API 사용")
+    parser.add_argument("--base-latency", type=float, default=0.8, help="가짜 모델의 호출당 기본 지연(초)")
+    parser.add_argument("--token-latency", type=float, default=0.004, help="가짜 모델의 출력 토큰당 지연(초)")
+    parser.add_argument("--input-price", type=float, default=0.30, help="입력 100만 토큰당 가격(USD)")
+    parser.add_argument("--output-price", type=float, default=2.50, help="출력 100만 토큰당 가격(USD)")
+    args = parser.parse_args()
+
+    # 반복 실행 시 인사이트 분석이 캐시에서 반환되지 않도록 캐시 비활성화 (매 실행을 첫 요청처럼 측정)
+    settings.LLM_CACHE_ENABLED = False
+
+    if not args.live:
+        gemini_service.model = FakeGeminiModel(args.base_latency, args.token_latency)
+        print("🧪 오프라인 모드 (가짜 Gemini 모델) - 품질 비교는 --live에서만 의미가 있습니다")
+
+    print("\n▶ 단계별 파이프라인")
+    staged = await benchmark("단계별", run_staged, args.runs, args.tone)
+    print("\n▶ fast 모드")
+    fused = await benchmark("fast 모드", run_fused, args.runs, args.tone)
+
+    print_comparison(staged, fused, args.input_price, args.output_price)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
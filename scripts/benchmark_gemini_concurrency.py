@@ -0,0 +1,196 @@
+"""
+Gemini 동시성 벤치마크 스크립트
+
+N개의 콘텐츠 생성 파이프라인(인사이트 → 전략 → 카피 → 이미지 프롬프트)을
+동시에 실행하여, 각 파이프라인의 Gemini 호출이 순차 실행되지 않고
+서로 겹쳐서(overlap) 실행되는지 확인합니다.
+
+동시에 이벤트 루프 지연(heartbeat lag)을 측정하여 Gemini 응답을 기다리는 동안
+다른 요청(예: /health)이 처리될 수 있는지 확인합니다.
+
+사용법:
+    # 오프라인 (가짜 Gemini 모델, 호출당 1.5초 지연)
+    python scripts/benchmark_gemini_concurrency.py --pipelines 5
+
+    # 기존 동작(동기 호출) 재현과 비교
+    python scripts/benchmark_gemini_concurrency.py --pipelines 5 --compare-blocking
+
+    # 실제 Gemini API 사용 (API 쿼터 소모)
+    python scripts/benchmark_gemini_concurrency.py --pipelines 3 --live
+"""
+
+import sys
+import time
+import json
+import asyncio
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+# .env 파일 로드
+from dotenv import load_dotenv
+load_dotenv(project_root / "backend" / ".env")
+
+from app.services.gemini_service import gemini_service
+
+
+# ============================================================
+# 가짜 Gemini 모델 (오프라인 벤치마크용)
+# ============================================================
+
+class _FakeResponse:
+    """generate_content 응답 흉내"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = [text]
+        self.candidates = []
+
+
+class FakeGeminiModel:
+    """
+    지정한 지연 시간 후 프롬프트에 맞는 JSON을 반환하는 가짜 모델
+
+    blocking=True이면 기존 구현처럼 이벤트 루프를 막는(time.sleep) 호출을 재현합니다.
+    """
+
+    def __init__(self, latency: float, blocking: bool = False):
+        self.latency = latency
+        self.blocking = blocking
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        if self.blocking:
+            time.sleep(self.latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return _FakeResponse(self._answer(prompt))
+
+    def _answer(self, prompt: str) -> str:
+        if '"strategies"' in prompt:
+            return json.dumps({"strategies": [
+                {"id": i, "name": f"전략 {i}", "core_message": "메시지", "emotion": "감성적",
+                 "expected_effect": "효과"}
+                for i in range(1, 4)
+            ]}, ensure_ascii=False)
+        if '"copies"' in prompt:
+            return json.dumps({"copies": [
+                {"id": 1, "tone": "professional", "text": "벤치마크 카피", "hashtags": ["#태그"], "length": 7}
+            ]}, ensure_ascii=False)
+        if "pain_points" in prompt:
+            return json.dumps({
+                "target_ages": ["20-29"], "target_interests": ["뷰티"], "pain_points": ["건조함"],
+                "preferred_channels": ["Instagram"], "tone_preferences": ["친근함"],
+                "message_strategies": ["공감"], "lifestyle_traits": ["바쁨"], "purchase_motivations": ["효능"]
+            }, ensure_ascii=False)
+        return "Professional commercial photography of a product, ultra detailed, 8K"
+
+
+# ============================================================
+# 벤치마크
+# ============================================================
+
+async def run_pipeline(index: int) -> float:
+    """콘텐츠 생성 파이프라인의 Gemini 단계만 실행하고 소요 시간 반환"""
+    start = time.perf_counter()
+
+    insights = await gemini_service.analyze_target_insights(
+        product_name=f"벤치마크 제품 {index}",
+        product_description="수분 크림",
+        category="beauty",
+        target_ages=["20-29"],
+        target_genders=["여성"],
+        target_interests=["뷰티"]
+    )
+    strategies = await gemini_service.generate_marketing_strategies(
+        product_name=f"벤치마크 제품 {index}",
+        product_description="수분 크림",
+        category="beauty",
+        target_age="20-29",
+        target_gender="여성",
+        target_interests=insights.get("target_interests", ["뷰티"])
+    )
+    copies = await gemini_service.generate_copies(
+        product_name=f"벤치마크 제품 {index}",
+        product_description="수분 크림",
+        strategy=strategies[0],
+        target_age="20-29",
+        target_gender="여성",
+        target_interests=["뷰티"]
+    )
+    await gemini_service.convert_to_image_prompt(
+        copy_text=copies[0]["text"],
+        product_name=f"벤치마크 제품 {index}",
+        target_age="20-29",
+        target_gender="여성",
+        strategy=strategies[0]
+    )
+
+    return time.perf_counter() - start
+
+
+async def heartbeat(stop: asyncio.Event, interval: float, lags: list):
+    """이벤트 루프가 interval마다 깨어나는지 측정 (/health 응답성의 대리 지표)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def benchmark(pipelines: int) -> dict:
+    """N개 파이프라인을 동시에 실행"""
+    stop = asyncio.Event()
+    lags = []
+    monitor = asyncio.create_task(heartbeat(stop, 0.05, lags))
+
+    start = time.perf_counter()
+    durations = await asyncio.gather(*(run_pipeline(i) for i in range(pipelines)))
+    wall_time = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+
+    return {
+        "pipelines": pipelines,
+        "wall_time": wall_time,
+        "sum_of_pipelines": sum(durations),
+        "overlap_factor": sum(durations) / wall_time if wall_time else 0.0,
+        "max_loop_lag": max(lags) if lags else 0.0
+    }
+
+
+def print_result(title: str, result: dict):
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+    print(f"동시 파이프라인 수:     {result['pipelines']}")
+    print(f"전체 소요 시간(wall):   {result['wall_time']:.2f}초")
+    print(f"파이프라인 시간 합계:   {result['sum_of_pipelines']:.2f}초")
+    print(f"겹침 배수(overlap):     {result['overlap_factor']:.2f}x (이상적: {result['pipelines']}x)")
+    print(f"최대 이벤트 루프 지연: {result['max_loop_lag'] * 1000:.0f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Gemini 동시성 벤치마크")
+    parser.add_argument("--pipelines", type=int, default=5, help="동시에 실행할 파이프라인 수")
+    parser.add_argument("--latency", type=float, default=1.5, help="가짜 모델의 호출당 지연 시간(초)")
+    parser.add_argument("--live", action="store_true", help="실제 Gemini API 사용")
+    parser.add_argument("--compare-blocking", action="store_true", help="동기 호출(기존 동작) 결과와 비교")
+    args = parser.parse_args()
+
+    if args.live:
+        print_result("🌐 실제 Gemini API", await benchmark(args.pipelines))
+        return
+
+    gemini_service.model = FakeGeminiModel(latency=args.latency)
+    print_result("✅ 비동기 호출 (generate_content_async)", await benchmark(args.pipelines))
+
+    if args.compare_blocking:
+        gemini_service.model = FakeGeminiModel(latency=args.latency, blocking=True)
+        print_result("⛔ 동기 호출 재현 (기존 동작)", await benchmark(args.pipelines))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
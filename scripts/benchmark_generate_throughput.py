@@ -0,0 +1,316 @@
+"""
+/api/content/generate 처리량 벤치마크 (외부 API 기록/재생)
+
+provider_sim으로 Gemini, Nano Banana, Replicate, Ideogram, Voyage AI 응답을 카세트에서 재생하여
+API 키와 쿼터 없이 전체 생성 파이프라인(인사이트 → 전략 → 카피 → 이미지 → DB 저장 → 성과 예측)을
+동시 요청으로 실행하고 처리량과 p50/p95/p99 지연 시간을 측정합니다.
+재생 지연 시간은 기록 당시 값 또는 지정한 분포를 따르고, 지정한 비율만큼 오류를 주입합니다.
+
+DB는 임시 SQLite 파일을 사용하고, 인증은 벤치마크용 사용자로 대체합니다.
+생성된 이미지는 실제 파이프라인과 같이 backend/storage/images에 저장됩니다.
+
+사용법:
+    # 1) 합성 카세트로 오프라인 실행 (API 키 불필요)
+    python scripts/benchmark_generate_throughput.py --seed-synthetic --requests 50 --concurrency 10
+
+    # 2) 실제 API 응답을 카세트에 기록 (backend/.env의 API 키 사용, 쿼터 소모)
+    python scripts/benchmark_generate_throughput.py --record --requests 3 --concurrency 1
+
+    # 3) 기록한 카세트 재생 + 지연 분포/오류 주입
+    python scripts/benchmark_generate_throughput.py --requests 200 --concurrency 20 \\
+        --latency gemini=lognormal:1.5:0.5 --latency gemini_rest=uniform:4:8 --error-rate gemini=0.02
+
+지연 분포 형식: 프로바이더=fixed:초 / uniform:최소:최대 / lognormal:중앙값:sigma
+프로바이더: gemini, gemini_rest(Nano Banana), replicate, ideogram, voyage, downloads
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+PRODUCT = {
+    "product_name": "수분 진정 크림",
+    "product_description": "민감한 피부를 위한 저자극 수분 크림. 판테놀과 세라마이드로 피부 장벽을 강화합니다.",
+    "category": "beauty",
+    "target_ages": ["20-29"],
+    "target_genders": ["여성"],
+    "target_interests": ["뷰티", "스킨케어"],
+    "copy_tone": "professional"
+}
+
+# 1x1 PNG (합성 카세트의 Nano Banana 이미지)
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+
+def parse_latency(values: list) -> dict:
+    """"gemini=lognormal:1.5:0.5" → {"gemini": {"dist": "lognormal", "median": 1.5, "sigma": 0.5}}"""
+    result = {}
+    for value in values:
+        provider, spec = value.split("=", 1)
+        dist, *params = spec.split(":")
+        params = [float(p) for p in params]
+        if dist == "fixed":
+            result[provider] = {"dist": "fixed", "value": params[0]}
+        elif dist == "uniform":
+            result[provider] = {"dist": "uniform", "min": params[0], "max": params[1]}
+        elif dist == "lognormal":
+            result[provider] = {"dist": "lognormal", "median": params[0], "sigma": params[1]}
+        else:
+            raise ValueError(f"알 수 없는 지연 분포: {dist}")
+    return result
+
+
+def parse_error_rates(values: list) -> dict:
+    """"gemini=0.02" → {"gemini": 0.02}"""
+    return {provider: float(rate) for provider, rate in (value.split("=", 1) for value in values)}
+
+
+# ============================================================
+# 합성 카세트
+# ============================================================
+
+def _strategies() -> list:
+    return [
+        {"id": i, "name": f"전략 {i}", "core_message": "피부 장벽부터 지키세요", "emotion": "감성적",
+         "expected_effect": "공감을 통한 관심 유도"}
+        for i in range(1, 4)
+    ]
+
+
+def _copy() -> dict:
+    text = "예민한 피부도 하루 종일 촉촉하게, 판테놀 세라마이드 장벽 크림으로 시작하세요"
+    return {"id": 1, "tone": "professional", "text": text,
+            "hashtags": [f"#태그{i}" for i in range(1, 18)], "length": len(text)}
+
+
+def _insights() -> dict:
+    return {
+        "target_ages": ["20-29"],
+        "target_interests": ["뷰티", "스킨케어"],
+        "pain_points": ["건조함", "민감성", "붉은기"],
+        "preferred_channels": ["Instagram", "YouTube", "올리브영 앱"],
+        "tone_preferences": ["친근함", "전문성"],
+        "message_strategies": ["성분 강조", "후기 활용"],
+        "lifestyle_traits": ["자기관리", "SNS 활발"],
+        "purchase_motivations": ["효능", "저자극"]
+    }
+
+
+def _personas(count: int = 30) -> list:
+    return [
+        {"name": f"페르소나{i}", "age": 20 + i % 10, "occupation": "직장인", "personality": "꼼꼼함",
+         "sns_usage": {"platforms": ["Instagram"], "daily_hours": 2.0},
+         "purchase_behavior": "후기를 보고 구매",
+         "ad_sensitivity": {"level": "중간", "triggers": ["할인", "후기"]}}
+        for i in range(1, count + 1)
+    ]
+
+
+def _simulation(count: int = 30) -> dict:
+    return {
+        "reactions": [
+            {"persona_name": f"페르소나{i}", "will_click": i % 3 == 0, "engagement_action": "like" if i % 4 == 0 else None,
+             "will_convert": i % 10 == 0, "brand_recall": 60.0, "reason": "성분에 관심"}
+            for i in range(1, count + 1)
+        ],
+        "overall_metrics": {"total_impressions": count, "total_clicks": count // 3, "ctr": 33.3,
+                            "engagement_rate": 25.0, "conversion_rate": 10.0, "avg_brand_recall": 60.0}
+    }
+
+
+def seed_synthetic(cassette_dir: Path):
+    """작업(label)별 합성 응답으로 카세트 생성 (기존 gemini/gemini_rest 카세트는 덮어씀)"""
+    cassette_dir.mkdir(parents=True, exist_ok=True)
+
+    def gemini(label: str, data, latency: float) -> dict:
+        text = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+        usage = {"prompt_token_count": 1500, "cached_content_token_count": 0, "candidates_token_count": len(text) // 2}
+        return {"key": "", "label": label, "latency": latency, "response": {"text": text, "usage": usage}}
+
+    gemini_entries = [
+        gemini("analyze_target_insights", _insights(), 3.0),
+        gemini("generate_marketing_strategies", {"strategies": _strategies()}, 6.0),
+        gemini("generate_copies", {"copies": [_copy()]}, 3.0),
+        gemini("convert_to_image_prompt", "A bright bathroom shelf with a moisturizing cream jar, soft morning light, photorealistic", 2.0),
+        gemini("generate_fused_content", {"insights": _insights(), "strategies": _strategies(), "selected_copy": _copy()}, 8.0),
+        gemini("PersonaListOutput", _personas(), 8.0),
+        gemini("SimulationOutput", _simulation(), 6.0),
+        # 라우트 없이 기본 모델로 호출하는 generate_text (재생성 시 이미지 프롬프트 수정 등)
+        gemini("gemini-2.5-flash", "A bright bathroom shelf with a pastel moisturizing cream jar, soft morning light, photorealistic", 2.0)
+    ]
+
+    image_body = {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"inlineData": {"mimeType": "image/png", "data": base64.b64encode(PIXEL_PNG).decode()}}]},
+            "finishReason": "STOP"
+        }]
+    }
+    rest_entries = [{
+        "key": "",
+        "label": "POST generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent",
+        "latency": 8.0,
+        "response": {
+            "status": 200,
+            "headers": {"content-type": "application/json"},
+            "body": base64.b64encode(json.dumps(image_body).encode()).decode()
+        }
+    }]
+
+    for provider, entries in (("gemini", gemini_entries), ("gemini_rest", rest_entries)):
+        with open(cassette_dir / f"{provider}.jsonl", "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    print(f"✓ 합성 카세트 생성: {cassette_dir}")
+
+
+# ============================================================
+# 벤치마크
+# ============================================================
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run(requests: int, concurrency: int, fast_mode: bool) -> tuple:
+    import httpx
+    from app.main import app
+    from app.models.base import Base, engine, SessionLocal
+    from app.models.user import User
+    from app.utils.auth import get_current_user
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = db.query(User).filter(User.email == "benchmark@example.com").first()
+    if user is None:
+        user = User(email="benchmark@example.com", name="벤치마크")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    db.expunge(user)
+    db.close()
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    # ASGITransport는 startup 이벤트를 실행하지 않으므로 후처리 작업 워커를 직접 시작
+    from app.config import settings
+    from app.services import content_jobs  # noqa: F401
+    from app.services.job_queue import job_queue
+    job_queue.start(settings.JOB_WORKER_CONCURRENCY)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None) as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/api/content/generate", json={**PRODUCT, "fast_mode": fast_mode})
+                    status = response.status_code
+                except Exception as e:
+                    status = type(e).__name__
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors[str(status)] = errors.get(str(status), 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    # 응답 후 남은 후처리 작업(임베딩 저장, 성과 예측)이 끝날 때까지 대기
+    def pending_jobs() -> int:
+        stats = job_queue.get_stats()["types"].values()
+        return sum(t["enqueued"] - t["succeeded"] - t["failed"] for t in stats)
+
+    drain_start = time.perf_counter()
+    while pending_jobs() > 0 and time.perf_counter() - drain_start < 600:
+        await asyncio.sleep(0.1)
+    drain_elapsed = time.perf_counter() - drain_start
+    await job_queue.stop()
+
+    return latencies, errors, elapsed, drain_elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="/api/content/generate 처리량 벤치마크 (기록/재생)")
+    parser.add_argument("--requests", type=int, default=50, help="요청 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--fast-mode", action="store_true", help="fast 모드(통합 호출)로 요청")
+    parser.add_argument("--record", action="store_true", help="실제 API를 호출하여 카세트에 기록")
+    parser.add_argument("--seed-synthetic", action="store_true", help="합성 카세트를 생성한 뒤 재생")
+    parser.add_argument("--cassette-dir", default=None, help="카세트 디렉토리 (기본: cassettes, 합성 시 cassettes/synthetic)")
+    parser.add_argument("--latency", action="append", default=[], help="재생 지연 분포 (예: gemini=lognormal:1.5:0.5)")
+    parser.add_argument("--error-rate", action="append", default=[], help="오류 주입 비율 (예: gemini=0.02)")
+    parser.add_argument("--speed", type=float, default=1.0, help="기록된 지연 시간 배율 (0이면 지연 없음)")
+    parser.add_argument("--rpm-limit", type=int, default=100000, help="재생 시 Gemini RPM 쿼터 (쿼터 대기가 처리량을 제한하지 않도록)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    args = parser.parse_args()
+
+    cassette_dir = Path(args.cassette_dir or ("cassettes/synthetic" if args.seed_synthetic else "cassettes"))
+    if not cassette_dir.is_absolute():
+        cassette_dir = project_root / "backend" / cassette_dir
+    if args.seed_synthetic:
+        seed_synthetic(cassette_dir)
+
+    # 설정은 app 모듈을 import하기 전에 환경 변수로 지정
+    db_path = Path(tempfile.mkdtemp()) / "benchmark.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}?check_same_thread=false"
+    os.environ["PROVIDER_SIM_MODE"] = "record" if args.record else "replay"
+    os.environ["PROVIDER_SIM_CASSETTE_DIR"] = str(cassette_dir)
+    os.environ["PROVIDER_SIM_LATENCY"] = json.dumps(parse_latency(args.latency))
+    os.environ["PROVIDER_SIM_ERROR_RATES"] = json.dumps(parse_error_rates(args.error_rate))
+    os.environ["PROVIDER_SIM_SPEED"] = str(args.speed)
+    os.environ["PROVIDER_SIM_SEED"] = str(args.seed)
+    # 같은 요청이 캐시에서 반환되면 처리량이 부풀려지므로 응답 캐시 비활성화
+    os.environ["LLM_CACHE_ENABLED"] = "False"
+
+    if args.record:
+        # 실제 API 키는 .env에서 로드 (위에서 지정한 값은 덮어쓰지 않음)
+        from dotenv import load_dotenv
+        load_dotenv(project_root / "backend" / ".env")
+    else:
+        # 재생 시에는 외부 연결이 없으므로 더미 키로 클라이언트만 초기화
+        os.environ["GEMINI_API_KEY"] = "replay"
+        os.environ["IMAGE_PROVIDER"] = os.environ.get("IMAGE_PROVIDER", "nanobanana")
+        os.environ["GEMINI_RPM_LIMIT"] = str(args.rpm_limit)
+        os.environ["GEMINI_CONTEXT_CACHE_ENABLED"] = "False"
+        os.environ["CLIENT_WARMUP_ON_STARTUP"] = "False"
+
+    latencies, errors, elapsed, drain_elapsed = await run(args.requests, args.concurrency, args.fast_mode)
+
+    from app.services.job_queue import job_queue
+    from app.services.provider_sim import provider_sim
+
+    print("\n" + "=" * 60)
+    print(f"📊 /api/content/generate 처리량 ({'기록' if args.record else '재생'}, 동시 {args.concurrency})")
+    print("=" * 60)
+    print(f"요청: {args.requests}개, 성공: {len(latencies)}개, 실패: {sum(errors.values())}개 {errors or ''}")
+    print(f"전체 시간: {elapsed:.2f}초, 처리량: {len(latencies) / elapsed:.2f} req/s")
+    if latencies:
+        print(f"지연 시간(초) p50: {percentile(latencies, 50):.2f}  p95: {percentile(latencies, 95):.2f}  "
+              f"p99: {percentile(latencies, 99):.2f}  max: {max(latencies):.2f}")
+    print(f"\n후처리 작업 (응답 후 {drain_elapsed:.2f}초 더 소요):")
+    for job_type, stats in job_queue.get_stats()["types"].items():
+        print(f"  {job_type:<20} {stats}")
+    print("\n프로바이더별 기록/재생:")
+    for provider, stats in provider_sim.get_stats()["providers"].items():
+        print(f"  {provider:<12} {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
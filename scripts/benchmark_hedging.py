@@ -0,0 +1,132 @@
+"""
+요청 헤징 벤치마크 스크립트
+
+가끔 긴 지연(stall)이 발생하는 가짜 API 호출을 헤징 없이 / 헤징 적용으로 각각 실행하여
+p50/p95/p99 지연 시간과 추가 호출 수(비용)를 비교합니다.
+
+사용법:
+    # 기본: 요청 300개, 4% 확률로 3초 지연, 평소 0.2-0.4초
+    python scripts/benchmark_hedging.py
+
+    # 지연 분포와 헤징 설정 변경
+    python scripts/benchmark_hedging.py --requests 500 --stall-prob 0.02 --stall 5 --percentile 90 --max-ratio 0.05
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+# .env 파일 로드
+from dotenv import load_dotenv
+load_dotenv(project_root / "backend" / ".env")
+
+from app.services.hedging import RequestHedger
+
+
+class FakeProvider:
+    """평소에는 빠르지만 가끔 멈추는(stall) 가짜 API"""
+
+    def __init__(self, base_min: float, base_max: float, stall_prob: float, stall: float):
+        self.base_min = base_min
+        self.base_max = base_max
+        self.stall_prob = stall_prob
+        self.stall = stall
+        self.calls = 0
+        self.cancelled = 0
+
+    async def call(self) -> float:
+        self.calls += 1
+        latency = self.stall if random.random() < self.stall_prob else random.uniform(self.base_min, self.base_max)
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return latency
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run(hedger: RequestHedger, provider: FakeProvider, requests: int, concurrency: int) -> list:
+    """requests개 요청을 concurrency개씩 동시에 실행하고 요청별 지연 시간 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await hedger.run("benchmark", provider.call)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def print_row(label: str, latencies: list, requests: int, provider: FakeProvider):
+    print(
+        f"{label:<12}"
+        f"{percentile(latencies, 50):>8.2f}"
+        f"{percentile(latencies, 95):>8.2f}"
+        f"{percentile(latencies, 99):>8.2f}"
+        f"{max(latencies):>8.2f}"
+        f"{provider.calls:>8}"
+        f"{(provider.calls - requests) / requests:>10.1%}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="요청 헤징 벤치마크")
+    parser.add_argument("--requests", type=int, default=300, help="요청 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--base-min", type=float, default=0.2, help="평소 최소 지연(초)")
+    parser.add_argument("--base-max", type=float, default=0.4, help="평소 최대 지연(초)")
+    parser.add_argument("--stall-prob", type=float, default=0.04, help="긴 지연 발생 확률")
+    parser.add_argument("--stall", type=float, default=3.0, help="긴 지연 시간(초)")
+    parser.add_argument("--percentile", type=float, default=95.0, help="헤지 전송 백분위")
+    parser.add_argument("--max-ratio", type=float, default=0.1, help="최대 헤지 비율")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    args = parser.parse_args()
+
+    results = {}
+    for label, enabled in (("헤징 없음", False), ("헤징 적용", True)):
+        random.seed(args.seed)
+        provider = FakeProvider(args.base_min, args.base_max, args.stall_prob, args.stall)
+        hedger = RequestHedger(
+            enabled=enabled,
+            percentile=args.percentile,
+            max_hedge_ratio=args.max_ratio,
+            min_samples=20,
+            min_delay_seconds=0.0
+        )
+        # 지연 분포를 학습할 수 있도록 워밍업 (헤징 여부와 관계없이 동일)
+        await run(hedger, FakeProvider(args.base_min, args.base_max, 0.0, args.stall), 30, args.concurrency)
+
+        latencies = await run(hedger, provider, args.requests, args.concurrency)
+        results[label] = (latencies, provider, hedger.get_stats()["operations"]["benchmark"])
+
+    print("\n" + "=" * 60)
+    print("📊 요청 헤징 효과 (단위: 초)")
+    print("=" * 60)
+    print(f"{'':<12}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'호출 수':>8}{'추가 호출':>10}")
+    print("-" * 60)
+    for label, (latencies, provider, _) in results.items():
+        print_row(label, latencies, args.requests, provider)
+
+    stats = results["헤징 적용"][2]
+    print(f"\n헤지 전송: {stats['hedged']}회, 헤지 승리: {stats['hedge_wins']}회, "
+          f"비율 한도로 생략: {stats['skipped_by_ratio']}회, 헤지 시점: {stats['hedge_delay']:.2f}초")
+    print(f"취소된 요청: {results['헤징 적용'][1].cancelled}회")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+이미지/카피 재생성 Gemini 호출 수 벤치마크 (외부 API 재생)
+
+/api/content/generate로 콘텐츠를 만든 뒤 같은 콘텐츠를 재생성하면서
+단계 산출물 재사용(REGENERATE_REUSE_ARTIFACTS)을 끄고 켠 경우의 재생성 1회당 Gemini 호출 수를 비교합니다.
+
+- 이미지 재생성: 이미지 프롬프트 변환 + 페르소나 생성 + 반응 시뮬레이션 → 이미지만 생성 (성과 예측은 원본 복사)
+- 이미지 재생성 (커스텀 요청): 프롬프트 수정 + 페르소나 생성 + 반응 시뮬레이션 → 프롬프트 수정만
+- 카피 재생성: 카피 생성 + 페르소나 생성 + 반응 시뮬레이션 → 카피 생성 + 반응 시뮬레이션
+
+합성 카세트(benchmark_generate_throughput.py --seed-synthetic과 동일)를 재생하므로 API 키가 필요 없습니다.
+
+사용법:
+    python scripts/benchmark_regenerate_calls.py
+    python scripts/benchmark_regenerate_calls.py --repeat 5
+"""
+
+import os
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmark_generate_throughput import PRODUCT, project_root, seed_synthetic
+
+SCENARIOS = {
+    "image": ("/api/content/regenerate/image", {}),
+    "image_custom": ("/api/content/regenerate/image", {"customPrompt": "배경을 파스텔 톤으로 바꿔줘"}),
+    "copy": ("/api/content/regenerate/copy", {"copy_tone": "casual"})
+}
+
+
+def regenerate_body(content: dict, extra: dict) -> dict:
+    """프론트엔드와 같은 재생성 요청 본문 (현재 콘텐츠 + 제품 정보)"""
+    strategy = content.get("selected_strategy") or {}
+    return {
+        **content,
+        "product_name": PRODUCT["product_name"],
+        "product_description": PRODUCT["product_description"],
+        "category": PRODUCT["category"],
+        "copy_tone": PRODUCT["copy_tone"],
+        "strategy_name": strategy.get("name", ""),
+        "core_message": strategy.get("core_message", ""),
+        **extra
+    }
+
+
+async def run(repeat: int) -> dict:
+    import httpx
+    from app.config import settings
+    from app.main import app
+    from app.models.base import Base, engine, SessionLocal
+    from app.models.user import User
+    from app.services.client_pool import client_pool
+    from app.utils.auth import get_current_user
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="benchmark@example.com", name="벤치마크")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    def gemini_calls() -> int:
+        return client_pool.stats.get("gemini", {}).get("calls", 0)
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None) as client:
+        response = await client.post("/api/content/generate", json=PRODUCT)
+        response.raise_for_status()
+        content = response.json()["data"]
+        print(f"✓ 원본 콘텐츠 생성 (content_id: {content['content_id']})")
+
+        for reuse in (False, True):
+            settings.REGENERATE_REUSE_ARTIFACTS = reuse
+            for name, (path, extra) in SCENARIOS.items():
+                counts = []
+                for _ in range(repeat):
+                    before = gemini_calls()
+                    response = await client.post(path, json=regenerate_body(content, extra))
+                    response.raise_for_status()
+                    counts.append(gemini_calls() - before)
+                results[(name, reuse)] = sum(counts) / len(counts)
+
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="재생성 Gemini 호출 수 벤치마크 (재생)")
+    parser.add_argument("--repeat", type=int, default=3, help="시나리오별 재생성 횟수")
+    args = parser.parse_args()
+
+    cassette_dir = project_root / "backend" / "cassettes" / "synthetic"
+    seed_synthetic(cassette_dir)
+
+    # 설정은 app 모듈을 import하기 전에 환경 변수로 지정
+    db_path = Path(tempfile.mkdtemp()) / "benchmark.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}?check_same_thread=false"
+    os.environ["PROVIDER_SIM_MODE"] = "replay"
+    os.environ["PROVIDER_SIM_CASSETTE_DIR"] = str(cassette_dir)
+    os.environ["PROVIDER_SIM_SPEED"] = "0"
+    os.environ["GEMINI_API_KEY"] = "replay"
+    os.environ["IMAGE_PROVIDER"] = "nanobanana"
+    os.environ["GEMINI_RPM_LIMIT"] = "100000"
+    os.environ["GEMINI_CONTEXT_CACHE_ENABLED"] = "False"
+    os.environ["CLIENT_WARMUP_ON_STARTUP"] = "False"
+    # 캐시 적중은 호출 수를 줄이므로 비활성화, 원본 성과 예측(페르소나)은 생성 요청 안에서 실행
+    os.environ["LLM_CACHE_ENABLED"] = "False"
+    os.environ["BACKGROUND_POST_PROCESSING"] = "False"
+
+    results = await run(args.repeat)
+
+    print("\n" + "=" * 60)
+    print(f"📊 재생성 1회당 Gemini 호출 수 (시나리오별 {args.repeat}회 평균)")
+    print("=" * 60)
+    print(f"{'시나리오':<16}{'재사용 끔':>10}{'재사용':>10}")
+    for name in SCENARIOS:
+        print(f"{name:<16}{results[(name, False)]:>10.1f}{results[(name, True)]:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
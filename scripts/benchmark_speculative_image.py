@@ -0,0 +1,109 @@
+"""
+추측(speculative) 이미지 생성 벤치마크 (외부 API 재생)
+
+/api/content/generate를 speculative_image 끄고/켜고 순차 실행하여 요청 지연 시간,
+추측 이미지 채택률(카피 기반 프롬프트와의 유사도 기준), 채택 시 절약한 시간을 비교합니다.
+
+합성 카세트(benchmark_generate_throughput.py --seed-synthetic과 동일)를 재생하므로 API 키가 필요 없습니다.
+합성 카세트는 이미지 프롬프트 변환 응답이 하나뿐이라 항상 채택되므로, 실제 채택률은 --record로 기록한
+카세트(benchmark_generate_throughput.py --record)를 --cassette-dir로 지정하거나 운영 지표
+(/api/metrics의 speculative_image.outcomes, speculative_image.saved_seconds)로 확인합니다.
+
+사용법:
+    python scripts/benchmark_speculative_image.py
+    python scripts/benchmark_speculative_image.py --requests 10 --speed 0.5
+"""
+
+import os
+import asyncio
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_generate_throughput import PRODUCT, percentile, project_root, seed_synthetic
+
+
+async def run(requests: int) -> dict:
+    import httpx
+    from app.main import app
+    from app.models.base import Base, engine, SessionLocal
+    from app.models.user import User
+    from app.utils.auth import get_current_user
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="benchmark@example.com", name="벤치마크")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None) as client:
+        for speculative in (False, True):
+            latencies, outcomes, saved = [], {}, []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.post("/api/content/generate", json={**PRODUCT, "speculative_image": speculative})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+                speculation = response.json()["data"].get("speculative_image") or {}
+                if speculation:
+                    outcomes[speculation["outcome"]] = outcomes.get(speculation["outcome"], 0) + 1
+                    if speculation.get("saved_seconds") is not None:
+                        saved.append(speculation["saved_seconds"])
+            results[speculative] = {"latencies": latencies, "outcomes": outcomes, "saved": saved}
+
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="추측 이미지 생성 벤치마크 (재생)")
+    parser.add_argument("--requests", type=int, default=5, help="모드별 요청 수")
+    parser.add_argument("--speed", type=float, default=1.0, help="기록된 지연 시간 배율")
+    parser.add_argument("--cassette-dir", default=None, help="재생할 카세트 디렉토리 (기본: 합성 카세트 생성)")
+    args = parser.parse_args()
+
+    if args.cassette_dir:
+        cassette_dir = Path(args.cassette_dir)
+    else:
+        cassette_dir = project_root / "backend" / "cassettes" / "synthetic"
+        seed_synthetic(cassette_dir)
+
+    # 설정은 app 모듈을 import하기 전에 환경 변수로 지정
+    db_path = Path(tempfile.mkdtemp()) / "benchmark.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}?check_same_thread=false"
+    os.environ["PROVIDER_SIM_MODE"] = "replay"
+    os.environ["PROVIDER_SIM_CASSETTE_DIR"] = str(cassette_dir)
+    os.environ["PROVIDER_SIM_SPEED"] = str(args.speed)
+    os.environ["GEMINI_API_KEY"] = "replay"
+    os.environ["IMAGE_PROVIDER"] = "nanobanana"
+    os.environ["GEMINI_RPM_LIMIT"] = "100000"
+    os.environ["GEMINI_CONTEXT_CACHE_ENABLED"] = "False"
+    os.environ["CLIENT_WARMUP_ON_STARTUP"] = "False"
+    os.environ["LLM_CACHE_ENABLED"] = "False"
+
+    results = await run(args.requests)
+
+    print("\n" + "=" * 60)
+    print(f"📊 추측 이미지 생성 (모드별 {args.requests}회, 순차)")
+    print("=" * 60)
+    for speculative, result in results.items():
+        latencies = result["latencies"]
+        print(f"{'speculative' if speculative else 'baseline':<12} p50: {percentile(latencies, 50):.2f}초  "
+              f"max: {max(latencies):.2f}초")
+    outcomes = results[True]["outcomes"]
+    total = sum(outcomes.values())
+    if total:
+        print(f"\n추측 이미지 채택률: {outcomes.get('accepted', 0) / total:.0%} {outcomes}")
+    saved = results[True]["saved"]
+    if saved:
+        print(f"채택 시 절약한 시간 (추정): 평균 {sum(saved) / len(saved):.2f}초")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""
+타겟 인사이트 웨어하우스 구축/갱신
+
+targets 테이블(import_target_profiles.py로 임포트한 프로필)을 (카테고리, 연령대, 성별, 관심사) 세그먼트별로
+집계하여 insight_segments 테이블을 교체합니다. targets가 비어 있으면 data/processed/target_profiles.json을 사용합니다.
+API 서버는 INSIGHT_WAREHOUSE_RELOAD_SECONDS 안에 새 세그먼트를 읽습니다.
+
+프로필 데이터가 바뀔 때마다(또는 주기적으로 cron에서) 실행합니다.
+
+사용법:
+    python scripts/build_insight_warehouse.py
+    python scripts/build_insight_warehouse.py --from-json data/processed/target_profiles.json
+    python scripts/build_insight_warehouse.py --dry-run   # 저장하지 않고 적중률/조회 시간만 확인
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+# .env 파일 로드
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / "backend" / ".env")
+
+from app.models.base import SessionLocal
+from app.models.target import Target
+from app.services.insight_warehouse import insight_warehouse, AGE_GROUPS, CATEGORY_NAMES, ANY
+
+DEFAULT_JSON = PROJECT_ROOT / "data" / "processed" / "target_profiles.json"
+
+
+def load_profiles(db, json_path: Path = None) -> list:
+    """targets 테이블 → 없으면 JSON 파일"""
+    if json_path is None:
+        targets = db.query(Target).all()
+        if targets:
+            print(f"✓ targets 테이블에서 {len(targets):,}개 프로필 로드")
+            return [
+                {
+                    "category": t.category,
+                    "age_group": t.age_group,
+                    "gender": t.gender,
+                    "income_level": t.income_level,
+                    "interests": t.interests or [],
+                    "pain_points": t.pain_points or [],
+                    "preferred_channels": t.preferred_channels or [],
+                    "lifestyle": t.lifestyle
+                }
+                for t in targets
+            ]
+        json_path = DEFAULT_JSON
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        profiles = json.load(f)
+    print(f"✓ {json_path}에서 {len(profiles):,}개 프로필 로드")
+    return profiles
+
+
+def coverage(segments: dict) -> None:
+    """프론트엔드 선택지(카테고리 × 연령대 × 성별, 관심사 없음) 기준 적중률과 조회 시간"""
+    insight_warehouse._segments = segments
+    insight_warehouse._loaded_at = time.monotonic()
+
+    hits, total, elapsed = 0, 0, 0.0
+    for category in CATEGORY_NAMES:
+        for age in AGE_GROUPS:
+            for gender in ("남성", "여성", "무관"):
+                start = time.perf_counter()
+                result = insight_warehouse.lookup(category, [age], [gender], [])
+                elapsed += time.perf_counter() - start
+                total += 1
+                hits += result is not None
+
+    interests = sorted({key[3] for key in segments if key[3] != ANY})
+    print(f"세그먼트: {len(segments):,}개 (관심사 {len(interests)}종)")
+    print(f"적중률 (카테고리 × 연령대 × 성별): {hits}/{total} ({hits / total:.0%})")
+    print(f"평균 조회 시간: {elapsed / total * 1e6:.1f}µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="타겟 인사이트 웨어하우스 구축")
+    parser.add_argument("--from-json", type=Path, default=None, help="targets 테이블 대신 사용할 프로필 JSON")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 적중률만 확인")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        profiles = load_profiles(db, args.from_json)
+        if not profiles:
+            print("❌ 프로필이 없습니다 (import_target_profiles.py로 먼저 임포트하세요)")
+            return
+
+        start = time.perf_counter()
+        segments = insight_warehouse.build(profiles)
+        print(f"✓ 세그먼트 집계 완료 ({time.perf_counter() - start:.2f}초)")
+
+        if not args.dry_run:
+            saved = insight_warehouse.save(db, segments)
+            print(f"✓ insight_segments 교체 완료 ({saved:,}개)")
+
+        coverage(segments)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()